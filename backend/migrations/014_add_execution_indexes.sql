@@ -0,0 +1,7 @@
+-- Migration: Add composite indexes for execution hot paths
+-- Description: get_active_execution, board stats and log reads filter/order by these columns
+
+CREATE INDEX IF NOT EXISTS idx_executions_card_active_started ON executions(card_id, is_active, started_at);
+CREATE INDEX IF NOT EXISTS idx_executions_active_started ON executions(is_active, started_at);
+CREATE INDEX IF NOT EXISTS idx_execution_logs_execution_sequence ON execution_logs(execution_id, sequence);
+
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark do read path do board (GET /api/cards).
+
+Compara o caminho antigo (4 queries por card: execução ativa em duas queries
+SQL cruas + get_token_stats_for_card + get_cost_stats_for_card) com
+ExecutionRepository.get_board_stats (queries agrupadas, número constante).
+
+Uso (a partir de backend/):
+    python scripts/benchmark_board.py [--cards 10 50 100 300 1000] [--executions 4]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from src.database import Base, _set_sqlite_pragma  # noqa: E402
+from src.models.card import Card  # noqa: E402
+from src.models.execution import Execution, ExecutionStatus  # noqa: E402
+from src.models.project import ActiveProject  # noqa: E402,F401
+from src.repositories.card_repository import CardRepository  # noqa: E402
+from src.repositories.execution_repository import ExecutionRepository  # noqa: E402
+
+STAGES = ["plan", "implement", "test", "review"]
+MODELS = ["opus-4.5", "sonnet-4.5", "haiku-4.5"]
+
+
+async def seed(session: AsyncSession, card_count: int, executions_per_card: int) -> None:
+    """Popula o banco com cards e execuções sintéticas."""
+    now = datetime.utcnow()
+    for i in range(card_count):
+        card_id = str(uuid.uuid4())
+        session.add(Card(id=card_id, title=f"Card {i}", column_id="implement"))
+        for j in range(executions_per_card):
+            is_last = j == executions_per_card - 1
+            session.add(Execution(
+                id=str(uuid.uuid4()),
+                card_id=card_id,
+                command=f"/{STAGES[j % len(STAGES)]}",
+                status=ExecutionStatus.RUNNING if is_last else ExecutionStatus.SUCCESS,
+                workflow_stage=STAGES[j % len(STAGES)],
+                model_used=MODELS[j % len(MODELS)],
+                input_tokens=1000 * (j + 1),
+                output_tokens=400 * (j + 1),
+                total_tokens=1400 * (j + 1),
+                is_active=is_last,
+                started_at=now - timedelta(minutes=executions_per_card - j),
+            ))
+    await session.commit()
+
+
+async def legacy_board(session: AsyncSession) -> int:
+    """Replica o loop por card do GET /api/cards original."""
+    cards = await CardRepository(session).get_all()
+    exec_repo = ExecutionRepository(session)
+    for card in cards:
+        result = await session.execute(
+            text("SELECT 1 FROM executions WHERE card_id = :card_id AND is_active = 1"),
+            {"card_id": card.id},
+        )
+        if result.first():
+            await session.execute(
+                text("""
+                    SELECT id, status, command, started_at, completed_at, workflow_stage, workflow_error
+                    FROM executions
+                    WHERE card_id = :card_id AND is_active = 1
+                """),
+                {"card_id": card.id},
+            )
+        await exec_repo.get_token_stats_for_card(card.id)
+        await exec_repo.get_cost_stats_for_card(card.id)
+    return len(cards)
+
+
+async def grouped_board(session: AsyncSession) -> int:
+    """Read path atual: cards + get_board_stats."""
+    cards = await CardRepository(session).get_all()
+    await ExecutionRepository(session).get_board_stats()
+    return len(cards)
+
+
+async def measure(session_maker, fn, repeat: int) -> float:
+    """Retorna a melhor latência (ms) entre `repeat` execuções."""
+    best = float("inf")
+    for _ in range(repeat):
+        async with session_maker() as session:
+            start = time.perf_counter()
+            await fn(session)
+            best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+async def run(card_counts: list[int], executions_per_card: int, repeat: int) -> None:
+    print(f"{'cards':>6} | {'per-card (ms)':>14} | {'grouped (ms)':>13} | {'speedup':>7}")
+    print("-" * 50)
+
+    for card_count in card_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/board.db")
+            event.listen(engine.sync_engine, "connect", _set_sqlite_pragma)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+            session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            async with session_maker() as session:
+                await seed(session, card_count, executions_per_card)
+
+            legacy_ms = await measure(session_maker, legacy_board, repeat)
+            grouped_ms = await measure(session_maker, grouped_board, repeat)
+            await engine.dispose()
+
+        print(f"{card_count:>6} | {legacy_ms:>14.1f} | {grouped_ms:>13.1f} | {legacy_ms / grouped_ms:>6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do read path do board")
+    parser.add_argument("--cards", type=int, nargs="+", default=[10, 50, 100, 300, 1000])
+    parser.add_argument("--executions", type=int, default=4, help="Execuções por card")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições (melhor tempo)")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.cards, args.executions, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
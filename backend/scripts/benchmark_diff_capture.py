@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark da captura de diff (DiffAnalyzer.capture_diff).
+
+Cria um repositório sintético com `--files` arquivos alterados numa branch
+(alguns com `--big-kb` KB de diff) e mede tempo e pico de memória Python
+(tracemalloc) da captura em passada única, comparando com o tamanho bruto
+do `git diff`. Com os limites por arquivo/total o pico fica limitado pelo
+conteúdo retido, não pelo tamanho do diff. Por fim mede a recaptura do
+mesmo intervalo (base, head), que é uma leitura do DiffCache (em memória).
+
+Uso (a partir de backend/):
+    python scripts/benchmark_diff_capture.py [--files 5000] [--big-files 20] [--big-kb 2048]
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.diff_analyzer import DiffAnalyzer  # noqa: E402
+from src.services.diff_cache import DiffCache  # noqa: E402
+
+
+def _git(cwd: Path, *args: str) -> bytes:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True).stdout
+
+
+def synthetic_repo(root: Path, files: int, big_files: int, big_kb: int) -> Path:
+    """Branch `agent/bench` alterando `files` arquivos (os `big_files` primeiros com diff grande)."""
+    repo = root / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    _git(repo, "config", "user.email", "bench@example.com")
+    _git(repo, "config", "user.name", "Bench")
+    for i in range(files):
+        directory = repo / f"pkg{i % 100:02d}"
+        directory.mkdir(exist_ok=True)
+        (directory / f"module_{i}.py").write_text(f"value = {i}\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "base")
+
+    _git(repo, "checkout", "-q", "-b", "agent/bench")
+    line = "x" * 63 + "\n"
+    for i in range(files):
+        body = line * (big_kb * 16) if i < big_files else ""
+        (repo / f"pkg{i % 100:02d}" / f"module_{i}.py").write_text(f"value = {i + 1}\n{body}")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "change")
+    return repo
+
+
+async def run(files: int, big_files: int, big_kb: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = synthetic_repo(Path(tmp), files, big_files, big_kb)
+        raw_size = len(_git(repo, "diff", "main...HEAD"))
+
+        start = time.perf_counter()
+        await DiffAnalyzer(DiffCache()).capture_diff(str(repo), "agent/bench", include_content=True)
+        elapsed = time.perf_counter() - start
+
+        # Segunda captura só para o pico de memória (tracemalloc deixa tudo mais lento)
+        analyzer = DiffAnalyzer(DiffCache())
+        tracemalloc.start()
+        stats = await analyzer.capture_diff(str(repo), "agent/bench", include_content=True)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        await analyzer.capture_diff(str(repo), "agent/bench")
+        cached = time.perf_counter() - start
+
+        captured = sum(len(diff.content) for diff in stats.file_diffs)
+        truncated = sum(diff.truncated for diff in stats.file_diffs)
+        print(f"Arquivos alterados:   {len(stats.file_diffs)} ({big_files} com {big_kb} KB de diff)")
+        print(f"Diff bruto:           {raw_size / 2**20:.1f} MB")
+        print(f"Conteúdo capturado:   {captured / 2**20:.1f} MB ({truncated} arquivos truncados)")
+        print(f"Pico de memória:      {peak / 2**20:.1f} MB")
+        print(f"Tempo de captura:     {elapsed:.2f} s")
+        print(f"Recaptura (cache):    {cached * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da captura de diff em passada única")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--big-files", type=int, default=20)
+    parser.add_argument("--big-kb", type=int, default=2048)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.files, args.big_files, args.big_kb))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória do registro de execuções em memória (agent.executions).
+
+Simula execuções sintéticas em sequência, cada uma transmitindo `--lines`
+logs de `--line-bytes` bytes, e mede o RSS do processo e a memória Python
+viva (tracemalloc) a cada bloco. Com o ring buffer por record e a expiração
+dos records concluídos o RSS deve ficar estável; `--unbounded` reproduz o
+comportamento antigo (dict sem limites) para comparação.
+
+Uso (a partir de backend/):
+    python scripts/benchmark_execution_memory.py [--executions 500] [--lines 1000] [--unbounded]
+"""
+
+import argparse
+import gc
+import resource
+import sys
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.execution import ExecutionLog, ExecutionRecord, ExecutionStatus, LogType  # noqa: E402
+from src.services.execution_registry import ExecutionRegistry  # noqa: E402
+
+
+def rss_mb() -> float:
+    """RSS atual (Linux: /proc/self/status; senão o pico via getrusage)."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(executions: int, lines: int, line_bytes: int, log_lines: int, grace: float, unbounded: bool) -> None:
+    if unbounded:
+        registry = ExecutionRegistry(max_log_lines=sys.maxsize, grace_seconds=float("inf"))
+    else:
+        registry = ExecutionRegistry(max_log_lines=log_lines, grace_seconds=grace)
+
+    mode = "sem limites" if unbounded else f"ring {log_lines} linhas, grace {grace:g}s"
+    print(f"{executions} execuções x {lines} logs de {line_bytes} B ({mode})\n")
+    print(f"{'execuções':>9} | {'records':>7} | {'RSS (MB)':>9} | {'Python vivo (MB)':>16}")
+    print("-" * 52)
+
+    tracemalloc.start()
+    payload = "x" * line_bytes
+    step = max(executions // 10, 1)
+    for i in range(1, executions + 1):
+        card_id = f"card-{i}"
+        record = ExecutionRecord(
+            cardId=card_id,
+            title=f"Synthetic card {i}",
+            startedAt=datetime.now().isoformat(),
+            status=ExecutionStatus.RUNNING,
+            logs=[],
+        )
+        registry[card_id] = record
+        for n in range(lines):
+            # Conteúdo único por linha, como tokens transmitidos de verdade
+            registry.append_log(record, ExecutionLog(
+                timestamp=datetime.now().isoformat(),
+                type=LogType.TEXT,
+                content=f"{n}:{payload}",
+            ))
+        record.completed_at = datetime.now().isoformat()
+        record.status = ExecutionStatus.SUCCESS
+
+        if i % step == 0 or i == executions:
+            gc.collect()
+            current, _ = tracemalloc.get_traced_memory()
+            print(f"{i:>9} | {len(registry):>7} | {rss_mb():>9.1f} | {current / 2**20:>16.1f}")
+
+    tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memória de agent.executions")
+    parser.add_argument("--executions", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=1000, help="Logs transmitidos por execução")
+    parser.add_argument("--line-bytes", type=int, default=200)
+    parser.add_argument("--log-lines", type=int, default=500, help="Tamanho do ring buffer por record")
+    parser.add_argument("--grace", type=float, default=0.0, help="Grace period dos records concluídos (s)")
+    parser.add_argument("--unbounded", action="store_true", help="Comportamento antigo, sem limites")
+    args = parser.parse_args()
+
+    run(args.executions, args.lines, args.line_bytes, args.log_lines, args.grace, args.unbounded)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark de recall vs memória das opções de armazenamento de vetores.
+
+Gera um conjunto sintético de learnings (vetores agrupados em tópicos, como
+embeddings de goals parecidos) e compara, no LocalVectorStore, float32 contra
+int8/binary (com rescoring em float32 do top-k) e truncamento Matryoshka.
+O recall@k é medido contra a busca exata em float32 na dimensão completa.
+
+Vetores sintéticos espalham a informação igualmente por todas as dimensões,
+então o truncamento aqui é um limite inferior: modelos treinados com
+Matryoshka concentram a informação nas primeiras dimensões.
+
+Uso (a partir de backend/):
+    python scripts/benchmark_quantization.py [--points 20000] [--queries 200] [--k 10]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.local_vector_store import LocalVectorStore  # noqa: E402
+from src.services.vector_store import VectorPoint  # noqa: E402
+
+# (rótulo, quantização, dimensão armazenada ou None, oversampling)
+CONFIGS = [
+    ("float32", "none", None, 1.0),
+    ("int8 x3", "int8", None, 3.0),
+    ("int8 x1", "int8", None, 1.0),
+    ("binary x3", "binary", None, 3.0),
+    ("binary x10", "binary", None, 10.0),
+    ("float32 @256", "none", 256, 1.0),
+    ("int8 x3 @256", "int8", 256, 3.0),
+    ("float32 @128", "none", 128, 1.0),
+]
+
+
+def synthetic_learnings(points: int, queries: int, dim: int, topics: int, seed: int = 0):
+    """Vetores normalizados em torno de `topics` centros + consultas próximas."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    data = centers[rng.integers(0, topics, points)] + 1.2 * rng.standard_normal((points, dim)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+
+    picked = data[rng.integers(0, points, queries)]
+    query_vectors = picked + 0.5 * rng.standard_normal((queries, dim)).astype(np.float32) / np.sqrt(dim)
+    query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    return data, query_vectors
+
+
+async def run_config(data, query_vectors, truth, k, quantization, dimension, oversampling):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalVectorStore(
+            tmp,
+            dimension=dimension or data.shape[1],
+            ivf_threshold=len(data) + 1,  # mede só a quantização, sem IVF
+            quantization=quantization,
+            rescore_oversampling=oversampling,
+        )
+        await store.upsert([
+            VectorPoint(id=str(i), vector=vector, payload={})
+            for i, vector in enumerate(data)
+        ])
+
+        hits = 0
+        start = time.perf_counter()
+        for query, expected in zip(query_vectors, truth):
+            results = store._query(query, k, None, None)
+            hits += len({int(r.id) for r in results} & expected)
+        latency_ms = (time.perf_counter() - start) * 1000 / len(query_vectors)
+
+        return hits / (k * len(query_vectors)), store.memory_bytes(), latency_ms
+
+
+async def run(points: int, queries: int, k: int, dim: int, topics: int) -> None:
+    data, query_vectors = synthetic_learnings(points, queries, dim, topics)
+    exact = query_vectors @ data.T
+    truth = [set(np.argsort(-row)[:k].tolist()) for row in exact]
+
+    print(f"{points} learnings, dim {dim}, {queries} consultas, recall@{k}\n")
+    print(f"{'config':>14} | {'recall':>7} | {'RAM (MB)':>9} | {'vs f32':>7} | {'ms/query':>8}")
+    print("-" * 58)
+
+    baseline = None
+    for label, quantization, dimension, oversampling in CONFIGS:
+        recall, memory, latency = await run_config(
+            data, query_vectors, truth, k, quantization, dimension, oversampling,
+        )
+        baseline = baseline or memory
+        print(
+            f"{label:>14} | {recall:>7.3f} | {memory / 2**20:>9.2f} | "
+            f"{baseline / memory:>6.1f}x | {latency:>8.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de recall vs memória (quantização)")
+    parser.add_argument("--points", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--topics", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.points, args.queries, args.k, args.dim, args.topics))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark de criação de worktree: checkout completo vs sparse-checkout.
+
+Cria um repositório sintético (`--files` arquivos de `--file-kb` KB em 100
+pacotes) e mede tempo, arquivos materializados e bytes em disco de
+`GitWorkspaceManager.create_worktree` com checkout completo e com o cone
+semeado por `--patterns` pacotes (como os file_patterns dos experts de um
+card). O pool fica desligado nos dois modos para comparar só o checkout.
+
+Uso (a partir de backend/):
+    python scripts/benchmark_sparse_worktree.py [--files 20000] [--file-kb 4] [--patterns 5] [--runs 3]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import git_workspace  # noqa: E402
+from src.git_workspace import GitWorkspaceManager  # noqa: E402
+
+from benchmark_worktree_pool import synthetic_repo  # noqa: E402
+
+
+def footprint(worktree: Path) -> tuple[int, int]:
+    """(arquivos, bytes) do worktree, sem contar o arquivo `.git`."""
+    files = size = 0
+    for dirpath, _, filenames in os.walk(worktree):
+        for name in filenames:
+            if dirpath == str(worktree) and name == ".git":
+                continue
+            files += 1
+            size += os.path.getsize(os.path.join(dirpath, name))
+    return files, size
+
+
+async def acquire(manager: GitWorkspaceManager, card_id: str, patterns):
+    start = time.perf_counter()
+    result = await manager.create_worktree(card_id, sparse_patterns=patterns)
+    elapsed = time.perf_counter() - start
+    if not result.success:
+        raise RuntimeError(result.error)
+    files, size = footprint(Path(result.worktree_path))
+    await manager.cleanup_worktree(card_id, result.branch_name)
+    return elapsed, files, size
+
+
+async def run(files: int, file_kb: int, patterns: int, runs: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = synthetic_repo(Path(tmp), files, file_kb)
+        manager = GitWorkspaceManager(str(repo))
+        git_workspace.get_worktree_pool = lambda _: None
+        sparse_patterns = [f"pkg{i:02d}/" for i in range(patterns)]
+        print(
+            f"Repositório sintético: {files} arquivos x {file_kb} KB, "
+            f"cone de {patterns}/100 pacotes, {runs} criações por modo\n"
+        )
+
+        print(f"{'modo':>8} | {'mediana (s)':>11} | {'arquivos':>8} | {'disco (MB)':>10}")
+        print("-" * 47)
+        medians = {}
+        for label, mode_patterns in (("completo", None), ("sparse", sparse_patterns)):
+            samples = [await acquire(manager, f"{label[:4]}{i:04d}", mode_patterns) for i in range(runs)]
+            medians[label] = statistics.median(s[0] for s in samples)
+            _, tree_files, tree_bytes = samples[-1]
+            print(f"{label:>8} | {medians[label]:>11.3f} | {tree_files:>8} | {tree_bytes / 2**20:>10.1f}")
+        print(f"\nSpeedup (mediana): {medians['completo'] / medians['sparse']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de worktree completo vs sparse-checkout")
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--file-kb", type=int, default=4)
+    parser.add_argument("--patterns", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.files, args.file_kb, args.patterns, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark de aquisição de worktree: caminho frio vs pool pré-aquecido.
+
+Cria um repositório sintético (`--files` arquivos de `--file-kb` KB) e mede
+o tempo de `GitWorkspaceManager.create_worktree` até o card ter seu worktree
+e branch: sem pool (detecção da branch padrão + `git worktree add` com
+checkout completo) e com o WorktreePool já preenchido (`checkout -B` no
+worktree destacado + `git worktree move`). O preenchimento do pool acontece
+fora do tempo medido, como no servidor (em background).
+
+Uso (a partir de backend/):
+    python scripts/benchmark_worktree_pool.py [--files 5000] [--file-kb 4] [--runs 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import git_workspace  # noqa: E402
+from src.git_workspace import GitWorkspaceManager, WorktreePool  # noqa: E402
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def synthetic_repo(root: Path, files: int, file_kb: int) -> Path:
+    """Repositório com `files` arquivos distribuídos em subdiretórios."""
+    repo = root / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    _git(repo, "config", "user.email", "bench@example.com")
+    _git(repo, "config", "user.name", "Bench")
+    line = "x" * 63 + "\n"
+    for i in range(files):
+        directory = repo / f"pkg{i % 100:02d}"
+        directory.mkdir(exist_ok=True)
+        (directory / f"module_{i}.py").write_text(f"# {i}\n" + line * (file_kb * 16))
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "initial")
+    return repo
+
+
+async def acquire(manager: GitWorkspaceManager, card_id: str) -> float:
+    start = time.perf_counter()
+    result = await manager.create_worktree(card_id)
+    elapsed = time.perf_counter() - start
+    if not result.success:
+        raise RuntimeError(result.error)
+    await manager.cleanup_worktree(card_id, result.branch_name)
+    return elapsed
+
+
+async def run(files: int, file_kb: int, runs: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = synthetic_repo(Path(tmp), files, file_kb)
+        manager = GitWorkspaceManager(str(repo))
+        print(f"Repositório sintético: {files} arquivos x {file_kb} KB, {runs} aquisições por modo\n")
+
+        git_workspace.get_worktree_pool = lambda _: None
+        cold = [await acquire(manager, f"cold{i:04d}") for i in range(runs)]
+
+        pool = WorktreePool(str(repo), size=1, refresh_interval=0)
+        git_workspace.get_worktree_pool = lambda _: pool
+        pooled = []
+        for i in range(runs):
+            await pool.fill()  # fora da medição: em produção roda em background
+            pooled.append(await acquire(manager, f"pool{i:04d}"))
+            await pool.stop()
+
+        print(f"{'modo':>8} | {'mediana (s)':>11} | {'mín (s)':>8} | {'máx (s)':>8}")
+        print("-" * 45)
+        for label, samples in (("frio", cold), ("pool", pooled)):
+            print(
+                f"{label:>8} | {statistics.median(samples):>11.3f} | "
+                f"{min(samples):>8.3f} | {max(samples):>8.3f}"
+            )
+        print(f"\nSpeedup (mediana): {statistics.median(cold) / statistics.median(pooled):.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de worktree frio vs pool")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--file-kb", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.files, args.file_kb, args.runs))
+
+
+if __name__ == "__main__":
+    main()
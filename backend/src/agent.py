@@ -1,6 +1,7 @@
 import re
 import json
 import asyncio
+import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -15,6 +16,7 @@ from claude_agent_sdk import (
     ToolUseBlock,
     ToolResultBlock,
     ResultMessage,
+    HookMatcher,
 )
 
 from .execution import (
@@ -27,11 +29,17 @@ from .execution import (
 
 from .repositories.execution_repository import ExecutionRepository
 from .models.execution import ExecutionStatus as DBExecutionStatus
-from .git_workspace import GitWorkspaceManager
+from .config.settings import get_settings
+from .git_workspace import GitWorkspaceManager, referenced_paths
+from .services.execution_registry import ExecutionRegistry
 from .services.execution_ws import execution_ws_manager
+from .services.live_broadcast_service import get_live_broadcast_service
 
-# Store executions in memory (mantido para compatibilidade durante migração)
-executions: dict[str, ExecutionRecord] = {}
+logger = logging.getLogger(__name__)
+
+# Store executions in memory (mantido para compatibilidade durante migração).
+# Limitado: últimas N linhas por record e records concluídos expiram.
+executions = ExecutionRegistry()
 
 
 def _is_retryable(error: str) -> bool:
@@ -69,7 +77,7 @@ async def execute_with_retry(
 
         if attempt < max_retries - 1:
             delay = retry_delay * (2 ** attempt)
-            print(f"[{card_id[:8]}] Retry {attempt + 1}/{max_retries} em {delay:.1f}s...")
+            logger.warning("[%s] Retry %s/%s em %.1fs...", card_id[:8], attempt + 1, max_retries, delay)
             await asyncio.sleep(delay)
 
     return PlanResult(
@@ -423,7 +431,7 @@ async def get_worktree_cwd(card_id: str, project_path: str, db_session: Optional
     # Verificar se eh repo git
     git_dir = Path(project_path) / ".git"
     if not git_dir.exists():
-        print(f"[Agent] Project is not a git repo, using project path directly")
+        logger.debug("Project is not a git repo, using project path directly")
         return project_path, None, None
 
     # Obter card para verificar se ja tem worktree
@@ -439,22 +447,31 @@ async def get_worktree_cwd(card_id: str, project_path: str, db_session: Optional
             if card.worktree_path:
                 # Verificar se worktree ainda existe
                 if Path(card.worktree_path).exists():
-                    print(f"[Agent] Using existing worktree: {card.worktree_path}")
+                    logger.debug("Using existing worktree: %s", card.worktree_path)
+                    await _expand_for_spec(card)
                     return card.worktree_path, card.branch_name, card.worktree_path
                 else:
-                    print(f"[Agent] Worktree path no longer exists, creating new one")
+                    logger.warning("Worktree path no longer exists, creating new one")
 
     # Criar novo worktree
     git_manager = GitWorkspaceManager(project_path)
     await git_manager.recover_state()
 
     if base_branch:
-        print(f"[Agent] Creating worktree with base branch: {base_branch}")
+        logger.debug("Creating worktree with base branch: %s", base_branch)
+
+    sparse_patterns = _sparse_patterns(card, project_path) if card else []
+    if sparse_patterns:
+        logger.debug("Creating sparse worktree seeded by %d patterns", len(sparse_patterns))
 
-    result = await git_manager.create_worktree(card_id, base_branch=base_branch)
+    result = await git_manager.create_worktree(
+        card_id, base_branch=base_branch, sparse_patterns=sparse_patterns or None
+    )
 
     if result.success:
-        print(f"[Agent] Created worktree: {result.worktree_path} on branch {result.branch_name}")
+        logger.info("Created worktree: %s on branch %s", result.worktree_path, result.branch_name)
+        if result.sparse_cone:
+            logger.info("Sparse checkout cone: %s", ", ".join(result.sparse_cone))
 
         # Atualizar card no banco
         if db_session:
@@ -469,10 +486,88 @@ async def get_worktree_cwd(card_id: str, project_path: str, db_session: Optional
 
         return result.worktree_path, result.branch_name, result.worktree_path
     else:
-        print(f"[Agent] Failed to create worktree: {result.error}, using project path")
+        logger.warning("Failed to create worktree: %s, using project path", result.error)
         return project_path, None, None
 
 
+def _sparse_patterns(card, project_path: str) -> list[str]:
+    """
+    Patterns que semeiam o sparse-checkout do worktree do card.
+
+    Vazio (checkout completo) se o modo estiver desligado ou se nenhum expert
+    do card tiver file_patterns: sem eles o cone teria so os arquivos da raiz.
+    """
+    settings = get_settings()
+    if not settings.worktree_sparse_checkout or not card.experts:
+        return []
+
+    from .config.experts import get_experts
+
+    experts = get_experts(project_path)
+    patterns = [
+        pattern
+        for expert_id in card.experts
+        for pattern in experts.get(expert_id, {}).get("file_patterns", [])
+    ]
+    if not patterns:
+        return []
+
+    patterns += settings.worktree_sparse_always_include
+    if card.spec_path:
+        patterns.append(card.spec_path)
+        spec_file = Path(project_path) / card.spec_path
+        if spec_file.is_file():
+            patterns += referenced_paths(spec_file.read_text(encoding="utf-8", errors="replace"))
+    return patterns
+
+
+async def _expand_for_spec(card) -> None:
+    """Amplia o cone do worktree sparse do card com os caminhos citados na spec (escrita no plan)."""
+    if not get_settings().worktree_sparse_checkout or not card.spec_path:
+        return
+    spec_file = Path(card.worktree_path) / card.spec_path
+    if not spec_file.is_file():
+        return
+    paths = referenced_paths(spec_file.read_text(encoding="utf-8", errors="replace"))
+    if paths:
+        await GitWorkspaceManager(card.worktree_path).expand_sparse_checkout(card.worktree_path, paths)
+
+
+# Ferramentas do SDK e o campo com o caminho que elas tocam
+_SPARSE_TOOL_PATHS = {"Read": "file_path", "Write": "file_path", "Edit": "file_path", "Glob": "path", "Grep": "path"}
+
+
+async def sparse_checkout_hooks(cwd: str) -> Optional[dict]:
+    """
+    Hooks do SDK que ampliam o cone de um worktree sparse antes de cada
+    ferramenta que toca um caminho fora dele. None se o cwd nao eh sparse.
+    """
+    # Desativado: evita o `git sparse-checkout list` em toda execucao
+    if not get_settings().worktree_sparse_checkout:
+        return None
+
+    manager = GitWorkspaceManager(cwd)
+    if await manager.sparse_cone(cwd) is None:
+        return None
+
+    async def expand(input_data, tool_use_id, context):
+        tool_name = input_data.get("tool_name")
+        tool_input = input_data.get("tool_input") or {}
+        paths = [tool_input.get(_SPARSE_TOOL_PATHS.get(tool_name, ""))]
+        if tool_name == "Glob" and tool_input.get("pattern"):
+            # Prefixo literal do glob: "backend/src/**/*.py" -> "backend/src"
+            paths.append(tool_input["pattern"].split("*")[0].rpartition("/")[0])
+        paths = [path for path in paths if path]
+        if paths:
+            try:
+                await manager.expand_sparse_checkout(cwd, paths, allow_new=tool_name == "Write")
+            except Exception as e:
+                logger.warning("Sparse checkout expansion failed: %s", e)
+        return {}
+
+    return {"PreToolUse": [HookMatcher(matcher="|".join(_SPARSE_TOOL_PATHS), hooks=[expand])]}
+
+
 async def get_execution(card_id: str, db_session: Optional[AsyncSession] = None) -> Optional[dict]:
     """Get execution record by card ID from database or memory."""
     if db_session:
@@ -494,6 +589,16 @@ async def get_execution(card_id: str, db_session: Optional[AsyncSession] = None)
         return None
 
 
+# Nível de log por tipo de entrada do agent
+_STREAM_LOG_LEVELS = {
+    LogType.TEXT.value: logging.DEBUG,
+    LogType.TOOL.value: logging.DEBUG,
+    LogType.INFO.value: logging.INFO,
+    LogType.RESULT.value: logging.INFO,
+    LogType.ERROR.value: logging.ERROR,
+}
+
+
 def get_all_executions() -> list[ExecutionRecord]:
     """Get all execution records."""
     return list(executions.values())
@@ -506,39 +611,47 @@ def add_log(record: ExecutionRecord, log_type: LogType, content: str) -> None:
         type=log_type,
         content=content,
     )
-    record.logs.append(log)
+    executions.append_log(record, log)
 
     # Criar prefixo com card_id (primeiros 8 caracteres para brevidade)
     card_id_short = record.card_id[:8] if len(record.card_id) > 8 else record.card_id
 
     # Se o record tiver título, incluir também (limitado)
-    if hasattr(record, 'title') and record.title:
+    if record.title:
         title_short = record.title[:25] + "..." if len(record.title) > 25 else record.title
         card_prefix = f"[{card_id_short}|{title_short}]"
     else:
         card_prefix = f"[{card_id_short}]"
 
-    print(f"{card_prefix} [Agent] [{log_type.value.upper()}] {content}")
+    log_type_str = log_type.value if hasattr(log_type, 'value') else str(log_type)
 
-    # Broadcast para espectadores do /live em tempo real
-    try:
-        from .services.live_broadcast_service import get_live_broadcast_service
-        live_broadcast = get_live_broadcast_service()
+    # Blocos transmitidos (text/tool) só em DEBUG: já vão para o banco e o WebSocket
+    logger.log(_STREAM_LOG_LEVELS.get(log_type_str, logging.INFO), "%s [%s] %s", card_prefix, log_type_str.upper(), content)
 
-        # Formatar log para espectadores
-        log_type_str = log_type.value if hasattr(log_type, 'value') else str(log_type)
+    # Broadcast para espectadores do /live em tempo real (só enfileira, não bloqueia execução)
+    try:
         formatted_content = f"{card_prefix} [{log_type_str.upper()}] {content}"
-
-        # Fire-and-forget async broadcast (não bloqueia execução)
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(live_broadcast.broadcast_log(formatted_content, log_type_str))
-        except RuntimeError:
-            # Sem event loop ativo, ignora broadcast
-            pass
+        get_live_broadcast_service().publish_log(formatted_content, log_type_str)
+    except RuntimeError:
+        # Sem event loop ativo, ignora broadcast
+        pass
     except Exception as e:
         # Não falha se broadcast falhar
-        print(f"[Agent] Warning: Failed to broadcast log to live: {e}")
+        logger.warning("Failed to broadcast log to live: %s", e)
+
+
+async def _full_logs(
+    record: ExecutionRecord,
+    repo: Optional[ExecutionRepository],
+    card_id: str,
+) -> list[ExecutionLog]:
+    """Logs completos da execução: busca no banco se o ring buffer descartou linhas."""
+    if not record.dropped_logs or repo is None:
+        return list(record.logs)
+    execution_data = await repo.get_execution_with_logs(card_id)
+    if not execution_data:
+        return list(record.logs)
+    return [ExecutionLog(**log) for log in execution_data["logs"]]
 
 
 def extract_spec_path(text: str) -> Optional[str]:
@@ -573,7 +686,7 @@ async def execute_plan_gemini(
     from .models.project import ActiveProject
     from sqlalchemy import select
 
-    print(f"[Agent] Initial cwd parameter: {cwd}")
+    logger.debug("Initial cwd parameter: %s", cwd)
 
     # Variável para armazenar project_id para métricas
     project_id = None
@@ -586,20 +699,20 @@ async def execute_plan_gemini(
         if active_project:
             project_path = active_project.path
             project_id = active_project.id
-            print(f"[Agent] Found active project: {project_path}")
+            logger.debug("Found active project: %s", project_path)
         else:
             project_path = str(Path(__file__).parent.parent.parent)
             project_id = "default-project"
-            print(f"[Agent] No active project, using root project: {project_path}")
+            logger.debug("No active project, using root project: %s", project_path)
 
         # Obter worktree para isolamento
         cwd, branch_name, worktree_path = await get_worktree_cwd(
             card_id, project_path, session
         )
         if worktree_path:
-            print(f"[Agent] Using worktree isolation: {cwd}")
+            logger.debug("Using worktree isolation: %s", cwd)
         else:
-            print(f"[Agent] Using project directory (no worktree): {cwd}")
+            logger.debug("Using project directory (no worktree): %s", cwd)
 
     gemini = GeminiAgent(model=model)
 
@@ -698,6 +811,12 @@ async def execute_plan_gemini(
             logs=record.logs,
         )
 
+    except asyncio.CancelledError:
+        # Descarrega logs bufferizados antes de propagar o cancelamento
+        if repo and execution_db:
+            await repo.flush_logs(execution_db.id)
+        raise
+
     except Exception as e:
         error_message = str(e)
         record.completed_at = datetime.now().isoformat()
@@ -746,7 +865,7 @@ async def execute_implement_gemini(
     from .models.project import ActiveProject
     from sqlalchemy import select
 
-    print(f"[Agent] Initial cwd parameter: {cwd}")
+    logger.debug("Initial cwd parameter: %s", cwd)
 
     # Variável para armazenar project_id para métricas
     project_id = None
@@ -759,20 +878,20 @@ async def execute_implement_gemini(
         if active_project:
             project_path = active_project.path
             project_id = active_project.id
-            print(f"[Agent] Found active project: {project_path}")
+            logger.debug("Found active project: %s", project_path)
         else:
             project_path = str(Path(__file__).parent.parent.parent)
             project_id = "default-project"
-            print(f"[Agent] No active project, using root project: {project_path}")
+            logger.debug("No active project, using root project: %s", project_path)
 
         # Obter worktree para isolamento
         cwd, branch_name, worktree_path = await get_worktree_cwd(
             card_id, project_path, session
         )
         if worktree_path:
-            print(f"[Agent] Using worktree isolation: {cwd}")
+            logger.debug("Using worktree isolation: %s", cwd)
         else:
-            print(f"[Agent] Using project directory (no worktree): {cwd}")
+            logger.debug("Using project directory (no worktree): %s", cwd)
 
     gemini = GeminiAgent(model=model)
 
@@ -869,6 +988,12 @@ async def execute_implement_gemini(
             logs=record.logs,
         )
 
+    except asyncio.CancelledError:
+        # Descarrega logs bufferizados antes de propagar o cancelamento
+        if repo and execution_db:
+            await repo.flush_logs(execution_db.id)
+        raise
+
     except Exception as e:
         error_message = str(e)
         record.completed_at = datetime.now().isoformat()
@@ -917,7 +1042,7 @@ async def execute_test_implementation_gemini(
     from .models.project import ActiveProject
     from sqlalchemy import select
 
-    print(f"[Agent] Initial cwd parameter: {cwd}")
+    logger.debug("Initial cwd parameter: %s", cwd)
 
     # Variável para armazenar project_id para métricas
     project_id = None
@@ -930,20 +1055,20 @@ async def execute_test_implementation_gemini(
         if active_project:
             project_path = active_project.path
             project_id = active_project.id
-            print(f"[Agent] Found active project: {project_path}")
+            logger.debug("Found active project: %s", project_path)
         else:
             project_path = str(Path(__file__).parent.parent.parent)
             project_id = "default-project"
-            print(f"[Agent] No active project, using root project: {project_path}")
+            logger.debug("No active project, using root project: %s", project_path)
 
         # Obter worktree para isolamento
         cwd, branch_name, worktree_path = await get_worktree_cwd(
             card_id, project_path, session
         )
         if worktree_path:
-            print(f"[Agent] Using worktree isolation: {cwd}")
+            logger.debug("Using worktree isolation: %s", cwd)
         else:
-            print(f"[Agent] Using project directory (no worktree): {cwd}")
+            logger.debug("Using project directory (no worktree): %s", cwd)
 
     gemini = GeminiAgent(model=model)
 
@@ -1040,6 +1165,12 @@ async def execute_test_implementation_gemini(
             logs=record.logs,
         )
 
+    except asyncio.CancelledError:
+        # Descarrega logs bufferizados antes de propagar o cancelamento
+        if repo and execution_db:
+            await repo.flush_logs(execution_db.id)
+        raise
+
     except Exception as e:
         error_message = str(e)
         record.completed_at = datetime.now().isoformat()
@@ -1088,7 +1219,7 @@ async def execute_review_gemini(
     from .models.project import ActiveProject
     from sqlalchemy import select
 
-    print(f"[Agent] Initial cwd parameter: {cwd}")
+    logger.debug("Initial cwd parameter: %s", cwd)
 
     # Variável para armazenar project_id para métricas
     project_id = None
@@ -1101,20 +1232,20 @@ async def execute_review_gemini(
         if active_project:
             project_path = active_project.path
             project_id = active_project.id
-            print(f"[Agent] Found active project: {project_path}")
+            logger.debug("Found active project: %s", project_path)
         else:
             project_path = str(Path(__file__).parent.parent.parent)
             project_id = "default-project"
-            print(f"[Agent] No active project, using root project: {project_path}")
+            logger.debug("No active project, using root project: %s", project_path)
 
         # Obter worktree para isolamento
         cwd, branch_name, worktree_path = await get_worktree_cwd(
             card_id, project_path, session
         )
         if worktree_path:
-            print(f"[Agent] Using worktree isolation: {cwd}")
+            logger.debug("Using worktree isolation: %s", cwd)
         else:
-            print(f"[Agent] Using project directory (no worktree): {cwd}")
+            logger.debug("Using project directory (no worktree): %s", cwd)
 
     gemini = GeminiAgent(model=model)
 
@@ -1211,6 +1342,12 @@ async def execute_review_gemini(
             logs=record.logs,
         )
 
+    except asyncio.CancelledError:
+        # Descarrega logs bufferizados antes de propagar o cancelamento
+        if repo and execution_db:
+            await repo.flush_logs(execution_db.id)
+        raise
+
     except Exception as e:
         error_message = str(e)
         record.completed_at = datetime.now().isoformat()
@@ -1267,7 +1404,7 @@ async def execute_plan(
     from .models.project import ActiveProject
     from sqlalchemy import select
 
-    print(f"[Agent] Initial cwd parameter: {cwd}")
+    logger.debug("Initial cwd parameter: %s", cwd)
 
     # Variável para armazenar project_id para métricas
     project_id = None
@@ -1280,22 +1417,22 @@ async def execute_plan(
         if active_project:
             project_path = active_project.path
             project_id = active_project.id
-            print(f"[Agent] Found active project: {project_path}")
+            logger.debug("Found active project: %s", project_path)
         else:
             # Fallback: usar o diretório raiz do orquestrator-agent
             # (3 níveis acima: agent.py -> src -> backend -> orquestrator-agent)
             project_path = str(Path(__file__).parent.parent.parent)
             project_id = "default-project"
-            print(f"[Agent] No active project, using root project: {project_path}")
+            logger.debug("No active project, using root project: %s", project_path)
 
         # Obter worktree para isolamento
         cwd, branch_name, worktree_path = await get_worktree_cwd(
             card_id, project_path, session
         )
         if worktree_path:
-            print(f"[Agent] Using worktree isolation: {cwd}")
+            logger.debug("Using worktree isolation: %s", cwd)
         else:
-            print(f"[Agent] Using project directory (no worktree): {cwd}")
+            logger.debug("Using project directory (no worktree): %s", cwd)
 
     # Detect provider
     provider = get_model_provider(model)
@@ -1319,7 +1456,7 @@ async def execute_plan(
         expert_context = build_expert_context_for_plan(experts, cwd)
         if expert_context:
             prompt += f"\n\n{expert_context}"
-            print(f"[Agent] Injected expert context from {len(experts)} experts")
+            logger.info("Injected expert context from %s experts", len(experts))
 
     # Add image references if available
     if images:
@@ -1376,7 +1513,7 @@ async def execute_plan(
     try:
         # Configure agent options
         cwd_path = Path(cwd)
-        print(f"[Agent] Final CWD being used: {cwd_path.absolute()}")
+        logger.debug("Final CWD being used: %s", cwd_path.absolute())
 
         if provider == "google":
             # Use Gemini implementation
@@ -1424,6 +1561,7 @@ async def execute_plan(
                 setting_sources=["user", "project"],  # Load Skills from .claude/skills/
                 allowed_tools=["Skill", "Read", "Write", "Edit", "Bash", "Glob", "Grep", "TodoWrite"],
                 permission_mode="acceptEdits",
+                hooks=await sparse_checkout_hooks(cwd),
                 model=sdk_model,
             )
 
@@ -1473,7 +1611,7 @@ async def execute_plan(
                                 spec_path = extract_spec_path(message.result)
 
                         # DEBUG: Log ResultMessage attributes
-                        print(f"[DEBUG] ResultMessage received. Has usage: {hasattr(message, 'usage')}, usage value: {getattr(message, 'usage', 'N/A')}")
+                        logger.debug("ResultMessage received. Has usage: %s, usage value: %s", hasattr(message, 'usage'), getattr(message, 'usage', 'N/A'))
 
                         # Capturar token usage (usage é um dict, não objeto)
                         if hasattr(message, 'usage') and message.usage:
@@ -1549,6 +1687,12 @@ async def execute_plan(
             spec_path=spec_path,
         )
 
+    except asyncio.CancelledError:
+        # Descarrega logs bufferizados antes de propagar o cancelamento
+        if repo and execution_db:
+            await repo.flush_logs(execution_db.id)
+        raise
+
     except Exception as e:
         error_message = str(e)
         record.completed_at = datetime.now().isoformat()
@@ -1614,7 +1758,7 @@ async def execute_implement(
     from .models.project import ActiveProject
     from sqlalchemy import select
 
-    print(f"[Agent] Initial cwd parameter: {cwd}")
+    logger.debug("Initial cwd parameter: %s", cwd)
 
     # Variável para armazenar project_id para métricas
     project_id = None
@@ -1627,21 +1771,21 @@ async def execute_implement(
         if active_project:
             project_path = active_project.path
             project_id = active_project.id
-            print(f"[Agent] Found active project: {project_path}")
+            logger.debug("Found active project: %s", project_path)
         else:
             # Fallback: usar o diretório raiz do orquestrator-agent
             project_path = str(Path(__file__).parent.parent.parent)
             project_id = "default-project"
-            print(f"[Agent] No active project, using root project: {project_path}")
+            logger.debug("No active project, using root project: %s", project_path)
 
         # Obter worktree para isolamento
         cwd, branch_name, worktree_path = await get_worktree_cwd(
             card_id, project_path, session
         )
         if worktree_path:
-            print(f"[Agent] Using worktree isolation: {cwd}")
+            logger.debug("Using worktree isolation: %s", cwd)
         else:
-            print(f"[Agent] Using project directory (no worktree): {cwd}")
+            logger.debug("Using project directory (no worktree): %s", cwd)
 
     # Mapear nome de modelo para valor do SDK
     model_map = {
@@ -1714,6 +1858,7 @@ async def execute_implement(
             setting_sources=["user", "project"],
             allowed_tools=["Skill", "Read", "Write", "Edit", "Bash", "Glob", "Grep", "TodoWrite"],
             permission_mode="acceptEdits",
+            hooks=await sparse_checkout_hooks(cwd),
             model=sdk_model,
         )
 
@@ -1813,6 +1958,12 @@ async def execute_implement(
             logs=record.logs,
         )
 
+    except asyncio.CancelledError:
+        # Descarrega logs bufferizados antes de propagar o cancelamento
+        if repo and execution_db:
+            await repo.flush_logs(execution_db.id)
+        raise
+
     except Exception as e:
         error_message = str(e)
         record.completed_at = datetime.now().isoformat()
@@ -1892,7 +2043,7 @@ async def create_fix_card_for_test_failure(
             # Check if there's already an active fix card
             existing_fix = await repo.get_active_fix_card(card_id)
             if existing_fix:
-                print(f"[{card_id[:8]}] Fix card already exists: {existing_fix.id}")
+                logger.info("[%s] Fix card already exists: %s", card_id[:8], existing_fix.id)
                 return existing_fix.id
 
             # Create the fix card
@@ -1906,14 +2057,14 @@ async def create_fix_card_for_test_failure(
 
             if fix_card:
                 await session.commit()
-                print(f"[{card_id[:8]}] Created fix card: {fix_card.id}")
+                logger.info("[%s] Created fix card: %s", card_id[:8], fix_card.id)
                 return fix_card.id
             else:
-                print(f"[{card_id[:8]}] Failed to create fix card")
+                logger.warning("[%s] Failed to create fix card", card_id[:8])
                 return None
 
     except Exception as e:
-        print(f"[{card_id[:8]}] Error creating fix card: {e}")
+        logger.error("[%s] Error creating fix card: %s", card_id[:8], e)
         return None
 
 
@@ -1937,7 +2088,7 @@ async def execute_test_implementation(
     from .models.project import ActiveProject
     from sqlalchemy import select
 
-    print(f"[Agent] Initial cwd parameter: {cwd}")
+    logger.debug("Initial cwd parameter: %s", cwd)
 
     # Variável para armazenar project_id para métricas
     project_id = None
@@ -1950,21 +2101,21 @@ async def execute_test_implementation(
         if active_project:
             project_path = active_project.path
             project_id = active_project.id
-            print(f"[Agent] Found active project: {project_path}")
+            logger.debug("Found active project: %s", project_path)
         else:
             # Fallback: usar o diretório raiz do orquestrator-agent
             project_path = str(Path(__file__).parent.parent.parent)
             project_id = "default-project"
-            print(f"[Agent] No active project, using root project: {project_path}")
+            logger.debug("No active project, using root project: %s", project_path)
 
         # Obter worktree para isolamento
         cwd, branch_name, worktree_path = await get_worktree_cwd(
             card_id, project_path, session
         )
         if worktree_path:
-            print(f"[Agent] Using worktree isolation: {cwd}")
+            logger.debug("Using worktree isolation: %s", cwd)
         else:
-            print(f"[Agent] Using project directory (no worktree): {cwd}")
+            logger.debug("Using project directory (no worktree): %s", cwd)
 
     # Mapear nome de modelo para valor do SDK
     model_map = {
@@ -2037,6 +2188,7 @@ async def execute_test_implementation(
             setting_sources=["user", "project"],
             allowed_tools=["Skill", "Read", "Write", "Edit", "Bash", "Glob", "Grep", "TodoWrite"],
             permission_mode="acceptEdits",
+            hooks=await sparse_checkout_hooks(cwd),
             model=sdk_model,
         )
 
@@ -2094,9 +2246,10 @@ async def execute_test_implementation(
                             model_used=model
                         )
 
-        # Check if tests failed based on logs
+        # Check if tests failed based on logs (completos: o record só guarda as últimas linhas)
+        test_logs = await _full_logs(record, repo, card_id)
         test_failed = False
-        for log in record.logs:
+        for log in test_logs:
             if log.type == LogType.ERROR or (
                 log.type in [LogType.TEXT, LogType.RESULT] and
                 any(indicator in log.content.lower() for indicator in [
@@ -2137,7 +2290,7 @@ async def execute_test_implementation(
                 )
 
             # Analyze test failure and create fix card
-            fix_card_id = await create_fix_card_for_test_failure(card_id, record.logs, spec_path)
+            fix_card_id = await create_fix_card_for_test_failure(card_id, test_logs, spec_path)
 
             # Busca execução para retornar logs
             if repo and execution_db:
@@ -2199,6 +2352,12 @@ async def execute_test_implementation(
                 logs=record.logs,
             )
 
+    except asyncio.CancelledError:
+        # Descarrega logs bufferizados antes de propagar o cancelamento
+        if repo and execution_db:
+            await repo.flush_logs(execution_db.id)
+        raise
+
     except Exception as e:
         error_message = str(e)
         record.completed_at = datetime.now().isoformat()
@@ -2277,7 +2436,7 @@ async def execute_review(
     from .models.project import ActiveProject
     from sqlalchemy import select
 
-    print(f"[Agent] Initial cwd parameter: {cwd}")
+    logger.debug("Initial cwd parameter: %s", cwd)
 
     # Variável para armazenar project_id para métricas
     project_id = None
@@ -2290,21 +2449,21 @@ async def execute_review(
         if active_project:
             project_path = active_project.path
             project_id = active_project.id
-            print(f"[Agent] Found active project: {project_path}")
+            logger.debug("Found active project: %s", project_path)
         else:
             # Fallback: usar o diretório raiz do orquestrator-agent
             project_path = str(Path(__file__).parent.parent.parent)
             project_id = "default-project"
-            print(f"[Agent] No active project, using root project: {project_path}")
+            logger.debug("No active project, using root project: %s", project_path)
 
         # Obter worktree para isolamento
         cwd, branch_name, worktree_path = await get_worktree_cwd(
             card_id, project_path, session
         )
         if worktree_path:
-            print(f"[Agent] Using worktree isolation: {cwd}")
+            logger.debug("Using worktree isolation: %s", cwd)
         else:
-            print(f"[Agent] Using project directory (no worktree): {cwd}")
+            logger.debug("Using project directory (no worktree): %s", cwd)
 
     # Mapear nome de modelo para valor do SDK
     model_map = {
@@ -2377,6 +2536,7 @@ async def execute_review(
             setting_sources=["user", "project"],
             allowed_tools=["Skill", "Read", "Write", "Edit", "Bash", "Glob", "Grep", "TodoWrite"],
             permission_mode="acceptEdits",
+            hooks=await sparse_checkout_hooks(cwd),
             model=sdk_model,
         )
 
@@ -2476,6 +2636,12 @@ async def execute_review(
             logs=record.logs,
         )
 
+    except asyncio.CancelledError:
+        # Descarrega logs bufferizados antes de propagar o cancelamento
+        if repo and execution_db:
+            await repo.flush_logs(execution_db.id)
+        raise
+
     except Exception as e:
         error_message = str(e)
         record.completed_at = datetime.now().isoformat()
@@ -2541,7 +2707,7 @@ async def execute_expert_triage(
     from .models.project import ActiveProject
     from sqlalchemy import select
 
-    print(f"[Agent] Starting expert triage for card: {card_id[:8]}")
+    logger.info("Starting expert triage for card: %s", card_id[:8])
 
     # Get project path
     async with async_session_maker() as session:
@@ -2551,10 +2717,10 @@ async def execute_expert_triage(
         active_project = result.scalar_one_or_none()
         if active_project:
             project_path = active_project.path
-            print(f"[Agent] Found active project: {project_path}")
+            logger.debug("Found active project: %s", project_path)
         else:
             project_path = str(Path(__file__).parent.parent.parent)
-            print(f"[Agent] No active project, using root project: {project_path}")
+            logger.debug("No active project, using root project: %s", project_path)
 
     # Build prompt with arguments
     # Format: <cardId> <title> [description]
@@ -2566,8 +2732,8 @@ async def execute_expert_triage(
     # Os logs do triage serão incluídos na execution do /plan
     # Isso evita race condition onde a UI mostra status do triage em vez do plan
 
-    print(f"[Agent] Expert triage for: {title[:50]}")
-    print(f"[Agent] Working directory: {project_path}")
+    logger.debug("Expert triage for: %s", title[:50])
+    logger.debug("Working directory: %s", project_path)
 
     result_text = ""
 
@@ -2586,10 +2752,10 @@ async def execute_expert_triage(
             if isinstance(message, AssistantMessage):
                 for block in message.content:
                     if isinstance(block, TextBlock):
-                        print(f"[Agent] [TRIAGE] {block.text[:100]}...")
+                        logger.debug("[TRIAGE] %s...", block.text[:100])
                         result_text += block.text + "\n"
                     elif isinstance(block, ToolUseBlock):
-                        print(f"[Agent] [TRIAGE] Using tool: {block.name}")
+                        logger.debug("[TRIAGE] Using tool: %s", block.name)
 
             elif isinstance(message, ResultMessage):
                 if hasattr(message, "result") and message.result:
@@ -2604,18 +2770,18 @@ async def execute_expert_triage(
                 json_str = json_match.group(1)
                 parsed = json.loads(json_str)
                 experts = parsed.get("experts", {})
-                print(f"[Agent] Identified {len(experts)} experts via AI")
+                logger.info("Identified %s experts via AI", len(experts))
             else:
                 # Try to parse entire result as JSON
                 parsed = json.loads(result_text.strip())
                 experts = parsed.get("experts", {})
-                print(f"[Agent] Identified {len(experts)} experts via AI")
+                logger.info("Identified %s experts via AI", len(experts))
         except json.JSONDecodeError as e:
-            print(f"[Agent] Failed to parse triage JSON: {e}")
+            logger.warning("Failed to parse triage JSON: %s", e)
             # Return empty experts on parse error
             experts = {}
 
-        print(f"[Agent] Expert triage completed successfully")
+        logger.info("Expert triage completed successfully")
 
         return {
             "success": True,
@@ -2625,7 +2791,7 @@ async def execute_expert_triage(
 
     except Exception as e:
         error_message = str(e)
-        print(f"[Agent] Expert triage error: {error_message}")
+        logger.error("Expert triage error: %s", error_message)
 
         return {
             "success": False,
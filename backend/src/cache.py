@@ -1,52 +1,207 @@
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+"""Cache em memória das execuções ativas (GET de logs por card).
+
+LRU com TTL e dois limites: número de entradas e bytes estimados dos
+payloads (que carregam a lista de logs inteira). Entradas expiradas são
+removidas no `get` e por um janitor agendado no lifespan; novos logs são
+anexados à entrada em cache em vez de invalidá-la.
+"""
+
 import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .config.settings import get_settings
+
+# Custo fixo estimado de cada log (dict + timestamp + tipo) além do conteúdo
+_LOG_OVERHEAD_BYTES = 200
+_ENTRY_OVERHEAD_BYTES = 1024
+
+
+def _log_size(log: Dict[str, Any]) -> int:
+    return _LOG_OVERHEAD_BYTES + len(log.get("content") or "")
+
+
+def estimate_size(data: Dict[str, Any]) -> int:
+    """Bytes aproximados de um payload de execução."""
+    return _ENTRY_OVERHEAD_BYTES + len(data.get("result") or "") + sum(
+        _log_size(log) for log in data.get("logs", [])
+    )
+
+
+@dataclass
+class _Entry:
+    data: Dict[str, Any]
+    expires_at: float
+    size: int
+
 
 class ExecutionCache:
-    """Cache em memória para logs de execução com TTL"""
+    """Cache LRU + TTL limitado por entradas e por bytes."""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self.ttl = ttl_seconds if ttl_seconds is not None else settings.execution_cache_ttl_seconds
+        self.max_entries = max_entries or settings.execution_cache_max_entries
+        self.max_bytes = max_bytes or settings.execution_cache_max_mb * 1024 * 1024
 
-    def __init__(self, ttl_seconds: int = 300):  # 5 minutos default
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._timestamps: Dict[str, datetime] = {}
-        self.ttl = timedelta(seconds=ttl_seconds)
+        self._cache: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._janitor: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.appends = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
 
     def get(self, card_id: str) -> Optional[Dict[str, Any]]:
         """Busca execução do cache se não expirou"""
-        if card_id not in self._cache:
+        entry = self._cache.get(card_id)
+        if entry is None:
+            self.misses += 1
             return None
 
-        # Verifica TTL
-        if datetime.utcnow() - self._timestamps[card_id] > self.ttl:
-            # Expirou, remove do cache
-            del self._cache[card_id]
-            del self._timestamps[card_id]
+        if time.monotonic() >= entry.expires_at:
+            self._remove(card_id)
+            self.expirations += 1
+            self.misses += 1
             return None
 
-        return self._cache[card_id]
+        self._cache.move_to_end(card_id)
+        self.hits += 1
+        return entry.data
 
     def set(self, card_id: str, data: Dict[str, Any]):
         """Adiciona ou atualiza execução no cache"""
-        self._cache[card_id] = data
-        self._timestamps[card_id] = datetime.utcnow()
+        self._remove(card_id)
+        size = estimate_size(data)
+        if size > self.max_bytes:
+            # Um payload maior que o cache inteiro só expulsaria todo o resto
+            self.rejected += 1
+            return
+
+        self._cache[card_id] = _Entry(data, time.monotonic() + self.ttl, size)
+        self._bytes += size
+        self._enforce_limits()
+
+    def append_logs(self, card_id: str, execution_id: str, logs: List[Dict[str, Any]]) -> bool:
+        """
+        Anexa logs novos à entrada em cache da execução.
+
+        A entrada é invalidada se for de outra execução ou se houver lacuna
+        de sequence (o próximo get recarrega do banco).
+
+        Returns:
+            True se a entrada foi atualizada
+        """
+        entry = self._cache.get(card_id)
+        if entry is None or not logs:
+            return False
+
+        data = entry.data
+        if data.get("executionId") != execution_id:
+            self.invalidate(card_id)
+            return False
+
+        new_logs = [log for log in logs if log["sequence"] > data["lastSequence"]]
+        if not new_logs:
+            return True
+        if new_logs[0]["sequence"] != data["lastSequence"] + 1:
+            self.invalidate(card_id)
+            return False
+
+        data["logs"].extend(new_logs)
+        data["lastSequence"] = new_logs[-1]["sequence"]
+        added = sum(_log_size(log) for log in new_logs)
+        entry.size += added
+        self._bytes += added
+        entry.expires_at = time.monotonic() + self.ttl
+        self._cache.move_to_end(card_id)
+        self.appends += 1
+
+        if entry.size > self.max_bytes:
+            self.invalidate(card_id)
+            self.rejected += 1
+            return False
+        self._enforce_limits()
+        return True
 
     def invalidate(self, card_id: str):
         """Remove execução do cache"""
-        if card_id in self._cache:
-            del self._cache[card_id]
-            del self._timestamps[card_id]
+        self._remove(card_id)
 
-    async def cleanup(self):
-        """Remove entradas expiradas periodicamente"""
+    def _remove(self, card_id: str) -> None:
+        entry = self._cache.pop(card_id, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _enforce_limits(self) -> None:
+        """Expulsa as entradas menos usadas até caber nos limites."""
+        while self._cache and (len(self._cache) > self.max_entries or self._bytes > self.max_bytes):
+            card_id, entry = self._cache.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    def purge_expired(self) -> int:
+        """Remove entradas expiradas; retorna quantas saíram."""
+        now = time.monotonic()
+        expired = [card_id for card_id, entry in self._cache.items() if now >= entry.expires_at]
+        for card_id in expired:
+            self._remove(card_id)
+        self.expirations += len(expired)
+        return len(expired)
+
+    async def cleanup(self, interval: Optional[float] = None):
+        """Remove entradas expiradas periodicamente (janitor)"""
+        interval = interval or get_settings().execution_cache_janitor_seconds
         while True:
-            await asyncio.sleep(60)  # Limpa a cada minuto
-            now = datetime.utcnow()
-            expired = [
-                card_id
-                for card_id, timestamp in self._timestamps.items()
-                if now - timestamp > self.ttl
-            ]
-            for card_id in expired:
-                self.invalidate(card_id)
+            await asyncio.sleep(interval)
+            self.purge_expired()
+
+    def start_janitor(self, interval: Optional[float] = None) -> None:
+        """Agenda o janitor no loop atual (idempotente)."""
+        if self._janitor is None or self._janitor.done():
+            self._janitor = asyncio.get_running_loop().create_task(self.cleanup(interval))
+
+    async def stop_janitor(self) -> None:
+        if self._janitor is not None and not self._janitor.done():
+            self._janitor.cancel()
+            try:
+                await self._janitor
+            except asyncio.CancelledError:
+                pass
+        self._janitor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para o endpoint de métricas do cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "bytes": self._bytes,
+            "maxEntries": self.max_entries,
+            "maxBytes": self.max_bytes,
+            "ttlSeconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "appends": self.appends,
+            "rejected": self.rejected,
+            "janitorRunning": self._janitor is not None and not self._janitor.done(),
+        }
+
 
 # Instância global
-execution_cache = ExecutionCache()
\ No newline at end of file
+execution_cache = ExecutionCache()
@@ -1,8 +1,11 @@
 """Qdrant configuration for long-term memory."""
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 
+from .settings import data_path
+
 
 class QdrantSettings(BaseSettings):
     """Qdrant connection and collection settings."""
@@ -22,12 +25,53 @@ class QdrantSettings(BaseSettings):
     api_key: str | None = None
     https: bool = False
 
+    # Vector store backend: "qdrant" (server) or "local" (in-process NumPy memmap)
+    vector_backend: str = "qdrant"
+    local_store_path: str = "vector_store"  # Relative paths live in backend/data
+    local_ivf_threshold: int = 20_000  # Points before the local store builds an IVF index
+
     # Collection settings
     collection_name: str = "zenflow_learnings"
     vector_size: int = 384  # all-MiniLM-L6-v2 dimension
 
+    # Storage precision (see scripts/benchmark_quantization.py)
+    vector_quantization: str = "int8"  # "none" | "int8" | "binary"; top-k is rescored in float32
+    vector_dimension: int | None = None  # Matryoshka truncation; only for models trained for it
+    rescore_oversampling: float = 3.0  # Candidates rescored per requested result
+
     # Embedding model
     embedding_model: str = "all-MiniLM-L6-v2"
+    warmup_on_startup: bool = False  # Load model + connect store in the lifespan
+    embedding_workers: int = 1  # Threads running encode off the event loop
+    embedding_cache_size: int = 1024  # Vectors kept in the in-memory LRU
+    embedding_cache_path: str | None = "embedding_cache.db"  # Empty disables the disk cache
+
+    # Hybrid retrieval (BM25 + vector, reciprocal-rank fusion)
+    hybrid_search: bool = True
+    hybrid_candidates: int = 20  # Candidates taken from each ranking before fusion
+    hybrid_rrf_k: int = 60
+    lexical_index_path: str | None = "learnings_lexical.db"  # Empty keeps it in memory only
+
+    # Bulk re-embedding
+    reindex_batch_size: int = 256  # Payloads scrolled and encoded per batch
+    reindex_upsert_chunk: int = 64  # Points per upsert request
+    reindex_checkpoint_path: str = "reindex_checkpoint.json"
+    reindex_active_store_path: str = "active_store.json"  # Collection swapped in by the last reindex
+
+    _anchor_data_paths = field_validator(
+        "local_store_path",
+        "embedding_cache_path",
+        "lexical_index_path",
+        "reindex_checkpoint_path",
+        "reindex_active_store_path",
+    )(data_path)
+
+    @property
+    def stored_dimension(self) -> int:
+        """Dimension actually stored (after Matryoshka truncation)."""
+        if self.vector_dimension and self.vector_dimension < self.vector_size:
+            return self.vector_dimension
+        return self.vector_size
 
     @property
     def url(self) -> str:
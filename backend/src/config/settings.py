@@ -1,8 +1,22 @@
 """Application configuration using pydantic-settings."""
 
 from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Caches e índices locais do backend (gitignored), independente do CWD do processo
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+def data_path(path: Optional[str]) -> Optional[str]:
+    """Ancora caminhos relativos em DATA_DIR; vazio (desativado) e absolutos ficam como estão."""
+    if not path or Path(path).is_absolute():
+        return path
+    return str(DATA_DIR / path)
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -35,15 +49,69 @@ class Settings(BaseSettings):
     # Server
     port: int = 3001
 
+    # Logging (pipeline não-bloqueante: QueueHandler -> QueueListener)
+    log_level: str = "INFO"  # DEBUG inclui os blocos transmitidos pelo agent
+    log_format: str = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
     # Orchestrator settings
     orchestrator_enabled: bool = True
-    orchestrator_loop_interval_seconds: int = 60  # 1 minute
+    orchestrator_loop_interval_seconds: int = 60  # Fallback: o loop acorda antes por eventos
+    orchestrator_event_debounce_ms: int = 200  # Agrupa eventos próximos em um único ciclo
     orchestrator_log_file: str = "orchestrator.log"
     orchestrator_usage_limit_percent: int = 80  # Pause if usage > 80%
+    orchestrator_usage_poll_seconds: int = 60  # Poll do uso enquanto pausado no limite (backoff exponencial)
+    orchestrator_usage_poll_max_seconds: int = 900
+    orchestrator_max_parallel_cards: int = 3  # Cards no pipeline simultaneamente (sessão e worktree próprios)
+    orchestrator_stage_workers: dict[str, int] = {  # Workers por estágio do pipeline
+        "plan": 2,
+        "implement": 2,
+        "test": 1,
+        "review": 1,
+    }
+    orchestrator_plan_ahead: bool = True  # Planeja cards da fila enquanto as dependências executam
+
+    # Pool de worktrees pré-criados (detached) por projeto; 0 desativa
+    worktree_pool_size: int = 2
+    worktree_pool_refresh_seconds: int = 300  # Reposiciona os worktrees ociosos no commit base atual
+
+    # Sparse-checkout (cone) semeado pelos file_patterns dos experts do card e
+    # pelos caminhos citados na spec; o cone cresce quando o agent toca outros paths
+    worktree_sparse_checkout: bool = False
+    worktree_sparse_always_include: list[str] = [".claude/"]  # Skills/comandos do projeto
+
+    # Execution log writer (logs bufferizados por execução)
+    execution_log_batch_size: int = 50  # Descarrega ao atingir N logs
+    execution_log_flush_interval_ms: int = 250  # ...ou após este intervalo
+    execution_ws_batch_interval_ms: int = 50  # Janela de agrupamento dos frames de log no WebSocket
+    live_ws_queue_size: int = 256  # Frames pendentes por espectador do /live (descarta logs antigos)
+
+    # Cache de execuções ativas (LRU + TTL)
+    execution_cache_ttl_seconds: int = 300
+    execution_cache_max_entries: int = 256  # Cards em cache simultaneamente
+    execution_cache_max_mb: int = 64  # Limite estimado dos payloads (logs inclusos)
+    execution_cache_janitor_seconds: int = 60  # Intervalo do janitor de entradas expiradas
+
+    # Records de execução em memória (agent.executions)
+    execution_memory_log_lines: int = 500  # Ring buffer de logs por record; o resto fica no banco
+    execution_memory_grace_seconds: int = 300  # Records concluídos saem da memória após este tempo
+
+    # Captura de diff (DiffAnalyzer): conteúdo do patch limitado por arquivo e no total
+    diff_max_file_kb: int = 256
+    diff_max_total_mb: int = 16
+    diff_cache_path: str = "diff_cache.db"  # Em DATA_DIR; diffs por (base, head); vazio mantém só em memória
+    diff_cache_max_entries: int = 200  # Diffs guardados (os menos lidos saem primeiro)
 
     # Short-term memory settings
     short_term_memory_retention_hours: int = 24
 
+    _anchor_data_paths = field_validator("diff_cache_path")(data_path)
+
+    @field_validator("orchestrator_stage_workers")
+    @classmethod
+    def _merge_stage_workers(cls, value: dict[str, int]) -> dict[str, int]:
+        """Override parcial (ex.: só "implement") mantém os demais estágios no padrão."""
+        return {**cls.model_fields["orchestrator_stage_workers"].default, **value}
+
 
 @lru_cache
 def get_settings() -> Settings:
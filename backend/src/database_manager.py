@@ -32,9 +32,21 @@ def _set_sqlite_pragma(dbapi_conn, connection_record):
     cursor.execute("PRAGMA busy_timeout=30000")
     cursor.close()
 
+
 logger = logging.getLogger(__name__)
 
 
+def _ensure_indexes(sync_conn):
+    """Create model-declared indexes missing from tables that already existed.
+
+    create_all only emits indexes for tables it creates, so databases from
+    older versions would otherwise never receive new indexes.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 class DatabaseManager:
     """Manages multiple isolated databases, one per project.
 
@@ -164,6 +176,7 @@ class DatabaseManager:
             # Create tables if new database
             async with engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(_ensure_indexes)
 
             logger.info(f"Initialized database for project at {project_path}")
             logger.info(f"Database location: {db_path}")
@@ -30,6 +30,7 @@ class ExecutionLog(BaseModel):
     timestamp: str
     type: str  # Pode ser string ou LogType, aceitar ambos
     content: str
+    sequence: Optional[int] = None  # Ordem do log na execução (cursor de tailing)
 
 
 class ExecutionRecord(CamelCaseModel):
@@ -49,6 +50,8 @@ class ExecutionRecord(CamelCaseModel):
     status: ExecutionStatus
     logs: list[ExecutionLog] = []
     result: Optional[str] = None
+    last_sequence: Optional[int] = Field(default=None, alias="lastSequence")
+    dropped_logs: int = Field(default=0, alias="droppedLogs")  # Linhas fora do ring buffer (ver execution_logs)
 
 
 class PlanResult(BaseModel):
@@ -72,6 +75,8 @@ class ExecutePlanRequest(CamelCaseModel):
 class HealthResponse(BaseModel):
     status: str
     timestamp: str
+    ready: bool = True
+    warmup: Optional[dict] = None
 
 
 class LogsResponse(BaseModel):
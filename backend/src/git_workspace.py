@@ -1,14 +1,33 @@
 """Git Workspace Manager for card isolation using worktrees."""
 
 import asyncio
+import logging
+import os
+import re
 import time
+import uuid
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Any, Awaitable, Callable, Iterable, Optional, List, Dict, Tuple
 from dataclasses import dataclass
 
+from .config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
 # Limite de worktrees simultaneos
 MAX_CONCURRENT_WORKTREES = 10
 
+# Locks por repositorio: `git worktree add` concorrente disputa .git/worktrees e refs
+_repo_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _get_repo_lock(project_path: Path) -> asyncio.Lock:
+    key = str(project_path.resolve())
+    lock = _repo_locks.get(key)
+    if lock is None:
+        lock = _repo_locks[key] = asyncio.Lock()
+    return lock
+
 
 @dataclass
 class WorktreeResult:
@@ -17,6 +36,170 @@ class WorktreeResult:
     worktree_path: Optional[str] = None
     branch_name: Optional[str] = None
     error: Optional[str] = None
+    sparse_cone: Optional[List[str]] = None
+
+
+# Caminhos relativos citados em texto livre (specs): `backend/src/main.py`, `frontend/src/`
+_PATH_RE = re.compile(r"(?<![\w/:.-])(?:[\w.-]+/)+[\w.-]*")
+
+
+def referenced_paths(text: str) -> List[str]:
+    """Caminhos com diretorio citados no texto (sem URLs), na ordem em que aparecem."""
+    paths = []
+    for match in _PATH_RE.finditer(text):
+        path = match.group(0).rstrip(".")
+        if path and path not in paths:
+            paths.append(path)
+    return paths
+
+
+def _pattern_prefix(pattern: str) -> Tuple[str, bool]:
+    """
+    Prefixo literal de um file_pattern e se ele certamente eh um diretorio.
+
+    "src/components/**" -> ("src/components", True)
+    "backend/src/database" -> ("backend/src/database", False)  # arquivo, prefixo ou diretorio
+    """
+    path = pattern.strip().replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    is_dir = path.endswith("/")
+    parts = []
+    for part in path.strip("/").split("/"):
+        if any(char in part for char in "*?["):
+            is_dir = True
+            break
+        if part == "..":
+            return "", False
+        if part and part != ".":
+            parts.append(part)
+    return "/".join(parts), is_dir
+
+
+def _minimal_cone(directories: Iterable[str]) -> List[str]:
+    """Remove diretorios ja cobertos por um ancestral (cone mode eh recursivo)."""
+    cone: List[str] = []
+    for directory in sorted(set(directories)):
+        if not any(_in_cone(directory, [parent]) for parent in cone):
+            cone.append(directory)
+    return cone
+
+
+def _in_cone(path: str, cone: Iterable[str]) -> bool:
+    return any(path == directory or path.startswith(directory + "/") for directory in cone)
+
+
+# Subcomandos git que alteram refs/worktrees (invalidam os metadados em cache)
+_MUTATING_COMMANDS = {
+    "worktree": {"add", "remove", "move", "prune"},
+    "branch": {"-D", "-d", "-m", "-M", "-c", "-C"},
+    "checkout": None,
+    "switch": None,
+    "merge": None,
+    "rebase": None,
+    "commit": None,
+    "reset": None,
+    "fetch": None,
+    "pull": None,
+}
+
+
+def _mutates_repository(args: List[str]) -> bool:
+    if len(args) < 2 or args[0] != "git" or args[1] not in _MUTATING_COMMANDS:
+        return False
+    flags = _MUTATING_COMMANDS[args[1]]
+    return flags is None or any(arg in flags for arg in args[2:])
+
+
+class RepoMetadataCache:
+    """
+    Metadados de um repositorio (branch padrao, worktrees, branches) em memoria.
+
+    Cada valor guarda a impressao digital do repositorio de quando foi lido:
+    mtimes de HEAD, config, packed-refs, .git/worktrees e de todos os
+    diretorios sob .git/refs. Git atualiza refs por lockfile + rename, entao
+    criar, mover ou apagar qualquer ref muda o mtime do diretorio que a
+    contem. Conferir a impressao custa alguns stat(), nao um subprocesso.
+    """
+
+    def __init__(self, project_path: Path):
+        self.project_path = project_path
+        self._values: Dict[str, Tuple[tuple, Any]] = {}
+        self._git_dir: Optional[Path] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _common_dir(self) -> Optional[Path]:
+        """Diretorio .git comum (segue o arquivo `.git` de worktrees ligados)."""
+        if self._git_dir is not None:
+            return self._git_dir
+        dot_git = self.project_path / ".git"
+        if dot_git.is_dir():
+            self._git_dir = dot_git
+        elif dot_git.is_file():
+            content = dot_git.read_text().strip()
+            if content.startswith("gitdir:"):
+                git_dir = (self.project_path / content.split(":", 1)[1].strip()).resolve()
+                commondir = git_dir / "commondir"
+                if commondir.exists():
+                    git_dir = (git_dir / commondir.read_text().strip()).resolve()
+                self._git_dir = git_dir
+        return self._git_dir
+
+    def fingerprint(self) -> tuple:
+        git_dir = self._common_dir()
+        if git_dir is None:
+            return ()
+
+        stamps = []
+        for name in ("HEAD", "config", "packed-refs", "worktrees"):
+            try:
+                stat = os.stat(git_dir / name)
+                stamps.append((name, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stamps.append((name, None, None))
+        # HEAD do worktree atual, se for um worktree ligado
+        if git_dir != self.project_path / ".git":
+            try:
+                stamps.append(("local", os.stat(self.project_path / ".git").st_mtime_ns))
+            except FileNotFoundError:
+                pass
+
+        for dirpath, _, _ in os.walk(git_dir / "refs"):
+            stamps.append((dirpath, os.stat(dirpath).st_mtime_ns))
+        return tuple(stamps)
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Valor em cache se o repositorio nao mudou; senao recarrega via `loader`."""
+        # Impressao tirada antes da leitura: mudancas durante o loader invalidam
+        fingerprint = self.fingerprint()
+        entry = self._values.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = await loader()
+        self._values[key] = (fingerprint, value)
+        return value
+
+    def invalidate(self) -> None:
+        self._values.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._values), "hits": self.hits, "misses": self.misses}
+
+
+# Metadados por repositorio, compartilhados entre instancias do manager
+_repo_metadata: Dict[str, RepoMetadataCache] = {}
+
+
+def get_repo_metadata(project_path: Path) -> RepoMetadataCache:
+    key = str(project_path.resolve())
+    cache = _repo_metadata.get(key)
+    if cache is None:
+        cache = _repo_metadata[key] = RepoMetadataCache(Path(key))
+    return cache
 
 
 class GitWorkspaceManager:
@@ -25,6 +208,7 @@ class GitWorkspaceManager:
     def __init__(self, project_path: str):
         self.project_path = Path(project_path)
         self.worktrees_dir = self.project_path / ".worktrees"
+        self.metadata = get_repo_metadata(self.project_path)
 
     async def _run_git_command(
         self,
@@ -51,9 +235,16 @@ class GitWorkspaceManager:
         )
 
         stdout, stderr = await process.communicate()
+        if _mutates_repository(args):
+            # Nao depende so de mtimes (filesystems com resolucao grosseira)
+            self.metadata.invalidate()
         return process.returncode, stdout.decode(), stderr.decode()
 
     async def _get_default_branch(self) -> str:
+        """Branch principal do repositorio (em cache ate refs/config mudarem)."""
+        return await self.metadata.get("default_branch", self._detect_default_branch)
+
+    async def _detect_default_branch(self) -> str:
         """Detecta branch principal do repositorio."""
         # Tentar via remote HEAD
         returncode, stdout, _ = await self._run_git_command(
@@ -94,12 +285,18 @@ class GitWorkspaceManager:
         if rebase_dir.exists():
             await self._run_git_command(["git", "rebase", "--abort"])
 
+    async def _local_branches(self) -> frozenset:
+        """Nomes das branches locais (em cache)."""
+        async def load() -> frozenset:
+            returncode, stdout, _ = await self._run_git_command(
+                ["git", "for-each-ref", "--format=%(refname:short)", "refs/heads"]
+            )
+            return frozenset(stdout.split()) if returncode == 0 else frozenset()
+        return await self.metadata.get("local_branches", load)
+
     async def _branch_exists(self, branch_name: str) -> bool:
         """Verifica se branch existe."""
-        returncode, stdout, _ = await self._run_git_command(
-            ["git", "branch", "--list", branch_name]
-        )
-        return returncode == 0 and stdout.strip() != ""
+        return branch_name in await self._local_branches()
 
     async def _cleanup_stale_branch(self, branch_name: str) -> None:
         """Remove branch orfa se existir."""
@@ -109,7 +306,8 @@ class GitWorkspaceManager:
     async def create_worktree(
         self,
         card_id: str,
-        base_branch: Optional[str] = None
+        base_branch: Optional[str] = None,
+        sparse_patterns: Optional[List[str]] = None
     ) -> WorktreeResult:
         """
         Cria worktree isolado para um card.
@@ -117,10 +315,23 @@ class GitWorkspaceManager:
         Args:
             card_id: ID do card
             base_branch: Branch base (detecta automaticamente se nao especificado)
+            sparse_patterns: file_patterns/caminhos que semeiam um sparse-checkout
+                (cone mode); None ou sem diretorio valido faz checkout completo
 
         Returns:
             WorktreeResult com path e nome da branch
         """
+        # Cards executados em paralelo criam worktrees ao mesmo tempo:
+        # serializa apenas a operacao no repositorio
+        async with _get_repo_lock(self.project_path):
+            return await self._create_worktree(card_id, base_branch, sparse_patterns)
+
+    async def _create_worktree(
+        self,
+        card_id: str,
+        base_branch: Optional[str],
+        sparse_patterns: Optional[List[str]] = None
+    ) -> WorktreeResult:
         # Verificar limite de worktrees
         active = await self.list_active_worktrees()
         card_worktrees = [w for w in active if w.get('branch', '').startswith('agent/')]
@@ -137,11 +348,19 @@ class GitWorkspaceManager:
         if not base_branch:
             base_branch = await self._get_default_branch()
 
+        cone = await self.resolve_sparse_cone(base_branch, sparse_patterns) if sparse_patterns else []
+
+        # Worktree pre-criado do pool (sem checkout completo); senao, caminho frio.
+        # Os do pool tem a arvore inteira: sparse-checkout sempre vai pelo caminho frio
+        pool = get_worktree_pool(str(self.project_path)) if not cone else None
+        if pool is not None:
+            result = await pool.claim(card_id, base_branch)
+            if result is not None:
+                return result
+
         # Definir paths com prefixo mais seguro
-        short_id = card_id[:8] if len(card_id) > 8 else card_id
-        timestamp = int(time.time())
-        branch_name = f"agent/{short_id}-{timestamp}"
-        worktree_path = self.worktrees_dir / f"card-{short_id}"
+        branch_name = self._branch_name(card_id)
+        worktree_path = self._card_worktree_path(card_id)
 
         # Verificar se worktree ja existe
         if worktree_path.exists():
@@ -154,8 +373,10 @@ class GitWorkspaceManager:
         await self._cleanup_stale_branch(branch_name)
 
         # Criar worktree com nova branch baseada na branch principal
+        # (sparse: sem checkout ate o cone estar definido)
         returncode, stdout, stderr = await self._run_git_command([
             "git", "worktree", "add",
+            *(["--no-checkout"] if cone else []),
             str(worktree_path),
             "-b", branch_name,
             base_branch
@@ -167,12 +388,141 @@ class GitWorkspaceManager:
                 error=f"Failed to create worktree: {stderr}"
             )
 
+        if cone:
+            error = await self._checkout_sparse(worktree_path, cone)
+            if error:
+                await self._run_git_command(["git", "worktree", "remove", str(worktree_path), "--force"])
+                await self._run_git_command(["git", "branch", "-D", branch_name])
+                return WorktreeResult(
+                    success=False,
+                    error=f"Failed to create sparse worktree: {error}"
+                )
+
         return WorktreeResult(
             success=True,
             worktree_path=str(worktree_path),
-            branch_name=branch_name
+            branch_name=branch_name,
+            sparse_cone=cone or None
         )
 
+    async def _checkout_sparse(self, worktree_path: Path, cone: List[str]) -> Optional[str]:
+        """Define o cone no worktree recem-criado e materializa so ele; retorna o erro, se houver."""
+        for args in (["git", "sparse-checkout", "set", "--cone", *cone], ["git", "checkout", "-f"]):
+            returncode, _, stderr = await self._run_git_command(args, cwd=str(worktree_path))
+            if returncode != 0:
+                return stderr
+        return None
+
+    async def _tree_directories(self, rev: str, paths: Iterable[str], cwd: Optional[str] = None) -> set:
+        """Quais dos caminhos (e seus ancestrais) sao diretorios em `rev`."""
+        paths = sorted({path for path in paths if path})
+        if not paths:
+            return set()
+        returncode, stdout, _ = await self._run_git_command(
+            ["git", "ls-tree", "-r", "-d", "--name-only", rev, "--", *paths], cwd=cwd
+        )
+        return set(stdout.splitlines()) if returncode == 0 else set()
+
+    async def resolve_sparse_cone(self, rev: str, patterns: Iterable[str]) -> List[str]:
+        """
+        Diretorios do cone que cobrem os patterns, validados contra a arvore de `rev`.
+
+        Patterns de diretorio/glob viram o proprio diretorio; arquivos e prefixos
+        ("backend/src/database") viram o diretorio pai. Caminhos que nao existem
+        em `rev` sao descartados; arquivos da raiz estao sempre no cone.
+        """
+        prefixes = [_pattern_prefix(pattern) for pattern in patterns]
+        prefixes = [(path, is_dir) for path, is_dir in prefixes if path]
+        trees = await self._tree_directories(
+            rev, [path for path, _ in prefixes] + [path.rpartition("/")[0] for path, _ in prefixes]
+        )
+
+        directories = []
+        for path, is_dir in prefixes:
+            parent = path.rpartition("/")[0]
+            if path in trees:
+                directories.append(path)
+            elif not is_dir and parent in trees:
+                directories.append(parent)
+        return _minimal_cone(directories)
+
+    async def sparse_cone(self, worktree_path: str) -> Optional[List[str]]:
+        """Cone atual do worktree; None se ele nao usa sparse-checkout."""
+        returncode, stdout, _ = await self._run_git_command(
+            ["git", "sparse-checkout", "list"], cwd=worktree_path
+        )
+        return stdout.split() if returncode == 0 else None
+
+    async def expand_sparse_checkout(
+        self,
+        worktree_path: str,
+        paths: Iterable[str],
+        allow_new: bool = False
+    ) -> List[str]:
+        """
+        Amplia o cone de um worktree sparse para cobrir `paths` (expansao sob demanda).
+
+        Caminhos que ja existem no disco saem sem subprocesso. Arquivos de um
+        diretorio ja materializado estao no cone (cone mode inclui os arquivos
+        dos ancestrais); subdiretorios ausentes entram no cone. Diretorios que
+        nao existem em HEAD so entram com `allow_new` (escrita de arquivo novo):
+        sem isso `git add` ignoraria o arquivo.
+
+        Returns:
+            Diretorios adicionados ao cone
+        """
+        root = Path(worktree_path).resolve()
+        missing = []
+        for path in paths:
+            full = Path(path) if os.path.isabs(path) else root / path
+            try:
+                rel = full.resolve().relative_to(root).as_posix()
+            except ValueError:
+                continue  # fora do worktree
+            if rel in ("", ".") or full.exists():
+                continue
+            missing.append(rel)
+        if not missing:
+            return []
+
+        # Expansoes concorrentes disputariam o index do worktree
+        async with _get_repo_lock(root):
+            cone = await self.sparse_cone(str(root))
+            if cone is None:
+                return []
+            trees = await self._tree_directories(
+                "HEAD", missing + [rel.rpartition("/")[0] for rel in missing], cwd=str(root)
+            )
+
+            directories = []
+            for rel in missing:
+                parent = rel.rpartition("/")[0]
+                if rel in trees:
+                    directories.append(rel)
+                elif parent and not (root / parent).exists() and (parent in trees or allow_new):
+                    directories.append(parent)
+            added = [d for d in _minimal_cone(directories) if not _in_cone(d, cone)]
+            if not added:
+                return []
+
+            returncode, _, stderr = await self._run_git_command(
+                ["git", "sparse-checkout", "add", *added], cwd=str(root)
+            )
+            if returncode != 0:
+                logger.warning("Failed to expand sparse checkout of %s: %s", root, stderr)
+                return []
+        logger.info("Sparse checkout of %s expanded with %s", root, ", ".join(added))
+        return added
+
+    def _card_worktree_path(self, card_id: str) -> Path:
+        short_id = card_id[:8] if len(card_id) > 8 else card_id
+        return self.worktrees_dir / f"card-{short_id}"
+
+    @staticmethod
+    def _branch_name(card_id: str) -> str:
+        short_id = card_id[:8] if len(card_id) > 8 else card_id
+        return f"agent/{short_id}-{int(time.time())}"
+
     async def cleanup_worktree(
         self,
         card_id: str,
@@ -199,7 +549,7 @@ class GitWorkspaceManager:
                 ["git", "worktree", "remove", str(worktree_path), "--force"]
             )
             if returncode != 0:
-                print(f"Warning: Failed to remove worktree: {stderr}")
+                logger.warning("Failed to remove worktree: %s", stderr)
                 return False
 
         # Deletar branch se solicitado
@@ -208,12 +558,16 @@ class GitWorkspaceManager:
                 ["git", "branch", "-D", branch_name]
             )
             if returncode != 0:
-                print(f"Warning: Failed to delete branch: {stderr}")
+                logger.warning("Failed to delete branch: %s", stderr)
 
         return True
 
     async def list_active_worktrees(self) -> List[Dict[str, str]]:
-        """Lista todos os worktrees ativos."""
+        """Lista todos os worktrees ativos (em cache ate .git/worktrees ou refs mudarem)."""
+        worktrees = await self.metadata.get("worktrees", self._load_worktrees)
+        return [dict(worktree) for worktree in worktrees]
+
+    async def _load_worktrees(self) -> List[Dict[str, str]]:
         _, output, _ = await self._run_git_command(
             ["git", "worktree", "list", "--porcelain"]
         )
@@ -228,6 +582,8 @@ class GitWorkspaceManager:
                 current = {'path': line.split(' ', 1)[1]}
             elif line.startswith('branch '):
                 current['branch'] = line.split(' ', 1)[1].replace('refs/heads/', '')
+            elif line == 'detached':
+                current['detached'] = 'true'
 
         if current:
             worktrees.append(current)
@@ -272,7 +628,11 @@ class GitWorkspaceManager:
         return removed
 
     async def list_all_branches(self) -> List[Dict[str, str]]:
-        """Lista todas as branches locais e remotas do repositório."""
+        """Lista todas as branches locais e remotas do repositório (em cache)."""
+        branches = await self.metadata.get("all_branches", self._load_all_branches)
+        return [dict(branch) for branch in branches]
+
+    async def _load_all_branches(self) -> List[Dict[str, str]]:
 
         # Listar branches locais
         returncode, stdout, _ = await self._run_git_command(
@@ -312,3 +672,223 @@ class GitWorkspaceManager:
         """Verifica se o projeto eh um repositorio git."""
         git_dir = self.project_path / ".git"
         return git_dir.exists()
+
+
+class WorktreePool:
+    """
+    Worktrees pre-criados (HEAD destacado) de um repositorio.
+
+    O checkout completo do `git worktree add` acontece em background; um card
+    reivindica um worktree do pool trocando para a sua branch no commit base
+    (`checkout -B`, que so toca os arquivos que diferem) e movendo-o para o
+    path do card. Os ociosos sao reposicionados periodicamente no commit
+    atual da branch padrao para manter essa diferenca pequena.
+    """
+
+    SLOT_PREFIX = "pool-"
+
+    def __init__(self, project_path: str, size: int, refresh_interval: float):
+        self.manager = GitWorkspaceManager(project_path)
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self._idle: List[Path] = []
+        self._creating = 0
+        self._fill_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._discovered = False
+        self.claims = 0
+        self.misses = 0
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def _run(self, args: List[str], cwd: Optional[Path] = None):
+        return self.manager._run_git_command(args, str(cwd) if cwd else None)
+
+    async def default_branch(self) -> str:
+        """Branch padrao do repositorio (metadados em cache do manager)."""
+        return await self.manager._get_default_branch()
+
+    async def _base_commit(self) -> Optional[str]:
+        returncode, stdout, _ = await self._run(["git", "rev-parse", "--verify", await self.default_branch()])
+        return stdout.strip() if returncode == 0 else None
+
+    def start(self) -> None:
+        """Agenda o preenchimento do pool e o refresh periodico (idempotente)."""
+        loop = asyncio.get_running_loop()
+        if self._fill_task is None or self._fill_task.done():
+            self._fill_task = loop.create_task(self.fill())
+        if self.refresh_interval > 0 and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = loop.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Para o refresh e espera o preenchimento em curso (os worktrees ficam para o proximo start)."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+        # Cancelar um `git worktree add` no meio deixaria um worktree pela metade
+        if self._fill_task is not None and not self._fill_task.done():
+            await self._fill_task
+        self._fill_task = self._refresh_task = None
+
+    async def _discover(self) -> None:
+        """Reaproveita worktrees do pool criados por uma execucao anterior."""
+        self._discovered = True
+        for worktree in await self.manager.list_active_worktrees():
+            path = Path(worktree['path'])
+            if worktree.get('detached') and path.name.startswith(self.SLOT_PREFIX) and path.exists():
+                if path not in self._idle:
+                    self._idle.append(path)
+
+    async def fill(self) -> int:
+        """Cria worktrees destacados ate completar o tamanho do pool."""
+        if not self._discovered:
+            await self._discover()
+
+        created = 0
+        while len(self._idle) + self._creating < self.size:
+            commit = await self._base_commit()
+            if commit is None:
+                break
+            self._creating += 1
+            try:
+                slot = self.manager.worktrees_dir / f"{self.SLOT_PREFIX}{uuid.uuid4().hex[:8]}"
+                self.manager.worktrees_dir.mkdir(exist_ok=True)
+                # O lock cobre so o registro do worktree; o checkout completo roda
+                # fora dele para nao segurar os create_worktree/claim dos cards
+                async with _get_repo_lock(self.manager.project_path):
+                    returncode, _, stderr = await self._run(
+                        ["git", "worktree", "add", "--no-checkout", "--detach", str(slot), commit]
+                    )
+                if returncode != 0:
+                    logger.warning("Failed to pre-create pooled worktree: %s", stderr)
+                    break
+                returncode, _, stderr = await self._run(["git", "checkout", "-f"], cwd=slot)
+                if returncode != 0:
+                    logger.warning("Failed to check out pooled worktree: %s", stderr)
+                    await self._discard(slot)
+                    break
+                self._idle.append(slot)
+                created += 1
+            finally:
+                self._creating -= 1
+        return created
+
+    async def refresh(self) -> int:
+        """Move os worktrees ociosos para o commit atual da branch padrao."""
+        commit = await self._base_commit()
+        if commit is None:
+            return 0
+
+        refreshed = 0
+        for slot in list(self._idle):
+            returncode, head, _ = await self._run(["git", "rev-parse", "HEAD"], cwd=slot)
+            if returncode == 0 and head.strip() == commit:
+                continue
+            # Fora do pool enquanto atualiza para nao ser reivindicado pela metade
+            if slot not in self._idle:
+                continue
+            self._idle.remove(slot)
+            returncode, _, _ = await self._run(["git", "checkout", "--detach", "-f", commit], cwd=slot)
+            if returncode == 0:
+                self._idle.append(slot)
+                refreshed += 1
+            else:
+                await self._discard(slot)
+        return refreshed
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+                await self.fill()
+            except Exception as e:
+                logger.warning("Worktree pool refresh failed: %s", e)
+
+    async def _discard(self, slot: Path) -> None:
+        async with _get_repo_lock(self.manager.project_path):
+            await self._run(["git", "worktree", "remove", str(slot), "--force"])
+
+    async def claim(self, card_id: str, base_branch: str) -> Optional[WorktreeResult]:
+        """
+        Reivindica um worktree do pool para o card.
+
+        Chamado com o lock do repositorio ja adquirido (create_worktree).
+
+        Returns:
+            WorktreeResult, ou None se o pool estiver vazio ou a troca falhar
+            (o chamador segue pelo caminho frio)
+        """
+        if not self._idle:
+            self.misses += 1
+            self.start()
+            return None
+
+        slot = self._idle.pop()
+        branch_name = self.manager._branch_name(card_id)
+        worktree_path = self.manager._card_worktree_path(card_id)
+
+        returncode, _, stderr = await self._run(
+            ["git", "checkout", "-f", "-B", branch_name, base_branch], cwd=slot
+        )
+        checked_out = returncode == 0
+        if checked_out:
+            await self._run(["git", "clean", "-fd"], cwd=slot)
+            if worktree_path.exists():
+                await self._run(["git", "worktree", "remove", str(worktree_path), "--force"])
+            returncode, _, stderr = await self._run(
+                ["git", "worktree", "move", str(slot), str(worktree_path)]
+            )
+
+        if returncode != 0:
+            logger.warning("Failed to claim pooled worktree: %s", stderr)
+            await self._run(["git", "worktree", "remove", str(slot), "--force"])
+            if checked_out:
+                # So depois de remover o slot: o git recusa apagar branch em checkout,
+                # e o comando roda no repo principal (o cwd do slot ja nao existe)
+                await self._run(["git", "branch", "-D", branch_name])
+            self.misses += 1
+            self.start()
+            return None
+
+        self.claims += 1
+        self.start()
+        return WorktreeResult(
+            success=True,
+            worktree_path=str(worktree_path),
+            branch_name=branch_name
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": self.size, "idle": len(self._idle), "claims": self.claims, "misses": self.misses}
+
+
+# Pools por repositorio (criados no primeiro create_worktree do projeto)
+_pools: Dict[str, WorktreePool] = {}
+
+
+def get_worktree_pool(project_path: str) -> Optional[WorktreePool]:
+    """Pool do repositorio; None se desativado (worktree_pool_size = 0)."""
+    settings = get_settings()
+    if settings.worktree_pool_size <= 0:
+        return None
+    key = str(Path(project_path).resolve())
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = WorktreePool(
+            key,
+            settings.worktree_pool_size,
+            settings.worktree_pool_refresh_seconds,
+        )
+    return pool
+
+
+async def shutdown_worktree_pools() -> None:
+    """Para as tarefas de background de todos os pools (shutdown do servidor)."""
+    for pool in list(_pools.values()):
+        await pool.stop()
@@ -0,0 +1,67 @@
+"""Pipeline de logging não-bloqueante da aplicação.
+
+Os loggers do pacote (`src.*`) publicam registros em uma fila em memória
+(QueueHandler); um QueueListener em thread própria formata e escreve no
+stdout. Assim o event loop nunca espera por escrita síncrona em stdout,
+que vira gargalo quando ele é um pipe para um coletor de logs e vários
+cards estão transmitindo ao mesmo tempo.
+"""
+
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .config.settings import get_settings
+
+# Logger raiz da aplicação: módulos usam logging.getLogger(__name__)
+APP_LOGGER = __name__.rpartition(".")[0]
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def setup_logging(level: Optional[str] = None, stream=None) -> QueueListener:
+    """
+    Instala o QueueHandler no logger da aplicação e inicia o listener.
+
+    Idempotente: chamadas seguintes só ajustam o nível.
+
+    Args:
+        level: Nível mínimo (padrão: settings.log_level)
+        stream: Destino do listener (padrão: sys.stdout)
+    """
+    global _listener, _queue_handler
+    settings = get_settings()
+    app_logger = logging.getLogger(APP_LOGGER)
+    app_logger.setLevel((level or settings.log_level).upper())
+
+    if _listener is not None:
+        return _listener
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(logging.Formatter(settings.log_format))
+
+    _queue_handler = QueueHandler(log_queue)
+    app_logger.addHandler(_queue_handler)
+    # Não duplica nos handlers do root (uvicorn/pytest)
+    app_logger.propagate = False
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Descarrega a fila e para o listener (shutdown do servidor)."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    app_logger = logging.getLogger(APP_LOGGER)
+    app_logger.removeHandler(_queue_handler)
+    app_logger.propagate = True
+    _listener = None
+    _queue_handler = None
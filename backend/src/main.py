@@ -1,10 +1,11 @@
+import logging
 import os
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from sqlalchemy import update, select
@@ -12,7 +13,7 @@ from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .agent import execute_plan, execute_implement, execute_test_implementation, execute_review, execute_expert_triage, get_execution, get_all_executions
-from .git_workspace import GitWorkspaceManager
+from .git_workspace import GitWorkspaceManager, get_worktree_pool, shutdown_worktree_pools
 from .database import create_tables
 from .repositories.execution_repository import ExecutionRepository
 from .models.execution import Execution
@@ -40,6 +41,8 @@ from .routes.experts import router as experts_router
 from .routes.orchestrator import router as orchestrator_router
 from .routes.live import router as live_router
 from .config.settings import get_settings
+from .cache import execution_cache
+from .logging_config import setup_logging, shutdown_logging
 from .database import get_db, async_session_maker
 from .repositories.card_repository import CardRepository
 from .schemas.card import CardUpdate
@@ -50,6 +53,8 @@ from .models.project import ActiveProject  # noqa: F401
 from .models.orchestrator import Goal, OrchestratorAction, OrchestratorLog  # noqa: F401
 from .models.live import Vote, VotingRound, VotingOption, CompletedProject  # noqa: F401
 
+logger = logging.getLogger(__name__)
+
 
 # Schema for workflow state update
 class WorkflowStateUpdate(BaseModel):
@@ -57,69 +62,66 @@ class WorkflowStateUpdate(BaseModel):
     error: Optional[str] = None
 
 
-import asyncio
+async def _start_worktree_pool() -> None:
+    """Inicia o pool de worktrees do projeto ativo (se for um repositório git)."""
+    try:
+        async with async_session_maker() as session:
+            project = await get_active_project(session)
+    except Exception as e:
+        logger.warning("Could not read active project for worktree pool: %s", e)
+        return
 
-# Global reference to orchestrator task
-_orchestrator_task: Optional[asyncio.Task] = None
+    if project and (Path(project.path) / ".git").exists():
+        pool = get_worktree_pool(project.path)
+        if pool is not None:
+            pool.start()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    global _orchestrator_task
+    from .services.orchestrator_service import get_orchestrator_service
+    from .services.memory_warmup import get_memory_warmup
+
+    # Logging em background (QueueListener): o event loop não escreve no stdout
+    setup_logging()
 
     # Startup: Create database tables
-    print("[Server] Creating database tables...")
+    logger.info("Creating database tables...")
     await create_tables()
-    print("[Server] Database tables created successfully")
+    logger.info("Database tables created successfully")
 
-    # Start orchestrator if enabled
-    settings = get_settings()
-    if settings.orchestrator_enabled:
-        print("[Server] Starting orchestrator background task...")
-        _orchestrator_task = asyncio.create_task(_run_orchestrator())
-        print("[Server] Orchestrator started")
+    # Warm up embedding model and vector store off the request path
+    warmup = get_memory_warmup()
+    warmup.start()
 
-    yield
+    # Janitor do cache de execuções (remove entradas expiradas)
+    execution_cache.start_janitor()
 
-    # Shutdown: stop orchestrator and cleanup
-    print("[Server] Shutting down...")
-    if _orchestrator_task:
-        print("[Server] Stopping orchestrator...")
-        _orchestrator_task.cancel()
-        try:
-            await _orchestrator_task
-        except asyncio.CancelledError:
-            pass
-        print("[Server] Orchestrator stopped")
-
-
-async def _run_orchestrator():
-    """Run the orchestrator loop as a background task."""
-    from .services.orchestrator_service import get_orchestrator_service
-    from .services.orchestrator_logger import get_orchestrator_logger
+    # Pré-cria worktrees do projeto ativo para os próximos cards
+    await _start_worktree_pool()
 
+    # Start orchestrator if enabled (single event-driven loop owned by the service)
     settings = get_settings()
-    orch_logger = get_orchestrator_logger(settings.orchestrator_log_file)
-
-    await orch_logger.log_info("Orchestrator background task started")
-
-    # Get the singleton orchestrator service (manages its own sessions)
     orchestrator = get_orchestrator_service()
+    if settings.orchestrator_enabled:
+        logger.info("Starting orchestrator background task...")
+        await orchestrator.start()
+        logger.info("Orchestrator started")
 
-    while True:
-        try:
-            await orchestrator._execute_cycle()
+    yield
 
-        except asyncio.CancelledError:
-            await orch_logger.log_info("Orchestrator cancelled")
-            raise
-        except Exception as e:
-            print(f"[Orchestrator] Error in cycle: {e}")
-            await orch_logger.log_error(f"Cycle error: {e}")
+    # Shutdown: stop orchestrator and cleanup
+    logger.info("Shutting down...")
+    await warmup.stop()
+    await execution_cache.stop_janitor()
+    await shutdown_worktree_pools()
+    if orchestrator.is_running():
+        logger.info("Stopping orchestrator...")
+        await orchestrator.stop()
+        logger.info("Orchestrator stopped")
 
-        # Wait for next cycle
-        await asyncio.sleep(settings.orchestrator_loop_interval_seconds)
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -155,10 +157,15 @@ app.include_router(live_router)
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint (readiness of the memory warm-up in `ready`)."""
+    from .services.memory_warmup import get_memory_warmup
+
+    warmup = get_memory_warmup()
     return HealthResponse(
         status="ok",
         timestamp=datetime.now().isoformat(),
+        ready=warmup.ready,
+        warmup=warmup.to_dict(),
     )
 
 
@@ -172,9 +179,9 @@ async def execute_plan_endpoint(request: ExecutePlanRequest):
             detail="Missing required fields: cardId and title are required",
         )
 
-    print(f"[Server] Received plan request for card: {request.card_id}")
-    print(f"[Server] Title: {request.title}")
-    print(f"[Server] Description: {request.description or '(none)'}")
+    logger.info("Received plan request for card: %s", request.card_id)
+    logger.debug("Title: %s", request.title)
+    logger.debug("Description: %s", request.description or '(none)')
 
     try:
         # Use the currently loaded project's directory as working directory
@@ -231,7 +238,7 @@ async def execute_plan_endpoint(request: ExecutePlanRequest):
 
     except Exception as e:
         error_message = str(e)
-        print(f"[Server] Error: {error_message}")
+        logger.error("Error: %s", error_message)
         error_response = ExecutePlanResponse(
             success=False,
             cardId=request.card_id,
@@ -254,8 +261,8 @@ async def execute_implement_endpoint(request: ExecuteImplementRequest):
             detail="Missing required fields: cardId and specPath are required",
         )
 
-    print(f"[Server] Received implement request for card: {request.card_id}")
-    print(f"[Server] Spec path: {request.spec_path}")
+    logger.info("Received implement request for card: %s", request.card_id)
+    logger.debug("Spec path: %s", request.spec_path)
 
     try:
         # Use the currently loaded project's directory as working directory
@@ -299,7 +306,7 @@ async def execute_implement_endpoint(request: ExecuteImplementRequest):
 
     except Exception as e:
         error_message = str(e)
-        print(f"[Server] Error: {error_message}")
+        logger.error("Error: %s", error_message)
         error_response = ExecuteImplementResponse(
             success=False,
             cardId=request.card_id,
@@ -321,8 +328,8 @@ async def execute_test_endpoint(request: ExecuteImplementRequest):
             detail="Missing required fields: cardId and specPath are required",
         )
 
-    print(f"[Server] Received test request for card: {request.card_id}")
-    print(f"[Server] Spec path: {request.spec_path}")
+    logger.info("Received test request for card: %s", request.card_id)
+    logger.debug("Spec path: %s", request.spec_path)
 
     try:
         cwd = get_project_manager().get_working_directory()
@@ -365,7 +372,7 @@ async def execute_test_endpoint(request: ExecuteImplementRequest):
 
     except Exception as e:
         error_message = str(e)
-        print(f"[Server] Error: {error_message}")
+        logger.error("Error: %s", error_message)
         error_response = ExecuteImplementResponse(
             success=False,
             cardId=request.card_id,
@@ -387,8 +394,8 @@ async def execute_review_endpoint(request: ExecuteImplementRequest):
             detail="Missing required fields: cardId and specPath are required",
         )
 
-    print(f"[Server] Received review request for card: {request.card_id}")
-    print(f"[Server] Spec path: {request.spec_path}")
+    logger.info("Received review request for card: %s", request.card_id)
+    logger.debug("Spec path: %s", request.spec_path)
 
     try:
         cwd = get_project_manager().get_working_directory()
@@ -431,7 +438,7 @@ async def execute_review_endpoint(request: ExecuteImplementRequest):
 
     except Exception as e:
         error_message = str(e)
-        print(f"[Server] Error: {error_message}")
+        logger.error("Error: %s", error_message)
         error_response = ExecuteImplementResponse(
             success=False,
             cardId=request.card_id,
@@ -463,8 +470,8 @@ async def execute_expert_triage_endpoint(request: ExpertTriageRequest):
             detail="Missing required fields: card_id and title are required",
         )
 
-    print(f"[Server] Received expert triage request for card: {request.card_id}")
-    print(f"[Server] Title: {request.title}")
+    logger.info("Received expert triage request for card: %s", request.card_id)
+    logger.debug("Title: %s", request.title)
 
     try:
         cwd = get_project_manager().get_working_directory()
@@ -503,7 +510,7 @@ async def execute_expert_triage_endpoint(request: ExpertTriageRequest):
 
     except Exception as e:
         error_message = str(e)
-        print(f"[Server] Error: {error_message}")
+        logger.error("Error: %s", error_message)
         return JSONResponse(
             status_code=500,
             content={
@@ -550,19 +557,31 @@ async def update_workflow_state(
 
 
 @app.get("/api/logs/{card_id}", response_model=LogsResponse)
-async def get_logs_endpoint(card_id: str, db: AsyncSession = Depends(get_db)):
-    """Get execution logs from database"""
+async def get_logs_endpoint(
+    card_id: str,
+    after_sequence: Optional[int] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get execution logs from database.
+
+    Com `after_sequence`, retorna apenas os logs posteriores ao cursor
+    (tailing incremental); o cliente reinicia o cursor se `executionId` mudar.
+    """
     repo = ExecutionRepository(db)
-    execution = await repo.get_execution_with_logs(card_id)
+    if after_sequence is not None:
+        execution = await repo.get_execution_logs_after(card_id, after_sequence)
+    else:
+        execution = await repo.get_execution_with_logs(card_id)
 
-    if not execution:
+    if not execution and after_sequence is None:
         # Fallback para memória se não houver no banco
         execution = await get_execution(card_id)
-        if not execution:
-            return LogsResponse(
-                success=False,
-                error="No execution found for this card",
-            )
+
+    if not execution:
+        return LogsResponse(
+            success=False,
+            error="No execution found for this card",
+        )
 
     return LogsResponse(
         success=True,
@@ -0,0 +1,111 @@
+"""
+Migração para adicionar índices compostos em executions e execution_logs.
+
+Aplica migrations/014_add_execution_indexes.sql nos databases de projeto
+existentes (.claude/database.db de cada projeto do histórico, além dos
+databases legados em .project_data). Databases novos já nascem com os
+índices declarados nos models.
+
+Execute este script a partir da raiz do repositório:
+    python -m backend.src.migrations.add_execution_indexes [caminho/database.db ...]
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+from typing import List
+
+MIGRATION_FILE = Path(__file__).parent.parent.parent / "migrations" / "014_add_execution_indexes.sql"
+
+
+def run_migration(db_path: Path) -> bool:
+    """Cria os índices em um database, se as tabelas existirem."""
+    if not db_path.exists():
+        print(f"Database {db_path} não existe, pulando...")
+        return False
+
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name IN ('executions', 'execution_logs')"
+        )
+        if len(cursor.fetchall()) < 2:
+            print(f"Tabelas de execução não existem em {db_path}, pulando...")
+            return False
+
+        cursor.executescript(MIGRATION_FILE.read_text())
+        conn.commit()
+
+        print(f"✓ Índices de execução aplicados em {db_path}")
+        return True
+
+    except Exception as e:
+        print(f"✗ Erro ao processar {db_path}: {e}")
+        return False
+
+    finally:
+        if conn:
+            conn.close()
+
+
+def find_project_databases(history_db: Path) -> List[Path]:
+    """Lista os databases de projeto conhecidos (histórico + legados)."""
+    databases: List[Path] = [Path(".claude/database.db")]
+
+    # Projetos carregados anteriormente guardam o database em <projeto>/.claude
+    if history_db.exists():
+        conn = sqlite3.connect(history_db)
+        try:
+            cursor = conn.execute("SELECT path FROM project_history")
+            for (project_path,) in cursor.fetchall():
+                databases.append(Path(project_path) / ".claude" / "database.db")
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            conn.close()
+
+    # Databases legados em .project_data/<project_id>/database.db
+    project_data_dir = history_db.parent
+    if project_data_dir.exists():
+        for project_dir in project_data_dir.iterdir():
+            if project_dir.is_dir():
+                databases.append(project_dir / "database.db")
+
+    # Remove duplicados preservando a ordem
+    seen = set()
+    unique = []
+    for db_path in databases:
+        resolved = db_path.resolve()
+        if resolved not in seen:
+            seen.add(resolved)
+            unique.append(db_path)
+    return unique
+
+
+def main():
+    """Migra os databases informados ou todos os databases de projeto encontrados."""
+    print("=" * 60)
+    print("Adicionando índices em executions/execution_logs")
+    print("=" * 60)
+
+    if len(sys.argv) > 1:
+        databases = [Path(arg) for arg in sys.argv[1:]]
+    else:
+        databases = find_project_databases(Path("backend/.project_data/project_history.db"))
+
+    migrated = 0
+    for db_path in databases:
+        print(f"\n📁 Processando: {db_path}")
+        if run_migration(db_path):
+            migrated += 1
+
+    print("\n" + "=" * 60)
+    print(f"✓ Migração concluída: {migrated} database(s) atualizados")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum, Integer, Boolean, Numeric
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum, Integer, Boolean, Numeric, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -13,6 +13,12 @@ class ExecutionStatus(enum.Enum):
 
 class Execution(Base):
     __tablename__ = "executions"
+    __table_args__ = (
+        # get_active_execution / histórico por card (filtro + ORDER BY started_at)
+        Index("idx_executions_card_active_started", "card_id", "is_active", "started_at"),
+        # Board: execuções ativas de todos os cards
+        Index("idx_executions_active_started", "is_active", "started_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     card_id = Column(String, ForeignKey("cards.id"), nullable=False)
@@ -44,6 +50,10 @@ class Execution(Base):
 
 class ExecutionLog(Base):
     __tablename__ = "execution_logs"
+    __table_args__ = (
+        # Logs em ordem e lookup do último sequence
+        Index("idx_execution_logs_execution_sequence", "execution_id", "sequence"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     execution_id = Column(String, ForeignKey("executions.id"), nullable=False)
@@ -53,4 +63,4 @@ class ExecutionLog(Base):
     sequence = Column(Integer)  # ordem do log
 
     # Relacionamento
-    execution = relationship("Execution", back_populates="logs")
\ No newline at end of file
+    execution = relationship("Execution", back_populates="logs")
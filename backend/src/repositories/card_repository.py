@@ -44,6 +44,15 @@ class CardRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_by_ids(self, card_ids: list[str]) -> list[Card]:
+        """Get several cards with a single IN query (missing IDs are skipped)."""
+        if not card_ids:
+            return []
+        result = await self.session.execute(
+            select(Card).where(Card.id.in_(card_ids))
+        )
+        return list(result.scalars().all())
+
     async def create(self, card_data: CardCreate) -> Card:
         """Create a new card in the backlog column."""
         card = Card(
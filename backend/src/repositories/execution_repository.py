@@ -1,12 +1,23 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete, func
-from typing import Optional, List
+from typing import Dict, Optional, List
+import logging
 import uuid
 from datetime import datetime
 from decimal import Decimal
 from ..models.execution import Execution, ExecutionLog, ExecutionStatus
 from ..cache import execution_cache
+from ..services.execution_log_writer import (
+    ExecutionLogWriter,
+    close_log_writer,
+    get_log_writer,
+    open_log_writer,
+)
 from ..services.cost_calculator import CostCalculator
+from ..services.execution_ws import execution_ws_manager
+
+logger = logging.getLogger(__name__)
+
 
 class ExecutionRepository:
     def __init__(self, db: AsyncSession):
@@ -50,6 +61,9 @@ class ExecutionRepository:
         self.db.add(execution)
         await self.db.commit()
 
+        # Execução nova: writer de logs começa do sequence 0 sem consultar o banco
+        open_log_writer(self.db.bind, execution.id, card_id)
+
         # Invalida cache para forçar reload da nova execução
         execution_cache.invalidate(card_id)
 
@@ -60,38 +74,46 @@ class ExecutionRepository:
         execution_id: str,
         log_type: str,
         content: str
-    ) -> ExecutionLog:
-        """Adiciona log a uma execução e invalida cache"""
-        # Busca último sequence
-        result = await self.db.execute(
-            select(ExecutionLog.sequence)
-            .where(ExecutionLog.execution_id == execution_id)
-            .order_by(ExecutionLog.sequence.desc())
-            .limit(1)
-        )
-        last_sequence = result.scalar() or 0
+    ) -> dict:
+        """
+        Enfileira log no writer bufferizado da execução.
 
-        log = ExecutionLog(
-            id=str(uuid.uuid4()),
-            execution_id=execution_id,
-            type=log_type,
-            content=content,
-            sequence=last_sequence + 1,
-            timestamp=datetime.utcnow()
+        O sequence é atribuído em memória e a persistência acontece em lote
+        (ver ExecutionLogWriter); a execução é descarregada por completo ao
+        concluir (update_execution_status) ou via close_log_writer.
+        """
+        writer = get_log_writer(execution_id)
+        if writer is None:
+            writer = await self._open_log_writer(execution_id)
+        entry = await writer.add(log_type, content)
+
+        if writer.card_id:
+            log = self._log_entry_to_dict(entry)
+            # Anexa ao payload em cache em vez de invalidá-lo
+            execution_cache.append_logs(writer.card_id, execution_id, [log])
+            # Push para os clientes do WebSocket (frames agrupados, mesmo sequence do banco)
+            execution_ws_manager.queue_log(writer.card_id, execution_id, log)
+        return entry
+
+    async def _open_log_writer(self, execution_id: str) -> ExecutionLogWriter:
+        """Abre writer para execução criada fora deste processo (busca estado uma vez)"""
+        card_result = await self.db.execute(
+            select(Execution.card_id).where(Execution.id == execution_id)
         )
-
-        self.db.add(log)
-        await self.db.commit()
-
-        # Invalida cache para forçar reload
-        execution_result = await self.db.execute(
-            select(Execution).where(Execution.id == execution_id)
+        seq_result = await self.db.execute(
+            select(func.max(ExecutionLog.sequence))
+            .where(ExecutionLog.execution_id == execution_id)
+        )
+        return open_log_writer(
+            self.db.bind,
+            execution_id,
+            card_result.scalar_one_or_none(),
+            last_sequence=seq_result.scalar() or 0,
         )
-        execution = execution_result.scalar_one_or_none()
-        if execution:
-            execution_cache.invalidate(execution.card_id)
 
-        return log
+    async def flush_logs(self, execution_id: str) -> None:
+        """Descarrega e fecha o writer de logs da execução (conclusão/cancelamento)"""
+        await close_log_writer(execution_id)
 
     async def get_by_id(self, execution_id: str) -> Optional[Execution]:
         """Busca execução por ID"""
@@ -108,6 +130,10 @@ class ExecutionRepository:
         workflow_stage: Optional[str] = None
     ):
         """Atualiza status de uma execução"""
+        # Garante que todos os logs bufferizados estão persistidos antes de concluir
+        if status != ExecutionStatus.RUNNING:
+            await close_log_writer(execution_id)
+
         # Busca card_id para invalidar cache
         exec_result = await self.db.execute(
             select(Execution.card_id).where(Execution.id == execution_id)
@@ -178,7 +204,7 @@ class ExecutionRepository:
                     await collector.collect_from_execution(execution, project_id)
             except Exception as e:
                 # Log erro mas não falha a operação principal
-                print(f"[MetricsCollector] Erro ao coletar métricas: {e}")
+                logger.error("Erro ao coletar métricas: %s", e)
 
     async def get_active_execution(self, card_id: str) -> Optional[Execution]:
         """Busca execução ativa de um card (a mais recente)"""
@@ -204,15 +230,88 @@ class ExecutionRepository:
         if not execution:
             return None
 
-        # Busca logs
-        logs_result = await self.db.execute(
+        logs = await self._get_logs(execution.id)
+        result = self._execution_to_dict(card_id, execution, logs)
+
+        # Inclui logs ainda no buffer do writer: a partir daqui o cache recebe
+        # os novos logs por append_logs, então o snapshot precisa estar completo
+        writer = get_log_writer(execution.id)
+        if writer:
+            pending = writer.pending_entries(result["lastSequence"])
+            result["logs"].extend(self._log_entry_to_dict(entry) for entry in pending)
+            if pending:
+                result["lastSequence"] = pending[-1]["sequence"]
+
+        # Adiciona ao cache se ainda running e sem lacuna (um flush concorrente
+        # pode ter tirado logs do buffer depois da leitura do banco)
+        complete = writer is None or result["lastSequence"] == writer.last_sequence
+        if execution.status == ExecutionStatus.RUNNING and complete:
+            execution_cache.set(card_id, result)
+
+        return result
+
+    async def get_execution_logs_after(
+        self,
+        card_id: str,
+        after_sequence: int
+    ) -> Optional[dict]:
+        """
+        Busca execução ativa apenas com os logs posteriores ao cursor.
+
+        Usado pelo polling incremental e pelo resume do WebSocket: o custo é
+        proporcional aos logs novos, não ao total da execução. O cliente deve
+        reiniciar o cursor quando `executionId` mudar.
+
+        Args:
+            card_id: ID do card
+            after_sequence: Último sequence já recebido pelo cliente
+        """
+        execution = await self.get_active_execution(card_id)
+        if not execution:
+            return None
+
+        logs = await self._get_logs(execution.id, after_sequence)
+        result = self._execution_to_dict(card_id, execution, logs)
+
+        # Inclui logs ainda no buffer do writer para não abrir lacuna entre
+        # o que está no banco e o que o WebSocket passa a enviar
+        writer = get_log_writer(execution.id)
+        if writer:
+            pending = writer.pending_entries(max(result["lastSequence"], after_sequence))
+            result["logs"].extend(self._log_entry_to_dict(entry) for entry in pending)
+            if pending:
+                result["lastSequence"] = pending[-1]["sequence"]
+
+        if not result["logs"]:
+            result["lastSequence"] = after_sequence
+        return result
+
+    async def _get_logs(self, execution_id: str, after_sequence: int = 0) -> List[ExecutionLog]:
+        """Logs persistidos de uma execução em ordem de sequence"""
+        query = (
             select(ExecutionLog)
-            .where(ExecutionLog.execution_id == execution.id)
+            .where(ExecutionLog.execution_id == execution_id)
             .order_by(ExecutionLog.sequence)
         )
-        logs = logs_result.scalars().all()
+        if after_sequence:
+            query = query.where(ExecutionLog.sequence > after_sequence)
+
+        logs_result = await self.db.execute(query)
+        return logs_result.scalars().all()
+
+    @staticmethod
+    def _log_entry_to_dict(entry: dict) -> dict:
+        """Formato de API de uma entrada do ExecutionLogWriter"""
+        return {
+            "timestamp": entry["timestamp"].isoformat(),
+            "type": entry["type"],
+            "content": entry["content"],
+            "sequence": entry["sequence"],
+        }
 
-        result = {
+    @staticmethod
+    def _execution_to_dict(card_id: str, execution: Execution, logs: List[ExecutionLog]) -> dict:
+        return {
             "cardId": card_id,
             "title": execution.title,
             "executionId": execution.id,
@@ -222,22 +321,18 @@ class ExecutionRepository:
             "startedAt": execution.started_at.isoformat() if execution.started_at else None,
             "completedAt": execution.completed_at.isoformat() if execution.completed_at else None,
             "result": execution.result,
+            "lastSequence": logs[-1].sequence if logs else 0,
             "logs": [
                 {
                     "timestamp": log.timestamp.isoformat(),
                     "type": log.type,
-                    "content": log.content
+                    "content": log.content,
+                    "sequence": log.sequence
                 }
                 for log in logs
             ]
         }
 
-        # Adiciona ao cache se ainda running
-        if execution.status == ExecutionStatus.RUNNING:
-            execution_cache.set(card_id, result)
-
-        return result
-
     async def get_execution_history(self, card_id: str) -> List[dict]:
         """Busca todas as execuções de um card com seus logs"""
         result = await self.db.execute(
@@ -341,4 +436,80 @@ class ExecutionRepository:
         executions = result.scalars().all()
 
         # Calcular breakdown de custos usando o serviço
-        return CostCalculator.calculate_cost_breakdown(executions)
\ No newline at end of file
+        return CostCalculator.calculate_cost_breakdown(executions)
+
+    async def get_board_stats(self) -> Dict[str, dict]:
+        """
+        Retorna execução ativa, token stats e cost stats de todos os cards.
+
+        Usa um número constante de queries agrupadas (independente da
+        quantidade de cards), em vez de 4 round trips por card.
+
+        Returns:
+            Dict card_id -> {"activeExecution", "tokenStats", "costStats"}
+        """
+        stats: Dict[str, dict] = {}
+
+        def entry(card_id: str) -> dict:
+            if card_id not in stats:
+                stats[card_id] = {"activeExecution": None, "tokenStats": None, "costStats": None}
+            return stats[card_id]
+
+        # 1) Execuções ativas de todos os cards (a mais recente vence)
+        active_result = await self.db.execute(
+            select(
+                Execution.id,
+                Execution.card_id,
+                Execution.status,
+                Execution.command,
+                Execution.started_at,
+                Execution.completed_at,
+                Execution.workflow_stage,
+                Execution.workflow_error,
+            )
+            .where(Execution.is_active == True)
+            .order_by(Execution.started_at)
+        )
+        for row in active_result:
+            entry(row.card_id)["activeExecution"] = {
+                "id": row.id,
+                "status": row.status.value if row.status else None,
+                "command": row.command,
+                "startedAt": row.started_at.isoformat() if row.started_at else None,
+                "completedAt": row.completed_at.isoformat() if row.completed_at else None,
+                "workflowStage": row.workflow_stage,
+                "workflowError": row.workflow_error,
+            }
+
+        # 2) Tokens agregados por card/estágio/modelo (custo é linear nos tokens)
+        totals_result = await self.db.execute(
+            select(
+                Execution.card_id,
+                Execution.workflow_stage,
+                Execution.model_used,
+                func.sum(Execution.input_tokens).label("total_input"),
+                func.sum(Execution.output_tokens).label("total_output"),
+                func.sum(Execution.total_tokens).label("total_tokens"),
+                func.count(Execution.id).label("execution_count"),
+            )
+            .group_by(Execution.card_id, Execution.workflow_stage, Execution.model_used)
+        )
+
+        groups: Dict[str, list] = {}
+        for row in totals_result:
+            groups.setdefault(row.card_id, []).append(row)
+
+        for card_id, rows in groups.items():
+            card_stats = entry(card_id)
+            card_stats["tokenStats"] = {
+                "inputTokens": sum(r.total_input or 0 for r in rows),
+                "outputTokens": sum(r.total_output or 0 for r in rows),
+                "totalTokens": sum(r.total_tokens or 0 for r in rows),
+                "executionCount": sum(r.execution_count or 0 for r in rows),
+            }
+            card_stats["costStats"] = CostCalculator.calculate_cost_breakdown_from_totals(
+                (r.workflow_stage, r.model_used, r.total_input, r.total_output)
+                for r in rows
+            )
+
+        return stats
@@ -203,6 +203,37 @@ class MetricsRepository:
             for row in rows
         ]
 
+    async def get_stage_duration_averages(self) -> List[Dict[str, Any]]:
+        """
+        Duração média das execuções bem-sucedidas por comando e modelo.
+
+        Usado pelo scheduler do orquestrador para estimar o tempo restante
+        de cada card (uma única query agrupada).
+        """
+        query = select(
+            ExecutionMetrics.command,
+            ExecutionMetrics.model_used,
+            func.avg(ExecutionMetrics.duration_ms).label('avg_duration_ms'),
+            func.count(ExecutionMetrics.id).label('samples')
+        ).where(
+            ExecutionMetrics.status == 'success',
+            ExecutionMetrics.duration_ms.isnot(None)
+        ).group_by(
+            ExecutionMetrics.command,
+            ExecutionMetrics.model_used
+        )
+
+        result = await self.db.execute(query)
+        return [
+            {
+                "command": row.command,
+                "model": row.model_used,
+                "avgDurationMs": float(row.avg_duration_ms or 0),
+                "samples": row.samples
+            }
+            for row in result.all()
+        ]
+
     async def get_cost_analysis(
         self,
         project_id: str,
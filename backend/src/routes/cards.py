@@ -1,7 +1,7 @@
 """Card routes for the API."""
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, text
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
@@ -17,11 +17,15 @@ from ..schemas.card import (
     CardDeleteResponse,
     ActiveExecution,
     DiffStats,
+    FileDiff,
     TokenStats,
     CostStats,
 )
 from ..services.diff_analyzer import DiffAnalyzer
+from ..services.diff_cache import get_diff_cache
+from ..services.orchestrator_events import OrchestratorEvent, publish_orchestrator_event
 from ..models.card import Card
+from ..models.project import ActiveProject
 
 router = APIRouter(prefix="/api/cards", tags=["cards"])
 
@@ -62,56 +66,25 @@ async def get_all_cards(db: AsyncSession = Depends(get_db)):
     exec_repo = ExecutionRepository(db)
     cards = await repo.get_all()
 
-    # Para cada card, buscar execução ativa e token stats
+    # Execução ativa, tokens e custos de todos os cards em queries agrupadas
+    board_stats = await exec_repo.get_board_stats()
+
     cards_with_execution = []
     for card in cards:
         card_dict = card_to_dict(card)
+        stats = board_stats.get(card.id)
 
-        # Buscar execução ativa no banco (usar SQL direto por enquanto)
-        result = await db.execute(
-            select(1).select_from(text("executions"))
-            .where(text("card_id = :card_id AND is_active = 1"))
-            .params(card_id=card.id)
-        )
-        execution = result.first()
-
-        if execution:
-            # Buscar detalhes da execução incluindo workflow state
-            exec_result = await db.execute(
-                text("""
-                    SELECT id, status, command, started_at, completed_at, workflow_stage, workflow_error
-                    FROM executions
-                    WHERE card_id = :card_id AND is_active = 1
-                """).params(card_id=card.id)
-            )
-            exec_data = exec_result.first()
-
-            if exec_data:
-                # started_at e completed_at podem vir como string ou datetime do SQLite
-                started_at = exec_data[3]
-                completed_at = exec_data[4]
-                workflow_stage = exec_data[5]
-                workflow_error = exec_data[6]
-
-                card_dict["activeExecution"] = ActiveExecution(
-                    id=exec_data[0],
-                    status=exec_data[1],
-                    command=exec_data[2],
-                    startedAt=started_at if isinstance(started_at, str) else (started_at.isoformat() if started_at else None),
-                    completedAt=completed_at if isinstance(completed_at, str) else (completed_at.isoformat() if completed_at else None),
-                    workflowStage=workflow_stage,
-                    workflowError=workflow_error
-                )
+        if stats:
+            if stats["activeExecution"]:
+                card_dict["activeExecution"] = ActiveExecution(**stats["activeExecution"])
 
-        # Buscar token stats para o card
-        token_stats = await exec_repo.get_token_stats_for_card(card.id)
-        if token_stats.get("totalTokens", 0) > 0:
-            card_dict["tokenStats"] = TokenStats(**token_stats)
+            token_stats = stats["tokenStats"]
+            if token_stats and token_stats.get("totalTokens", 0) > 0:
+                card_dict["tokenStats"] = TokenStats(**token_stats)
 
-        # Buscar cost stats para o card
-        cost_stats = await exec_repo.get_cost_stats_for_card(card.id)
-        if cost_stats.get("totalCost", 0.0) > 0:
-            card_dict["costStats"] = CostStats(**cost_stats)
+            cost_stats = stats["costStats"]
+            if cost_stats and cost_stats.get("totalCost", 0.0) > 0:
+                card_dict["costStats"] = CostStats(**cost_stats)
 
         cards_with_execution.append(CardResponse.model_validate(card_dict))
 
@@ -184,6 +157,7 @@ async def delete_card(card_id: str, db: AsyncSession = Depends(get_db)):
     if not deleted:
         raise HTTPException(status_code=404, detail="Card not found")
 
+    get_diff_cache().unpin(card_id)
     return CardDeleteResponse()
 
 
@@ -214,7 +188,8 @@ async def move_card(
                 diff_analyzer = DiffAnalyzer()
                 diff_stats = await diff_analyzer.capture_diff(
                     card.worktree_path,
-                    card.branch_name
+                    card.branch_name,
+                    card_id=card_id
                 )
                 if diff_stats:
                     card_update = CardUpdate(diff_stats=diff_stats)
@@ -234,6 +209,14 @@ async def move_card(
         card_data=card_dict
     )
 
+    # A manual move can unblock (or re-queue) goal cards
+    publish_orchestrator_event(
+        OrchestratorEvent.CARD_MOVED,
+        card_id=card_id,
+        from_column=from_column,
+        to_column=move_data.column_id,
+    )
+
     return CardSingleResponse(card=card_response)
 
 
@@ -278,7 +261,8 @@ async def capture_diff(card_id: str, db: AsyncSession = Depends(get_db)):
     diff_analyzer = DiffAnalyzer()
     diff_stats = await diff_analyzer.capture_diff(
         card.worktree_path,
-        card.branch_name
+        card.branch_name,
+        card_id=card_id
     )
 
     if not diff_stats:
@@ -294,3 +278,40 @@ async def capture_diff(card_id: str, db: AsyncSession = Depends(get_db)):
     return CardSingleResponse(card=CardResponse.model_validate(card))
 
 
+@router.get("/{card_id}/diff/file", response_model=FileDiff)
+async def get_file_diff(
+    card_id: str, path: str = Query(..., description="Relative path of a changed file"), db: AsyncSession = Depends(get_db)
+):
+    """Load one file's diff on demand (diff cache read for a captured range)."""
+    repo = CardRepository(db)
+    card = await repo.get_by_id(card_id)
+
+    if not card:
+        raise HTTPException(status_code=404, detail="Card not found")
+
+    diff_stats = card.diff_stats or {}
+    if not card.worktree_path and not diff_stats.get("head_commit"):
+        raise HTTPException(
+            status_code=400,
+            detail="Card has no captured diff or worktree"
+        )
+
+    # Once the worktree is removed (done cards), the range still exists in the project repo
+    result = await db.execute(
+        select(ActiveProject).order_by(ActiveProject.loaded_at.desc()).limit(1)
+    )
+    project = result.scalar_one_or_none()
+
+    file_diff = await DiffAnalyzer().get_file_diff(
+        card.worktree_path or "",
+        path,
+        diff_stats.get("base_commit"),
+        diff_stats.get("head_commit"),
+        repo_path=project.path if project else None
+    )
+    if not file_diff:
+        raise HTTPException(status_code=404, detail="No diff for this file")
+
+    return file_diff
+
+
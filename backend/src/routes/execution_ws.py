@@ -1,14 +1,48 @@
+import json
+from typing import Optional
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from ..database import get_session
+from ..repositories.execution_repository import ExecutionRepository
 from ..services.execution_ws import execution_ws_manager
 
 router = APIRouter(tags=["execution"])
 
 
 @router.websocket("/api/execution/ws/{card_id}")
-async def execution_websocket(websocket: WebSocket, card_id: str):
+async def execution_websocket(websocket: WebSocket, card_id: str, after_sequence: Optional[int] = None):
     await execution_ws_manager.connect(card_id, websocket)
     try:
+        # Resume: reenvia os logs perdidos desde o último sequence recebido
+        if after_sequence is not None:
+            await _send_replay(websocket, card_id, after_sequence)
+
         while True:
-            await websocket.receive_text()
+            data = await websocket.receive_text()
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            # Heartbeat do useWebSocketBase
+            if isinstance(message, dict) and message.get("type") == "ping":
+                await websocket.send_json({"type": "pong"})
     except WebSocketDisconnect:
+        pass
+    finally:
         execution_ws_manager.disconnect(card_id, websocket)
+
+
+async def _send_replay(websocket: WebSocket, card_id: str, after_sequence: int):
+    session_factory = get_session()
+    async with session_factory() as session:
+        execution = await ExecutionRepository(session).get_execution_logs_after(card_id, after_sequence)
+
+    if execution:
+        await websocket.send_json({
+            "type": "log_replay",
+            "cardId": card_id,
+            "executionId": execution["executionId"],
+            "status": execution["status"],
+            "logs": execution["logs"],
+            "lastSequence": execution["lastSequence"],
+        })
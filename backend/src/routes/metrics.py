@@ -6,6 +6,7 @@ from typing import Optional, Literal
 from datetime import date, datetime, timedelta
 from pydantic import BaseModel
 
+from ..cache import execution_cache
 from ..database import get_db
 from ..repositories.metrics_repository import MetricsRepository
 from ..services.metrics_aggregator import MetricsAggregator
@@ -81,6 +82,23 @@ class ROIResponse(BaseModel):
     estimatedTimeSaved: dict
 
 
+class ExecutionCacheResponse(BaseModel):
+    """Response model for execution cache counters."""
+    entries: int
+    bytes: int
+    maxEntries: int
+    maxBytes: int
+    ttlSeconds: int
+    hits: int
+    misses: int
+    hitRate: float
+    evictions: int
+    expirations: int
+    appends: int
+    rejected: int
+    janitorRunning: bool
+
+
 class ProductivityResponse(BaseModel):
     """Response model for productivity metrics."""
     cardsCompleted: int
@@ -335,3 +353,9 @@ async def compare_periods(
     )
 
     return comparison
+
+
+@router.get("/cache/executions", response_model=ExecutionCacheResponse)
+async def get_execution_cache_stats():
+    """Contadores do cache de execuções ativas (hits, misses, evicções)."""
+    return execution_cache.stats()
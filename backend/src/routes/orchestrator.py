@@ -25,6 +25,8 @@ from ..schemas.orchestrator import (
 from ..services.orchestrator_service import get_orchestrator_service
 from ..services.orchestrator_logger import get_orchestrator_logger
 from ..services.qdrant_service import get_qdrant_service
+from ..services.embedding_service import get_embedding_service
+from ..services.learning_reindex import get_reindex_progress, start_reindex
 from ..repositories.orchestrator_repository import GoalRepository, ActionRepository
 
 logger = logging.getLogger(__name__)
@@ -191,10 +193,10 @@ async def get_logs(
 async def query_learnings(request: LearningQueryRequest):
     """Query relevant learnings from long-term memory."""
     qdrant = get_qdrant_service()
-    results = qdrant.query_learnings(
+    results = await qdrant.search_learnings(
         query_text=request.query,
         limit=request.limit,
-        score_threshold=request.min_score,
+        min_score=request.min_score,
     )
 
     learnings = [
@@ -220,7 +222,36 @@ async def query_learnings(request: LearningQueryRequest):
 async def get_learning_stats():
     """Get statistics about long-term memory."""
     qdrant = get_qdrant_service()
-    return qdrant.get_collection_stats()
+    stats = await qdrant.get_collection_stats()
+    stats["embedding_cache"] = get_embedding_service().cache_stats()
+    return stats
+
+
+@router.post("/learnings/reindex")
+async def reindex_learnings(
+    resume: bool = True,
+    target_collection: Optional[str] = None,
+    vector_size: Optional[int] = None,
+):
+    """
+    Re-embed every learning with the current embedding model (background).
+
+    Writes into `target_collection` (a new collection by default) sized
+    `vector_size`, and swaps it in once complete.
+    """
+    try:
+        progress = start_reindex(resume=resume, target_collection=target_collection, vector_size=vector_size)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"started": True, "progress": progress.to_dict()}
+
+
+@router.get("/learnings/reindex")
+async def get_reindex_status():
+    """Progress of the current or last re-embedding run."""
+    return {"progress": get_reindex_progress()}
 
 
 # ==================== WEBSOCKET ====================
@@ -271,7 +302,7 @@ async def get_stats(db: AsyncSession = Depends(get_db)):
     qdrant = get_qdrant_service()
     collection_stats = None
     try:
-        stats = qdrant.get_collection_stats()
+        stats = await qdrant.get_collection_stats()
         if "error" not in stats:
             collection_stats = stats
     except Exception:
@@ -10,7 +10,8 @@ class FileDiff(BaseModel):
     """Schema for a single file diff."""
     path: str
     status: str  # 'added', 'modified', 'removed'
-    content: str  # The actual diff content
+    content: str = ""  # The actual diff content (empty until loaded in summaries)
+    truncated: bool = False  # Content cut at the per-file/total capture limit
 
 
 class DiffStats(BaseModel):
@@ -23,7 +24,9 @@ class DiffStats(BaseModel):
     total_changes: int = 0
     captured_at: Optional[str] = None
     branch_name: Optional[str] = None
-    file_diffs: List[FileDiff] = []  # Detailed diff content per file
+    base_commit: Optional[str] = None  # Resolved SHAs of the captured base...head range
+    head_commit: Optional[str] = None
+    file_diffs: List[FileDiff] = []  # Per-file diffs; content may be empty and loaded on demand
 
 
 ColumnId = Literal["backlog", "plan", "implement", "test", "review", "done", "completed", "archived", "cancelado"]
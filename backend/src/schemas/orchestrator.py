@@ -112,6 +112,9 @@ class UsageInfo(BaseModel):
 class OrchestratorStatus(BaseModel):
     """Schema for orchestrator status."""
     running: bool
+    running_cards: List[str] = []
+    max_parallel_cards: int = 1
+    stage_workers: Dict[str, Dict[str, int]] = {}
     loop_interval_seconds: int
     usage_limit_percent: int
     last_usage_check: Optional[UsageInfo] = None
@@ -163,6 +166,7 @@ class CollectionStats(BaseModel):
     points_count: int
     vectors_count: int
     status: str
+    backend: Optional[str] = None
 
 
 class OrchestratorStats(BaseModel):
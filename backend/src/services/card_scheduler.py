@@ -0,0 +1,180 @@
+"""Scheduler dos cards de um goal baseado no grafo de dependências.
+
+Monta o DAG a partir de `Card.dependencies`, ordena topologicamente (Kahn)
+detectando ciclos e prioriza os cards prontos pelo caminho crítico: a duração
+estimada do card somada à cadeia mais longa de dependentes. Executar primeiro
+o que está no caminho mais longo reduz o tempo total do goal, em vez de
+depender da ordem de inserção.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..models.card import Card
+
+# Colunas a partir das quais o orquestrador ainda executa algum estágio
+EXECUTABLE_COLUMNS = ["backlog", "plan", "implement", "test", "review"]
+WORKFLOW_STAGES = ["plan", "implement", "test", "review"]
+
+# Comando gravado em ExecutionMetrics para cada estágio
+STAGE_COMMANDS = {
+    "plan": "/plan",
+    "implement": "/implement",
+    "test": "/test-implementation",
+    "review": "/review",
+}
+
+# Estimativa usada enquanto não há métricas para o estágio
+DEFAULT_STAGE_DURATION_MS = {
+    "plan": 180_000,
+    "implement": 600_000,
+    "test": 300_000,
+    "review": 180_000,
+}
+
+
+class StageDurationEstimator:
+    """Estima a duração de cada estágio a partir das médias de ExecutionMetrics."""
+
+    def __init__(self, averages: Sequence[Dict[str, Any]] = ()):
+        self._by_model: Dict[tuple, float] = {}
+        totals: Dict[str, List[float]] = {}
+
+        for row in averages:
+            command, samples = row["command"], row["samples"] or 0
+            if not samples:
+                continue
+            self._by_model[(command, row["model"])] = row["avgDurationMs"]
+            total = totals.setdefault(command, [0.0, 0])
+            total[0] += row["avgDurationMs"] * samples
+            total[1] += samples
+
+        # Média do comando ponderada pelas amostras de todos os modelos
+        self._by_command = {command: total / count for command, (total, count) in totals.items()}
+
+    def estimate(self, stage: str, model: Optional[str] = None) -> float:
+        """Duração estimada (ms) de um estágio, preferindo a média do modelo."""
+        command = STAGE_COMMANDS[stage]
+        if (command, model) in self._by_model:
+            return self._by_model[(command, model)]
+        return self._by_command.get(command, DEFAULT_STAGE_DURATION_MS[stage])
+
+    def remaining(self, card: Card) -> float:
+        """Duração estimada (ms) dos estágios que faltam para o card chegar a done."""
+        if card.column_id not in EXECUTABLE_COLUMNS:
+            return 0.0
+
+        start = 0 if card.column_id == "backlog" else WORKFLOW_STAGES.index(card.column_id)
+        return sum(
+            self.estimate(stage, getattr(card, f"model_{stage}", None))
+            for stage in WORKFLOW_STAGES[start:]
+        )
+
+
+@dataclass
+class ScheduledCard:
+    """Estado de um card dentro do schedule do goal."""
+    card: Card
+    dependencies: List[str]
+    dependencies_satisfied: bool
+    ready_to_execute: bool
+    in_cycle: bool
+    can_plan_ahead: bool
+    estimated_ms: float
+    critical_path_ms: float
+    order: int
+
+
+@dataclass
+class CardSchedule:
+    """Resultado do scheduler: cards em ordem de prioridade."""
+    cards: List[ScheduledCard] = field(default_factory=list)
+    cycle: List[str] = field(default_factory=list)
+
+    @property
+    def ready(self) -> List[ScheduledCard]:
+        return [c for c in self.cards if c.ready_to_execute]
+
+
+def build_schedule(
+    card_ids: Sequence[str],
+    cards: Dict[str, Card],
+    estimator: StageDurationEstimator,
+) -> CardSchedule:
+    """
+    Ordena os cards do goal por caminho crítico.
+
+    Dependências que não pertencem ao goal (ou não existem) nunca ficam
+    satisfeitas. Cards em ciclo, ou que dependem de um ciclo, não ficam
+    prontos e são reportados em `cycle`.
+
+    Args:
+        card_ids: IDs do goal, na ordem original (desempate estável)
+        cards: Cards carregados, indexados por ID
+        estimator: Estimador de duração dos estágios
+    """
+    ids = [cid for cid in dict.fromkeys(card_ids) if cid in cards]
+    dependents: Dict[str, List[str]] = {cid: [] for cid in ids}
+    indegree: Dict[str, int] = {cid: 0 for cid in ids}
+
+    for cid in ids:
+        for dep_id in dict.fromkeys(cards[cid].dependencies or []):
+            if dep_id in dependents:
+                dependents[dep_id].append(cid)
+                indegree[cid] += 1
+
+    # Kahn: o que sobrar com indegree > 0 está em um ciclo (ou depende de um)
+    queue = deque(cid for cid in ids if indegree[cid] == 0)
+    topo: List[str] = []
+    while queue:
+        cid = queue.popleft()
+        topo.append(cid)
+        for child in dependents[cid]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                queue.append(child)
+
+    acyclic = set(topo)
+    cycle = [cid for cid in ids if cid not in acyclic]
+
+    # Caminho crítico: duração restante do card + maior cadeia de dependentes
+    estimated = {cid: estimator.remaining(cards[cid]) for cid in ids}
+    critical: Dict[str, float] = {cid: estimated[cid] for cid in cycle}
+    for cid in reversed(topo):
+        downstream = [critical[child] for child in dependents[cid] if child in acyclic]
+        critical[cid] = estimated[cid] + max(downstream, default=0.0)
+
+    position = {cid: i for i, cid in enumerate(topo + cycle)}
+    scheduled = []
+    for cid in ids:
+        card = cards[cid]
+        deps = card.dependencies or []
+        deps_satisfied = all(
+            dep_id in cards and cards[dep_id].column_id == "done"
+            for dep_id in deps
+        )
+        in_cycle = cid not in acyclic
+        # PLAN antecipado: só falta a conclusão de dependências do próprio goal
+        can_plan_ahead = (
+            card.column_id == "backlog"
+            and not deps_satisfied
+            and not in_cycle
+            and all(dep_id in cards for dep_id in deps)
+        )
+        scheduled.append(ScheduledCard(
+            card=card,
+            dependencies=deps,
+            dependencies_satisfied=deps_satisfied,
+            ready_to_execute=(
+                card.column_id in EXECUTABLE_COLUMNS and deps_satisfied and not in_cycle
+            ),
+            in_cycle=in_cycle,
+            can_plan_ahead=can_plan_ahead,
+            estimated_ms=estimated[cid],
+            critical_path_ms=critical[cid],
+            order=position[cid],
+        ))
+
+    scheduled.sort(key=lambda c: (c.in_cycle, -c.critical_path_ms, c.order))
+    return CardSchedule(cards=scheduled, cycle=cycle)
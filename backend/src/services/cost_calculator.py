@@ -1,7 +1,7 @@
 """Service for calculating execution costs based on token usage and model pricing."""
 
 from decimal import Decimal
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from ..config.pricing import calculate_cost
 from ..models.execution import Execution
@@ -53,7 +53,40 @@ class CostCalculator:
         Returns:
             Dicionário com custos por tipo (plan, implement, test, review) e total
         """
-        costs = {
+        costs = CostCalculator._empty_breakdown()
+
+        for execution in executions:
+            cost = float(CostCalculator.calculate_execution_cost(execution))
+            CostCalculator._add_stage_cost(costs, execution.workflow_stage, cost)
+
+        return costs
+
+    @staticmethod
+    def calculate_cost_breakdown_from_totals(
+        rows: Iterable[Tuple[Optional[str], Optional[str], int, int]]
+    ) -> Dict[str, float]:
+        """Calcula o breakdown de custos a partir de tokens já agregados no banco.
+
+        Args:
+            rows: Tuplas (workflow_stage, model_used, input_tokens, output_tokens),
+                  uma por combinação estágio/modelo (resultado de um GROUP BY)
+
+        Returns:
+            Dicionário no mesmo formato de calculate_cost_breakdown
+        """
+        costs = CostCalculator._empty_breakdown()
+
+        for workflow_stage, model_used, input_tokens, output_tokens in rows:
+            if not model_used:
+                continue
+            cost = float(calculate_cost(model_used, input_tokens or 0, output_tokens or 0))
+            CostCalculator._add_stage_cost(costs, workflow_stage, cost)
+
+        return costs
+
+    @staticmethod
+    def _empty_breakdown() -> Dict[str, float]:
+        return {
             "totalCost": 0.0,
             "planCost": 0.0,
             "implementCost": 0.0,
@@ -62,20 +95,17 @@ class CostCalculator:
             "currency": "USD"
         }
 
-        for execution in executions:
-            cost = float(CostCalculator.calculate_execution_cost(execution))
-
-            # Mapear tipo de execução para campo de custo
-            execution_type = execution.workflow_stage
-            if execution_type == "plan":
-                costs["planCost"] += cost
-            elif execution_type == "implement":
-                costs["implementCost"] += cost
-            elif execution_type == "test":
-                costs["testCost"] += cost
-            elif execution_type == "review":
-                costs["reviewCost"] += cost
-
-            costs["totalCost"] += cost
-
-        return costs
+    @staticmethod
+    def _add_stage_cost(costs: Dict[str, float], execution_type: Optional[str], cost: float) -> None:
+        """Soma o custo no campo do estágio correspondente e no total."""
+        # Mapear tipo de execução para campo de custo
+        if execution_type == "plan":
+            costs["planCost"] += cost
+        elif execution_type == "implement":
+            costs["implementCost"] += cost
+        elif execution_type == "test":
+            costs["testCost"] += cost
+        elif execution_type == "review":
+            costs["reviewCost"] += cost
+
+        costs["totalCost"] += cost
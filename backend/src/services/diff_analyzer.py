@@ -1,23 +1,209 @@
 """Diff analyzer service for capturing git changes."""
 
 import asyncio
+import codecs
+import logging
 import os
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
 
+from ..config.settings import get_settings
 from ..schemas.card import DiffStats, FileDiff
+from .diff_cache import DiffCache, get_diff_cache
+
+logger = logging.getLogger(__name__)
+
+# `git diff --raw` status letter -> status exposed in DiffStats (renames count as modified)
+_STATUS_BY_LETTER = {"A": "added", "C": "added", "D": "removed", "M": "modified", "R": "modified", "T": "modified"}
+
+_READ_CHUNK = 64 * 1024
+
+
+def _unquote_path(path: str) -> str:
+    """Undo git's C-style quoting of paths with special characters."""
+    if len(path) >= 2 and path[0] == path[-1] == '"':
+        return codecs.escape_decode(path[1:-1].encode("utf-8"))[0].decode("utf-8", errors="replace")
+    return path
+
+
+async def _read_lines(stream: asyncio.StreamReader, max_line: int) -> AsyncIterator[List[Tuple[bytes, bool]]]:
+    """
+    Yield batches of (line, cut) from `stream`, one batch per chunk read.
+
+    Lines come without the trailing newline. Lines longer than `max_line`
+    are cut there (cut=True) and the rest is skipped, so a minified file
+    cannot grow the buffer without bound.
+    """
+    buffer = b""
+    skipping = False
+    while True:
+        chunk = await stream.read(_READ_CHUNK)
+        if not chunk:
+            break
+        lines = chunk.split(b"\n")
+        lines[0] = buffer + lines[0]
+        buffer = lines.pop()
+        if skipping and lines:
+            # Tail of the line already cut
+            lines.pop(0)
+            skipping = False
+
+        batch = [(line, False) if len(line) <= max_line else (line[:max_line], True) for line in lines]
+        if skipping:
+            buffer = b""
+        elif len(buffer) > max_line:
+            batch.append((buffer[:max_line], True))
+            buffer = b""
+            skipping = True
+        if batch:
+            yield batch
+    if buffer and not skipping:
+        yield [(buffer, False)]
+
+
+@dataclass
+class _FileEntry:
+    path: str
+    status: str
+    lines_added: int = 0
+    lines_removed: int = 0
+
+
+class _DiffParser:
+    """
+    Incremental parser for `git diff --raw --numstat -p` output.
+
+    Git prints the raw lines, then the numstat lines, a blank line and the
+    patches, all in the same file order, so every section is matched to its
+    file by position instead of by path lookups. Patch content is kept up to
+    `max_file_bytes` per file and `max_total_bytes` overall; the rest is
+    counted and replaced by a truncation marker.
+    """
+
+    def __init__(self, max_file_bytes: int, max_total_bytes: int):
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.files: List[_FileEntry] = []
+        self.file_diffs: List[FileDiff] = []
+        self.total_bytes = 0
+        self._numstat_index = 0
+        self._patch_index = 0
+        self._in_patches = False
+        self._current: Optional[_FileEntry] = None
+        self._lines: List[bytes] = []
+        self._size = 0
+        self._omitted_lines = 0
+        self._omitted_bytes = 0
+
+    def feed(self, raw_line: bytes, cut: bool = False) -> None:
+        if not self._in_patches:
+            self._feed_header(raw_line.decode("utf-8", errors="replace"))
+            return
+
+        size = len(raw_line) + 1
+        if raw_line.startswith(b"diff --git "):
+            self._finish_file()
+            if self._patch_index < len(self.files):
+                self._current = self.files[self._patch_index]
+            self._patch_index += 1
+            self._keep(raw_line, size)
+            return
+        if self._current is None:
+            return
+
+        if (
+            cut
+            or self._omitted_lines
+            or self._size + size > self.max_file_bytes
+            or self.total_bytes + size > self.max_total_bytes
+        ):
+            self._omitted_lines += 1
+            self._omitted_bytes += size
+        else:
+            self._keep(raw_line, size)
+
+    def _feed_header(self, line: str) -> None:
+        if line.startswith(":"):
+            meta, _, paths = line.partition("\t")
+            letter = meta.split()[-1][:1] if meta.split() else "M"
+            self.files.append(_FileEntry(
+                path=_unquote_path(paths.split("\t")[-1]),
+                status=_STATUS_BY_LETTER.get(letter, "modified"),
+            ))
+        elif line:
+            added, removed, _ = (line.split("\t", 2) + ["", ""])[:3]
+            if self._numstat_index < len(self.files):
+                entry = self.files[self._numstat_index]
+                # Binary files show "-" and count as zero lines, like --shortstat
+                entry.lines_added = int(added) if added.isdigit() else 0
+                entry.lines_removed = int(removed) if removed.isdigit() else 0
+            self._numstat_index += 1
+        else:
+            self._in_patches = True
+
+    def _keep(self, raw_line: bytes, size: int) -> None:
+        self._lines.append(raw_line)
+        self._size += size
+        self.total_bytes += size
+
+    def _finish_file(self) -> None:
+        if self._current is not None:
+            content = b"\n".join(self._lines).decode("utf-8", errors="replace")
+            if self._omitted_lines:
+                content += (
+                    f"\n... diff truncated: {self._omitted_lines} more lines "
+                    f"({self._omitted_bytes} bytes) not captured"
+                )
+            self.file_diffs.append(FileDiff(
+                path=self._current.path,
+                status=self._current.status,
+                content=content,
+                truncated=self._omitted_lines > 0,
+            ))
+        self._current = None
+        self._lines = []
+        self._size = self._omitted_lines = self._omitted_bytes = 0
+
+    def finish(self) -> None:
+        self._finish_file()
 
 
 class DiffAnalyzer:
     """Service for analyzing git diffs in worktrees."""
 
-    async def capture_diff(self, worktree_path: str, branch_name: str) -> Optional[DiffStats]:
+    def __init__(self, cache: Optional[DiffCache] = None):
+        self._cache = cache
+
+    @property
+    def cache(self) -> DiffCache:
+        if self._cache is None:
+            self._cache = get_diff_cache()
+        return self._cache
+
+    async def capture_diff(
+        self,
+        worktree_path: str,
+        branch_name: str,
+        include_content: bool = False,
+        card_id: Optional[str] = None
+    ) -> Optional[DiffStats]:
         """
         Capture diff statistics from a worktree.
 
+        The base and head commits are resolved first; a diff already
+        captured for that pair is read from the diff cache. Otherwise
+        statuses, line counts and per-file patches come from a single
+        streaming `git diff` pass (patch content capped per file and in
+        total, settings diff_max_file_kb / diff_max_total_mb) and are cached.
+
         Args:
             worktree_path: Path to the worktree
             branch_name: Name of the branch
+            include_content: Fill file_diffs content; by default it is left
+                empty and loaded per file with get_file_diff
+            card_id: Card whose diff_stats will reference this range; the
+                range is pinned in the cache so its hunks outlive the worktree
 
         Returns:
             DiffStats object with captured statistics or None if capture fails
@@ -26,244 +212,112 @@ class DiffAnalyzer:
             return None
 
         try:
-            # Get the base branch (usually main or master)
-            base_branch = await self._get_base_branch(worktree_path)
-
-            # Get file status changes
-            files_data = await self._get_file_changes(worktree_path, base_branch)
-
-            # Get line changes statistics
-            lines_data = await self._get_line_changes(worktree_path, base_branch)
-
-            # Get detailed diff content for each file
-            file_diffs = await self._get_all_file_diffs(worktree_path, base_branch, files_data)
-
-            # Combine all data
-            diff_stats = DiffStats(
-                files_added=files_data["added"],
-                files_modified=files_data["modified"],
-                files_removed=files_data["removed"],
-                lines_added=lines_data["added"],
-                lines_removed=lines_data["removed"],
-                total_changes=lines_data["added"] + lines_data["removed"],
+            commits = await self._resolve_commits(worktree_path)
+            if commits is None:
+                return None
+            base_commit, head_commit = commits
+
+            summary = self.cache.get_summary(base_commit, head_commit)
+            if summary is not None:
+                if card_id:
+                    self.cache.pin(card_id, base_commit, head_commit)
+                stats = DiffStats(**summary)
+                stats.branch_name = branch_name
+                if include_content:
+                    stats.file_diffs = [
+                        self.cache.get_file(base_commit, head_commit, fd.path) or fd
+                        for fd in stats.file_diffs
+                    ]
+                return stats
+
+            parser = await self._stream_diff(worktree_path, f"{base_commit}...{head_commit}")
+            if parser is None:
+                return None
+
+            files_added: List[str] = []
+            files_modified: List[str] = []
+            files_removed: List[str] = []
+            by_status = {"added": files_added, "modified": files_modified, "removed": files_removed}
+            for entry in parser.files:
+                by_status[entry.status].append(entry.path)
+
+            lines_added = sum(entry.lines_added for entry in parser.files)
+            lines_removed = sum(entry.lines_removed for entry in parser.files)
+
+            stats = DiffStats(
+                files_added=files_added,
+                files_modified=files_modified,
+                files_removed=files_removed,
+                lines_added=lines_added,
+                lines_removed=lines_removed,
+                total_changes=lines_added + lines_removed,
                 captured_at=datetime.utcnow().isoformat(),
                 branch_name=branch_name,
-                file_diffs=file_diffs
+                base_commit=base_commit,
+                head_commit=head_commit,
+                file_diffs=parser.file_diffs
             )
+            await asyncio.to_thread(self.cache.put, base_commit, head_commit, stats)
+            if card_id:
+                self.cache.pin(card_id, base_commit, head_commit)
 
-            return diff_stats
+            if not include_content:
+                stats.file_diffs = [fd.model_copy(update={"content": ""}) for fd in stats.file_diffs]
+            return stats
 
         except Exception as e:
-            print(f"Error capturing diff: {e}")
+            logger.warning("Error capturing diff: %s", e)
             return None
 
-    async def _get_base_branch(self, worktree_path: str) -> str:
-        """Get the base branch name (main or master)."""
-        try:
-            # Try to find main branch
-            process = await asyncio.create_subprocess_exec(
-                "git", "-C", worktree_path, "rev-parse", "--verify", "main",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            await process.communicate()
-
-            if process.returncode == 0:
-                return "main"
-
-            # Fallback to master
-            return "master"
-
-        except Exception:
-            return "main"
-
-    async def _get_file_changes(self, worktree_path: str, base_branch: str) -> Dict[str, List[str]]:
-        """
-        Get files added, modified, and removed.
-
-        Returns:
-            Dict with keys: added, modified, removed
-        """
-        try:
-            # Run git diff --name-status
-            process = await asyncio.create_subprocess_exec(
-                "git", "-C", worktree_path, "diff", "--name-status", f"{base_branch}...HEAD",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await process.communicate()
-
-            if process.returncode != 0:
-                return {"added": [], "modified": [], "removed": []}
-
-            output = stdout.decode("utf-8").strip()
-            if not output:
-                return {"added": [], "modified": [], "removed": []}
-
-            added = []
-            modified = []
-            removed = []
-
-            for line in output.split("\n"):
-                parts = line.split("\t", 1)
-                if len(parts) != 2:
-                    continue
-
-                status = parts[0]
-                filepath = parts[1]
-
-                if status.startswith("A"):
-                    added.append(filepath)
-                elif status.startswith("M"):
-                    modified.append(filepath)
-                elif status.startswith("D"):
-                    removed.append(filepath)
-                elif status.startswith("R"):
-                    # Renamed files - treat as modified
-                    modified.append(filepath)
-
-            return {
-                "added": added,
-                "modified": modified,
-                "removed": removed
-            }
-
-        except Exception as e:
-            print(f"Error getting file changes: {e}")
-            return {"added": [], "modified": [], "removed": []}
-
-    async def _get_line_changes(self, worktree_path: str, base_branch: str) -> Dict[str, int]:
-        """
-        Get lines added and removed.
-
-        Returns:
-            Dict with keys: added, removed
-        """
-        try:
-            # Run git diff --shortstat
-            process = await asyncio.create_subprocess_exec(
-                "git", "-C", worktree_path, "diff", "--shortstat", f"{base_branch}...HEAD",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await process.communicate()
-
-            if process.returncode != 0:
-                return {"added": 0, "removed": 0}
-
-            output = stdout.decode("utf-8").strip()
-            if not output:
-                return {"added": 0, "removed": 0}
-
-            # Parse output like: "3 files changed, 45 insertions(+), 12 deletions(-)"
-            lines_added = 0
-            lines_removed = 0
-
-            if "insertion" in output:
-                # Extract number before "insertion"
-                parts = output.split("insertion")
-                if parts:
-                    num_str = parts[0].strip().split()[-1]
-                    try:
-                        lines_added = int(num_str)
-                    except ValueError:
-                        pass
-
-            if "deletion" in output:
-                # Extract number before "deletion"
-                parts = output.split("deletion")
-                if parts:
-                    num_str = parts[0].strip().split()[-1]
-                    try:
-                        lines_removed = int(num_str)
-                    except ValueError:
-                        pass
-
-            return {
-                "added": lines_added,
-                "removed": lines_removed
-            }
-
-        except Exception as e:
-            print(f"Error getting line changes: {e}")
-            return {"added": 0, "removed": 0}
-
-    async def _get_all_file_diffs(
-        self, worktree_path: str, base_branch: str, files_data: Dict[str, List[str]]
-    ) -> List[FileDiff]:
+    async def get_file_diff(
+        self,
+        worktree_path: str,
+        file_path: str,
+        base_commit: Optional[str] = None,
+        head_commit: Optional[str] = None,
+        repo_path: Optional[str] = None
+    ) -> Optional[FileDiff]:
         """
-        Get diff content for all changed files.
+        Get the diff of one file, from the diff cache when possible.
 
         Args:
             worktree_path: Path to the worktree
-            base_branch: Base branch to compare against
-            files_data: Dict with added, modified, removed file lists
+            file_path: Relative path to the file
+            base_commit / head_commit: Range of a captured diff (DiffStats);
+                resolved from the worktree when not given
+            repo_path: Project repository, used to diff the range on a cache
+                miss once the worktree has been removed (commits are shared)
 
         Returns:
-            List of FileDiff objects with diff content
+            FileDiff or None if the file has no diff or git failed
         """
-        file_diffs = []
-
-        # Get full diff output
         try:
-            process = await asyncio.create_subprocess_exec(
-                "git", "-C", worktree_path, "diff", f"{base_branch}...HEAD",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await process.communicate()
+            if not (base_commit and head_commit):
+                if not os.path.exists(worktree_path):
+                    return None
+                commits = await self._resolve_commits(worktree_path)
+                if commits is None:
+                    return None
+                base_commit, head_commit = commits
+
+            cached = self.cache.get_file(base_commit, head_commit, file_path)
+            if cached is not None:
+                return cached
+
+            cwd = next((path for path in (worktree_path, repo_path) if path and os.path.exists(path)), None)
+            if cwd is None:
+                return None
 
-            if process.returncode != 0:
-                return []
-
-            full_diff = stdout.decode("utf-8", errors="replace")
-
-            # Parse the diff into individual file diffs
-            current_file = None
-            current_content = []
-            current_status = "modified"
-
-            for line in full_diff.split("\n"):
-                if line.startswith("diff --git"):
-                    # Save previous file if exists
-                    if current_file and current_content:
-                        file_diffs.append(FileDiff(
-                            path=current_file,
-                            status=current_status,
-                            content="\n".join(current_content)
-                        ))
-
-                    # Extract file path from diff line
-                    parts = line.split(" b/")
-                    if len(parts) >= 2:
-                        current_file = parts[-1].strip()
-                    else:
-                        current_file = None
-
-                    # Determine status
-                    if current_file in files_data["added"]:
-                        current_status = "added"
-                    elif current_file in files_data["removed"]:
-                        current_status = "removed"
-                    else:
-                        current_status = "modified"
-
-                    current_content = [line]
-                elif current_file:
-                    current_content.append(line)
-
-            # Save last file
-            if current_file and current_content:
-                file_diffs.append(FileDiff(
-                    path=current_file,
-                    status=current_status,
-                    content="\n".join(current_content)
-                ))
+            parser = await self._stream_diff(cwd, f"{base_commit}...{head_commit}", file_path)
+            if parser is None or not parser.file_diffs:
+                return None
+            file_diff = parser.file_diffs[0]
+            await asyncio.to_thread(self.cache.put_file, base_commit, head_commit, file_diff)
+            return file_diff
 
         except Exception as e:
-            print(f"Error getting all file diffs: {e}")
-
-        return file_diffs
+            logger.warning("Error getting file diff: %s", e)
+            return None
 
     async def get_detailed_diff(self, worktree_path: str, file_path: str) -> Optional[str]:
         """
@@ -276,25 +330,51 @@ class DiffAnalyzer:
         Returns:
             Diff content as string or None if failed
         """
-        if not os.path.exists(worktree_path):
-            return None
-
-        try:
-            base_branch = await self._get_base_branch(worktree_path)
+        file_diff = await self.get_file_diff(worktree_path, file_path)
+        return file_diff.content if file_diff else None
 
-            # Run git diff for specific file
+    async def _resolve_commits(self, worktree_path: str) -> Optional[Tuple[str, str]]:
+        """SHAs of the base branch (main, else master) and HEAD, in one rev-parse."""
+        for base_branch in ("main", "master"):
             process = await asyncio.create_subprocess_exec(
-                "git", "-C", worktree_path, "diff", f"{base_branch}...HEAD", "--", file_path,
+                "git", "-C", worktree_path, "rev-parse", base_branch, "HEAD",
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.DEVNULL
             )
             stdout, _ = await process.communicate()
-
-            if process.returncode != 0:
-                return None
-
-            return stdout.decode("utf-8")
-
-        except Exception as e:
-            print(f"Error getting detailed diff: {e}")
+            shas = stdout.decode().split()
+            if process.returncode == 0 and len(shas) == 2:
+                return shas[0], shas[1]
+        return None
+
+    async def _stream_diff(
+        self, worktree_path: str, revision_range: str, file_path: Optional[str] = None
+    ) -> Optional[_DiffParser]:
+        """Run `git diff --raw --numstat -p` once and parse it as it streams."""
+        settings = get_settings()
+        parser = _DiffParser(
+            max_file_bytes=settings.diff_max_file_kb * 1024,
+            max_total_bytes=settings.diff_max_total_mb * 1024 * 1024,
+        )
+
+        process = await asyncio.create_subprocess_exec(
+            "git", "-C", worktree_path, "-c", "core.quotepath=off",
+            "diff", "--no-color", "--no-ext-diff", "--raw", "--numstat", "-p",
+            revision_range, *(["--", file_path] if file_path else []),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            async for batch in _read_lines(process.stdout, parser.max_file_bytes):
+                for line, cut in batch:
+                    parser.feed(line, cut)
+            await process.wait()
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+        if process.returncode != 0:
             return None
+        parser.finish()
+        return parser
@@ -0,0 +1,171 @@
+"""Persisted diff cache keyed by (base commit, head commit).
+
+A `base...head` diff is fully determined by the two commit SHAs, so a
+captured diff never goes stale: entries are only evicted by count. The
+summary (statuses, line counts, file list) and each file's hunks are
+stored separately, so a review view reads the summary once and loads file
+content only when a file is opened.
+
+The range last captured for a card is pinned: the card's diff_stats no
+longer carries the patches, so those entries are never evicted (the card's
+worktree may be gone by then) until the card is deleted.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..config.settings import get_settings
+from ..schemas.card import DiffStats, FileDiff
+
+logger = logging.getLogger(__name__)
+
+
+class DiffCache:
+    """Thread-safe SQLite store of diff summaries and per-file hunks."""
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or get_settings().diff_cache_max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS diff_summaries ("
+            " base_sha TEXT NOT NULL, head_sha TEXT NOT NULL, stats TEXT NOT NULL,"
+            " accessed_at REAL NOT NULL, PRIMARY KEY (base_sha, head_sha));"
+            "CREATE TABLE IF NOT EXISTS diff_files ("
+            " base_sha TEXT NOT NULL, head_sha TEXT NOT NULL, path TEXT NOT NULL,"
+            " status TEXT NOT NULL, content TEXT NOT NULL, truncated INTEGER NOT NULL,"
+            " PRIMARY KEY (base_sha, head_sha, path));"
+            "CREATE TABLE IF NOT EXISTS diff_pins ("
+            " card_id TEXT PRIMARY KEY, base_sha TEXT NOT NULL, head_sha TEXT NOT NULL);"
+        )
+        self._db.commit()
+
+    def get_summary(self, base_sha: str, head_sha: str) -> Optional[Dict[str, Any]]:
+        """Cached DiffStats payload (file diffs without content), or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT stats FROM diff_summaries WHERE base_sha = ? AND head_sha = ?",
+                (base_sha, head_sha),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute(
+                "UPDATE diff_summaries SET accessed_at = ? WHERE base_sha = ? AND head_sha = ?",
+                (time.time(), base_sha, head_sha),
+            )
+            self._db.commit()
+        return json.loads(row[0])
+
+    def get_file(self, base_sha: str, head_sha: str, path: str) -> Optional[FileDiff]:
+        """Hunks of one file of a cached diff, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, content, truncated FROM diff_files"
+                " WHERE base_sha = ? AND head_sha = ? AND path = ?",
+                (base_sha, head_sha, path),
+            ).fetchone()
+        if row is None:
+            return None
+        return FileDiff(path=path, status=row[0], content=row[1], truncated=bool(row[2]))
+
+    def put(self, base_sha: str, head_sha: str, stats: DiffStats) -> None:
+        """Store a captured diff: the summary without content plus one row per file."""
+        summary = stats.model_dump()
+        for file_diff in summary["file_diffs"]:
+            file_diff["content"] = ""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO diff_summaries (base_sha, head_sha, stats, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (base_sha, head_sha, json.dumps(summary), time.time()),
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO diff_files (base_sha, head_sha, path, status, content, truncated)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (base_sha, head_sha, fd.path, fd.status, fd.content, int(fd.truncated))
+                    for fd in stats.file_diffs
+                ],
+            )
+            self._evict()
+            self._db.commit()
+
+    def put_file(self, base_sha: str, head_sha: str, file_diff: FileDiff) -> bool:
+        """
+        Store the hunks of a single file loaded outside a full capture.
+
+        Only for ranges with a cached summary: rows of other ranges would
+        never be evicted. Returns whether the file was stored.
+        """
+        with self._lock:
+            exists = self._db.execute(
+                "SELECT 1 FROM diff_summaries WHERE base_sha = ? AND head_sha = ?",
+                (base_sha, head_sha),
+            ).fetchone()
+            if exists is None:
+                return False
+            self._db.execute(
+                "INSERT OR REPLACE INTO diff_files (base_sha, head_sha, path, status, content, truncated)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (base_sha, head_sha, file_diff.path, file_diff.status, file_diff.content, int(file_diff.truncated)),
+            )
+            self._db.commit()
+        return True
+
+    def pin(self, card_id: str, base_sha: str, head_sha: str) -> None:
+        """Keep the card's captured range out of eviction (replaces its previous pin)."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO diff_pins (card_id, base_sha, head_sha) VALUES (?, ?, ?)",
+                (card_id, base_sha, head_sha),
+            )
+            self._evict()
+            self._db.commit()
+
+    def unpin(self, card_id: str) -> None:
+        """Release the card's range (card deleted); it becomes evictable again."""
+        with self._lock:
+            self._db.execute("DELETE FROM diff_pins WHERE card_id = ?", (card_id,))
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        """Drop the least recently read unpinned diffs beyond max_entries (lock held)."""
+        stale = self._db.execute(
+            "SELECT base_sha, head_sha FROM diff_summaries s WHERE NOT EXISTS ("
+            " SELECT 1 FROM diff_pins p WHERE p.base_sha = s.base_sha AND p.head_sha = s.head_sha)"
+            " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?",
+            (self.max_entries,),
+        ).fetchall()
+        for base_sha, head_sha in stale:
+            self._db.execute(
+                "DELETE FROM diff_summaries WHERE base_sha = ? AND head_sha = ?", (base_sha, head_sha)
+            )
+            self._db.execute(
+                "DELETE FROM diff_files WHERE base_sha = ? AND head_sha = ?", (base_sha, head_sha)
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM diff_summaries").fetchone()[0]
+            pinned = self._db.execute("SELECT COUNT(*) FROM diff_pins").fetchone()[0]
+        return {"entries": entries, "pinned": pinned, "hits": self.hits, "misses": self.misses}
+
+
+@lru_cache
+def get_diff_cache() -> DiffCache:
+    """Get cached diff cache instance."""
+    return DiffCache(get_settings().diff_cache_path or None)
@@ -0,0 +1,125 @@
+"""Content-addressed cache for embedding vectors.
+
+Vectors are keyed by sha256(model name, text), so the same text embedded by
+the same model is never encoded twice. A bounded in-memory LRU sits in front
+of an optional SQLite blob table (float32 bytes) that survives restarts.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Thread-safe LRU + on-disk cache of embedding vectors."""
+
+    def __init__(self, model_name: str, max_entries: int = 1024, path: Optional[str] = None):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache disabled ({path}): {e}")
+                self._db = None
+
+    def key(self, text: str) -> str:
+        """Content address of a text for the current model."""
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str, memory_only: bool = False) -> Optional[List[float]]:
+        """
+        Look up a vector, promoting disk hits into the LRU.
+
+        Args:
+            text: Embedded text
+            memory_only: Skip the SQLite lookup (safe to call from the event loop)
+
+        Returns:
+            Cached vector, or None on a miss
+        """
+        key = self.key(text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector
+            if memory_only:
+                return None
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    vector = np.frombuffer(row[0], dtype=np.float32).tolist()
+                    self._remember(key, vector)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return vector
+
+            self.misses += 1
+            return None
+
+    def put(self, text: str, vector: List[float]) -> None:
+        """Store a freshly computed vector in memory and on disk."""
+        self.put_many([text], [vector])
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]) -> None:
+        """Store several vectors in a single disk transaction."""
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                self._remember(key, vector)
+                rows.append((key, self.model_name, np.asarray(vector, dtype=np.float32).tobytes()))
+
+            if self._db is not None and rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, model, vector) VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, object]:
+        """Hit/miss counters for the stats endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "model": self.model_name,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "persistent": self._db is not None,
+            }
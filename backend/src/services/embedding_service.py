@@ -1,9 +1,13 @@
 """Embedding service using sentence-transformers for vector generation."""
 
+import asyncio
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from functools import lru_cache
 
+from .embedding_cache import EmbeddingCache
+
 logger = logging.getLogger(__name__)
 
 # Lazy loading to avoid importing heavy model at startup
@@ -25,10 +29,32 @@ def _get_model():
 
 
 class EmbeddingService:
-    """Service for generating text embeddings."""
+    """
+    Service for generating text embeddings.
+
+    `encode` is CPU-bound and synchronous: async code must use the
+    `*_async` methods, which run it on a dedicated thread pool (torch
+    releases the GIL while encoding) so the event loop keeps serving
+    WebSockets and HTTP requests.
+
+    Vectors go through a content-addressed cache, so repeated texts (the
+    same active goal queried every cycle) never reach the transformer.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache: Optional[EmbeddingCache] = None):
+        from ..config.qdrant import get_qdrant_settings
 
-    def __init__(self):
+        settings = get_qdrant_settings()
         self._model = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.embedding_workers,
+            thread_name_prefix="embedding",
+        )
+        self._cache = cache or EmbeddingCache(
+            model_name=settings.embedding_model,
+            max_entries=settings.embedding_cache_size,
+            path=settings.embedding_cache_path or None,
+        )
 
     @property
     def model(self):
@@ -37,6 +63,11 @@ class EmbeddingService:
             self._model = _get_model()
         return self._model
 
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the model is in memory (encoding will not stall on a load)."""
+        return self._model is not None or _model is not None
+
     def embed_text(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
@@ -47,8 +78,13 @@ class EmbeddingService:
         Returns:
             List of floats representing the embedding vector
         """
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached
+
+        embedding = self.model.encode(text, convert_to_numpy=True).tolist()
+        self._cache.put(text, embedding)
+        return embedding
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """
@@ -60,8 +96,44 @@ class EmbeddingService:
         Returns:
             List of embedding vectors
         """
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
-        return embeddings.tolist()
+        results: List[Optional[List[float]]] = [self._cache.get(text) for text in texts]
+        missing = [i for i, vector in enumerate(results) if vector is None]
+
+        if missing:
+            # Only cache misses reach the model, in a single batch
+            missing_texts = [texts[i] for i in missing]
+            embeddings = self.model.encode(missing_texts, convert_to_numpy=True).tolist()
+            self._cache.put_many(missing_texts, embeddings)
+            for i, embedding in zip(missing, embeddings):
+                results[i] = embedding
+
+        return results
+
+    async def embed_text_async(self, text: str) -> List[float]:
+        """Awaitable embed_text, executed off the event loop."""
+        cached = self._cache.get(text, memory_only=True)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.embed_text, text)
+
+    async def embed_texts_async(self, texts: List[str]) -> List[List[float]]:
+        """Awaitable embed_texts, executed off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.embed_texts, texts)
+
+    async def warm_up(self) -> None:
+        """Load the model and run a dummy encode on the embedding thread."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self._executor,
+            lambda: self.model.encode("warm-up", convert_to_numpy=True),
+        )
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of the embedding cache."""
+        return self._cache.stats()
 
     def get_vector_size(self) -> int:
         """Get the dimension of embedding vectors."""
@@ -0,0 +1,181 @@
+"""Writer assíncrono e bufferizado para logs de execução.
+
+Cada execução ganha um sink próprio que atribui o `sequence` em memória e
+agrupa as entradas em INSERTs multi-row. O buffer é descarregado quando atinge
+`batch_size` entradas, após `flush_interval` segundos ou quando a execução
+termina/é cancelada, trocando um COMMIT por log por um COMMIT por lote.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from ..config.settings import get_settings
+from ..models.execution import ExecutionLog
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionLogWriter:
+    """Sink de logs de uma única execução."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        execution_id: str,
+        card_id: Optional[str],
+        last_sequence: int = 0,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        settings = get_settings()
+        self.engine = engine
+        self.execution_id = execution_id
+        self.card_id = card_id
+        self.batch_size = batch_size or settings.execution_log_batch_size
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else settings.execution_log_flush_interval_ms / 1000
+        )
+
+        self._sequence = last_sequence
+        self._buffer: List[Dict[str, Any]] = []
+        self._in_flight: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        # True enquanto o timer já saiu do sleep e está persistindo
+        self._timer_flushing = False
+
+    @property
+    def last_sequence(self) -> int:
+        """Último sequence atribuído (persistido ou não)."""
+        return self._sequence
+
+    @property
+    def pending(self) -> int:
+        """Quantidade de entradas ainda não persistidas."""
+        return len(self._buffer)
+
+    def pending_entries(self, after_sequence: int = 0) -> List[Dict[str, Any]]:
+        """Entradas ainda não confirmadas no banco (lote em voo + buffer)."""
+        return [
+            entry for entry in self._in_flight + self._buffer
+            if entry["sequence"] > after_sequence
+        ]
+
+    async def add(self, log_type: str, content: str) -> Dict[str, Any]:
+        """Enfileira um log e retorna a entrada com o sequence atribuído."""
+        self._sequence += 1
+        entry = {
+            "id": str(uuid.uuid4()),
+            "execution_id": self.execution_id,
+            "type": log_type,
+            "content": content,
+            "sequence": self._sequence,
+            "timestamp": datetime.utcnow(),
+        }
+        self._buffer.append(entry)
+
+        if len(self._buffer) >= self.batch_size:
+            # shield: um cancelamento do chamador não pode perder o lote em voo
+            await asyncio.shield(self.flush())
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+        return entry
+
+    async def _flush_later(self) -> None:
+        """Descarrega o buffer após o intervalo (repete se chegaram logs durante o flush)."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self._timer_flushing = True
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Erro ao persistir logs de %s: %s", self.execution_id[:8], e)
+                return
+            finally:
+                self._timer_flushing = False
+            if not self._buffer:
+                return
+
+    async def flush(self) -> int:
+        """Persiste as entradas pendentes em um único INSERT multi-row."""
+        async with self._lock:
+            if not self._buffer:
+                return 0
+
+            rows, self._buffer = self._buffer, []
+            self._in_flight = rows
+            committed = False
+            try:
+                await self._insert(rows)
+                committed = True
+            except BaseException:
+                # Devolve o lote à frente do buffer (ordem preservada), mas só se
+                # o COMMIT não aconteceu: reinserir duplicaria as chaves
+                if not committed:
+                    self._buffer[:0] = rows
+                raise
+            finally:
+                self._in_flight = []
+
+        return len(rows)
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        async with AsyncSession(self.engine) as session:
+            await session.execute(insert(ExecutionLog).values(rows))
+            await session.commit()
+
+    async def close(self) -> None:
+        """Encerra o timer pendente e descarrega o que restou no buffer."""
+        timer, self._timer = self._timer, None
+        if timer and not timer.done():
+            if self._timer_flushing:
+                # Flush em curso: cancelar no meio do COMMIT poderia devolver ao
+                # buffer um lote já gravado; espera ele terminar
+                await timer
+            else:
+                timer.cancel()
+        await asyncio.shield(self.flush())
+
+
+# Writers abertos, indexados por execution_id
+_writers: Dict[str, ExecutionLogWriter] = {}
+
+
+def get_log_writer(execution_id: str) -> Optional[ExecutionLogWriter]:
+    """Retorna o writer aberto de uma execução, se houver."""
+    return _writers.get(execution_id)
+
+
+def open_log_writer(
+    engine: AsyncEngine,
+    execution_id: str,
+    card_id: Optional[str],
+    last_sequence: int = 0,
+) -> ExecutionLogWriter:
+    """Registra (ou reaproveita) o writer de uma execução."""
+    writer = _writers.get(execution_id)
+    if writer is None:
+        writer = ExecutionLogWriter(engine, execution_id, card_id, last_sequence)
+        _writers[execution_id] = writer
+    return writer
+
+
+async def close_log_writer(execution_id: str) -> None:
+    """Descarrega e remove o writer de uma execução (conclusão/cancelamento)."""
+    writer = _writers.get(execution_id)
+    if writer is None:
+        return
+    # Continua registrado durante o flush final: o replay por sequence ainda
+    # enxerga o lote em voo, e só sai do registro depois de persistido
+    await writer.close()
+    if _writers.get(execution_id) is writer:
+        del _writers[execution_id]
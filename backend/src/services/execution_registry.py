@@ -0,0 +1,97 @@
+"""Registro em memória das execuções do agent (fallback sem banco).
+
+Cada record guarda só as últimas linhas, entre `max_log_lines` e o dobro
+(o corte é feito em bloco; o histórico completo fica em execution_logs) e records concluídos são removidos após
+`grace_seconds`, para que o processo não cresça com o total de execuções
+e tokens já transmitidos.
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from ..config.settings import get_settings
+from ..execution import ExecutionLog, ExecutionRecord, ExecutionStatus
+
+
+class ExecutionRegistry:
+    """Mapa card_id -> ExecutionRecord com ring buffer de logs e expiração."""
+
+    def __init__(self, max_log_lines: Optional[int] = None, grace_seconds: Optional[float] = None):
+        settings = get_settings()
+        self.max_log_lines = max_log_lines or settings.execution_memory_log_lines
+        self.grace_seconds = (
+            grace_seconds if grace_seconds is not None else settings.execution_memory_grace_seconds
+        )
+        self._records: Dict[str, ExecutionRecord] = {}
+        # Instante (monotonic) em que cada record foi visto concluído
+        self._completed_at: Dict[str, float] = {}
+
+    def __setitem__(self, card_id: str, record: ExecutionRecord) -> None:
+        self.evict_completed()
+        self._completed_at.pop(card_id, None)
+        if len(record.logs) > self.max_log_lines:
+            record.dropped_logs += len(record.logs) - self.max_log_lines
+            del record.logs[: len(record.logs) - self.max_log_lines]
+        self._records[card_id] = record
+
+    def __getitem__(self, card_id: str) -> ExecutionRecord:
+        return self._records[card_id]
+
+    def __contains__(self, card_id: object) -> bool:
+        return card_id in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def get(self, card_id: str) -> Optional[ExecutionRecord]:
+        self.evict_completed()
+        return self._records.get(card_id)
+
+    def values(self) -> List[ExecutionRecord]:
+        self.evict_completed()
+        return list(self._records.values())
+
+    def pop(self, card_id: str, default: Optional[ExecutionRecord] = None) -> Optional[ExecutionRecord]:
+        self._completed_at.pop(card_id, None)
+        return self._records.pop(card_id, default)
+
+    def append_log(self, record: ExecutionRecord, log: ExecutionLog) -> None:
+        """Adiciona log ao record descartando as linhas mais antigas."""
+        record.logs.append(log)
+        # Corte em bloco ao atingir o dobro do limite: O(1) amortizado por linha
+        # (remover a primeira linha a cada append copia a lista inteira)
+        if len(record.logs) > 2 * self.max_log_lines:
+            excess = len(record.logs) - self.max_log_lines
+            del record.logs[:excess]
+            record.dropped_logs += excess
+
+    def _finished_at(self, card_id: str, record: ExecutionRecord, now: float) -> float:
+        """Conclusão em tempo monotonic (completed_at do record ou 1ª vez visto concluído)."""
+        if card_id not in self._completed_at:
+            finished = now
+            if record.completed_at:
+                try:
+                    elapsed = (datetime.now() - datetime.fromisoformat(record.completed_at)).total_seconds()
+                    finished = now - max(elapsed, 0.0)
+                except ValueError:
+                    pass
+            self._completed_at[card_id] = finished
+        return self._completed_at[card_id]
+
+    def evict_completed(self) -> int:
+        """Remove records concluídos há mais de `grace_seconds`."""
+        now = time.monotonic()
+        expired = []
+        for card_id, record in self._records.items():
+            if record.status == ExecutionStatus.RUNNING:
+                self._completed_at.pop(card_id, None)
+            elif now - self._finished_at(card_id, record, now) >= self.grace_seconds:
+                expired.append(card_id)
+
+        for card_id in expired:
+            self.pop(card_id)
+        return len(expired)
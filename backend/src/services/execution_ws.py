@@ -1,13 +1,26 @@
 """WebSocket manager para notificacoes de execucao em tempo real"""
-from typing import Dict, Set
+import asyncio
+from typing import Dict, List, Optional, Set
 from fastapi import WebSocket
 import json
 from datetime import datetime
 
+from ..config.settings import get_settings
+
 
 class ExecutionWebSocketManager:
-    def __init__(self):
+    def __init__(self, batch_interval: Optional[float] = None):
         self.connections: Dict[str, Set[WebSocket]] = {}
+        self.batch_interval = (
+            batch_interval
+            if batch_interval is not None
+            else get_settings().execution_ws_batch_interval_ms / 1000
+        )
+        # Logs aguardando o próximo frame, por card
+        self._pending_logs: Dict[str, List[dict]] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        # Acorda o flush antes do fim da janela (conclusão da execução)
+        self._flush_wakeups: Dict[str, asyncio.Event] = {}
 
     async def connect(self, card_id: str, websocket: WebSocket):
         await websocket.accept()
@@ -18,23 +31,89 @@ class ExecutionWebSocketManager:
     def disconnect(self, card_id: str, websocket: WebSocket):
         if card_id in self.connections:
             self.connections[card_id].discard(websocket)
+            if not self.connections[card_id]:
+                del self.connections[card_id]
+
+    def has_subscribers(self, card_id: str) -> bool:
+        return bool(self.connections.get(card_id))
 
     async def broadcast(self, card_id: str, message: dict):
         if card_id not in self.connections:
             return
 
+        # Serializa uma única vez para todos os clientes do card
+        payload = json.dumps(message)
         dead = set()
-        for ws in self.connections[card_id]:
+        for ws in list(self.connections[card_id]):
             try:
-                await ws.send_text(json.dumps(message))
+                await ws.send_text(payload)
             except:
                 dead.add(ws)
 
         for ws in dead:
-            self.connections[card_id].discard(ws)
+            self.disconnect(card_id, ws)
+
+    def queue_log(self, card_id: str, execution_id: str, log: dict):
+        """
+        Enfileira um log para o próximo frame `log_batch` do card.
+
+        Não bloqueia o chamador: os logs acumulados durante `batch_interval`
+        são enviados juntos. Sem assinantes, o log é descartado (o cliente
+        recupera o histórico via replay por sequence ao conectar).
+        """
+        if not self.has_subscribers(card_id):
+            return
+
+        self._pending_logs.setdefault(card_id, []).append({**log, "executionId": execution_id})
+
+        task = self._flush_tasks.get(card_id)
+        if task is None or task.done():
+            wakeup = self._flush_wakeups[card_id] = asyncio.Event()
+            self._flush_tasks[card_id] = asyncio.get_running_loop().create_task(
+                self._flush_later(card_id, wakeup)
+            )
+
+    async def _flush_later(self, card_id: str, wakeup: asyncio.Event):
+        # Logs enfileirados durante o broadcast não rearmam a task (ela ainda
+        # não terminou), então repete até não sobrar nada pendente
+        while self._pending_logs.get(card_id):
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.batch_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush_logs(card_id)
+        if self._flush_wakeups.get(card_id) is wakeup:
+            del self._flush_wakeups[card_id]
+
+    async def flush_logs(self, card_id: str):
+        """Envia imediatamente os logs pendentes do card em um único frame."""
+        pending = self._pending_logs.pop(card_id, None)
+        if not pending:
+            return
+
+        # Um frame por execução, mantendo a ordem de chegada
+        batches: Dict[str, List[dict]] = {}
+        for log in pending:
+            batches.setdefault(log.pop("executionId"), []).append(log)
+
+        for execution_id, logs in batches.items():
+            await self.broadcast(card_id, {
+                "type": "log_batch",
+                "cardId": card_id,
+                "executionId": execution_id,
+                "logs": logs,
+                "lastSequence": logs[-1]["sequence"],
+            })
 
     async def notify_complete(self, card_id: str, status: str, command: str,
                               token_stats: dict = None, cost_stats: dict = None, error: str = None):
+        # Os logs finais precisam chegar antes do evento de conclusão
+        task = self._flush_tasks.pop(card_id, None)
+        if task and not task.done():
+            self._flush_wakeups[card_id].set()
+            await task
+        await self.flush_logs(card_id)
+
         await self.broadcast(card_id, {
             "type": "execution_complete",
             "cardId": card_id,
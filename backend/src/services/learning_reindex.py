@@ -0,0 +1,371 @@
+"""Bulk re-embedding of the learnings collection.
+
+Used after switching `embedding_model` (or importing learnings produced by
+another model): payloads are streamed from the vector store with scroll,
+re-encoded in large `embed_texts` batches and upserted in chunks into a
+target store. The upsert of one batch overlaps with encoding the next, and a
+checkpoint with the scroll offset is written after every batch so an
+interrupted run resumes where it stopped.
+
+The background run (`start_reindex`) writes into a separate collection sized
+for the new model and swaps it into QdrantService once complete, so searches
+keep using the old vectors meanwhile and a dimension change never hits the
+live collection. Learnings written or deleted during the run are carried
+over before the swap (catch-up by ID, then the service's change log), and
+the swapped-in collection is recorded in `reindex_active_store_path` so it
+is still used after a restart.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config.qdrant import QdrantSettings, get_qdrant_settings
+from .embedding_service import EmbeddingService, get_embedding_service
+from .qdrant_service import learning_text
+from .vector_store import VectorPoint, VectorStore, create_vector_store
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReindexProgress:
+    """State of a re-embedding run (also the checkpoint contents)."""
+    model: str
+    target: Optional[str] = None
+    processed: int = 0
+    total: Optional[int] = None
+    offset: Any = None
+    running: bool = False
+    completed: bool = False
+    error: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def load_checkpoint(path: Path) -> Optional[ReindexProgress]:
+    """Read a reindex checkpoint; None if missing or unreadable."""
+    try:
+        return ReindexProgress(**json.loads(Path(path).read_text()))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def store_label(store: VectorStore) -> str:
+    """Collection name (Qdrant) or directory (local) identifying a store."""
+    name = getattr(store, "collection_name", None)
+    return name if name else str(getattr(store, "path", store.backend))
+
+
+class LearningReindexer:
+    """Re-embeds every point of a vector store with the current model."""
+
+    def __init__(
+        self,
+        store: VectorStore,
+        embedding_service: Optional[EmbeddingService] = None,
+        target: Optional[VectorStore] = None,
+        checkpoint_path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        upsert_chunk: Optional[int] = None,
+        on_progress: Optional[Callable[[ReindexProgress], None]] = None,
+    ):
+        """
+        Args:
+            store: Store to read payloads from
+            embedding_service: Encoder (defaults to the shared service)
+            target: Store to write to; defaults to `store` (in place). Use a
+                separate collection when the new model changes the dimension.
+            checkpoint_path: JSON checkpoint for resuming
+            batch_size: Payloads scrolled and encoded per batch
+            upsert_chunk: Points per upsert request
+            on_progress: Called after every committed batch
+        """
+        settings = get_qdrant_settings()
+        self.store = store
+        self.target = target or store
+        self.embedding_service = embedding_service or get_embedding_service()
+        self.checkpoint_path = Path(checkpoint_path or settings.reindex_checkpoint_path)
+        self.batch_size = batch_size or settings.reindex_batch_size
+        self.upsert_chunk = upsert_chunk or settings.reindex_upsert_chunk
+        self.on_progress = on_progress
+        self.progress = ReindexProgress(model=settings.embedding_model, target=store_label(self.target))
+
+    async def _embed(self, points: List[VectorPoint]) -> List[VectorPoint]:
+        vectors = await self.embedding_service.embed_texts_async([
+            learning_text(p.payload.get("goal_description", ""), p.payload.get("learning", ""))
+            for p in points
+        ])
+        return [VectorPoint(id=p.id, vector=vector, payload=p.payload) for p, vector in zip(points, vectors)]
+
+    async def _scroll_all(self, store: VectorStore) -> List[VectorPoint]:
+        points: List[VectorPoint] = []
+        offset = None
+        while True:
+            page, offset = await store.scroll(self.batch_size, offset)
+            points.extend(page)
+            if offset is None:
+                return points
+
+    async def catch_up(self) -> int:
+        """
+        Align the target with the source before a swap.
+
+        Learnings added to the source during the run (their IDs may sort
+        behind the scroll cursor, or the run may have been interrupted) are
+        embedded and copied; learnings deleted meanwhile are removed.
+
+        Returns:
+            Points copied plus points removed
+        """
+        target_ids = {point.id for point in await self._scroll_all(self.target)}
+        source = await self._scroll_all(self.store)
+        missing = [point for point in source if point.id not in target_ids]
+        stale = list(target_ids - {point.id for point in source})
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = await self._embed(missing[start:start + self.batch_size])
+            for chunk in range(0, len(batch), self.upsert_chunk):
+                await self.target.upsert(batch[chunk:chunk + self.upsert_chunk])
+        if stale:
+            await self.target.delete(stale)
+        return len(missing) + len(stale)
+
+    def _save_checkpoint(self) -> None:
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.progress.to_dict()))
+        tmp.replace(self.checkpoint_path)
+
+    async def _write_batch(self, points: List[VectorPoint], next_offset: Any) -> None:
+        for start in range(0, len(points), self.upsert_chunk):
+            await self.target.upsert(points[start:start + self.upsert_chunk])
+
+        self.progress.processed += len(points)
+        self.progress.offset = next_offset
+        self._save_checkpoint()
+        logger.info(
+            f"[Reindex] {self.progress.processed}"
+            f"/{self.progress.total if self.progress.total is not None else '?'} learnings re-embedded"
+        )
+        if self.on_progress:
+            self.on_progress(self.progress)
+
+    async def run(self, resume: bool = True) -> ReindexProgress:
+        """
+        Re-embed the whole collection.
+
+        Args:
+            resume: Continue from the checkpoint of an unfinished run with the
+                same model and target instead of starting over
+
+        Returns:
+            Final progress (completed, or with error set)
+        """
+        checkpoint = load_checkpoint(self.checkpoint_path) if resume else None
+        if (
+            checkpoint
+            and checkpoint.model == self.progress.model
+            and checkpoint.target == self.progress.target
+            and not checkpoint.completed
+        ):
+            self.progress = checkpoint
+            logger.info(f"[Reindex] Resuming after {checkpoint.processed} learnings")
+        else:
+            self.progress = ReindexProgress(model=self.progress.model, target=self.progress.target)
+
+        self.progress.running = True
+        self.progress.error = None
+        self.progress.started_at = self.progress.started_at or datetime.utcnow().isoformat()
+        try:
+            self.progress.total = (await self.store.stats()).get("points_count")
+        except Exception:
+            self.progress.total = None
+
+        offset = self.progress.offset
+        pending: Optional[asyncio.Task] = None
+        try:
+            while True:
+                points, next_offset = await self.store.scroll(self.batch_size, offset)
+                if points:
+                    batch = await self._embed(points)
+                    # Previous batch must land first so checkpoints stay in order
+                    if pending:
+                        await pending
+                    pending = asyncio.create_task(self._write_batch(batch, next_offset))
+
+                if next_offset is None:
+                    break
+                offset = next_offset
+
+            if pending:
+                await pending
+            self.progress.completed = True
+        except Exception as e:
+            if pending and not pending.done():
+                pending.cancel()
+            self.progress.error = str(e)
+            logger.error(f"[Reindex] Stopped after {self.progress.processed} learnings: {e}")
+        finally:
+            self.progress.running = False
+            self.progress.finished_at = datetime.utcnow().isoformat()
+            self._save_checkpoint()
+
+        return self.progress
+
+
+_reindexer: Optional[LearningReindexer] = None
+_reindex_task: Optional[asyncio.Task] = None
+
+
+def get_reindex_progress() -> Optional[Dict[str, Any]]:
+    """Progress of the current (or last) run, falling back to the checkpoint."""
+    if _reindexer is not None:
+        return _reindexer.progress.to_dict()
+    saved = load_checkpoint(Path(get_qdrant_settings().reindex_checkpoint_path))
+    return saved.to_dict() if saved else None
+
+
+def _store_settings(settings: QdrantSettings, name: str, vector_size: int) -> QdrantSettings:
+    """Settings for collection (or local store directory) `name` of `vector_size`."""
+    return settings.model_copy(update={
+        "collection_name": name,
+        "local_store_path": str(Path(settings.local_store_path).with_name(name)),
+        "vector_size": vector_size,
+    })
+
+
+def active_store_settings(settings: Optional[QdrantSettings] = None) -> QdrantSettings:
+    """
+    Settings of the store learnings are served from: the collection swapped
+    in by the last completed reindex, if it was built with the current
+    `embedding_model`, else the configured one.
+    """
+    settings = settings or get_qdrant_settings()
+    try:
+        active = json.loads(Path(settings.reindex_active_store_path).read_text())
+    except (OSError, ValueError):
+        return settings
+    if active.get("model") != settings.embedding_model:
+        logger.warning(
+            f"[Reindex] Ignoring swapped-in collection '{active.get('collection')}': built with "
+            f"{active.get('model')}, current model is {settings.embedding_model}"
+        )
+        return settings
+    return _store_settings(settings, active["collection"], active["vector_size"])
+
+
+def _save_active_store(name: str, vector_size: int, model: str) -> None:
+    path = Path(get_qdrant_settings().reindex_active_store_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"collection": name, "vector_size": vector_size, "model": model}))
+    tmp.replace(path)
+
+
+def create_reindex_target(
+    live: VectorStore,
+    target_collection: Optional[str] = None,
+    vector_size: Optional[int] = None,
+    checkpoint: Optional[ReindexProgress] = None,
+) -> Optional[VectorStore]:
+    """
+    Store a background run writes into.
+
+    Args:
+        live: Store learnings are currently served from
+        target_collection: Collection (or, for the local backend, directory
+            next to `local_store_path`) to fill; defaults to the target of an
+            unfinished checkpoint, else a new `<collection>_<timestamp>` one
+        vector_size: Dimension of the new model (defaults to the live one)
+        checkpoint: Checkpoint of the run being resumed
+
+    Returns:
+        The new store, or None to re-embed the live collection in place
+
+    Raises:
+        ValueError: In-place target with a different vector size
+    """
+    settings = active_store_settings()
+    vector_size = vector_size or settings.vector_size
+
+    if target_collection is None and checkpoint and not checkpoint.completed and checkpoint.target:
+        target_collection = Path(checkpoint.target).name
+    if target_collection is None:
+        target_collection = f"{get_qdrant_settings().collection_name}_{datetime.utcnow():%Y%m%d%H%M%S}"
+
+    if target_collection == Path(store_label(live)).name:
+        if vector_size != settings.vector_size:
+            raise ValueError("Re-embedding in place needs the same vector size; choose another target collection")
+        return None
+
+    return create_vector_store(_store_settings(settings, target_collection, vector_size))
+
+
+async def _run_and_swap(reindexer: LearningReindexer, resume: bool, vector_size: int) -> ReindexProgress:
+    """Run the reindex and, for a separate target, catch it up and serve from it."""
+    from .qdrant_service import get_qdrant_service
+
+    service = get_qdrant_service()
+    try:
+        progress = await reindexer.run(resume=resume)
+        if not progress.completed or reindexer.target is reindexer.store:
+            return progress
+        try:
+            synced = await reindexer.catch_up()
+            await service.swap_store(reindexer.target)
+        except Exception as e:
+            progress.completed = False
+            progress.error = f"Swap failed: {e}"
+            logger.error(f"[Reindex] Could not swap in '{progress.target}': {e}")
+            return progress
+        _save_active_store(Path(progress.target).name, vector_size, progress.model)
+        logger.info(f"[Reindex] Now serving learnings from '{progress.target}' ({synced} caught up)")
+        return progress
+    finally:
+        service.record_changes(False)
+
+
+def start_reindex(
+    resume: bool = True,
+    target_collection: Optional[str] = None,
+    vector_size: Optional[int] = None,
+) -> ReindexProgress:
+    """
+    Start re-embedding the learnings collection in the background.
+
+    Args:
+        resume: Continue an unfinished run with the same model and target
+        target_collection: Collection to fill and swap in (see
+            create_reindex_target); the live collection name re-embeds in place
+        vector_size: Dimension of the new model
+
+    Raises:
+        RuntimeError: If a run is already in progress
+        ValueError: In-place target with a different vector size
+    """
+    global _reindexer, _reindex_task
+    from .qdrant_service import get_qdrant_service
+
+    if _reindex_task is not None and not _reindex_task.done():
+        raise RuntimeError("Re-embedding already in progress")
+
+    service = get_qdrant_service()
+    checkpoint = load_checkpoint(Path(get_qdrant_settings().reindex_checkpoint_path)) if resume else None
+    target = create_reindex_target(service.store, target_collection, vector_size, checkpoint)
+    if target is not None:
+        # Writes from now on are replayed into the target before the swap
+        service.record_changes()
+    _reindexer = LearningReindexer(service.store, target=target)
+    _reindexer.progress.running = True
+    _reindex_task = asyncio.get_running_loop().create_task(
+        _run_and_swap(_reindexer, resume, vector_size or active_store_settings().vector_size)
+    )
+    return _reindexer.progress
@@ -0,0 +1,193 @@
+"""BM25 inverted index over learning payloads.
+
+Embeddings blur exact identifiers (file names, card titles) that goal
+descriptions often share, so learnings are also indexed lexically. The
+index is updated incrementally as learnings are stored and persisted in a
+small SQLite table, which also lets it answer on its own (keyword fast path)
+while the embedding model is cold or the vector backend is down.
+
+The `*_async` methods run the same operations (SQLite writes, scoring) in a
+worker thread, for callers on the event loop.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..config.qdrant import get_qdrant_settings
+
+logger = logging.getLogger(__name__)
+
+# Whole identifiers (auth_service.py, card-123) plus their parts
+_TOKEN_RE = re.compile(r"[\w][\w./-]*[\w]|\w", re.UNICODE)
+_SPLIT_RE = re.compile(r"[./_-]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased tokens; compound identifiers also yield their parts."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        tokens.append(token)
+        parts = [p for p in _SPLIT_RE.split(token) if p]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked ID lists: score(d) = sum(1 / (k + rank_i(d))).
+
+    Returns:
+        (id, fused score) best first
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class LexicalIndex:
+    """Thread-safe incremental BM25 index with SQLite persistence."""
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._doc_terms: Dict[str, Counter] = {}
+        self._lengths: Dict[str, int] = {}
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._total_length = 0
+        self._db: Optional[sqlite3.Connection] = None
+
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS learning_docs ("
+                "id TEXT PRIMARY KEY, text TEXT NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._db.commit()
+            for doc_id, text, payload in self._db.execute("SELECT id, text, payload FROM learning_docs"):
+                self._index(doc_id, text, json.loads(payload))
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def _index(self, doc_id: str, text: str, payload: Dict[str, Any]) -> None:
+        self._unindex(doc_id)
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self._postings[term][doc_id] = tf
+        self._doc_terms[doc_id] = terms
+        self._payloads[doc_id] = payload
+        self._lengths[doc_id] = sum(terms.values())
+        self._total_length += self._lengths[doc_id]
+
+    def _unindex(self, doc_id: str) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+        self._payloads.pop(doc_id, None)
+        self._total_length -= self._lengths.pop(doc_id)
+
+    def add_many(self, docs: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Index (id, text, payload) documents, replacing existing IDs."""
+        docs = list(docs)
+        with self._lock:
+            for doc_id, text, payload in docs:
+                self._index(doc_id, text, payload)
+            if self._db is not None and docs:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO learning_docs (id, text, payload) VALUES (?, ?, ?)",
+                    [(doc_id, text, json.dumps(payload)) for doc_id, text, payload in docs],
+                )
+                self._db.commit()
+
+    def add(self, doc_id: str, text: str, payload: Dict[str, Any]) -> None:
+        self.add_many([(doc_id, text, payload)])
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            self._unindex(doc_id)
+            if self._db is not None:
+                self._db.execute("DELETE FROM learning_docs WHERE id = ?", (doc_id,))
+                self._db.commit()
+
+    async def add_many_async(self, docs: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Awaitable add_many, executed off the event loop."""
+        await asyncio.to_thread(self.add_many, list(docs))
+
+    async def add_async(self, doc_id: str, text: str, payload: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.add, doc_id, text, payload)
+
+    async def remove_async(self, doc_id: str) -> None:
+        await asyncio.to_thread(self.remove, doc_id)
+
+    def payload(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        return self._payloads.get(doc_id)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        payload_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        BM25 ranking of the documents sharing at least one query term.
+
+        Returns:
+            (id, bm25 score) best first
+        """
+        with self._lock:
+            n_docs = len(self._doc_terms)
+            if not n_docs:
+                return []
+            avg_length = self._total_length / n_docs
+            scores: Dict[str, float] = defaultdict(float)
+
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / norm
+
+            if payload_filter:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if all(self._payloads[doc_id].get(k) == v for k, v in payload_filter.items())
+                }
+            return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    async def search_async(
+        self,
+        query: str,
+        limit: int,
+        payload_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Awaitable search, executed off the event loop."""
+        return await asyncio.to_thread(self.search, query, limit, payload_filter)
+
+
+@lru_cache
+def get_lexical_index() -> LexicalIndex:
+    """Get cached lexical index instance."""
+    return LexicalIndex(get_qdrant_settings().lexical_index_path or None)
@@ -2,11 +2,13 @@
 
 import asyncio
 import json
+from collections import deque
 from datetime import datetime
-from typing import Optional, Dict, Any, Set, List
+from typing import Optional, Dict, Any, Deque, Tuple
 from fastapi import WebSocket
 import logging
 
+from ..config.settings import get_settings
 from .presence_service import get_presence_service
 from .voting_service import get_voting_service
 from ..schemas.live import (
@@ -18,6 +20,107 @@ from ..schemas.live import (
 logger = logging.getLogger(__name__)
 
 
+# Frames that only carry the latest state: a queued one is replaced by the newer one
+COALESCED_TYPES = {"presence_update", "status_update", "voting_update"}
+# Frames that may be dropped (oldest first) when a spectator falls behind
+DROPPABLE_TYPES = {"log_entry"}
+
+PONG_FRAME = json.dumps({"type": "pong"})
+
+
+def serialize_message(message: Any) -> str:
+    """Serialize a WS message (schema or dict) to JSON text once."""
+    if hasattr(message, "model_dump_json"):
+        return message.model_dump_json()
+    return json.dumps(message, default=str)
+
+
+class LiveConnection:
+    """
+    One spectator socket with a bounded send queue and a dedicated writer task.
+
+    Broadcasting only enqueues pre-serialized frames, so a slow socket delays
+    nothing but its own queue. When the queue is full the oldest log frame is
+    dropped; state frames (presence/status/votes) are coalesced to the latest.
+    A client whose queue is full of frames that cannot be dropped is closed.
+    """
+
+    def __init__(self, session_id: str, websocket: WebSocket, max_queue: int, on_dead):
+        self.session_id = session_id
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self._on_dead = on_dead
+        self._queue: Deque[Tuple[str, str]] = deque()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._writer())
+
+    async def stop(self) -> None:
+        self.closed = True
+        task, self._task = self._task, None
+        if task is not None and task is not asyncio.current_task() and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def offer(self, msg_type: str, text: str) -> bool:
+        """Queue a frame without blocking; False if the client must be dropped."""
+        if self.closed:
+            return False
+
+        if msg_type in COALESCED_TYPES:
+            for i, (queued_type, _) in enumerate(self._queue):
+                if queued_type == msg_type:
+                    del self._queue[i]
+                    self.coalesced += 1
+                    break
+
+        if len(self._queue) >= self.max_queue:
+            victim = next((i for i, (t, _) in enumerate(self._queue) if t in DROPPABLE_TYPES), None)
+            if victim is not None:
+                del self._queue[victim]
+                self.dropped += 1
+            elif msg_type in DROPPABLE_TYPES:
+                self.dropped += 1
+                return True
+            else:
+                return False
+
+        self._queue.append((msg_type, text))
+        self._ready.set()
+        return True
+
+    async def _writer(self) -> None:
+        try:
+            while True:
+                await self._ready.wait()
+                while self._queue:
+                    _, text = self._queue.popleft()
+                    await self.websocket.send_text(text)
+                    self.sent += 1
+                self._ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Don't log common disconnection errors
+            if "close message" not in str(e).lower():
+                logger.error(f"Error sending to {self.session_id[:8]}...: {e}")
+            self.closed = True
+            await self._on_dead(self.session_id)
+
+
 class LiveBroadcastService:
     """Service to broadcast events to live spectators."""
 
@@ -34,8 +137,9 @@ class LiveBroadcastService:
             return
         self._initialized = True
 
-        # Active WebSocket connections
-        self._connections: Dict[str, WebSocket] = {}
+        # Active spectator connections (socket + send queue + writer task)
+        self._connections: Dict[str, LiveConnection] = {}
+        self._max_queue = get_settings().live_ws_queue_size
 
         # Current AI status
         self._current_status: Dict[str, Any] = {
@@ -46,12 +150,14 @@ class LiveBroadcastService:
         }
 
         # Recent logs (keep last N for new connections)
-        self._recent_logs: List[Dict[str, Any]] = []
-        self._max_recent_logs = 50
+        self._recent_logs: Deque[Dict[str, Any]] = deque(maxlen=50)
 
         # Lock for thread safety
         self._lock = asyncio.Lock()
 
+        # Counters of clients closed for falling behind
+        self._evicted = 0
+
         # Setup callbacks from other services
         self._setup_callbacks()
 
@@ -72,54 +178,52 @@ class LiveBroadcastService:
 
     async def connect(self, session_id: str, websocket: WebSocket) -> None:
         """Register a new WebSocket connection."""
+        connection = LiveConnection(session_id, websocket, self._max_queue, self.disconnect)
         async with self._lock:
-            self._connections[session_id] = websocket
+            self._connections[session_id] = connection
+            connection.start()
             logger.info(f"Live WS connected: {session_id[:8]}... Total: {len(self._connections)}")
 
+        # Send initial state first, through the connection queue (keeps ordering)
+        self._send_initial_state(connection)
+
         # Register with presence service
         presence = get_presence_service()
         await presence.connect(session_id)
 
-        # Send initial state
-        await self._send_initial_state(session_id, websocket)
-
     async def disconnect(self, session_id: str) -> None:
         """Remove a WebSocket connection."""
         async with self._lock:
-            self._connections.pop(session_id, None)
+            connection = self._connections.pop(session_id, None)
+            if connection is None:
+                return
             logger.info(f"Live WS disconnected: {session_id[:8]}... Total: {len(self._connections)}")
+        await connection.stop()
 
         # Unregister from presence service
         presence = get_presence_service()
         await presence.disconnect(session_id)
 
-    async def _send_initial_state(self, session_id: str, websocket: WebSocket) -> None:
-        """Send initial state to a new connection."""
+    def _send_initial_state(self, connection: LiveConnection) -> None:
+        """Queue the initial state for a new connection."""
         try:
-            # Check if still connected
-            if websocket.client_state.name != "CONNECTED":
-                return
-
             presence = get_presence_service()
             voting = get_voting_service()
 
-            # Send presence count
-            await self._send_to_one(websocket, WSPresenceUpdate(
-                spectator_count=presence.count
-            ))
-
-            # Send current status
-            await self._send_to_one(websocket, WSStatusUpdate(
-                is_working=self._current_status["is_working"],
-                current_stage=self._current_status.get("current_stage"),
-                current_card=self._current_status.get("current_card"),
-                progress=self._current_status.get("progress")
-            ))
+            messages = [
+                WSPresenceUpdate(spectator_count=presence.count),
+                WSStatusUpdate(
+                    is_working=self._current_status["is_working"],
+                    current_stage=self._current_status.get("current_stage"),
+                    current_card=self._current_status.get("current_card"),
+                    progress=self._current_status.get("progress")
+                ),
+            ]
 
             # Send voting state if active
             if voting.is_active:
                 state = voting.get_state()
-                await self._send_to_one(websocket, WSVotingStarted(
+                messages.append(WSVotingStarted(
                     round_id=state.round_id,
                     options=state.options,
                     ends_at=state.ends_at,
@@ -127,68 +231,63 @@ class LiveBroadcastService:
                 ))
 
             # Send recent logs
-            for log in self._recent_logs[-20:]:  # Last 20 logs
-                await self._send_to_one(websocket, WSLogEntry(
+            for log in list(self._recent_logs)[-20:]:  # Last 20 logs
+                messages.append(WSLogEntry(
                     content=log["content"],
                     log_type=log.get("log_type"),
                     timestamp=log.get("timestamp", datetime.utcnow())
                 ))
 
-        except Exception as e:
-            logger.error(f"Error sending initial state: {e}")
+            for message in messages:
+                connection.offer(message.type, serialize_message(message))
 
-    async def _send_to_one(self, websocket: WebSocket, message: Any) -> bool:
-        """Send message to a single connection."""
-        try:
-            # Check if websocket is still open
-            if websocket.client_state.name != "CONNECTED":
-                return False
-
-            if hasattr(message, 'model_dump'):
-                data = message.model_dump(mode='json')
-            else:
-                data = message
-            await websocket.send_json(data)
-            return True
         except Exception as e:
-            # Don't log common disconnection errors
-            if "close message" not in str(e).lower():
-                logger.error(f"Error sending to WebSocket: {e}")
-            return False
+            logger.error(f"Error sending initial state: {e}")
 
-    async def broadcast(self, message: Any) -> int:
-        """Broadcast message to all connected spectators."""
-        if hasattr(message, 'model_dump'):
-            data = message.model_dump(mode='json')
-        else:
-            data = message
+    def publish(self, message: Any) -> int:
+        """
+        Fan a message out to every spectator without awaiting any socket.
 
-        sent = 0
-        failed = []
+        The message is serialized once; each connection's writer task sends
+        it. Clients that cannot keep up are disconnected in the background.
 
-        async with self._lock:
-            connections = list(self._connections.items())
+        Returns:
+            Number of connections the frame was queued to
+        """
+        msg_type = message.type if hasattr(message, "type") else message.get("type", "")
+        text = serialize_message(message)
 
-        for session_id, ws in connections:
-            try:
-                # Check if websocket is still connected
-                if ws.client_state.name != "CONNECTED":
-                    failed.append(session_id)
-                    continue
+        queued = 0
+        lagging = []
+        for session_id, connection in list(self._connections.items()):
+            if connection.offer(msg_type, text):
+                queued += 1
+            else:
+                lagging.append(session_id)
 
-                await ws.send_json(data)
-                sent += 1
-            except Exception as e:
-                # Don't spam logs with common disconnection errors
-                if "close message" not in str(e).lower():
-                    logger.error(f"Error broadcasting to {session_id[:8]}...: {e}")
-                failed.append(session_id)
+        for session_id in lagging:
+            self._evicted += 1
+            logger.warning(f"Live WS {session_id[:8]}... too slow, disconnecting")
+            asyncio.get_running_loop().create_task(self.disconnect(session_id))
 
-        # Cleanup failed connections
-        for session_id in failed:
-            await self.disconnect(session_id)
+        return queued
 
-        return sent
+    async def broadcast(self, message: Any) -> int:
+        """Broadcast message to all connected spectators (never waits on sockets)."""
+        return self.publish(message)
+
+    def stats(self) -> Dict[str, Any]:
+        """Fan-out counters (queued frames, drops, coalesced, evicted clients)."""
+        connections = list(self._connections.values())
+        return {
+            "connections": len(connections),
+            "queued": sum(c.pending for c in connections),
+            "maxQueued": max((c.pending for c in connections), default=0),
+            "sent": sum(c.sent for c in connections),
+            "dropped": sum(c.dropped for c in connections),
+            "coalesced": sum(c.coalesced for c in connections),
+            "evicted": self._evicted,
+        }
 
     # =========================================================================
     # Status Updates
@@ -261,23 +360,21 @@ class LiveBroadcastService:
     # Log Entries
     # =========================================================================
 
-    async def broadcast_log(self, content: str, log_type: Optional[str] = None) -> None:
-        """Broadcast log entry to spectators."""
-        log_entry = {
+    def publish_log(self, content: str, log_type: Optional[str] = None) -> int:
+        """Queue a log entry for spectators (sync, safe on the agent hot path)."""
+        timestamp = datetime.utcnow()
+        self._recent_logs.append({
             "content": content,
             "log_type": log_type,
-            "timestamp": datetime.utcnow()
-        }
-
-        # Store in recent logs
-        self._recent_logs.append(log_entry)
-        if len(self._recent_logs) > self._max_recent_logs:
-            self._recent_logs = self._recent_logs[-self._max_recent_logs:]
+            "timestamp": timestamp
+        })
+        if not self._connections:
+            return 0
+        return self.publish(WSLogEntry(content=content, log_type=log_type, timestamp=timestamp))
 
-        await self.broadcast(WSLogEntry(
-            content=content,
-            log_type=log_type
-        ))
+    async def broadcast_log(self, content: str, log_type: Optional[str] = None) -> None:
+        """Broadcast log entry to spectators."""
+        self.publish_log(content, log_type)
 
     # =========================================================================
     # Presence Callbacks
@@ -400,13 +497,9 @@ class LiveBroadcastService:
         await presence.heartbeat(session_id)
 
         # Send pong
-        async with self._lock:
-            ws = self._connections.get(session_id)
-            if ws:
-                try:
-                    await ws.send_json({"type": "pong"})
-                except:
-                    pass
+        connection = self._connections.get(session_id)
+        if connection:
+            connection.offer("pong", PONG_FRAME)
 
 
 # Singleton instance
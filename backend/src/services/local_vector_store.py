@@ -0,0 +1,381 @@
+"""In-process vector store: NumPy matrix in a memory-mapped file.
+
+Vectors are L2-normalized on insert and kept as rows of a float32 memmap
+(`vectors.f32`), so cosine similarity for every point is one matmul. IDs and
+payloads live in a small SQLite table (`points.db`) next to it and are
+mirrored in memory. Past `ivf_threshold` points an IVF index (k-means
+centroids + inverted lists) restricts the scan to the nearest clusters.
+
+With quantization enabled the scan runs over int8/binary codes held in RAM
+and only the best candidates are rescored against the float32 memmap, which
+then stays mostly paged out.
+
+The row layout is recorded in `store.json` (dimension, quantization): a store
+written with another dimension is refused instead of being read with the
+wrong row size.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .vector_quantization import QuantizedCodes, truncate_vector
+from .vector_store import VectorPoint, VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class IVFIndex:
+    """Inverted-file index: rows grouped by their nearest k-means centroid."""
+
+    def __init__(self, centroids: np.ndarray, lists: List[np.ndarray]):
+        self.centroids = centroids
+        self.lists = lists
+        self.indexed_rows = sum(len(rows) for rows in lists)
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, rows: np.ndarray, iterations: int = 8, seed: int = 0) -> "IVFIndex":
+        """Spherical k-means over the given rows (nlist ~ sqrt(n))."""
+        data = matrix[rows]
+        nlist = max(1, int(np.sqrt(len(rows))))
+        rng = np.random.default_rng(seed)
+        centroids = data[rng.choice(len(rows), size=nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignment = np.argmax(data @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = data[assignment == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[c] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        lists = [rows[assignment == c] for c in range(nlist)]
+        return cls(centroids, lists)
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows in the `nprobe` clusters closest to the query."""
+        nprobe = min(nprobe, len(self.lists))
+        nearest = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        return np.concatenate([self.lists[c] for c in nearest])
+
+
+class LocalVectorStore(VectorStore):
+    """VectorStore kept entirely in-process, persisted under `path`."""
+
+    backend = "local"
+    INITIAL_CAPACITY = 1024
+
+    def __init__(
+        self,
+        path: str,
+        dimension: int,
+        ivf_threshold: int = 20_000,
+        nprobe: int = 8,
+        quantization: str = "none",
+        rescore_oversampling: float = 3.0,
+    ):
+        """
+        Args:
+            path: Directory holding vectors.f32, points.db and store.json
+            dimension: Stored dimension (longer vectors are truncated)
+            ivf_threshold: Points before the IVF index is built
+            nprobe: Clusters scanned per query once indexed
+            quantization: "none", "int8" or "binary" candidate codes
+            rescore_oversampling: Candidates rescored per requested result
+        """
+        self.path = Path(path)
+        self.dimension = dimension
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.quantization = quantization
+        self.rescore_oversampling = rescore_oversampling
+        self._lock = threading.Lock()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._vectors_file = self.path / "vectors.f32"
+        self._meta_file = self.path / "store.json"
+        self._check_layout()
+        self._db = sqlite3.connect(self.path / "points.db", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS points ("
+            "row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+        self._matrix = self._open_matrix(self.INITIAL_CAPACITY)
+        self._alive = np.zeros(len(self._matrix), dtype=bool)
+        self._codes: Optional[QuantizedCodes] = (
+            QuantizedCodes(quantization, dimension, len(self._matrix))
+            if quantization != "none" else None
+        )
+        self._ids: Dict[int, str] = {}
+        self._payloads: Dict[int, Dict[str, Any]] = {}
+        self._row_of: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._size = 0
+        self._ivf: Optional[IVFIndex] = None
+        # Rows written since the last IVF build (always scanned)
+        self._unindexed: set = set()
+        self._load()
+
+    # ==================== STORAGE ====================
+
+    def _check_layout(self) -> None:
+        """
+        Refuse a vectors.f32 written with another dimension; record the layout.
+
+        Quantization codes are rebuilt from the float32 rows on load, so a
+        changed vector_quantization only re-encodes them. Stores created
+        before store.json existed are accepted when their file size matches
+        the doubling capacities of this dimension.
+        """
+        if self._meta_file.exists():
+            meta = json.loads(self._meta_file.read_text())
+            stored = meta.get("dimension")
+        elif self._vectors_file.exists():
+            row_bytes = self.dimension * 4
+            size = self._vectors_file.stat().st_size
+            rows, rest = divmod(size, row_bytes)
+            multiple = rows // self.INITIAL_CAPACITY
+            fits = (
+                not rest and rows % self.INITIAL_CAPACITY == 0
+                and multiple > 0 and multiple & (multiple - 1) == 0
+            )
+            stored = self.dimension if fits or not size else None
+            meta = {}
+        else:
+            stored, meta = self.dimension, {}
+
+        if stored != self.dimension:
+            raise ValueError(
+                f"Vector store at {self.path} holds {stored or 'unknown'}-dimensional vectors, "
+                f"settings ask for {self.dimension}: reindex into a new store "
+                f"(POST /api/orchestrator/learnings/reindex) or point local_store_path elsewhere"
+            )
+        if meta.get("quantization") not in (None, self.quantization):
+            logger.info(
+                f"Vector store quantization changed from {meta['quantization']} to "
+                f"{self.quantization}: re-encoding codes on load"
+            )
+        if meta != {"dimension": self.dimension, "quantization": self.quantization}:
+            self._meta_file.write_text(json.dumps({"dimension": self.dimension, "quantization": self.quantization}))
+
+    def _open_matrix(self, min_capacity: int) -> np.memmap:
+        """Open (growing if needed) the memmap with room for min_capacity rows."""
+        row_bytes = self.dimension * 4
+        current = self._vectors_file.stat().st_size // row_bytes if self._vectors_file.exists() else 0
+        capacity = max(current, min_capacity)
+        if capacity > current:
+            with open(self._vectors_file, "ab") as f:
+                f.truncate(capacity * row_bytes)
+        return np.memmap(self._vectors_file, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+
+    def _load(self) -> None:
+        for row, point_id, payload in self._db.execute("SELECT row, id, payload FROM points"):
+            self._ids[row] = point_id
+            self._payloads[row] = json.loads(payload)
+            self._row_of[point_id] = row
+        self._size = max(self._ids, default=-1) + 1
+        self._free_rows = sorted(set(range(self._size)) - set(self._ids), reverse=True)
+        if self._size > len(self._matrix):
+            self._matrix = self._open_matrix(self._size)
+        self._alive = np.zeros(len(self._matrix), dtype=bool)
+        self._alive[list(self._ids)] = True
+        if self._codes is not None:
+            self._codes.resize(len(self._matrix))
+            rows = self._alive_rows()
+            if len(rows):
+                self._codes.set(rows, self._matrix[rows])
+        if self._ids:
+            logger.info(f"Loaded {len(self._ids)} points from {self.path}")
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        row = self._size
+        self._size += 1
+        if row >= len(self._matrix):
+            self._matrix.flush()
+            self._matrix = self._open_matrix(len(self._matrix) * 2)
+            self._alive = np.concatenate([self._alive, np.zeros(len(self._matrix) - len(self._alive), dtype=bool)])
+            if self._codes is not None:
+                self._codes.resize(len(self._matrix))
+        return row
+
+    def _alive_rows(self) -> np.ndarray:
+        return np.flatnonzero(self._alive[:self._size])
+
+    # ==================== SYNC OPERATIONS ====================
+
+    def _upsert(self, points: List[VectorPoint]) -> None:
+        with self._lock:
+            rows = []
+            for point in points:
+                vector = truncate_vector(point.vector, self.dimension)
+                row = self._row_of.get(point.id)
+                if row is None:
+                    row = self._allocate_row()
+                self._matrix[row] = vector
+                if self._codes is not None:
+                    self._codes.set(row, vector)
+                self._alive[row] = True
+                self._unindexed.add(row)
+                self._ids[row] = point.id
+                self._payloads[row] = point.payload
+                self._row_of[point.id] = row
+                rows.append((row, point.id, json.dumps(point.payload)))
+
+            self._matrix.flush()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO points (row, id, payload) VALUES (?, ?, ?)", rows
+            )
+            self._db.commit()
+            self._maybe_rebuild_index()
+
+    def _maybe_rebuild_index(self) -> None:
+        """Build the IVF index past the threshold; rebuild after 10% growth."""
+        alive = len(self._ids)
+        if alive < self.ivf_threshold:
+            self._ivf = None
+        elif self._ivf is None or len(self._unindexed) > self._ivf.indexed_rows * 0.1:
+            self._ivf = IVFIndex.build(self._matrix, self._alive_rows())
+            self._unindexed.clear()
+
+    def _query(
+        self,
+        vector: List[float],
+        limit: int,
+        score_threshold: Optional[float],
+        payload_filter: Optional[Dict[str, Any]],
+    ) -> List[VectorPoint]:
+        with self._lock:
+            if not self._ids:
+                return []
+
+            query = truncate_vector(vector, self.dimension)
+
+            if self._ivf is not None:
+                rows = np.union1d(
+                    self._ivf.candidates(query, self.nprobe),
+                    np.fromiter(self._unindexed, dtype=np.int64, count=len(self._unindexed)),
+                )
+                rows = rows[self._alive[rows]]
+            else:
+                rows = self._alive_rows()
+
+            if payload_filter:
+                rows = np.array([
+                    r for r in rows
+                    if all(self._payloads[r].get(k) == v for k, v in payload_filter.items())
+                ], dtype=np.int64)
+            if not len(rows):
+                return []
+
+            # Codes pick the candidates; full precision rescoring decides the order
+            candidates = max(limit, int(limit * self.rescore_oversampling))
+            if self._codes is not None and len(rows) > candidates:
+                approx = self._codes.approx_scores(rows, query)
+                rows = rows[np.argpartition(-approx, candidates - 1)[:candidates]]
+
+            scores = self._matrix[rows] @ query
+            if score_threshold is not None:
+                keep = scores >= score_threshold
+                rows, scores = rows[keep], scores[keep]
+
+            top = np.argsort(-scores)[:limit]
+            return [
+                VectorPoint(
+                    id=self._ids[int(rows[i])],
+                    payload=self._payloads[int(rows[i])],
+                    score=float(scores[i]),
+                )
+                for i in top
+            ]
+
+    def _delete(self, ids: List[str]) -> None:
+        with self._lock:
+            rows = [self._row_of.pop(point_id) for point_id in ids if point_id in self._row_of]
+            for row in rows:
+                del self._ids[row]
+                del self._payloads[row]
+                self._matrix[row] = 0.0
+                if self._codes is not None:
+                    self._codes.clear(row)
+                self._alive[row] = False
+                self._unindexed.discard(row)
+                self._free_rows.append(row)
+            self._db.executemany("DELETE FROM points WHERE row = ?", [(row,) for row in rows])
+            self._db.commit()
+
+    def _retrieve(self, ids: List[str]) -> List[VectorPoint]:
+        with self._lock:
+            return [
+                VectorPoint(id=point_id, payload=self._payloads[self._row_of[point_id]])
+                for point_id in ids
+                if point_id in self._row_of
+            ]
+
+    def _scroll(self, limit: int, offset: Any = None) -> Tuple[List[VectorPoint], Any]:
+        # Offset is a row number: rows never move, so paging is stable under upserts
+        with self._lock:
+            rows = self._alive_rows()
+            rows = rows[rows >= (offset or 0)]
+            page, rest = rows[:limit], rows[limit:]
+            points = [VectorPoint(id=self._ids[int(r)], payload=self._payloads[int(r)]) for r in page]
+            return points, (int(rest[0]) if len(rest) else None)
+
+    def _stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "points_count": len(self._ids),
+                "vectors_count": len(self._ids),
+                "status": "green",
+                "indexed": self._ivf is not None,
+                "quantization": self.quantization,
+                "dimension": self.dimension,
+                "memory_bytes": self.memory_bytes(),
+            }
+
+    # ==================== VectorStore API ====================
+
+    async def upsert(self, points: List[VectorPoint]) -> None:
+        await asyncio.to_thread(self._upsert, points)
+
+    async def query(
+        self,
+        vector: List[float],
+        limit: int,
+        score_threshold: Optional[float] = None,
+        payload_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[VectorPoint]:
+        return await asyncio.to_thread(self._query, vector, limit, score_threshold, payload_filter)
+
+    async def retrieve(self, ids: List[str]) -> List[VectorPoint]:
+        return await asyncio.to_thread(self._retrieve, ids)
+
+    async def delete(self, ids: List[str]) -> None:
+        await asyncio.to_thread(self._delete, ids)
+
+    async def scroll(self, limit: int, offset: Any = None) -> Tuple[List[VectorPoint], Any]:
+        return await asyncio.to_thread(self._scroll, limit, offset)
+
+    async def stats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._stats)
+
+    def memory_bytes(self) -> int:
+        """RAM scanned per query: the codes, or the float32 rows without them."""
+        alive = len(self._ids)
+        if self._codes is not None:
+            return self._codes.memory_bytes(alive)
+        return alive * self.dimension * 4
+
+    async def health_check(self) -> bool:
+        return True
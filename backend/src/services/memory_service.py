@@ -97,7 +97,7 @@ class MemoryService:
 
     # ==================== LONG-TERM MEMORY (Qdrant) ====================
 
-    def store_learning(
+    async def store_learning(
         self,
         goal_description: str,
         learning: str,
@@ -115,7 +115,7 @@ class MemoryService:
             Learning ID if successful, None otherwise
         """
         try:
-            learning_id = self.qdrant.store_learning(
+            learning_id = await self.qdrant.store_learning(
                 goal_description=goal_description,
                 learning=learning,
                 cards_created=cards_created,
@@ -131,7 +131,7 @@ class MemoryService:
             logger.error(f"[Memory] Failed to store learning: {e}")
             return None
 
-    def query_relevant_learnings(
+    async def query_relevant_learnings(
         self,
         context: str,
         limit: int = 5,
@@ -149,10 +149,10 @@ class MemoryService:
             List of relevant learnings with their scores
         """
         try:
-            learnings = self.qdrant.query_learnings(
+            learnings = await self.qdrant.search_learnings(
                 query_text=context,
                 limit=limit,
-                score_threshold=min_score,
+                min_score=min_score,
             )
             logger.info(f"[Memory] Found {len(learnings)} relevant learnings")
             return learnings
@@ -160,10 +160,10 @@ class MemoryService:
             logger.error(f"[Memory] Failed to query learnings: {e}")
             return []
 
-    def get_learning_stats(self) -> Dict[str, Any]:
+    async def get_learning_stats(self) -> Dict[str, Any]:
         """Get statistics about long-term memory."""
         try:
-            return self.qdrant.get_collection_stats()
+            return await self.qdrant.get_collection_stats()
         except Exception as e:
             logger.error(f"[Memory] Failed to get stats: {e}")
             return {"error": str(e)}
@@ -186,7 +186,7 @@ class MemoryService:
         # Query long-term learnings if we have context
         long_term_learnings = []
         if goal_description:
-            long_term_learnings = self.query_relevant_learnings(
+            long_term_learnings = await self.query_relevant_learnings(
                 context=goal_description,
                 limit=3,
             )
@@ -197,9 +197,9 @@ class MemoryService:
             "has_learnings": len(long_term_learnings) > 0,
         }
 
-    def health_check(self) -> Dict[str, bool]:
+    async def health_check(self) -> Dict[str, bool]:
         """Check health of both memory systems."""
-        qdrant_healthy = self.qdrant.health_check()
+        qdrant_healthy = await self.qdrant.health_check()
 
         return {
             "short_term": True,  # SQLite is always available if we got here
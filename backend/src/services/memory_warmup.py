@@ -0,0 +1,94 @@
+"""Startup warm-up for long-term memory.
+
+Loading the SentenceTransformer model and connecting to the vector store
+(ensuring the collection) take seconds. With `warmup_on_startup` (off by
+default) a background task from the FastAPI lifespan keeps that cost off the
+first `_step_query` or `/learnings/query`. `/health` keeps answering 200 and
+reports the progress in its `ready` and `warmup` fields.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from ..config.qdrant import get_qdrant_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MemoryWarmup:
+    """Readiness state of the embedding model and the vector store."""
+    enabled: bool = True
+    ready: bool = False
+    model_loaded: bool = False
+    store_ready: bool = False
+    error: Optional[str] = None
+    duration_ms: Optional[float] = None
+    _task: Optional[asyncio.Task] = field(default=None, repr=False, compare=False)
+
+    def start(self) -> None:
+        """Schedule the warm-up (no-op when disabled: the instance is ready)."""
+        if not self.enabled:
+            self.ready = True
+            return
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel an unfinished warm-up on shutdown."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self) -> None:
+        """Load the model with a dummy encode, then connect the vector store."""
+        from .embedding_service import get_embedding_service
+        from .qdrant_service import get_qdrant_service
+
+        started = time.perf_counter()
+        try:
+            await get_embedding_service().warm_up()
+            self.model_loaded = True
+            logger.info("[Warmup] Embedding model loaded")
+
+            qdrant = get_qdrant_service()
+            self.store_ready = await qdrant.health_check()
+            if self.store_ready:
+                await qdrant.backfill_lexical_index()
+            else:
+                self.error = "Vector store unavailable"
+                logger.warning("[Warmup] Vector store unavailable; learnings disabled until it returns")
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"[Warmup] Failed: {e}")
+        finally:
+            # A missing optional backend must not keep the instance out of rotation
+            self.ready = True
+            self.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            logger.info(f"[Warmup] Finished in {self.duration_ms}ms")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "modelLoaded": self.model_loaded,
+            "storeReady": self.store_ready,
+            "error": self.error,
+            "durationMs": self.duration_ms,
+        }
+
+
+_warmup: Optional[MemoryWarmup] = None
+
+
+def get_memory_warmup() -> MemoryWarmup:
+    """Get or create the memory warm-up state."""
+    global _warmup
+    if _warmup is None:
+        _warmup = MemoryWarmup(enabled=get_qdrant_settings().warmup_on_startup)
+    return _warmup
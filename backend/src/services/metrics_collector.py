@@ -1,5 +1,6 @@
 """Serviço de coleta automática de métricas."""
 
+import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime
@@ -8,6 +9,8 @@ from decimal import Decimal
 from ..models.execution import Execution
 from ..repositories.metrics_repository import MetricsRepository
 
+logger = logging.getLogger(__name__)
+
 
 class MetricsCollector:
     """Serviço para coletar métricas automaticamente durante execuções."""
@@ -86,7 +89,7 @@ class MetricsCollector:
                 collected_count += 1
             except Exception as e:
                 # Log error mas continua processando
-                print(f"Erro ao coletar métrica da execução {execution.id}: {e}")
+                logger.error("Erro ao coletar métrica da execução %s: %s", execution.id, e)
                 continue
 
         return collected_count
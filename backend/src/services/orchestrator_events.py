@@ -0,0 +1,91 @@
+"""Barramento interno de eventos que acorda o loop do orquestrador.
+
+Em vez de dormir o intervalo inteiro entre ciclos, o loop espera por eventos
+(goal submetido, card concluído/movido, reset do limite de uso) e usa o timer
+apenas como fallback. Eventos que chegam juntos são agrupados em um único
+ciclo (debounce), então rajadas não multiplicam ciclos.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional
+
+from ..config.settings import get_settings
+
+
+class OrchestratorEvent(str, Enum):
+    """Eventos que justificam um novo ciclo imediato."""
+    GOAL_SUBMITTED = "goal_submitted"
+    CARD_COMPLETED = "card_completed"
+    CARD_MOVED = "card_moved"
+    USAGE_RESET = "usage_reset"
+
+
+@dataclass
+class BusEvent:
+    """Evento publicado no barramento."""
+    type: OrchestratorEvent
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+
+
+class OrchestratorEventBus:
+    """Fila de eventos com um único consumidor (o loop do orquestrador)."""
+
+    # Sem consumidor (orquestrador desligado) os eventos antigos são descartados
+    MAX_PENDING = 100
+
+    def __init__(self, debounce_seconds: Optional[float] = None):
+        self.debounce_seconds = (
+            debounce_seconds
+            if debounce_seconds is not None
+            else get_settings().orchestrator_event_debounce_ms / 1000
+        )
+        self._pending: Deque[BusEvent] = deque(maxlen=self.MAX_PENDING)
+        self._wakeup = asyncio.Event()
+
+    def publish(self, event_type: OrchestratorEvent, **data: Any) -> None:
+        """Publica um evento (não bloqueia; seguro em callbacks síncronos)."""
+        self._pending.append(BusEvent(type=event_type, data=data))
+        self._wakeup.set()
+
+    async def wait(self, timeout: float) -> List[BusEvent]:
+        """
+        Espera o próximo evento ou o timeout (fallback).
+
+        Returns:
+            Eventos acumulados desde a última chamada; vazio se foi o timer
+        """
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+
+        # Agrupa a rajada (ex.: vários cards concluindo juntos, commit da rota)
+        if self.debounce_seconds > 0:
+            await asyncio.sleep(self.debounce_seconds)
+
+        events = list(self._pending)
+        self._pending.clear()
+        self._wakeup.clear()
+        return events
+
+
+_event_bus: Optional[OrchestratorEventBus] = None
+
+
+def get_orchestrator_event_bus() -> OrchestratorEventBus:
+    """Get or create the orchestrator event bus."""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = OrchestratorEventBus()
+    return _event_bus
+
+
+def publish_orchestrator_event(event_type: OrchestratorEvent, **data: Any) -> None:
+    """Atalho para publicar no barramento global."""
+    get_orchestrator_event_bus().publish(event_type, **data)
@@ -3,7 +3,7 @@
 import asyncio
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 from dataclasses import dataclass
 from enum import Enum
 
@@ -14,10 +14,15 @@ from ..models.orchestrator import GoalStatus, ActionType, OrchestratorLogType
 from ..models.card import Card
 from ..repositories.orchestrator_repository import GoalRepository, ActionRepository, LogRepository
 from ..repositories.card_repository import CardRepository
+from ..repositories.execution_repository import ExecutionRepository
+from ..models.execution import ExecutionStatus
+from ..repositories.metrics_repository import MetricsRepository
+from .card_scheduler import StageDurationEstimator, build_schedule
 from .memory_service import MemoryService
-from .usage_checker_service import get_usage_checker_service, UsageInfo
+from .usage_checker_service import get_usage_checker_service, stop_usage_reset_watch, UsageInfo
 from .orchestrator_logger import get_orchestrator_logger
 from .live_broadcast_service import get_live_broadcast_service
+from .orchestrator_events import OrchestratorEvent, get_orchestrator_event_bus
 
 logger = logging.getLogger(__name__)
 
@@ -75,10 +80,20 @@ class OrchestratorService:
         self.settings = get_settings()
         self.usage_checker = get_usage_checker_service(self.settings.orchestrator_usage_limit_percent)
         self.logger = get_orchestrator_logger(self.settings.orchestrator_log_file)
+        self.event_bus = get_orchestrator_event_bus()
 
         self._running = False
         self._task: Optional[asyncio.Task] = None
         self._last_usage_check: Optional[UsageInfo] = None
+        # Cards em execução (um task por card, cada um com sua própria sessão)
+        self._card_tasks: Dict[str, asyncio.Task] = {}
+        # Pipeline: um pool de workers por estágio, com limite próprio
+        # (Settings completa um override parcial com os limites padrão)
+        self._stage_limits = {
+            stage: max(1, limit) for stage, limit in self.settings.orchestrator_stage_workers.items()
+        }
+        self._stage_slots = {stage: asyncio.Semaphore(limit) for stage, limit in self._stage_limits.items()}
+        self._stage_busy: Dict[str, int] = {stage: 0 for stage in self._stage_slots}
 
     def _get_session_factory(self):
         """Get the current session factory from db_manager or fallback to legacy."""
@@ -117,6 +132,8 @@ class OrchestratorService:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        await self.cancel_card_tasks()
+        await stop_usage_reset_watch()
         await self.logger.log_info("Orchestrator stopped")
         logger.info("[Orchestrator] Stopped")
 
@@ -125,7 +142,13 @@ class OrchestratorService:
         return self._running
 
     async def _run_loop(self) -> None:
-        """Main orchestrator loop."""
+        """
+        Main orchestrator loop.
+
+        Runs a cycle, then sleeps until an event arrives on the event bus
+        (goal submitted, card completed/moved, usage reset). The loop interval
+        is only a fallback for changes that publish no event.
+        """
         while self._running:
             try:
                 await self._execute_cycle()
@@ -133,8 +156,11 @@ class OrchestratorService:
                 logger.exception(f"[Orchestrator] Error in loop: {e}")
                 await self.logger.log_error(f"Loop error: {e}")
 
-            # Wait for next cycle
-            await asyncio.sleep(self.settings.orchestrator_loop_interval_seconds)
+            # Wait for an event or the fallback timer
+            events = await self.event_bus.wait(self.settings.orchestrator_loop_interval_seconds)
+            if events:
+                reasons = sorted({event.type.value for event in events})
+                await self.logger.log_info(f"Woken by events: {', '.join(reasons)}")
 
     # ==================== MAIN CYCLE ====================
 
@@ -241,7 +267,7 @@ class OrchestratorService:
         active_goal = context.get("active_goal")
         if active_goal:
             goal_desc = active_goal.get("description", "")
-            learnings = memory.query_relevant_learnings(goal_desc, limit=3)
+            learnings = await memory.query_relevant_learnings(goal_desc, limit=3)
 
             await memory.record_step(
                 OrchestratorLogType.QUERY,
@@ -311,20 +337,49 @@ class OrchestratorService:
                 )
 
             # Check for cards ready to execute (in backlog or workflow columns with satisfied deps)
-            ready_cards = [c for c in cards_status if c.get("ready_to_execute")]
-            if ready_cards:
-                # Execute one card at a time to avoid SQLAlchemy session conflicts
-                first_card_id = ready_cards[0].get("id")
+            # Cards already running are skipped: they are still in a workflow column
+            running = self.running_card_ids()
+            ready_cards = [
+                c for c in cards_status
+                if c.get("ready_to_execute") and c.get("id") not in running
+            ]
+            free_slots = self.settings.orchestrator_max_parallel_cards - len(running)
+            batch = [c.get("id") for c in ready_cards[:free_slots]]
+
+            # Spare pipeline slots plan queued cards ahead while their dependencies run
+            # (only backlog cards qualify: a planned card waits in the plan column)
+            plan_ahead = []
+            if self.settings.orchestrator_plan_ahead:
+                plan_ahead = [
+                    c.get("id") for c in cards_status
+                    if c.get("can_plan_ahead") and c.get("id") not in running
+                ][:max(0, free_slots - len(batch))]
+
+            if batch or plan_ahead:
+                card_ids_to_run = batch + plan_ahead
+                context = {"plan_only": plan_ahead} if plan_ahead else None
+                if len(card_ids_to_run) == 1:
+                    return ThinkResult(
+                        decision=OrchestratorDecision.EXECUTE_CARD,
+                        goal_id=active_goal.id,
+                        card_ids=card_ids_to_run,
+                        reason=(
+                            f"Card {card_ids_to_run[0][:8]} ready to execute ({len(ready_cards)} cards waiting)"
+                            if batch else f"Planning card {card_ids_to_run[0][:8]} ahead of its dependencies"
+                        ),
+                        context=context
+                    )
                 return ThinkResult(
-                    decision=OrchestratorDecision.EXECUTE_CARD,
+                    decision=OrchestratorDecision.EXECUTE_CARDS_PARALLEL,
                     goal_id=active_goal.id,
-                    card_ids=[first_card_id],
-                    reason=f"Card {first_card_id[:8]} ready to execute ({len(ready_cards)} cards waiting)"
+                    card_ids=card_ids_to_run,
+                    reason=(
+                        f"{len(batch)} independent cards ready to execute ({len(ready_cards)} cards waiting), "
+                        f"{len(plan_ahead)} planned ahead"
+                    ),
+                    context=context
                 )
 
-                # NOTE: Parallel execution disabled due to SQLAlchemy session conflicts
-                # TODO: Fix session management to re-enable parallel execution
-
             # Check if all cards are done
             done_cards = [c for c in cards_status if c.get("column") in ["done", "completed"]]
             if len(done_cards) == len(cards_status):
@@ -338,7 +393,7 @@ class OrchestratorService:
             return ThinkResult(
                 decision=OrchestratorDecision.WAIT,
                 goal_id=active_goal.id,
-                reason="Cards in progress, waiting"
+                reason=f"Cards in progress ({len(running)} running), waiting"
             )
 
         # No active goal, check for pending goals
@@ -369,11 +424,13 @@ class OrchestratorService:
                 case OrchestratorDecision.DECOMPOSE:
                     return await self._act_decompose(think_result.goal_id, repos)
 
-                case OrchestratorDecision.EXECUTE_CARD:
-                    return await self._act_execute_card(think_result.card_id, repos)
-
-                case OrchestratorDecision.EXECUTE_CARDS_PARALLEL:
-                    return await self._act_execute_cards_parallel(think_result.card_ids, repos)
+                case OrchestratorDecision.EXECUTE_CARD | OrchestratorDecision.EXECUTE_CARDS_PARALLEL:
+                    return await self._act_execute_cards_parallel(
+                        think_result.card_ids,
+                        repos,
+                        goal_id=think_result.goal_id,
+                        plan_only=(think_result.context or {}).get("plan_only")
+                    )
 
                 case OrchestratorDecision.CREATE_FIX:
                     return await self._act_create_fix(
@@ -433,7 +490,7 @@ class OrchestratorService:
             return
 
         # Store in Qdrant
-        learning_id = memory.store_learning(
+        learning_id = await memory.store_learning(
             goal_description=goal.description,
             learning=act_result.learning,
             cards_created=goal.cards or [],
@@ -616,8 +673,19 @@ class OrchestratorService:
             }
         )
 
-    async def _act_execute_card(self, card_id: str, repos: Dict[str, Any]) -> ActResult:
-        """Execute a card through the complete workflow (plan → implement → test → review → done)."""
+    async def _act_execute_card(
+        self,
+        card_id: str,
+        repos: Dict[str, Any],
+        plan_only: bool = False
+    ) -> ActResult:
+        """
+        Execute a card through the complete workflow (plan → implement → test → review → done).
+
+        Each stage runs inside its stage worker pool (see _run_stage), so cards
+        overlap like a pipeline. With plan_only the card stops after PLAN and is
+        resumed later from the plan column without planning again.
+        """
         card_repo = repos["card_repo"]
 
         card = await card_repo.get_by_id(card_id)
@@ -664,18 +732,19 @@ class OrchestratorService:
         try:
             # Execute each stage sequentially until done
 
+            # Planned ahead while its dependencies were running: skip straight to IMPLEMENT
+            planned_ahead = current_column == "plan" and await self._has_completed_plan(card, card_repo)
+
             # Stage 1: PLAN (if not already past it)
-            if current_column in ["backlog", "plan"]:
+            if current_column in ["backlog", "plan"] and not planned_ahead:
                 await self.logger.log_act(f"[1/4] Executing PLAN stage...")
-                await self._move_card_with_broadcast(card_id, "plan", card_repo)
-
-                result = await execute_plan(
+                result = await self._run_stage("plan", card_id, card_repo, lambda: execute_plan(
                     card_id=card_id,
                     title=card.title,
                     description=card.description or "",
                     cwd=cwd,
                     model=card.model_plan,
-                )
+                ))
 
                 if not result.success:
                     await self.logger.log_error(f"PLAN failed: {result.error}")
@@ -686,11 +755,18 @@ class OrchestratorService:
                 # Save spec_path to card (execute_plan returns it but doesn't persist)
                 if result.spec_path:
                     await card_repo.update_spec_path(card_id, result.spec_path)
+                    await card_repo.session.commit()
                     await self.logger.log_act(f"Saved spec_path: {result.spec_path}")
 
                 # Refresh card to get updated spec_path
                 card = await card_repo.get_by_id(card_id)
 
+                if plan_only:
+                    return ActResult(
+                        success=True,
+                        data={"column": "plan", "planned_ahead": bool(card.spec_path)}
+                    )
+
             # Stage 2: IMPLEMENT
             if current_column in ["backlog", "plan", "implement"]:
                 # Validate spec_path exists before proceeding
@@ -699,14 +775,12 @@ class OrchestratorService:
                     return ActResult(success=False, error="Card has no spec_path. Run /plan first.")
 
                 await self.logger.log_act(f"[2/4] Executing IMPLEMENT stage...")
-                await self._move_card_with_broadcast(card_id, "implement", card_repo)
-
-                result = await execute_implement(
+                result = await self._run_stage("implement", card_id, card_repo, lambda: execute_implement(
                     card_id=card_id,
                     spec_path=card.spec_path,
                     cwd=cwd,
                     model=card.model_implement,
-                )
+                ))
 
                 if not result.success:
                     await self.logger.log_error(f"IMPLEMENT failed: {result.error}")
@@ -722,14 +796,12 @@ class OrchestratorService:
                     return ActResult(success=False, error="Card has no spec_path. Run /plan first.")
 
                 await self.logger.log_act(f"[3/4] Executing TEST stage...")
-                await self._move_card_with_broadcast(card_id, "test", card_repo)
-
-                result = await execute_test_implementation(
+                result = await self._run_stage("test", card_id, card_repo, lambda: execute_test_implementation(
                     card_id=card_id,
                     spec_path=card.spec_path,
                     cwd=cwd,
                     model=card.model_test,
-                )
+                ))
 
                 if not result.success:
                     await self.logger.log_error(f"TEST failed: {result.error}")
@@ -749,14 +821,12 @@ class OrchestratorService:
                     return ActResult(success=False, error="Card has no spec_path. Run /plan first.")
 
                 await self.logger.log_act(f"[4/4] Executing REVIEW stage...")
-                await self._move_card_with_broadcast(card_id, "review", card_repo)
-
-                result = await execute_review(
+                result = await self._run_stage("review", card_id, card_repo, lambda: execute_review(
                     card_id=card_id,
                     spec_path=card.spec_path,
                     cwd=cwd,
                     model=card.model_review,
-                )
+                ))
 
                 if not result.success:
                     await self.logger.log_error(f"REVIEW failed: {result.error}")
@@ -784,72 +854,169 @@ class OrchestratorService:
             logger.exception(f"Error executing card {card_id}: {e}")
             return ActResult(success=False, error=str(e))
 
+    async def _has_completed_plan(self, card: Card, card_repo: CardRepository) -> bool:
+        """
+        Whether the card's latest execution is a successful /plan with a saved spec.
+
+        Read from the database rather than kept in memory, so a card planned
+        ahead is not planned again after the orchestrator restarts.
+        """
+        if not card.spec_path:
+            return False
+        execution = await ExecutionRepository(card_repo.session).get_active_execution(card.id)
+        return (
+            execution is not None
+            and execution.command == "/plan"
+            and execution.status == ExecutionStatus.SUCCESS
+        )
+
+    async def _run_stage(
+        self,
+        stage: str,
+        card_id: str,
+        card_repo: CardRepository,
+        execute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run one workflow stage inside that stage's worker pool.
+
+        The card only moves to the stage column once a worker is free, so a
+        card waiting for IMPLEMENT stays visible in PLAN while another card
+        occupies the pool.
+        """
+        async with self._stage_slots[stage]:
+            self._stage_busy[stage] += 1
+            try:
+                await self._move_card_with_broadcast(card_id, stage, card_repo)
+                return await execute()
+            finally:
+                self._stage_busy[stage] -= 1
+
     async def _act_execute_cards_parallel(
         self,
         card_ids: List[str],
-        repos: Dict[str, Any]
+        repos: Dict[str, Any],
+        goal_id: Optional[str] = None,
+        plan_only: Optional[List[str]] = None
     ) -> ActResult:
-        """Execute multiple cards in parallel."""
-        await self.logger.log_act(
-            f"Starting parallel execution of {len(card_ids)} cards",
-            data={"card_ids": [cid[:8] for cid in card_ids]}
-        )
-
-        # Create tasks for all cards
-        tasks = [
-            self._act_execute_card(card_id, repos)
-            for card_id in card_ids
-        ]
+        """
+        Dispatch cards for concurrent execution.
 
-        # Execute all tasks in parallel using asyncio.gather
-        # return_exceptions=True prevents one failure from canceling others
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Each card runs in its own task with its own session (repos are never
+        shared across tasks) and its own worktree, created by the agent stages.
+        The cycle returns right away; the number of running cards is bounded by
+        orchestrator_max_parallel_cards and outcomes are recorded by each task.
+        Cards listed in plan_only only run their PLAN stage (planned ahead).
+        """
+        plan_only = set(plan_only or [])
+        limit = self.settings.orchestrator_max_parallel_cards
+        dispatched = []
 
-        # Process results
-        successes = []
-        failures = []
+        for card_id in card_ids:
+            if card_id in self._card_tasks:
+                continue
+            if len(self._card_tasks) >= limit:
+                break
 
-        for card_id, result in zip(card_ids, results):
-            if isinstance(result, Exception):
-                failures.append({
-                    "card_id": card_id,
-                    "error": str(result)
-                })
-                await self.logger.log_error(
-                    f"Card {card_id[:8]} failed with exception: {result}"
-                )
-            elif isinstance(result, ActResult):
-                if result.success:
-                    successes.append(card_id)
-                else:
-                    failures.append({
-                        "card_id": card_id,
-                        "error": result.error
-                    })
-                    await self.logger.log_error(
-                        f"Card {card_id[:8]} failed: {result.error}"
-                    )
+            task = asyncio.create_task(
+                self._run_card_task(card_id, goal_id, plan_only=card_id in plan_only)
+            )
+            self._card_tasks[card_id] = task
+            task.add_done_callback(lambda t, cid=card_id: self._on_card_task_done(cid, t))
+            dispatched.append(card_id)
 
         await self.logger.log_act(
-            f"Parallel execution completed: {len(successes)} succeeded, {len(failures)} failed",
-            data={"successes": [s[:8] for s in successes], "failures": failures}
+            f"Dispatched {len(dispatched)} cards ({len(self._card_tasks)}/{limit} running)",
+            goal_id=goal_id,
+            data={"card_ids": [cid[:8] for cid in dispatched]}
         )
 
-        # Determine overall success (partial success is still success for the orchestrator)
-        all_success = len(failures) == 0
-
         return ActResult(
-            success=all_success,
-            should_learn=len(successes) > 0,
-            learning=f"Parallel execution: {len(successes)}/{len(card_ids)} cards completed" if successes else None,
-            error=f"{len(failures)} cards failed" if failures else None,
+            success=True,
             data={
-                "successes": successes,
-                "failures": failures,
-                "total": len(card_ids)
+                "dispatched": dispatched,
+                "running": len(self._card_tasks),
+                "limit": limit,
             }
         )
 
+    async def _run_card_task(
+        self,
+        card_id: str,
+        goal_id: Optional[str],
+        plan_only: bool = False
+    ) -> ActResult:
+        """Execute one card's workflow with a dedicated session."""
+        session_factory = self._get_session_factory()
+
+        async with session_factory() as session:
+            repos = self._create_repos(session)
+            try:
+                result = await self._act_execute_card(card_id, repos, plan_only=plan_only)
+            except Exception as e:
+                logger.exception(f"Error executing card {card_id}: {e}")
+                result = ActResult(success=False, error=str(e))
+
+            try:
+                await self._record_card_outcome(card_id, goal_id, result, repos)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.warning(f"Failed to record outcome of card {card_id}: {e}")
+
+        if not result.success:
+            await self.logger.log_error(f"Card {card_id[:8]} failed: {result.error}")
+        return result
+
+    async def _record_card_outcome(
+        self,
+        card_id: str,
+        goal_id: Optional[str],
+        result: ActResult,
+        repos: Dict[str, Any]
+    ) -> None:
+        """RECORD/LEARN for a card executed outside the main cycle."""
+        memory = repos["memory"]
+
+        await memory.record_step(
+            OrchestratorLogType.ACT,
+            f"Card {card_id[:8]} workflow finished: success={result.success}",
+            context={
+                "card_id": card_id,
+                "success": result.success,
+                "error": result.error,
+            },
+            goal_id=goal_id
+        )
+
+        if result.should_learn and result.learning:
+            think_result = ThinkResult(
+                decision=OrchestratorDecision.EXECUTE_CARD,
+                goal_id=goal_id,
+                card_ids=[card_id],
+            )
+            await self._step_learn(think_result, result, repos)
+
+    def _on_card_task_done(self, card_id: str, task: asyncio.Task) -> None:
+        """Release the card's slot and wake the loop when a card task finishes."""
+        if self._card_tasks.get(card_id) is task:
+            del self._card_tasks[card_id]
+        if not task.cancelled():
+            self.event_bus.publish(OrchestratorEvent.CARD_COMPLETED, card_id=card_id)
+
+    def running_card_ids(self) -> set[str]:
+        """IDs of cards currently being executed."""
+        return set(self._card_tasks)
+
+    async def cancel_card_tasks(self) -> None:
+        """Cancel running card executions (shutdown)."""
+        tasks = list(self._card_tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._card_tasks.clear()
+
     async def _act_create_fix(self, card_id: str, context: Optional[dict], repos: Dict[str, Any]) -> ActResult:
         """Create a fix card for a failed card."""
         card_repo = repos["card_repo"]
@@ -1025,46 +1192,35 @@ class OrchestratorService:
     # ==================== HELPERS ====================
 
     async def _get_cards_status(self, card_ids: List[str], card_repo: CardRepository) -> List[Dict[str, Any]]:
-        """Get status of multiple cards including dependency satisfaction."""
-        # First pass: get all cards
-        cards: Dict[str, Card] = {}
-        for card_id in card_ids:
-            card = await card_repo.get_by_id(card_id)
-            if card:
-                cards[card_id] = card
+        """
+        Get status of the goal's cards in scheduling priority order.
 
-        # Second pass: build status with dependency checking
-        statuses = []
-        for card_id in card_ids:
-            card = cards.get(card_id)
-            if not card:
-                continue
+        Cards are loaded with a single IN query and ranked by critical path
+        (see card_scheduler): ready cards on the longest remaining chain come
+        first. Cards in a dependency cycle are never ready.
+        """
+        cards = {card.id: card for card in await card_repo.get_by_ids(card_ids)}
+        averages = await MetricsRepository(card_repo.session).get_stage_duration_averages()
+        schedule = build_schedule(card_ids, cards, StageDurationEstimator(averages))
 
-            # Check if dependencies are satisfied (all deps must be in 'done' column)
-            deps = card.dependencies or []
-            deps_satisfied = all(
-                cards.get(dep_id) and cards.get(dep_id).column_id == "done"
-                for dep_id in deps
-            )
+        if schedule.cycle:
+            logger.warning(f"[Orchestrator] Dependency cycle between cards: {[cid[:8] for cid in schedule.cycle]}")
 
-            # Card is ready to execute if:
-            # 1. It's in an executable column
-            # 2. All its dependencies are satisfied (in 'done')
-            is_executable_column = card.column_id in ["backlog", "plan", "implement", "test", "review"]
-            ready_to_execute = is_executable_column and deps_satisfied
-
-            status = {
-                "id": card.id,
-                "title": card.title,
-                "column": card.column_id,
-                "dependencies": deps,
-                "dependencies_satisfied": deps_satisfied,
-                "ready_to_execute": ready_to_execute,
+        return [
+            {
+                "id": item.card.id,
+                "title": item.card.title,
+                "column": item.card.column_id,
+                "dependencies": item.dependencies,
+                "dependencies_satisfied": item.dependencies_satisfied,
+                "ready_to_execute": item.ready_to_execute,
+                "in_cycle": item.in_cycle,
+                "can_plan_ahead": item.can_plan_ahead,
+                "critical_path_ms": item.critical_path_ms,
                 "needs_fix": False,  # TODO: Detect test failures
             }
-            statuses.append(status)
-
-        return statuses
+            for item in schedule.cards
+        ]
 
     async def _move_card_with_broadcast(
         self,
@@ -1085,6 +1241,10 @@ class OrchestratorService:
         if error:
             return None, error
 
+        # Commit right away: card tasks run for minutes and an open write
+        # transaction would hold SQLite's lock against the other cards
+        await card_repo.session.commit()
+
         # Broadcast via WebSocket (admin)
         try:
             from .card_ws import card_ws_manager
@@ -1164,6 +1324,7 @@ class OrchestratorService:
                 f"New goal submitted: {description[:50]}...",
                 goal_id=goal.id
             )
+            self.event_bus.publish(OrchestratorEvent.GOAL_SUBMITTED, goal_id=goal.id)
 
             return {
                 "id": goal.id,
@@ -1175,6 +1336,12 @@ class OrchestratorService:
         """Get orchestrator status."""
         return {
             "running": self._running,
+            "running_cards": sorted(self._card_tasks),
+            "max_parallel_cards": self.settings.orchestrator_max_parallel_cards,
+            "stage_workers": {
+                stage: {"limit": self._stage_limits.get(stage, 1), "busy": busy}
+                for stage, busy in self._stage_busy.items()
+            },
             "loop_interval_seconds": self.settings.orchestrator_loop_interval_seconds,
             "usage_limit_percent": self.settings.orchestrator_usage_limit_percent,
             "last_usage_check": self._last_usage_check.__dict__ if self._last_usage_check else None,
@@ -1,60 +1,100 @@
-"""Qdrant service for long-term memory vector storage."""
+"""Long-term memory service over the configured vector store.
 
+All operations are awaitable: the store (Qdrant via AsyncQdrantClient, or the
+in-process local backend) never blocks the event loop, and embeddings are
+computed on the embedding service's thread pool. Learnings are also kept in
+a BM25 index (lexical_index.py) for hybrid retrieval, also updated and
+searched off the loop.
+"""
+
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import uuid4
 from datetime import datetime
 from functools import lru_cache
 
-from qdrant_client import QdrantClient
-from qdrant_client.http import models as qdrant_models
-from qdrant_client.http.exceptions import UnexpectedResponse
-
 from ..config.qdrant import get_qdrant_settings
 from .embedding_service import get_embedding_service
+from .lexical_index import LexicalIndex, get_lexical_index, reciprocal_rank_fusion
+from .vector_store import VectorPoint, VectorStore, create_vector_store
 
 logger = logging.getLogger(__name__)
 
 
+def learning_text(goal_description: str, learning: str) -> str:
+    """Text embedded for a learning (goal + learning combined)."""
+    return f"{goal_description}\n\n{learning}"
+
+
 class QdrantService:
-    """Service for Qdrant vector database operations."""
+    """Service for learnings stored in a vector database (see vector_store.py)."""
 
-    def __init__(self):
-        self._client: Optional[QdrantClient] = None
+    def __init__(
+        self,
+        store: Optional[VectorStore] = None,
+        embedding_service=None,
+        lexical_index: Optional[LexicalIndex] = None,
+    ):
         self._settings = get_qdrant_settings()
-        self._embedding_service = get_embedding_service()
+        if store is None:
+            # Collection swapped in by a completed reindex, if any
+            from .learning_reindex import active_store_settings
+            store = create_vector_store(active_store_settings(self._settings))
+        self._store = store
+        self._embedding_service = embedding_service or get_embedding_service()
+        self._lexical = lexical_index if lexical_index is not None else get_lexical_index()
+        self._warming: Optional[asyncio.Task] = None
+        # Writes made while a reindex fills another store, replayed before the swap
+        self._change_log: Optional[List[Tuple[str, Any]]] = None
 
     @property
-    def client(self) -> QdrantClient:
-        """Lazy initialize Qdrant client."""
-        if self._client is None:
-            logger.info(f"Connecting to Qdrant at {self._settings.url}")
-            self._client = QdrantClient(
-                host=self._settings.host,
-                port=self._settings.port,
-                api_key=self._settings.api_key,
-                https=self._settings.https,
-            )
-            self._ensure_collection()
-        return self._client
+    def store(self) -> VectorStore:
+        return self._store
 
-    def _ensure_collection(self) -> None:
-        """Ensure the learnings collection exists."""
+    def record_changes(self, enabled: bool = True) -> None:
+        """Start (or stop) logging writes for a store that will be swapped in."""
+        self._change_log = [] if enabled else None
+
+    async def _write(self, op: str, data: Any) -> None:
+        """
+        Upsert points / delete IDs in the live store.
+
+        During a reindex the change is also logged for the new store, so a
+        live store that rejects it (e.g. vectors of the new dimension) only
+        warns: the learning is kept in the collection about to be swapped in.
+        """
+        if self._change_log is not None:
+            self._change_log.append((op, data))
         try:
-            self._client.get_collection(self._settings.collection_name)
-            logger.info(f"Collection '{self._settings.collection_name}' exists")
-        except (UnexpectedResponse, Exception):
-            logger.info(f"Creating collection '{self._settings.collection_name}'")
-            self._client.create_collection(
-                collection_name=self._settings.collection_name,
-                vectors_config=qdrant_models.VectorParams(
-                    size=self._settings.vector_size,
-                    distance=qdrant_models.Distance.COSINE,
-                ),
-            )
-            logger.info(f"Collection '{self._settings.collection_name}' created")
+            if op == "upsert":
+                await self._store.upsert(data)
+            else:
+                await self._store.delete(data)
+        except Exception as e:
+            if self._change_log is None:
+                raise
+            logger.warning(f"Live store rejected {op} during reindex (kept for the new collection): {e}")
+
+    async def swap_store(self, store: VectorStore) -> VectorStore:
+        """
+        Replay the writes logged since record_changes() into `store`, then
+        serve from it. Returns the previous store.
+        """
+        while self._change_log:
+            changes = self._change_log[:]
+            del self._change_log[:len(changes)]
+            for op, data in changes:
+                if op == "upsert":
+                    await store.upsert(data)
+                else:
+                    await store.delete(data)
+        # No await between the empty log and the swap: nothing can slip through
+        self._change_log = None
+        previous, self._store = self._store, store
+        return previous
 
-    def store_learning(
+    async def store_learning(
         self,
         goal_description: str,
         learning: str,
@@ -84,8 +124,8 @@ class QdrantService:
             ID of the stored learning
         """
         # Generate embedding from goal + learning combined
-        text_to_embed = f"{goal_description}\n\n{learning}"
-        vector = self._embedding_service.embed_text(text_to_embed)
+        text_to_embed = learning_text(goal_description, learning)
+        vector = await self._embedding_service.embed_text_async(text_to_embed)
 
         # Create point
         point_id = str(uuid4())
@@ -102,21 +142,58 @@ class QdrantService:
             **(metadata or {}),
         }
 
-        self.client.upsert(
-            collection_name=self._settings.collection_name,
-            points=[
-                qdrant_models.PointStruct(
-                    id=point_id,
-                    vector=vector,
-                    payload=payload,
-                )
-            ],
-        )
+        await self._write("upsert", [VectorPoint(id=point_id, vector=vector, payload=payload)])
+        await self._lexical.add_async(point_id, text_to_embed, payload)
 
         logger.info(f"Stored learning {point_id}: {learning[:50]}...")
         return point_id
 
-    def query_learnings(
+    async def store_learnings(
+        self,
+        learnings: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Store many learnings at once (e.g. imported from another project).
+
+        Texts are encoded in a single embed_texts batch and upserted in chunks,
+        instead of one embedding and one request per learning.
+
+        Args:
+            learnings: Payloads with at least goal_description and learning
+            chunk_size: Points per upsert (defaults to reindex_upsert_chunk)
+
+        Returns:
+            IDs of the stored learnings, in input order
+        """
+        if not learnings:
+            return []
+
+        chunk_size = chunk_size or self._settings.reindex_upsert_chunk
+        vectors = await self._embedding_service.embed_texts_async([
+            learning_text(item.get("goal_description", ""), item.get("learning", ""))
+            for item in learnings
+        ])
+        points = [
+            VectorPoint(
+                id=str(uuid4()),
+                vector=vector,
+                payload={"timestamp": datetime.utcnow().isoformat(), **item},
+            )
+            for item, vector in zip(learnings, vectors)
+        ]
+
+        for start in range(0, len(points), chunk_size):
+            await self._write("upsert", points[start:start + chunk_size])
+        await self._lexical.add_many_async(
+            (point.id, learning_text(item.get("goal_description", ""), item.get("learning", "")), point.payload)
+            for item, point in zip(learnings, points)
+        )
+
+        logger.info(f"Stored {len(points)} learnings in batch")
+        return [point.id for point in points]
+
+    async def query_learnings(
         self,
         query_text: str,
         limit: int = 5,
@@ -135,30 +212,17 @@ class QdrantService:
         Returns:
             List of relevant learnings with scores
         """
-        vector = self._embedding_service.embed_text(query_text)
-
-        # Build filter if needed
-        query_filter = None
-        if outcome_filter:
-            query_filter = qdrant_models.Filter(
-                must=[
-                    qdrant_models.FieldCondition(
-                        key="outcome",
-                        match=qdrant_models.MatchValue(value=outcome_filter),
-                    )
-                ]
-            )
+        vector = await self._embedding_service.embed_text_async(query_text)
 
-        results = self.client.query_points(
-            collection_name=self._settings.collection_name,
-            query=vector,
-            query_filter=query_filter,
+        results = await self._store.query(
+            vector,
             limit=limit,
             score_threshold=score_threshold,
+            payload_filter={"outcome": outcome_filter} if outcome_filter else None,
         )
 
         learnings = []
-        for result in results.points:
+        for result in results:
             learnings.append({
                 "id": result.id,
                 "score": result.score,
@@ -168,54 +232,126 @@ class QdrantService:
         logger.info(f"Found {len(learnings)} relevant learnings for query")
         return learnings
 
-    def get_learning_by_id(self, learning_id: str) -> Optional[Dict[str, Any]]:
+    async def search_learnings(
+        self,
+        query_text: str,
+        limit: int = 5,
+        min_score: float = 0.5,
+        outcome_filter: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Hybrid retrieval: BM25 and vector rankings fused by reciprocal rank.
+
+        Vector hits must pass `min_score`; lexical hits only need to share a
+        term with the query, so exact identifiers survive even when the
+        embeddings blur them. While the embedding model is cold or the vector
+        backend fails, the BM25 ranking answers alone (keyword fast path).
+
+        Returns:
+            Learnings best first; `score` is the fused score, with
+            `vector_score`/`bm25_score` and `retrieval` ("hybrid"/"keyword")
+        """
+        if not self._settings.hybrid_search:
+            return await self.query_learnings(query_text, limit, min_score, outcome_filter)
+
+        candidates = max(limit, self._settings.hybrid_candidates)
+        payload_filter = {"outcome": outcome_filter} if outcome_filter else None
+        lexical = await self._lexical.search_async(query_text, candidates, payload_filter)
+
+        vector_results = None
+        if getattr(self._embedding_service, "is_loaded", True):
+            try:
+                vector_results = await self.query_learnings(query_text, candidates, min_score, outcome_filter)
+            except Exception as e:
+                logger.warning(f"Vector search unavailable, using keyword fast path: {e}")
+        else:
+            self._warm_embeddings_in_background()
+
+        if vector_results is None:
+            return [
+                {"id": doc_id, "score": score, "bm25_score": score, "retrieval": "keyword", **self._lexical.payload(doc_id)}
+                for doc_id, score in lexical[:limit]
+            ]
+
+        by_id = {str(r["id"]): r for r in vector_results}
+        bm25 = dict(lexical)
+        fused = reciprocal_rank_fusion(
+            [list(by_id), [doc_id for doc_id, _ in lexical]],
+            k=self._settings.hybrid_rrf_k,
+        )
+
+        results = []
+        for doc_id, score in fused[:limit]:
+            hit = by_id.get(doc_id)
+            payload = {k: v for k, v in hit.items() if k not in ("id", "score")} if hit else self._lexical.payload(doc_id)
+            results.append({
+                "id": doc_id,
+                "score": score,
+                "vector_score": hit["score"] if hit else None,
+                "bm25_score": bm25.get(doc_id),
+                "retrieval": "hybrid",
+                **payload,
+            })
+        return results
+
+    def _warm_embeddings_in_background(self) -> None:
+        """Load a cold model without making the current query wait for it."""
+        warm_up = getattr(self._embedding_service, "warm_up", None)
+        if warm_up and (self._warming is None or self._warming.done()):
+            self._warming = asyncio.get_running_loop().create_task(warm_up())
+
+    async def backfill_lexical_index(self) -> int:
+        """Index learnings already in the vector store when the BM25 index is empty."""
+        if len(self._lexical):
+            return 0
+
+        indexed, offset = 0, None
+        while True:
+            points, offset = await self._store.scroll(self._settings.reindex_batch_size, offset)
+            await self._lexical.add_many_async(
+                (p.id, learning_text(p.payload.get("goal_description", ""), p.payload.get("learning", "")), p.payload)
+                for p in points
+            )
+            indexed += len(points)
+            if offset is None:
+                break
+
+        if indexed:
+            logger.info(f"Indexed {indexed} existing learnings for keyword search")
+        return indexed
+
+    async def get_learning_by_id(self, learning_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific learning by ID."""
         try:
-            results = self.client.retrieve(
-                collection_name=self._settings.collection_name,
-                ids=[learning_id],
-            )
+            results = await self._store.retrieve([learning_id])
             if results:
                 return {"id": results[0].id, **results[0].payload}
         except Exception as e:
             logger.error(f"Error retrieving learning {learning_id}: {e}")
         return None
 
-    def delete_learning(self, learning_id: str) -> bool:
+    async def delete_learning(self, learning_id: str) -> bool:
         """Delete a learning by ID."""
         try:
-            self.client.delete(
-                collection_name=self._settings.collection_name,
-                points_selector=qdrant_models.PointIdsList(
-                    points=[learning_id],
-                ),
-            )
+            await self._write("delete", [learning_id])
+            await self._lexical.remove_async(learning_id)
             logger.info(f"Deleted learning {learning_id}")
             return True
         except Exception as e:
             logger.error(f"Error deleting learning {learning_id}: {e}")
             return False
 
-    def get_collection_stats(self) -> Dict[str, Any]:
+    async def get_collection_stats(self) -> Dict[str, Any]:
         """Get collection statistics."""
         try:
-            info = self.client.get_collection(self._settings.collection_name)
-            return {
-                "points_count": info.points_count,
-                "vectors_count": info.vectors_count,
-                "status": info.status,
-            }
+            return await self._store.stats()
         except Exception as e:
             logger.error(f"Error getting collection stats: {e}")
             return {"error": str(e)}
 
-    def health_check(self) -> bool:
-        """Check if Qdrant is healthy."""
-        try:
-            self.client.get_collections()
-            return True
-        except Exception:
-            return False
+    async def health_check(self) -> bool:
+        """Check if the vector store is healthy."""
+        return await self._store.health_check()
 
 
 @lru_cache
@@ -6,8 +6,15 @@ import re
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
+from ..config.settings import get_settings
+
 logger = logging.getLogger(__name__)
 
+# Último resultado de check_usage (compartilhado entre instâncias) para detectar o reset
+_last_safe_to_execute: Optional[bool] = None
+# Poll independente enquanto o uso está acima do limite (o ciclo do orquestrador fica pausado)
+_reset_watch_task: Optional[asyncio.Task] = None
+
 
 @dataclass
 class UsageInfo:
@@ -35,9 +42,50 @@ class UsageCheckerService:
         """
         Check current Claude Code usage by running `claude /usage`.
 
+        Publishes USAGE_RESET on the orchestrator event bus when usage goes
+        back under the limit after having been over it.
+
         Returns:
             UsageInfo with usage percentages and safety status
         """
+        global _last_safe_to_execute
+
+        usage = await self._run_usage_command()
+        if usage.is_safe_to_execute and _last_safe_to_execute is False:
+            from .orchestrator_events import OrchestratorEvent, publish_orchestrator_event
+            logger.info("[UsageChecker] Usage back under the limit")
+            publish_orchestrator_event(OrchestratorEvent.USAGE_RESET)
+        _last_safe_to_execute = usage.is_safe_to_execute
+        if not usage.is_safe_to_execute:
+            self._watch_for_reset()
+        return usage
+
+    def _watch_for_reset(self) -> None:
+        """Start polling usage in the background until it goes back under the limit."""
+        global _reset_watch_task
+
+        if _reset_watch_task is not None and not _reset_watch_task.done():
+            return
+        _reset_watch_task = asyncio.create_task(self._poll_until_reset())
+
+    async def _poll_until_reset(self) -> None:
+        """
+        Poll usage with exponential backoff while over the limit.
+
+        check_usage publishes USAGE_RESET on the transition, waking the
+        orchestrator without waiting for its own cycle.
+        """
+        settings = get_settings()
+        delay = settings.orchestrator_usage_poll_seconds
+        while True:
+            await asyncio.sleep(delay)
+            usage = await self.check_usage()
+            if usage.is_safe_to_execute:
+                return
+            delay = min(delay * 2, settings.orchestrator_usage_poll_max_seconds)
+
+    async def _run_usage_command(self) -> UsageInfo:
+        """Run `claude /usage` and parse its output."""
         try:
             # Run claude /usage command
             process = await asyncio.create_subprocess_exec(
@@ -150,6 +198,19 @@ class UsageCheckerService:
         }
 
 
+async def stop_usage_reset_watch() -> None:
+    """Cancel the background usage poll (orchestrator stopped)."""
+    global _reset_watch_task
+
+    task, _reset_watch_task = _reset_watch_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
 def get_usage_checker_service(limit_threshold: int = 80) -> UsageCheckerService:
     """Get usage checker service instance."""
     return UsageCheckerService(limit_threshold=limit_threshold)
@@ -0,0 +1,80 @@
+"""Compact vector representations for the vector stores.
+
+- Matryoshka truncation: keep the first `vector_dimension` components and
+  renormalize (only meaningful for models trained that way).
+- Scalar int8 quantization: one byte per component plus a per-vector scale.
+- Binary quantization: one bit per component (sign), compared by Hamming
+  distance.
+
+Quantized codes are only used to pick candidates; the top `limit *
+rescore_oversampling` are rescored with the full-precision vectors.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+QUANTIZATION_KINDS = ("none", "int8", "binary")
+
+# Bits set in each byte value, for Hamming distance over packed codes
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def truncate_vector(vector: Sequence[float], dimension: Optional[int]) -> np.ndarray:
+    """First `dimension` components, L2-normalized (no-op if already short)."""
+    array = np.asarray(vector, dtype=np.float32)
+    if dimension and array.shape[-1] > dimension:
+        array = array[..., :dimension]
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+class QuantizedCodes:
+    """Row-aligned quantized copy of a float32 matrix, kept in RAM."""
+
+    def __init__(self, kind: str, dimension: int, capacity: int):
+        if kind not in QUANTIZATION_KINDS or kind == "none":
+            raise ValueError(f"Unknown quantization: {kind}")
+        self.kind = kind
+        self.dimension = dimension
+        width = dimension if kind == "int8" else (dimension + 7) // 8
+        dtype = np.int8 if kind == "int8" else np.uint8
+        self.codes = np.zeros((capacity, width), dtype=dtype)
+        self.scales = np.zeros(capacity, dtype=np.float32) if kind == "int8" else None
+
+    def resize(self, capacity: int) -> None:
+        extra = capacity - len(self.codes)
+        if extra > 0:
+            self.codes = np.concatenate([self.codes, np.zeros((extra, self.codes.shape[1]), self.codes.dtype)])
+            if self.scales is not None:
+                self.scales = np.concatenate([self.scales, np.zeros(extra, np.float32)])
+
+    def set(self, rows, vectors: np.ndarray) -> None:
+        """Quantize normalized vectors into the given rows."""
+        rows = np.atleast_1d(rows)
+        vectors = np.atleast_2d(vectors)
+        if self.kind == "int8":
+            max_abs = np.abs(vectors).max(axis=1)
+            max_abs[max_abs == 0] = 1.0
+            self.codes[rows] = np.round(vectors / max_abs[:, None] * 127).astype(np.int8)
+            self.scales[rows] = max_abs / 127
+        else:
+            self.codes[rows] = np.packbits(vectors > 0, axis=1)
+
+    def clear(self, row: int) -> None:
+        self.codes[row] = 0
+        if self.scales is not None:
+            self.scales[row] = 0.0
+
+    def approx_scores(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Similarity estimate for each row (higher is closer)."""
+        if self.kind == "int8":
+            return (self.codes[rows].astype(np.float32) @ query) * self.scales[rows]
+        query_bits = np.packbits(query > 0)
+        hamming = _POPCOUNT[np.bitwise_xor(self.codes[rows], query_bits)].sum(axis=1, dtype=np.int32)
+        return -hamming.astype(np.float32)
+
+    def memory_bytes(self, rows: int) -> int:
+        """RAM used by `rows` codes."""
+        per_row = self.codes.shape[1] * self.codes.itemsize + (4 if self.scales is not None else 0)
+        return rows * per_row
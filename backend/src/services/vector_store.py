@@ -0,0 +1,273 @@
+"""Pluggable vector store used by long-term memory.
+
+`VectorStore` is the interface QdrantService talks to. Two backends exist:
+
+- `QdrantVectorStore`: a Qdrant server reached through AsyncQdrantClient.
+- `LocalVectorStore` (local_vector_store.py): an in-process NumPy index in a
+  memory-mapped file, for single-node deployments without Qdrant.
+
+The backend is chosen by `vector_backend` in config/qdrant.py.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models as qdrant_models
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from ..config.qdrant import QdrantSettings, get_qdrant_settings
+from .vector_quantization import truncate_vector
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VectorPoint:
+    """A stored point: ID, payload and (optionally) vector and query score."""
+    id: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    vector: Optional[List[float]] = None
+    score: Optional[float] = None
+
+
+class VectorStore(ABC):
+    """Minimal async interface for a cosine-similarity vector collection."""
+
+    backend: str = ""
+
+    @abstractmethod
+    async def upsert(self, points: List[VectorPoint]) -> None:
+        """Insert or replace points by ID."""
+
+    @abstractmethod
+    async def query(
+        self,
+        vector: List[float],
+        limit: int,
+        score_threshold: Optional[float] = None,
+        payload_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[VectorPoint]:
+        """
+        Nearest points by cosine similarity, best first.
+
+        Args:
+            vector: Query vector
+            limit: Maximum number of points
+            score_threshold: Minimum similarity
+            payload_filter: Exact-match conditions on payload keys
+        """
+
+    @abstractmethod
+    async def retrieve(self, ids: List[str]) -> List[VectorPoint]:
+        """Points by ID (missing IDs are skipped)."""
+
+    @abstractmethod
+    async def delete(self, ids: List[str]) -> None:
+        """Delete points by ID."""
+
+    @abstractmethod
+    async def scroll(self, limit: int, offset: Any = None) -> Tuple[List[VectorPoint], Any]:
+        """
+        Page through every point's payload in a stable order.
+
+        Returns:
+            (points, next_offset); next_offset is None after the last page
+        """
+
+    @abstractmethod
+    async def stats(self) -> Dict[str, Any]:
+        """Collection statistics (points_count, vectors_count, status)."""
+
+    @abstractmethod
+    async def health_check(self) -> bool:
+        """Whether the backend is reachable."""
+
+
+class QdrantVectorStore(VectorStore):
+    """VectorStore backed by a Qdrant server (or an AsyncQdrantClient instance)."""
+
+    backend = "qdrant"
+
+    def __init__(self, client: Optional[AsyncQdrantClient] = None, settings: Optional[QdrantSettings] = None):
+        self._settings = settings or get_qdrant_settings()
+        self._client: Optional[AsyncQdrantClient] = client
+        self._client_ready = False
+        self._client_lock = asyncio.Lock()
+
+    @property
+    def collection_name(self) -> str:
+        return self._settings.collection_name
+
+    async def get_client(self) -> AsyncQdrantClient:
+        """Lazy initialize the async Qdrant client (and the collection)."""
+        if self._client_ready:
+            return self._client
+
+        async with self._client_lock:
+            if not self._client_ready:
+                if self._client is None:
+                    logger.info(f"Connecting to Qdrant at {self._settings.url}")
+                    self._client = AsyncQdrantClient(
+                        host=self._settings.host,
+                        port=self._settings.port,
+                        api_key=self._settings.api_key,
+                        https=self._settings.https,
+                    )
+                await self._ensure_collection()
+                self._client_ready = True
+        return self._client
+
+    async def _ensure_collection(self) -> None:
+        """Ensure the learnings collection exists."""
+        try:
+            await self._client.get_collection(self.collection_name)
+            logger.info(f"Collection '{self.collection_name}' exists")
+        except (UnexpectedResponse, Exception):
+            logger.info(f"Creating collection '{self.collection_name}'")
+            quantization_config = self._quantization_config()
+            await self._client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=qdrant_models.VectorParams(
+                    size=self._settings.stored_dimension,
+                    distance=qdrant_models.Distance.COSINE,
+                    # Originals only serve rescoring once codes are in RAM
+                    on_disk=quantization_config is not None,
+                ),
+                quantization_config=quantization_config,
+            )
+            logger.info(f"Collection '{self.collection_name}' created")
+
+    def _quantization_config(self):
+        """Qdrant quantization matching `vector_quantization` (None for float32)."""
+        kind = self._settings.vector_quantization
+        if kind == "int8":
+            return qdrant_models.ScalarQuantization(
+                scalar=qdrant_models.ScalarQuantizationConfig(
+                    type=qdrant_models.ScalarType.INT8,
+                    always_ram=True,
+                ),
+            )
+        if kind == "binary":
+            return qdrant_models.BinaryQuantization(
+                binary=qdrant_models.BinaryQuantizationConfig(always_ram=True),
+            )
+        return None
+
+    def _fit(self, vector: List[float]) -> List[float]:
+        return truncate_vector(vector, self._settings.stored_dimension).tolist()
+
+    async def upsert(self, points: List[VectorPoint]) -> None:
+        client = await self.get_client()
+        await client.upsert(
+            collection_name=self.collection_name,
+            points=[
+                qdrant_models.PointStruct(id=point.id, vector=self._fit(point.vector), payload=point.payload)
+                for point in points
+            ],
+        )
+
+    async def query(
+        self,
+        vector: List[float],
+        limit: int,
+        score_threshold: Optional[float] = None,
+        payload_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[VectorPoint]:
+        query_filter = None
+        if payload_filter:
+            query_filter = qdrant_models.Filter(
+                must=[
+                    qdrant_models.FieldCondition(
+                        key=key,
+                        match=qdrant_models.MatchValue(value=value),
+                    )
+                    for key, value in payload_filter.items()
+                ]
+            )
+
+        search_params = None
+        if self._settings.vector_quantization != "none":
+            search_params = qdrant_models.SearchParams(
+                quantization=qdrant_models.QuantizationSearchParams(
+                    rescore=True,
+                    oversampling=self._settings.rescore_oversampling,
+                ),
+            )
+
+        client = await self.get_client()
+        results = await client.query_points(
+            collection_name=self.collection_name,
+            query=self._fit(vector),
+            query_filter=query_filter,
+            search_params=search_params,
+            limit=limit,
+            score_threshold=score_threshold,
+        )
+        return [
+            VectorPoint(id=str(result.id), payload=result.payload or {}, score=result.score)
+            for result in results.points
+        ]
+
+    async def retrieve(self, ids: List[str]) -> List[VectorPoint]:
+        client = await self.get_client()
+        results = await client.retrieve(collection_name=self.collection_name, ids=ids)
+        return [VectorPoint(id=str(r.id), payload=r.payload or {}) for r in results]
+
+    async def delete(self, ids: List[str]) -> None:
+        client = await self.get_client()
+        await client.delete(
+            collection_name=self.collection_name,
+            points_selector=qdrant_models.PointIdsList(points=ids),
+        )
+
+    async def scroll(self, limit: int, offset: Any = None) -> Tuple[List[VectorPoint], Any]:
+        client = await self.get_client()
+        points, next_offset = await client.scroll(
+            collection_name=self.collection_name,
+            limit=limit,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False,
+        )
+        return [VectorPoint(id=str(p.id), payload=p.payload or {}) for p in points], next_offset
+
+    async def stats(self) -> Dict[str, Any]:
+        client = await self.get_client()
+        info = await client.get_collection(self.collection_name)
+        return {
+            "backend": self.backend,
+            "points_count": info.points_count or 0,
+            "vectors_count": getattr(info, "vectors_count", None) or info.points_count or 0,
+            "status": str(getattr(info.status, "value", info.status)),
+        }
+
+    async def health_check(self) -> bool:
+        try:
+            client = await self.get_client()
+            await client.get_collections()
+            return True
+        except Exception:
+            return False
+
+
+def create_vector_store(settings: Optional[QdrantSettings] = None) -> VectorStore:
+    """Build the backend selected by `vector_backend`."""
+    settings = settings or get_qdrant_settings()
+
+    if settings.vector_backend == "local":
+        from .local_vector_store import LocalVectorStore
+
+        return LocalVectorStore(
+            path=settings.local_store_path,
+            dimension=settings.stored_dimension,
+            ivf_threshold=settings.local_ivf_threshold,
+            quantization=settings.vector_quantization,
+            rescore_oversampling=settings.rescore_oversampling,
+        )
+    if settings.vector_backend != "qdrant":
+        raise ValueError(f"Unknown vector backend: {settings.vector_backend}")
+    return QdrantVectorStore(settings=settings)
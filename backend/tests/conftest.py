@@ -0,0 +1,60 @@
+"""Shared test fixtures."""
+
+import asyncio
+from typing import Optional
+
+import numpy as np
+import pytest
+
+EMBEDDING_DIM = 8
+
+
+class FakeEmbeddingService:
+    """
+    Stand-in for EmbeddingService without loading a model.
+
+    Vectors are deterministic per text; `seed` plays the role of the model.
+    With `constant`, every text maps to the same direction, so vectors cannot
+    tell learnings apart. `warm_up` waits for `release` when given.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        dim: int = EMBEDDING_DIM,
+        constant: bool = False,
+        loaded: bool = True,
+        release: Optional[asyncio.Event] = None,
+    ):
+        self.seed = seed
+        self.dim = dim
+        self.constant = constant
+        self.is_loaded = loaded
+        self.release = release
+        self.batches = []
+        self.warm_ups = 0
+
+    def vector(self, text: str):
+        if self.constant:
+            return np.ones(self.dim).tolist()
+        rng = np.random.default_rng(abs(hash((self.seed, text))) % 2**32)
+        return rng.standard_normal(self.dim).tolist()
+
+    async def embed_text_async(self, text):
+        return self.vector(text)
+
+    async def embed_texts_async(self, texts):
+        self.batches.append(len(texts))
+        return [self.vector(t) for t in texts]
+
+    async def warm_up(self):
+        if self.release is not None:
+            await self.release.wait()
+        self.warm_ups += 1
+        self.is_loaded = True
+
+
+@pytest.fixture
+def fake_embedding_service():
+    """Factory for FakeEmbeddingService (see its docstring for the options)."""
+    return FakeEmbeddingService
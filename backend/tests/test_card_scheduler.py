@@ -0,0 +1,88 @@
+"""Tests for the DAG card scheduler."""
+
+from src.models.card import Card
+from src.services.card_scheduler import (
+    DEFAULT_STAGE_DURATION_MS,
+    StageDurationEstimator,
+    build_schedule,
+)
+
+
+def _card(card_id, column="backlog", dependencies=None):
+    return Card(
+        id=card_id,
+        title=card_id,
+        column_id=column,
+        dependencies=dependencies or [],
+        model_plan="opus-4.5",
+        model_implement="opus-4.5",
+        model_test="opus-4.5",
+        model_review="opus-4.5",
+    )
+
+
+def _schedule(*cards, averages=()):
+    by_id = {card.id: card for card in cards}
+    return build_schedule([card.id for card in cards], by_id, StageDurationEstimator(averages))
+
+
+class TestCardScheduler:
+    """Test suite for build_schedule."""
+
+    def test_longest_chain_is_scheduled_first(self):
+        """A root that unblocks a long chain beats an isolated card listed before it."""
+        schedule = _schedule(
+            _card("solo"),
+            _card("root"),
+            _card("mid", dependencies=["root"]),
+            _card("leaf", dependencies=["mid"]),
+        )
+
+        assert [c.card.id for c in schedule.ready] == ["root", "solo"]
+        by_id = {c.card.id: c for c in schedule.cards}
+        assert by_id["root"].critical_path_ms == 3 * by_id["solo"].critical_path_ms
+        assert not by_id["mid"].ready_to_execute
+        assert by_id["mid"].can_plan_ahead
+        assert not by_id["root"].can_plan_ahead
+
+    def test_done_dependencies_unblock_cards(self):
+        """Cards whose dependencies are done become ready; done cards are not."""
+        schedule = _schedule(
+            _card("a", column="done"),
+            _card("b", dependencies=["a"]),
+        )
+
+        assert [c.card.id for c in schedule.ready] == ["b"]
+
+    def test_cycles_are_detected_and_never_ready(self):
+        """Cards in (or behind) a cycle are reported and not scheduled."""
+        schedule = _schedule(
+            _card("a", dependencies=["b"]),
+            _card("b", dependencies=["a"]),
+            _card("c", dependencies=["b"]),
+            _card("d"),
+        )
+
+        assert sorted(schedule.cycle) == ["a", "b", "c"]
+        assert [c.card.id for c in schedule.ready] == ["d"]
+        assert [c.card.id for c in schedule.cards][-3:] == ["a", "b", "c"]
+
+    def test_missing_dependency_is_unsatisfied(self):
+        """A dependency outside the goal keeps the card waiting."""
+        schedule = _schedule(_card("a", dependencies=["elsewhere"]))
+
+        assert schedule.ready == []
+        assert schedule.cycle == []
+
+    def test_estimates_use_execution_metrics(self):
+        """Stage estimates come from metrics, falling back to defaults."""
+        estimator = StageDurationEstimator([
+            {"command": "/implement", "model": "opus-4.5", "avgDurationMs": 1000.0, "samples": 3},
+            {"command": "/implement", "model": "sonnet-4.5", "avgDurationMs": 4000.0, "samples": 1},
+        ])
+
+        assert estimator.estimate("implement", "opus-4.5") == 1000.0
+        assert estimator.estimate("implement", "haiku-4.5") == 1750.0
+        assert estimator.estimate("plan", "opus-4.5") == DEFAULT_STAGE_DURATION_MS["plan"]
+        assert estimator.remaining(_card("x", column="review")) == DEFAULT_STAGE_DURATION_MS["review"]
+        assert estimator.remaining(_card("y", column="done")) == 0.0
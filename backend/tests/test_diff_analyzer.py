@@ -0,0 +1,189 @@
+"""Tests for the streaming diff capture and the diff cache."""
+
+import asyncio
+import subprocess
+
+import pytest
+
+from src.config.settings import get_settings
+from src.services.diff_analyzer import DiffAnalyzer, _read_lines
+from src.services.diff_cache import DiffCache
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.email", "dev@example.com")
+    _git(path, "config", "user.name", "Dev")
+    for name in ["keep.py", "edit.py", "gone.py", "old name.py"]:
+        (path / name).write_text(f"# {name}\nvalue = 1\n")
+    _git(path, "add", ".")
+    _git(path, "commit", "-q", "-m", "base")
+
+    _git(path, "checkout", "-q", "-b", "agent/card")
+    (path / "edit.py").write_text("# edit.py\nvalue = 2\nother = 3\n")
+    (path / "gone.py").unlink()
+    _git(path, "mv", "old name.py", "new name.py")
+    (path / "ação.txt").write_text("novo\n")
+    (path / "image.bin").write_bytes(bytes(range(256)))
+    _git(path, "add", "-A")
+    _git(path, "commit", "-q", "-m", "change")
+    return path
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return DiffAnalyzer(DiffCache(str(tmp_path / "diff_cache.db")))
+
+
+@pytest.mark.asyncio
+class TestDiffAnalyzer:
+    """Test suite for DiffAnalyzer.capture_diff."""
+
+    async def test_single_pass_matches_git(self, analyzer, repo):
+        stats = await analyzer.capture_diff(str(repo), "agent/card", include_content=True)
+
+        assert sorted(stats.files_added) == ["ação.txt", "image.bin"]
+        assert sorted(stats.files_modified) == ["edit.py", "new name.py"]
+        assert stats.files_removed == ["gone.py"]
+        assert (stats.lines_added, stats.lines_removed) == (3, 3)
+        assert stats.total_changes == 6
+        assert "3 insertions(+), 3 deletions(-)" in _git(repo, "diff", "--shortstat", "main...HEAD")
+
+        diffs = {diff.path: diff for diff in stats.file_diffs}
+        assert set(diffs) == {"ação.txt", "edit.py", "gone.py", "image.bin", "new name.py"}
+        assert diffs["edit.py"].status == "modified"
+        assert "+other = 3" in diffs["edit.py"].content
+        assert diffs["gone.py"].status == "removed"
+        assert diffs["ação.txt"].content.endswith("+novo")
+        assert not any(diff.truncated for diff in stats.file_diffs)
+
+    async def test_large_files_are_truncated(self, analyzer, repo, monkeypatch):
+        monkeypatch.setattr(get_settings(), "diff_max_file_kb", 4)
+        (repo / "big.py").write_text("".join(f"line_{i} = {i}\n" for i in range(5000)))
+        (repo / "minified.js").write_text("x" * 100_000)
+        _git(repo, "add", "-A")
+        _git(repo, "commit", "-q", "-m", "big")
+
+        stats = await analyzer.capture_diff(str(repo), "agent/card", include_content=True)
+
+        diffs = {diff.path: diff for diff in stats.file_diffs}
+        big = diffs["big.py"]
+        assert big.truncated and len(big.content) < 5 * 1024
+        assert big.content.startswith("diff --git a/big.py b/big.py")
+        assert "diff truncated:" in big.content.splitlines()[-1]
+        assert diffs["minified.js"].truncated
+        assert stats.lines_added == 3 + 5000 + 1
+        assert not diffs["edit.py"].truncated
+
+    async def test_total_budget_keeps_headers(self, analyzer, repo, monkeypatch):
+        monkeypatch.setattr(get_settings(), "diff_max_total_mb", 0)
+
+        stats = await analyzer.capture_diff(str(repo), "agent/card", include_content=True)
+
+        assert len(stats.file_diffs) == 5
+        for diff in stats.file_diffs:
+            assert diff.content.startswith("diff --git ")
+            assert diff.truncated
+
+    async def test_missing_worktree(self, analyzer, tmp_path):
+        assert await analyzer.capture_diff(str(tmp_path / "nope"), "agent/x") is None
+
+
+@pytest.mark.asyncio
+class TestDiffCache:
+    """Test suite for the (base, head) diff cache."""
+
+    async def test_summary_is_content_free_and_files_load_lazily(self, repo, analyzer):
+        stats = await analyzer.capture_diff(str(repo), "agent/card")
+
+        assert stats.base_commit == _git(repo, "rev-parse", "main")
+        assert stats.head_commit == _git(repo, "rev-parse", "HEAD")
+        assert all(diff.content == "" for diff in stats.file_diffs)
+
+        file_diff = await analyzer.get_file_diff(str(repo), "edit.py", stats.base_commit, stats.head_commit)
+        assert "+other = 3" in file_diff.content
+
+    async def test_unchanged_range_is_a_cache_read(self, repo, analyzer, monkeypatch):
+        first = await analyzer.capture_diff(str(repo), "agent/card")
+
+        async def no_git(*args, **kwargs):
+            raise AssertionError("git diff should not run on a cache hit")
+
+        monkeypatch.setattr(analyzer, "_stream_diff", no_git)
+        again = await analyzer.capture_diff(str(repo), "agent/card")
+        assert again == first
+        assert analyzer.cache.hits == 1
+        assert "+novo" in await analyzer.get_detailed_diff(str(repo), "ação.txt")
+
+        # Cached files are still served once the worktree is gone
+        removed = await analyzer.get_file_diff(
+            str(repo.parent / "gone"), "gone.py", first.base_commit, first.head_commit
+        )
+        assert removed.status == "removed"
+
+    async def test_new_commit_is_a_new_entry(self, repo, analyzer):
+        first = await analyzer.capture_diff(str(repo), "agent/card")
+        (repo / "edit.py").write_text("# edit.py\nvalue = 4\n")
+        _git(repo, "commit", "-qam", "more")
+
+        second = await analyzer.capture_diff(str(repo), "agent/card")
+
+        assert second.head_commit != first.head_commit
+        assert analyzer.cache.stats()["entries"] == 2
+        assert "+value = 4" in (await analyzer.get_file_diff(str(repo), "edit.py")).content
+
+    async def test_persisted_and_bounded(self, repo, tmp_path):
+        path = str(tmp_path / "persisted.db")
+        stats = await DiffAnalyzer(DiffCache(path)).capture_diff(str(repo), "agent/card")
+
+        reopened = DiffCache(path, max_entries=1)
+        assert reopened.get_summary(stats.base_commit, stats.head_commit)["lines_added"] == 3
+        reopened.put("b" * 40, "c" * 40, stats)
+        assert reopened.get_summary(stats.base_commit, stats.head_commit) is None
+        assert reopened.get_file(stats.base_commit, stats.head_commit, "edit.py") is None
+
+    async def test_pinned_range_survives_eviction_and_worktree_removal(self, repo, tmp_path):
+        _git(repo, "checkout", "-q", "main")
+        worktree = tmp_path / "card-wt"
+        _git(repo, "worktree", "add", "-q", str(worktree), "agent/card")
+        analyzer = DiffAnalyzer(DiffCache(max_entries=1))
+
+        stats = await analyzer.capture_diff(str(worktree), "agent/card", card_id="card-1")
+        analyzer.cache.put("b" * 40, "c" * 40, stats)
+        analyzer.cache.put("d" * 40, "e" * 40, stats)
+        _git(repo, "worktree", "remove", "--force", str(worktree))
+
+        assert analyzer.cache.stats()["pinned"] == 1
+        cached = await analyzer.get_file_diff(str(worktree), "edit.py", stats.base_commit, stats.head_commit)
+        assert "+other = 3" in cached.content
+
+        analyzer.cache.unpin("card-1")
+        analyzer.cache.put("f" * 40, "0" * 40, stats)
+        assert analyzer.cache.get_summary(stats.base_commit, stats.head_commit) is None
+
+        # Evicted and no worktree: the project repository still has the commits
+        assert await analyzer.get_file_diff(str(worktree), "edit.py", stats.base_commit, stats.head_commit) is None
+        from_repo = await analyzer.get_file_diff(
+            str(worktree), "edit.py", stats.base_commit, stats.head_commit, repo_path=str(repo)
+        )
+        assert "+other = 3" in from_repo.content
+        # ...but a range without a summary is not cached file by file
+        assert analyzer.cache.get_file(stats.base_commit, stats.head_commit, "edit.py") is None
+
+
+@pytest.mark.asyncio
+async def test_read_lines_cuts_long_lines():
+    stream = asyncio.StreamReader()
+    stream.feed_data(b"short\n" + b"y" * 200_000 + b"\nafter\nlast")
+    stream.feed_eof()
+
+    lines = [line async for batch in _read_lines(stream, max_line=10) for line in batch]
+
+    assert lines == [(b"short", False), (b"y" * 10, True), (b"after", False), (b"last", False)]
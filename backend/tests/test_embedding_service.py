@@ -0,0 +1,146 @@
+"""Tests for off-loop embedding and the async Qdrant service."""
+
+import asyncio
+import time
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+
+from src.config.qdrant import get_qdrant_settings
+from src.services.embedding_cache import EmbeddingCache
+from src.services.embedding_service import EmbeddingService
+from src.services.lexical_index import LexicalIndex
+from src.services.qdrant_service import QdrantService
+from src.services.vector_store import QdrantVectorStore
+
+
+class SlowFakeModel:
+    """Blocks like a real CPU-bound encode and returns deterministic vectors."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.encoded = []
+
+    def encode(self, texts, convert_to_numpy=True):
+        import numpy as np
+
+        time.sleep(self.delay)
+        self.encoded.append(texts)
+        single = isinstance(texts, str)
+        size = get_qdrant_settings().vector_size
+        vectors = []
+        for text in [texts] if single else texts:
+            vector = np.zeros(size, dtype=np.float32)
+            vector[sum(map(ord, text)) % size] = 1.0
+            vectors.append(vector)
+        return vectors[0] if single else np.stack(vectors)
+
+
+def _embedding_service(delay: float = 0.0, cache_path=None) -> EmbeddingService:
+    cache = EmbeddingCache("fake-model", max_entries=2, path=cache_path)
+    service = EmbeddingService(max_workers=1, cache=cache)
+    service._model = SlowFakeModel(delay)
+    return service
+
+
+@pytest.mark.asyncio
+class TestEmbeddingOffLoop:
+    """Test suite for the embedding thread pool."""
+
+    async def test_encode_does_not_stall_event_loop(self):
+        """A slow encode runs while the loop keeps ticking on schedule."""
+        service = _embedding_service(delay=0.3)
+        max_lag = 0.0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal max_lag
+            loop = asyncio.get_running_loop()
+            while not done.is_set():
+                start = loop.time()
+                await asyncio.sleep(0.01)
+                max_lag = max(max_lag, loop.time() - start - 0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        vector = await service.embed_text_async("hello")
+        done.set()
+        await tick_task
+
+        assert len(vector) == get_qdrant_settings().vector_size
+        assert max_lag < 0.1
+
+    async def test_batch_embedding(self):
+        """embed_texts_async returns one vector per text."""
+        service = _embedding_service()
+
+        vectors = await service.embed_texts_async(["a", "b", "c"])
+
+        assert len(vectors) == 3
+
+
+class TestEmbeddingCache:
+    """Test suite for the content-addressed embedding cache."""
+
+    def test_repeated_text_skips_the_model(self):
+        """The second embed of the same text is served from the LRU."""
+        service = _embedding_service()
+
+        first = service.embed_text("goal")
+        second = service.embed_text("goal")
+
+        assert first == second
+        assert service.model.encoded == ["goal"]
+        assert service.cache_stats()["hits"] == 1
+        assert service.cache_stats()["misses"] == 1
+
+    def test_batch_only_encodes_misses(self):
+        """embed_texts sends only uncached texts to the model, in one batch."""
+        service = _embedding_service()
+        service.embed_text("a")
+
+        vectors = service.embed_texts(["a", "b", "c"])
+
+        assert len(vectors) == 3
+        assert service.model.encoded == ["a", ["b", "c"]]
+
+    def test_disk_store_survives_restart_and_lru_is_bounded(self, tmp_path):
+        """Evicted or restarted entries come back from the SQLite store."""
+        path = str(tmp_path / ".claude" / "embedding_cache.db")
+        service = _embedding_service(cache_path=path)
+        expected = service.embed_texts(["a", "b", "c"])
+        assert service.cache_stats()["memory_entries"] == 2
+
+        restarted = _embedding_service(cache_path=path)
+        assert restarted.embed_texts(["a", "b", "c"]) == expected
+        assert restarted.model.encoded == []
+        assert restarted.cache_stats()["disk_hits"] == 3
+
+    def test_key_depends_on_model(self):
+        """Switching models never reuses vectors from the previous one."""
+        assert EmbeddingCache("m1").key("text") != EmbeddingCache("m2").key("text")
+
+
+@pytest.mark.asyncio
+class TestAsyncQdrantService:
+    """Test suite for QdrantService on AsyncQdrantClient."""
+
+    async def test_store_and_query_learning(self):
+        """Stored learnings are found again by an identical query."""
+        service = QdrantService(
+            store=QdrantVectorStore(client=AsyncQdrantClient(location=":memory:")),
+            embedding_service=_embedding_service(),
+            lexical_index=LexicalIndex(),
+        )
+
+        learning_id = await service.store_learning(
+            goal_description="goal",
+            learning="use smaller batches",
+            cards_created=["card-1"],
+            outcome="success",
+        )
+        results = await service.query_learnings("goal\n\nuse smaller batches", score_threshold=0.9)
+
+        assert [r["id"] for r in results] == [learning_id]
+        assert results[0]["learning"] == "use smaller batches"
+        assert (await service.get_learning_by_id(learning_id))["outcome"] == "success"
+        assert await service.health_check()
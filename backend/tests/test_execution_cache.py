@@ -0,0 +1,96 @@
+"""Tests for the bounded execution cache."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.cache import ExecutionCache
+
+
+def _payload(execution_id="exec-1", n_logs=2, content="x"):
+    logs = [
+        {"timestamp": "2026-01-01T00:00:00", "type": "text", "content": content, "sequence": i}
+        for i in range(1, n_logs + 1)
+    ]
+    return {"executionId": execution_id, "result": None, "lastSequence": n_logs, "logs": logs}
+
+
+def _log(sequence, content="new"):
+    return {"timestamp": "2026-01-01T00:00:01", "type": "text", "content": content, "sequence": sequence}
+
+
+class TestExecutionCache:
+    """Test suite for ExecutionCache."""
+
+    def test_lru_eviction_by_entries(self):
+        cache = ExecutionCache(ttl_seconds=60, max_entries=2, max_bytes=10**6)
+        cache.set("a", _payload())
+        cache.set("b", _payload())
+        cache.get("a")
+        cache.set("c", _payload())
+
+        assert cache.get("b") is None
+        assert cache.get("a") and cache.get("c")
+        assert cache.stats()["evictions"] == 1
+
+    def test_byte_limit_evicts_and_rejects(self):
+        cache = ExecutionCache(ttl_seconds=60, max_entries=10, max_bytes=20_000)
+        cache.set("a", _payload(content="x" * 8000))
+        cache.set("b", _payload(content="x" * 8000))
+
+        assert len(cache) == 1 and cache.get("b")
+        assert cache.stats()["bytes"] <= 20_000
+
+        cache.set("huge", _payload(content="x" * 50_000))
+        assert cache.get("huge") is None
+        assert cache.stats()["rejected"] == 1
+
+    def test_ttl_expiry_and_purge(self, monkeypatch):
+        cache = ExecutionCache(ttl_seconds=10, max_entries=10, max_bytes=10**6)
+        now = time.monotonic()
+        cache.set("a", _payload())
+        cache.set("b", _payload())
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+        assert cache.get("a") is None
+        assert cache.purge_expired() == 1
+        stats = cache.stats()
+        assert stats["entries"] == 0 and stats["bytes"] == 0
+        assert stats["expirations"] == 2
+
+    def test_append_updates_entry_in_place(self):
+        cache = ExecutionCache(ttl_seconds=60, max_entries=10, max_bytes=10**6)
+        cache.set("a", _payload())
+        size = cache.stats()["bytes"]
+
+        assert cache.append_logs("a", "exec-1", [_log(3), _log(4)])
+        assert cache.append_logs("a", "exec-1", [_log(4)])  # já presente
+
+        cached = cache.get("a")
+        assert [log["sequence"] for log in cached["logs"]] == [1, 2, 3, 4]
+        assert cached["lastSequence"] == 4
+        assert cache.stats()["bytes"] > size
+
+    def test_append_with_gap_or_other_execution_invalidates(self):
+        cache = ExecutionCache(ttl_seconds=60, max_entries=10, max_bytes=10**6)
+        cache.set("a", _payload())
+        cache.set("b", _payload())
+
+        assert not cache.append_logs("a", "exec-1", [_log(5)])
+        assert not cache.append_logs("b", "exec-2", [_log(3)])
+        assert cache.get("a") is None and cache.get("b") is None
+        assert cache.stats()["bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_janitor_purges_on_schedule(self):
+        cache = ExecutionCache(ttl_seconds=0, max_entries=10, max_bytes=10**6)
+        cache.set("a", _payload())
+
+        cache.start_janitor(interval=0.01)
+        await asyncio.sleep(0.05)
+        assert cache.stats()["janitorRunning"]
+        await cache.stop_janitor()
+
+        assert len(cache) == 0
+        assert not cache.stats()["janitorRunning"]
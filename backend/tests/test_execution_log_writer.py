@@ -0,0 +1,155 @@
+"""Tests for the buffered execution log writer."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+
+from src.database import Base
+from src.models.card import Card
+from src.models.execution import ExecutionLog, ExecutionStatus
+from src.models.project import ActiveProject  # noqa: F401
+from src.repositories.execution_repository import ExecutionRepository
+from src.services.execution_log_writer import (
+    ExecutionLogWriter,
+    close_log_writer,
+    get_log_writer,
+    open_log_writer,
+)
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    """Create a file-backed test database (the writer uses its own connections)."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", echo=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def async_session(engine):
+    """Create an async test database session."""
+    async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session_maker() as session:
+        session.add(Card(id="card-1", title="Card", column_id="implement"))
+        await session.commit()
+        yield session
+
+
+async def _count_logs(session: AsyncSession, execution_id: str) -> int:
+    result = await session.execute(
+        select(func.count(ExecutionLog.id)).where(ExecutionLog.execution_id == execution_id)
+    )
+    return result.scalar()
+
+
+@pytest.mark.asyncio
+class TestExecutionLogWriter:
+    """Test suite for ExecutionLogWriter."""
+
+    async def test_logs_are_buffered_until_batch_size(self, engine, async_session):
+        """Logs stay in memory until the batch threshold is reached."""
+        repo = ExecutionRepository(async_session)
+        execution = await repo.create_execution("card-1", "/implement", "impl")
+
+        writer = ExecutionLogWriter(engine, execution.id, "card-1", batch_size=10, flush_interval=60)
+        for i in range(9):
+            await writer.add("text", f"line {i}")
+
+        assert writer.pending == 9
+        assert await _count_logs(async_session, execution.id) == 0
+
+        await writer.add("text", "line 9")
+
+        assert writer.pending == 0
+        assert await _count_logs(async_session, execution.id) == 10
+        await writer.close()
+
+    async def test_timer_flushes_partial_batch(self, engine, async_session):
+        """A partial batch is persisted after the flush interval."""
+        repo = ExecutionRepository(async_session)
+        execution = await repo.create_execution("card-1", "/implement", "impl")
+
+        writer = ExecutionLogWriter(engine, execution.id, "card-1", batch_size=100, flush_interval=0.01)
+        await writer.add("text", "only line")
+        await asyncio.sleep(0.2)
+
+        assert writer.pending == 0
+        assert await _count_logs(async_session, execution.id) == 1
+
+    async def test_completion_flushes_and_preserves_order(self, async_session):
+        """Completing an execution persists every buffered log in sequence order."""
+        repo = ExecutionRepository(async_session)
+        execution = await repo.create_execution("card-1", "/implement", "impl")
+
+        for i in range(123):
+            await repo.add_log(execution.id, "text", f"line {i}")
+
+        await repo.update_execution_status(execution.id, ExecutionStatus.SUCCESS)
+
+        assert get_log_writer(execution.id) is None
+        result = await async_session.execute(
+            select(ExecutionLog.sequence, ExecutionLog.content)
+            .where(ExecutionLog.execution_id == execution.id)
+            .order_by(ExecutionLog.sequence)
+        )
+        rows = result.all()
+        assert [r.sequence for r in rows] == list(range(1, 124))
+        assert [r.content for r in rows] == [f"line {i}" for i in range(123)]
+
+    async def test_writer_stays_registered_while_closing(self, engine, async_session):
+        """Replay still finds the final batch while close() is persisting it."""
+        repo = ExecutionRepository(async_session)
+        execution = await repo.create_execution("card-1", "/implement", "impl")
+        writer = open_log_writer(engine, execution.id, "card-1")
+        await writer.add("text", "last line")
+
+        closing = asyncio.get_running_loop().create_task(close_log_writer(execution.id))
+        await asyncio.sleep(0)
+
+        assert get_log_writer(execution.id) is writer
+        assert [e["content"] for e in writer.pending_entries()] == ["last line"]
+        await closing
+        assert get_log_writer(execution.id) is None
+        assert await _count_logs(async_session, execution.id) == 1
+
+    async def test_close_during_timer_flush_does_not_duplicate(self, engine, async_session):
+        """Closing while the timer's flush is committing waits for it instead of re-inserting."""
+        repo = ExecutionRepository(async_session)
+        execution = await repo.create_execution("card-1", "/implement", "impl")
+
+        class SlowWriter(ExecutionLogWriter):
+            async def _insert(self, rows):
+                await super()._insert(rows)
+                await asyncio.sleep(0.05)  # committed, still awaiting
+
+        writer = SlowWriter(engine, execution.id, "card-1", batch_size=100, flush_interval=0.01)
+        await writer.add("text", "line 1")
+        await asyncio.sleep(0.03)
+        assert writer.pending_entries()  # flush in progress
+
+        await writer.close()
+
+        assert writer.pending == 0
+        assert await _count_logs(async_session, execution.id) == 1
+
+    async def test_resumes_sequence_for_existing_execution(self, async_session):
+        """A writer opened for an execution with persisted logs continues its sequence."""
+        repo = ExecutionRepository(async_session)
+        execution = await repo.create_execution("card-1", "/plan", "plan")
+        await repo.add_log(execution.id, "info", "first")
+        await repo.flush_logs(execution.id)
+
+        entry = await repo.add_log(execution.id, "info", "second")
+        await repo.flush_logs(execution.id)
+
+        assert entry["sequence"] == 2
+        assert await _count_logs(async_session, execution.id) == 2
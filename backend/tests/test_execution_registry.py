@@ -0,0 +1,71 @@
+"""Tests for the bounded in-memory execution registry."""
+
+import time
+from datetime import datetime, timedelta
+
+from src.execution import ExecutionLog, ExecutionRecord, ExecutionStatus, LogType
+from src.services.execution_registry import ExecutionRegistry
+
+
+def _record(card_id, status=ExecutionStatus.RUNNING, completed_at=None):
+    return ExecutionRecord(cardId=card_id, status=status, completedAt=completed_at, logs=[])
+
+
+def _log(n):
+    return ExecutionLog(timestamp=datetime.now().isoformat(), type=LogType.TEXT, content=f"line {n}")
+
+
+class TestExecutionRegistry:
+    """Test suite for ExecutionRegistry."""
+
+    def test_ring_buffer_keeps_last_lines(self):
+        registry = ExecutionRegistry(max_log_lines=3, grace_seconds=60)
+        record = _record("card-1")
+        registry["card-1"] = record
+
+        for n in range(10):
+            registry.append_log(record, _log(n))
+            assert len(record.logs) <= 6
+
+        assert [log.content for log in record.logs][-3:] == ["line 7", "line 8", "line 9"]
+        assert record.dropped_logs + len(record.logs) == 10
+        assert record.dropped_logs == 4
+
+    def test_completed_records_expire_after_grace(self, monkeypatch):
+        registry = ExecutionRegistry(max_log_lines=10, grace_seconds=30)
+        running = _record("running")
+        done = _record("done")
+        registry["running"] = running
+        registry["done"] = done
+        done.status = ExecutionStatus.SUCCESS
+        done.completed_at = datetime.now().isoformat()
+
+        assert registry.get("done") is done
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+
+        assert registry.get("done") is None
+        assert registry.values() == [running]
+
+    def test_old_completion_timestamp_is_honoured(self):
+        """A record that finished long ago is evicted on the first sweep."""
+        registry = ExecutionRegistry(max_log_lines=10, grace_seconds=30)
+        finished = (datetime.now() - timedelta(minutes=5)).isoformat()
+        registry["old"] = _record("old", ExecutionStatus.ERROR, finished)
+
+        registry["new"] = _record("new")
+
+        assert "old" not in registry
+        assert len(registry) == 1
+
+    def test_rerun_resets_completion(self, monkeypatch):
+        registry = ExecutionRegistry(max_log_lines=10, grace_seconds=30)
+        registry["card-1"] = _record("card-1", ExecutionStatus.SUCCESS, datetime.now().isoformat())
+        registry.evict_completed()
+        registry["card-1"] = _record("card-1")
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 60)
+
+        assert registry.get("card-1") is not None
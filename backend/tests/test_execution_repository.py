@@ -0,0 +1,219 @@
+"""Tests for Execution Repository."""
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+
+from src.cache import execution_cache
+from src.database import Base
+from src.models.card import Card
+from src.models.execution import Execution, ExecutionStatus
+from src.models.project import ActiveProject  # noqa: F401
+from src.repositories.execution_repository import ExecutionRepository
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    """Create a file-backed test database."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", echo=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def async_session(engine):
+    """Create an async test database session."""
+    async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session_maker() as session:
+        yield session
+
+
+def _execution(card_id, stage, model, input_tokens, output_tokens, is_active=False, started_at=None):
+    return Execution(
+        card_id=card_id,
+        command=f"/{stage}",
+        status=ExecutionStatus.SUCCESS if not is_active else ExecutionStatus.RUNNING,
+        workflow_stage=stage,
+        model_used=model,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=(input_tokens or 0) + (output_tokens or 0),
+        is_active=is_active,
+        started_at=started_at or datetime.utcnow(),
+    )
+
+
+@pytest.mark.asyncio
+class TestBoardStats:
+    """Test suite for ExecutionRepository.get_board_stats."""
+
+    async def test_board_stats_match_per_card_queries(self, async_session):
+        """Grouped board stats return the same numbers as the per-card methods."""
+        now = datetime.utcnow()
+        async_session.add_all([
+            Card(id="card-1", title="One", column_id="implement"),
+            Card(id="card-2", title="Two", column_id="review"),
+            Card(id="card-3", title="Three", column_id="backlog"),
+        ])
+        async_session.add_all([
+            _execution("card-1", "plan", "opus-4.5", 1000, 500, started_at=now - timedelta(minutes=5)),
+            _execution("card-1", "implement", "sonnet-4.5", 20000, 8000, started_at=now - timedelta(minutes=3)),
+            _execution("card-1", "implement", "opus-4.5", 300, 100, is_active=True, started_at=now),
+            _execution("card-2", "review", "haiku-4.5", 4000, 2000),
+            _execution("card-2", "review", None, None, None),
+        ])
+        await async_session.commit()
+
+        repo = ExecutionRepository(async_session)
+        stats = await repo.get_board_stats()
+
+        for card_id in ("card-1", "card-2"):
+            assert stats[card_id]["tokenStats"] == await repo.get_token_stats_for_card(card_id)
+            expected_cost = await repo.get_cost_stats_for_card(card_id)
+            for key, value in expected_cost.items():
+                assert stats[card_id]["costStats"][key] == pytest.approx(value)
+
+        active = await repo.get_active_execution("card-1")
+        assert stats["card-1"]["activeExecution"]["id"] == active.id
+        assert stats["card-1"]["activeExecution"]["status"] == "running"
+        assert stats["card-2"]["activeExecution"] is None
+        assert "card-3" not in stats
+
+
+class _StatementRecorder:
+    """Captures SQL statements issued through an engine."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append((statement, parameters))
+
+
+async def _query_plan(engine, statement, parameters) -> str:
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return "\n".join(row[-1] for row in result)
+
+
+@pytest.mark.asyncio
+class TestExecutionIndexes:
+    """Hot execution queries must be answered by the composite indexes."""
+
+    async def _plans(self, engine, coro_factory):
+        with _StatementRecorder(engine) as recorder:
+            await coro_factory()
+        return [await _query_plan(engine, s, p) for s, p in recorder.statements]
+
+    async def test_active_execution_uses_card_active_index(self, engine, async_session):
+        repo = ExecutionRepository(async_session)
+
+        plans = await self._plans(engine, lambda: repo.get_active_execution("card-1"))
+
+        assert len(plans) == 1
+        assert "idx_executions_card_active_started" in plans[0]
+        assert "TEMP B-TREE" not in plans[0]
+
+    async def test_logs_read_uses_execution_sequence_index(self, engine, async_session):
+        async_session.add(Card(id="card-1", title="Card", column_id="implement"))
+        await async_session.commit()
+        repo = ExecutionRepository(async_session)
+        execution = await repo.create_execution("card-1", "/implement", "impl")
+        execution_cache.invalidate("card-1")
+
+        plans = await self._plans(engine, lambda: repo.get_execution_with_logs("card-1"))
+
+        logs_plan = next(p for p in plans if "execution_logs" in p)
+        assert "idx_execution_logs_execution_sequence" in logs_plan
+        assert "TEMP B-TREE" not in logs_plan
+        await repo.flush_logs(execution.id)
+
+    async def test_max_sequence_lookup_uses_covering_index(self, engine, async_session):
+        async_session.add(Card(id="card-1", title="Card", column_id="implement"))
+        await async_session.commit()
+        repo = ExecutionRepository(async_session)
+        execution = await repo.create_execution("card-1", "/implement", "impl")
+        await repo.flush_logs(execution.id)
+
+        plans = await self._plans(engine, lambda: repo.add_log(execution.id, "info", "resumed"))
+
+        sequence_plan = next(p for p in plans if "execution_logs" in p)
+        assert "COVERING INDEX idx_execution_logs_execution_sequence" in sequence_plan
+        await repo.flush_logs(execution.id)
+
+    async def test_board_active_executions_use_active_index(self, engine, async_session):
+        repo = ExecutionRepository(async_session)
+
+        plans = await self._plans(engine, repo.get_board_stats)
+
+        assert "idx_executions_active_started" in plans[0]
+        assert "TEMP B-TREE" not in plans[0]
+
+
+@pytest.mark.asyncio
+class TestLogTailing:
+    """Test suite for cursor-based log reads."""
+
+    async def test_returns_only_logs_after_cursor(self, async_session):
+        """Only logs with a sequence greater than the cursor are returned."""
+        async_session.add(Card(id="card-1", title="Card", column_id="implement"))
+        await async_session.commit()
+        repo = ExecutionRepository(async_session)
+        execution = await repo.create_execution("card-1", "/implement", "impl")
+        for i in range(5):
+            await repo.add_log(execution.id, "text", f"line {i}")
+        await repo.flush_logs(execution.id)
+
+        full = await repo.get_execution_with_logs("card-1")
+        tail = await repo.get_execution_logs_after("card-1", 3)
+        empty = await repo.get_execution_logs_after("card-1", 5)
+
+        assert full["lastSequence"] == 5
+        assert [log["content"] for log in tail["logs"]] == ["line 3", "line 4"]
+        assert [log["sequence"] for log in tail["logs"]] == [4, 5]
+        assert tail["lastSequence"] == 5
+        assert tail["executionId"] == execution.id
+        assert empty["logs"] == []
+        assert empty["lastSequence"] == 5
+
+    async def test_no_active_execution(self, async_session):
+        """A card without an active execution yields None."""
+        repo = ExecutionRepository(async_session)
+
+        assert await repo.get_execution_logs_after("missing", 0) is None
+
+    async def test_new_logs_are_appended_to_cached_execution(self, async_session):
+        """add_log extends the cached payload instead of invalidating it."""
+        async_session.add(Card(id="card-1", title="Card", column_id="implement"))
+        await async_session.commit()
+        repo = ExecutionRepository(async_session)
+        execution = await repo.create_execution("card-1", "/implement", "impl")
+        await repo.add_log(execution.id, "text", "buffered")
+
+        first = await repo.get_execution_with_logs("card-1")
+        await repo.add_log(execution.id, "text", "appended")
+        second = await repo.get_execution_with_logs("card-1")
+
+        assert second is first
+        assert [log["content"] for log in second["logs"]] == ["buffered", "appended"]
+        assert second["lastSequence"] == 2
+        await repo.flush_logs(execution.id)
+        execution_cache.invalidate("card-1")
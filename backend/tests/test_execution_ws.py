@@ -0,0 +1,135 @@
+"""Tests for the execution WebSocket log push."""
+
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+
+from src.database import Base
+from src.models.card import Card
+from src.models.project import ActiveProject  # noqa: F401
+from src.repositories.execution_repository import ExecutionRepository
+from src.services.execution_ws import ExecutionWebSocketManager, execution_ws_manager
+
+
+class FakeWebSocket:
+    """Collects the frames sent by the manager."""
+
+    def __init__(self):
+        self.frames = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        self.frames.append(json.loads(data))
+
+
+@pytest_asyncio.fixture
+async def async_session(tmp_path):
+    """Create a file-backed test database session."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session_maker() as session:
+        session.add(Card(id="card-1", title="Card", column_id="implement"))
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+def _log(sequence: int) -> dict:
+    return {"timestamp": "2026-01-01T00:00:00", "type": "text", "content": f"line {sequence}", "sequence": sequence}
+
+
+@pytest.mark.asyncio
+class TestExecutionWebSocketManager:
+    """Test suite for batched log frames."""
+
+    async def test_logs_are_batched_into_one_frame(self):
+        """Logs queued inside the batch window go out in a single frame."""
+        manager = ExecutionWebSocketManager(batch_interval=0.02)
+        ws = FakeWebSocket()
+        await manager.connect("card-1", ws)
+
+        for i in range(1, 6):
+            manager.queue_log("card-1", "exec-1", _log(i))
+        await asyncio.sleep(0.1)
+
+        assert len(ws.frames) == 1
+        frame = ws.frames[0]
+        assert frame["type"] == "log_batch"
+        assert frame["executionId"] == "exec-1"
+        assert [log["sequence"] for log in frame["logs"]] == [1, 2, 3, 4, 5]
+        assert frame["lastSequence"] == 5
+
+    async def test_no_subscribers_skips_queueing(self):
+        """Without connected clients nothing is buffered."""
+        manager = ExecutionWebSocketManager(batch_interval=0.02)
+
+        manager.queue_log("card-1", "exec-1", _log(1))
+
+        assert manager._pending_logs == {}
+
+    async def test_complete_flushes_pending_logs_first(self):
+        """execution_complete is only sent after the remaining logs."""
+        manager = ExecutionWebSocketManager(batch_interval=60)
+        ws = FakeWebSocket()
+        await manager.connect("card-1", ws)
+
+        manager.queue_log("card-1", "exec-1", _log(1))
+        await manager.flush_logs("card-1")
+        manager.queue_log("card-1", "exec-1", _log(2))
+        await manager.notify_complete("card-1", "success", "/implement")
+
+        assert [frame["type"] for frame in ws.frames] == ["log_batch", "log_batch", "execution_complete"]
+        assert ws.frames[1]["logs"][0]["sequence"] == 2
+
+    async def test_logs_queued_during_broadcast_are_flushed(self):
+        """A log queued while a frame is being sent goes out in the next frame."""
+        manager = ExecutionWebSocketManager(batch_interval=0.01)
+        ws = FakeWebSocket()
+        send_text = ws.send_text
+
+        async def slow_send(data: str):
+            await send_text(data)
+            if len(ws.frames) == 1:
+                manager.queue_log("card-1", "exec-1", _log(2))
+                await asyncio.sleep(0.02)
+
+        ws.send_text = slow_send
+        await manager.connect("card-1", ws)
+
+        manager.queue_log("card-1", "exec-1", _log(1))
+        await asyncio.sleep(0.2)
+
+        assert [frame["logs"][0]["sequence"] for frame in ws.frames] == [1, 2]
+        assert manager._pending_logs == {}
+
+    async def test_repository_logs_are_pushed_with_sequence(self, async_session):
+        """add_log pushes the persisted entry, and replay covers unflushed logs."""
+        ws = FakeWebSocket()
+        await execution_ws_manager.connect("card-1", ws)
+        try:
+            repo = ExecutionRepository(async_session)
+            execution = await repo.create_execution("card-1", "/implement", "impl")
+            await repo.add_log(execution.id, "info", "first")
+            await repo.add_log(execution.id, "text", "second")
+
+            # Ainda no buffer do writer: o replay deve incluí-los
+            replay = await repo.get_execution_logs_after("card-1", 0)
+            assert [log["sequence"] for log in replay["logs"]] == [1, 2]
+            assert replay["lastSequence"] == 2
+
+            await execution_ws_manager.flush_logs("card-1")
+            pushed = [log for frame in ws.frames for log in frame["logs"]]
+            assert [log["content"] for log in pushed] == ["first", "second"]
+            assert [log["sequence"] for log in pushed] == [1, 2]
+            await repo.flush_logs(execution.id)
+        finally:
+            execution_ws_manager.disconnect("card-1", ws)
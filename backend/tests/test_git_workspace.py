@@ -0,0 +1,259 @@
+"""Tests for worktree creation: pool, metadata cache and sparse checkout."""
+
+import asyncio
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src import git_workspace
+from src.git_workspace import GitWorkspaceManager, WorktreePool, referenced_paths
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.email", "dev@example.com")
+    _git(path, "config", "user.name", "Dev")
+    (path / "app.py").write_text("print('v1')\n")
+    _git(path, "add", ".")
+    _git(path, "commit", "-q", "-m", "v1")
+    return path
+
+
+@pytest.fixture
+def pool(repo, monkeypatch):
+    pool = WorktreePool(str(repo), size=2, refresh_interval=0)
+    monkeypatch.setattr(git_workspace, "get_worktree_pool", lambda _: pool)
+    return pool
+
+
+@pytest.mark.asyncio
+class TestWorktreePool:
+    """Test suite for WorktreePool."""
+
+    async def test_claim_uses_prewarmed_worktree(self, repo, pool):
+        assert await pool.fill() == 2
+
+        result = await GitWorkspaceManager(str(repo)).create_worktree("card-abcdef123")
+        await pool._fill_task
+
+        assert result.success and pool.claims == 1
+        worktree = Path(result.worktree_path)
+        assert worktree.name == "card-card-abc"
+        assert _git(worktree, "rev-parse", "--abbrev-ref", "HEAD") == result.branch_name
+        assert _git(worktree, "rev-parse", "HEAD") == _git(repo, "rev-parse", "main")
+        assert pool.idle == 2  # refilled in background
+
+    async def test_claim_on_other_base_and_cleanup(self, repo, pool):
+        _git(repo, "checkout", "-q", "-b", "feature")
+        (repo / "app.py").write_text("print('feature')\n")
+        _git(repo, "commit", "-qam", "feature")
+        _git(repo, "checkout", "-q", "main")
+        await pool.fill()
+
+        manager = GitWorkspaceManager(str(repo))
+        result = await manager.create_worktree("card-2", base_branch="feature")
+
+        assert (Path(result.worktree_path) / "app.py").read_text() == "print('feature')\n"
+        assert await manager.cleanup_worktree("card-2", result.branch_name)
+        assert not Path(result.worktree_path).exists()
+        await pool.stop()
+
+    async def test_empty_pool_falls_back_to_cold_path(self, repo, pool):
+        result = await GitWorkspaceManager(str(repo)).create_worktree("card-3")
+        await pool.stop()
+
+        assert result.success and pool.misses == 1
+        assert _git(Path(result.worktree_path), "rev-parse", "--abbrev-ref", "HEAD") == result.branch_name
+
+    async def test_refresh_moves_idle_slots_to_new_base(self, repo, pool):
+        await pool.fill()
+        (repo / "app.py").write_text("print('v2')\n")
+        _git(repo, "commit", "-qam", "v2")
+
+        assert await pool.refresh() == 2
+        head = _git(repo, "rev-parse", "main")
+        assert all(_git(slot, "rev-parse", "HEAD") == head for slot in pool._idle)
+
+    async def test_failed_move_removes_slot_and_branch(self, repo, pool):
+        await pool.fill()
+        manager = GitWorkspaceManager(str(repo))
+        target = manager._card_worktree_path("card-4")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text("not a worktree\n")  # blocks `git worktree move`
+        slot = pool._idle[-1]
+
+        assert await pool.claim("card-4", "main") is None
+        await pool.stop()
+
+        assert not Path(slot).exists()
+        assert _git(repo, "branch", "--list", manager._branch_name("card-4")) == ""
+
+    async def test_claim_does_not_wait_for_refill_checkout(self, repo, pool, monkeypatch):
+        await pool.fill()
+        run = pool._run
+        checkout_started = asyncio.Event()
+
+        async def slow_checkout(args, cwd=None):
+            # Full checkout of a slot: the expensive part of a refill
+            if args == ["git", "checkout", "-f"] or (args[1:3] == ["worktree", "add"] and "--no-checkout" not in args):
+                checkout_started.set()
+                await asyncio.sleep(0.5)
+            return await run(args, cwd)
+
+        monkeypatch.setattr(pool, "_run", slow_checkout)
+        manager = GitWorkspaceManager(str(repo))
+        await manager.create_worktree("card-a")  # starts the background refill
+        await checkout_started.wait()
+
+        second = await asyncio.wait_for(manager.create_worktree("card-b"), timeout=0.3)
+
+        assert second.success and pool.claims == 2
+        await pool.stop()
+        assert all((slot / "app.py").exists() for slot in pool._idle)
+
+    async def test_pool_slots_are_rediscovered(self, repo):
+        first = WorktreePool(str(repo), size=2, refresh_interval=0)
+        await first.fill()
+
+        second = WorktreePool(str(repo), size=2, refresh_interval=0)
+
+        assert await second.fill() == 0
+        assert sorted(second._idle) == sorted(first._idle)
+
+
+@pytest.mark.asyncio
+class TestRepoMetadataCache:
+    """Test suite for the per-repository metadata cache."""
+
+    @pytest.fixture
+    def manager(self, repo, monkeypatch):
+        monkeypatch.setattr(git_workspace, "_repo_metadata", {})
+        manager = GitWorkspaceManager(str(repo))
+        calls = []
+        original = manager._run_git_command
+
+        async def counting(args, cwd=None):
+            calls.append(args)
+            return await original(args, cwd)
+
+        monkeypatch.setattr(manager, "_run_git_command", counting)
+        manager.calls = calls
+        return manager
+
+    async def test_repeated_reads_answer_from_memory(self, manager):
+        assert await manager._get_default_branch() == "main"
+        await manager.list_all_branches()
+        await manager.list_active_worktrees()
+        spawned = len(manager.calls)
+
+        for _ in range(3):
+            assert await manager._get_default_branch() == "main"
+            assert await manager.list_all_branches() == [{"name": "main", "type": "local"}]
+            assert len(await manager.list_active_worktrees()) == 1
+
+        assert len(manager.calls) == spawned
+        assert manager.metadata.hits == 9
+
+    async def test_external_ref_changes_invalidate(self, repo, manager):
+        assert not await manager._branch_exists("feature")
+
+        _git(repo, "branch", "feature")
+        assert await manager._branch_exists("feature")
+
+        _git(repo, "worktree", "add", "-q", str(repo.parent / "wt"), "feature")
+        assert len(await manager.list_active_worktrees()) == 2
+
+    async def test_own_mutations_invalidate(self, repo, manager):
+        await manager.list_active_worktrees()
+
+        await manager._run_git_command(["git", "worktree", "add", "--detach", str(repo.parent / "wt2")])
+
+        assert manager.metadata.stats()["entries"] == 0
+        assert len(await manager.list_active_worktrees()) == 2
+
+
+@pytest.fixture
+def tree_repo(repo):
+    for path in ["backend/src/models/card.py", "backend/src/database.py", "backend/tests/test_card.py",
+                 "frontend/src/App.tsx", "docs/guide.md", ".claude/commands/plan.md"]:
+        (repo / path).parent.mkdir(parents=True, exist_ok=True)
+        (repo / path).write_text(path)
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "tree")
+    return repo
+
+
+def test_referenced_paths():
+    text = "Edit `backend/src/main.py` and src/hooks/ (see https://example.com/docs/x)."
+
+    assert referenced_paths(text) == ["backend/src/main.py", "src/hooks/"]
+
+
+@pytest.mark.asyncio
+class TestSparseCheckout:
+    """Test suite for sparse-checkout worktrees."""
+
+    @pytest.fixture(autouse=True)
+    def no_pool(self, monkeypatch):
+        monkeypatch.setattr(git_workspace, "get_worktree_pool", lambda _: None)
+
+    async def test_cone_from_patterns(self, tree_repo):
+        manager = GitWorkspaceManager(str(tree_repo))
+
+        cone = await manager.resolve_sparse_cone("main", [
+            "backend/src/models/", "backend/src/database", "src/components/**",
+            "backend/src/models/card.py", ".claude/", "../outside", "README.md",
+        ])
+
+        assert cone == [".claude", "backend/src"]
+
+    async def test_sparse_worktree_materializes_only_the_cone(self, tree_repo):
+        manager = GitWorkspaceManager(str(tree_repo))
+
+        result = await manager.create_worktree("card-sparse", sparse_patterns=["backend/src/models/"])
+
+        worktree = Path(result.worktree_path)
+        assert result.success and result.sparse_cone == ["backend/src/models"]
+        assert (worktree / "backend/src/models/card.py").exists()
+        assert (worktree / "app.py").exists()
+        assert not (worktree / "frontend").exists()
+        assert not (worktree / "backend/tests").exists()
+        assert _git(worktree, "status", "--porcelain") == ""
+        assert await manager.sparse_cone(str(worktree)) == ["backend/src/models"]
+
+    async def test_unknown_patterns_fall_back_to_full_checkout(self, tree_repo):
+        manager = GitWorkspaceManager(str(tree_repo))
+
+        result = await manager.create_worktree("card-full", sparse_patterns=["nope/"])
+
+        assert result.success and result.sparse_cone is None
+        assert (Path(result.worktree_path) / "frontend/src/App.tsx").exists()
+        assert await manager.sparse_cone(result.worktree_path) is None
+
+    async def test_touching_paths_outside_the_cone_expands_it(self, tree_repo):
+        manager = GitWorkspaceManager(str(tree_repo))
+        result = await manager.create_worktree("card-lazy", sparse_patterns=["backend/src/models/"])
+        worktree = Path(result.worktree_path)
+
+        assert await manager.expand_sparse_checkout(str(worktree), ["backend/src/models/card.py"]) == []
+        assert await manager.expand_sparse_checkout(str(worktree), ["backend/src/new.py"]) == []
+        assert await manager.expand_sparse_checkout(
+            str(worktree), [str(worktree / "frontend/src/App.tsx"), "backend/tests"]
+        ) == ["backend/tests", "frontend/src"]
+        assert (worktree / "frontend/src/App.tsx").exists()
+        assert await manager.expand_sparse_checkout(str(worktree), ["scratch/notes.md"]) == []
+
+        # A new file in a new directory must join the cone or `git add` skips it
+        assert await manager.expand_sparse_checkout(str(worktree), ["scratch/notes.md"], allow_new=True) == ["scratch"]
+        (worktree / "scratch").mkdir()
+        (worktree / "scratch/notes.md").write_text("notes")
+        _git(worktree, "add", "-A")
+        assert _git(worktree, "diff", "--cached", "--name-only") == "scratch/notes.md"
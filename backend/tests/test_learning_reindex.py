@@ -0,0 +1,199 @@
+"""Tests for batch learning ingestion and bulk re-embedding."""
+
+import asyncio
+import json
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+
+from src.config.qdrant import QdrantSettings
+from src.services import learning_reindex, qdrant_service
+from src.services.learning_reindex import LearningReindexer, start_reindex
+from src.services.lexical_index import LexicalIndex
+from src.services.local_vector_store import LocalVectorStore
+from src.services.qdrant_service import QdrantService, learning_text
+from src.services.vector_store import QdrantVectorStore, VectorPoint
+
+DIM = 8
+
+
+class FlakyStore(LocalVectorStore):
+    """Fails the n-th upsert once, simulating an interrupted run."""
+
+    fail_on = None
+
+    async def upsert(self, points):
+        if self.fail_on is not None:
+            self.fail_on -= 1
+            if self.fail_on == 0:
+                self.fail_on = None
+                raise ConnectionError("store went away")
+        await super().upsert(points)
+
+
+async def _seed(store, n: int, old_model):
+    await store.upsert([
+        VectorPoint(
+            id=f"l{i}",
+            vector=old_model.vector(f"goal {i}\n\nlearning {i}"),
+            payload={"goal_description": f"goal {i}", "learning": f"learning {i}"},
+        )
+        for i in range(n)
+    ])
+
+
+@pytest.mark.asyncio
+class TestLearningReindexer:
+    """Test suite for LearningReindexer."""
+
+    async def test_reembeds_whole_collection_in_batches(self, tmp_path, fake_embedding_service):
+        """Every point gets the new model's vector; encoding is batched."""
+        store = LocalVectorStore(str(tmp_path / "store"), dimension=DIM)
+        await _seed(store, 25, fake_embedding_service(seed=99))
+        new_model = fake_embedding_service(seed=1)
+        updates = []
+
+        progress = await LearningReindexer(
+            store,
+            embedding_service=new_model,
+            checkpoint_path=str(tmp_path / "checkpoint.json"),
+            batch_size=10,
+            upsert_chunk=4,
+            on_progress=lambda p: updates.append(p.processed),
+        ).run()
+
+        assert progress.completed and progress.processed == 25 and progress.total == 25
+        assert new_model.batches == [10, 10, 5]
+        assert updates == [10, 20, 25]
+        query = new_model.vector(learning_text("goal 7", "learning 7"))
+        result = (await store.query(query, limit=1))[0]
+        assert result.id == "l7" and result.score == pytest.approx(1.0, abs=1e-5)
+
+    async def test_interrupted_run_resumes_from_checkpoint(self, tmp_path, fake_embedding_service):
+        """A failed run keeps its offset and the next run only does the rest."""
+        store = FlakyStore(str(tmp_path / "store"), dimension=DIM)
+        await _seed(store, 30, fake_embedding_service(seed=99))
+        checkpoint = tmp_path / "checkpoint.json"
+        store.fail_on = 2
+
+        first = await LearningReindexer(
+            store, embedding_service=fake_embedding_service(1),
+            checkpoint_path=str(checkpoint), batch_size=10, upsert_chunk=10,
+        ).run()
+        assert not first.completed
+        assert first.error == "store went away"
+        assert first.processed == 10
+        assert json.loads(checkpoint.read_text())["processed"] == 10
+
+        new_model = fake_embedding_service(1)
+        second = await LearningReindexer(
+            store, embedding_service=new_model,
+            checkpoint_path=str(checkpoint), batch_size=10, upsert_chunk=10,
+        ).run()
+
+        assert second.completed and second.processed == 30
+        assert sum(new_model.batches) == 20
+
+
+@pytest.mark.asyncio
+async def test_store_learnings_embeds_once_and_chunks(tmp_path, fake_embedding_service):
+    """Batch ingestion encodes all texts together and upserts in chunks."""
+    store = LocalVectorStore(str(tmp_path), dimension=DIM)
+    embedder = fake_embedding_service()
+    service = QdrantService(store=store, embedding_service=embedder, lexical_index=LexicalIndex())
+
+    ids = await service.store_learnings(
+        [{"goal_description": f"g{i}", "learning": f"l{i}", "outcome": "success"} for i in range(7)],
+        chunk_size=3,
+    )
+
+    assert len(ids) == 7
+    assert embedder.batches == [7]
+    assert (await store.stats())["points_count"] == 7
+    assert (await service.get_learning_by_id(ids[2]))["learning"] == "l2"
+
+
+@pytest.mark.asyncio
+async def test_reindex_pages_through_qdrant_scroll(tmp_path, fake_embedding_service):
+    """The Qdrant backend is paged with scroll offsets until exhausted."""
+    store = QdrantVectorStore(
+        client=AsyncQdrantClient(location=":memory:"),
+        settings=QdrantSettings(vector_size=DIM),
+    )
+    service = QdrantService(store=store, embedding_service=fake_embedding_service(99), lexical_index=LexicalIndex())
+    await service.store_learnings([{"goal_description": f"g{i}", "learning": "x"} for i in range(12)])
+
+    progress = await LearningReindexer(
+        store, embedding_service=fake_embedding_service(1),
+        checkpoint_path=str(tmp_path / "checkpoint.json"), batch_size=5,
+    ).run()
+
+    assert progress.completed and progress.processed == 12
+
+
+@pytest.mark.asyncio
+async def test_background_reindex_fills_new_store_and_swaps(tmp_path, monkeypatch, fake_embedding_service):
+    """A dimension change is written to a new store, caught up with writes made meanwhile, and swapped in."""
+    settings = QdrantSettings(
+        vector_backend="local",
+        local_store_path=str(tmp_path / "store"),
+        vector_size=DIM,
+        vector_quantization="none",
+        reindex_batch_size=2,
+        reindex_checkpoint_path=str(tmp_path / "checkpoint.json"),
+        reindex_active_store_path=str(tmp_path / "active_store.json"),
+    )
+    live = LocalVectorStore(settings.local_store_path, dimension=DIM)
+    await _seed(live, 6, fake_embedding_service(seed=99))
+    new_model = fake_embedding_service(seed=1, dim=4)
+    embed_texts = new_model.embed_texts_async
+
+    async def slow_embed(texts):
+        await asyncio.sleep(0.01)
+        return await embed_texts(texts)
+
+    new_model.embed_texts_async = slow_embed
+    service = QdrantService(store=live, embedding_service=new_model, lexical_index=LexicalIndex())
+    monkeypatch.setattr(learning_reindex, "get_qdrant_settings", lambda: settings)
+    monkeypatch.setattr(learning_reindex, "get_embedding_service", lambda: new_model)
+    monkeypatch.setattr(qdrant_service, "get_qdrant_service", lambda: service)
+
+    with pytest.raises(ValueError):
+        start_reindex(target_collection="store", vector_size=4)
+
+    start_reindex(target_collection="store_v2", vector_size=4)
+    await asyncio.sleep(0.015)
+    added = await service.store_learning("goal new", "learning new", [], "success")
+    assert await service.delete_learning("l5")
+    progress = await learning_reindex._reindex_task
+
+    assert progress.completed and progress.target == str(tmp_path / "store_v2")
+    assert service.store is not live and service.store.dimension == 4
+    ids = {p.id for p in (await service.store.scroll(100))[0]}
+    assert ids == {"l0", "l1", "l2", "l3", "l4", added}
+    query = new_model.vector(learning_text("goal 3", "learning 3"))
+    assert (await service.store.query(query, limit=1))[0].id == "l3"
+
+    # A restart keeps serving the swapped-in collection
+    active = learning_reindex.active_store_settings(settings)
+    assert active.local_store_path == str(tmp_path / "store_v2") and active.vector_size == 4
+
+
+@pytest.mark.asyncio
+async def test_catch_up_copies_missing_and_drops_deleted(tmp_path, fake_embedding_service):
+    """Points missing from the target are embedded; points gone from the source are removed."""
+    source = LocalVectorStore(str(tmp_path / "source"), dimension=DIM)
+    target = LocalVectorStore(str(tmp_path / "target"), dimension=DIM)
+    await _seed(source, 4, fake_embedding_service(seed=99))
+    await _seed(target, 3, fake_embedding_service(seed=99))
+    await source.delete(["l0"])
+    new_model = fake_embedding_service(seed=1)
+
+    reindexer = LearningReindexer(
+        source, embedding_service=new_model, target=target,
+        checkpoint_path=str(tmp_path / "checkpoint.json"), batch_size=2,
+    )
+
+    assert await reindexer.catch_up() == 2
+    assert {p.id for p in (await target.scroll(10))[0]} == {"l1", "l2", "l3"}
+    assert new_model.batches == [1]
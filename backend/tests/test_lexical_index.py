@@ -0,0 +1,108 @@
+"""Tests for the BM25 index and hybrid learning retrieval."""
+
+import pytest
+
+from src.services.lexical_index import LexicalIndex, reciprocal_rank_fusion, tokenize
+from src.services.local_vector_store import LocalVectorStore
+from src.services.qdrant_service import QdrantService
+
+DIM = 8
+
+
+class BrokenStore(LocalVectorStore):
+    async def query(self, *args, **kwargs):
+        raise ConnectionError("vector backend down")
+
+
+LEARNINGS = [
+    {"goal_description": "Refactor auth_service.py token refresh", "learning": "Mock the clock", "outcome": "success"},
+    {"goal_description": "Add dark mode to the board", "learning": "Use CSS variables", "outcome": "success"},
+    {"goal_description": "Fix flaky websocket reconnect", "learning": "Backoff with jitter", "outcome": "failed"},
+]
+
+
+async def _service(tmp_path, fake_embedding_service, store_cls=LocalVectorStore, loaded=True):
+    # Constant vectors: only BM25 can tell the learnings apart
+    embedder = fake_embedding_service(constant=True, loaded=loaded)
+    service = QdrantService(
+        store=store_cls(str(tmp_path / "store"), dimension=DIM),
+        embedding_service=embedder,
+        lexical_index=LexicalIndex(),
+    )
+    ids = await service.store_learnings(LEARNINGS)
+    return service, ids, embedder
+
+
+class TestLexicalIndex:
+    """Test suite for LexicalIndex."""
+
+    def test_tokenize_keeps_identifiers_and_parts(self):
+        assert tokenize("Fix auth_service.py") == ["fix", "auth_service.py", "auth", "service", "py"]
+
+    def test_exact_identifier_ranks_first(self):
+        index = LexicalIndex()
+        index.add("a", "update auth_service.py", {})
+        index.add("b", "update the auth docs for the service", {})
+
+        assert [doc_id for doc_id, _ in index.search("auth_service.py", 5)] == ["a", "b"]
+
+    def test_incremental_updates_and_persistence(self, tmp_path):
+        path = str(tmp_path / "lexical.db")
+        index = LexicalIndex(path)
+        index.add("a", "card title alpha", {"outcome": "success"})
+        index.add("b", "card title beta", {"outcome": "failed"})
+        index.add("a", "renamed gamma", {"outcome": "success"})
+        index.remove("b")
+
+        reopened = LexicalIndex(path)
+
+        assert reopened.search("alpha beta", 5) == []
+        assert [doc_id for doc_id, _ in reopened.search("gamma", 5)] == ["a"]
+        assert reopened.search("gamma", 5, payload_filter={"outcome": "failed"}) == []
+
+    def test_reciprocal_rank_fusion(self):
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], k=60)
+
+        assert [doc_id for doc_id, _ in fused] == ["a", "c", "b"]
+
+
+@pytest.mark.asyncio
+class TestHybridSearch:
+    """Test suite for QdrantService.search_learnings."""
+
+    async def test_lexical_match_breaks_vector_ties(self, tmp_path, fake_embedding_service):
+        """When embeddings cannot separate learnings, the identifier decides."""
+        service, ids, _ = await _service(tmp_path, fake_embedding_service)
+
+        results = await service.search_learnings("auth_service.py", limit=3)
+
+        assert results[0]["id"] == ids[0]
+        assert results[0]["retrieval"] == "hybrid"
+        assert results[0]["vector_score"] == pytest.approx(1.0, abs=1e-5)
+        assert results[0]["bm25_score"] > 0
+        assert results[0]["learning"] == "Mock the clock"
+
+    async def test_keyword_fast_path_when_backend_down(self, tmp_path, fake_embedding_service):
+        service, ids, _ = await _service(tmp_path, fake_embedding_service, store_cls=BrokenStore)
+
+        results = await service.search_learnings("websocket reconnect", limit=3)
+
+        assert [r["id"] for r in results] == [ids[2]]
+        assert results[0]["retrieval"] == "keyword"
+
+    async def test_cold_model_answers_by_keyword_and_warms_up(self, tmp_path, fake_embedding_service):
+        service, ids, embedder = await _service(tmp_path, fake_embedding_service, loaded=False)
+
+        results = await service.search_learnings("dark mode", limit=3)
+        await service._warming
+
+        assert [r["id"] for r in results] == [ids[1]]
+        assert embedder.warm_ups == 1
+
+    async def test_backfill_indexes_existing_learnings(self, tmp_path, fake_embedding_service):
+        service, ids, _ = await _service(tmp_path, fake_embedding_service)
+        fresh = QdrantService(store=service.store, embedding_service=fake_embedding_service(constant=True), lexical_index=LexicalIndex())
+
+        assert await fresh.backfill_lexical_index() == 3
+        assert await fresh.backfill_lexical_index() == 0
+        assert (await fresh.search_learnings("jitter", limit=1))[0]["id"] == ids[2]
@@ -0,0 +1,134 @@
+"""Tests for the backpressure-aware live broadcast fan-out."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.services import live_broadcast_service
+from src.services.live_broadcast_service import LiveBroadcastService
+from src.schemas.live import WSLogEntry, WSPresenceUpdate
+
+
+class FakePresence:
+    count = 0
+
+    def on_change(self, callback):
+        pass
+
+    async def connect(self, session_id):
+        self.count += 1
+
+    async def disconnect(self, session_id):
+        self.count -= 1
+
+    async def heartbeat(self, session_id):
+        pass
+
+
+class FakeVoting:
+    is_active = False
+
+    def on_started(self, callback):
+        pass
+
+    on_update = on_ended = on_started
+
+
+class FakeSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.frames = []
+
+    async def send_text(self, text):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(json.loads(text))
+
+
+class BrokenSocket(FakeSocket):
+    async def send_text(self, text):
+        raise RuntimeError("connection reset")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(live_broadcast_service, "get_presence_service", lambda: FakePresence())
+    monkeypatch.setattr(live_broadcast_service, "get_voting_service", lambda: FakeVoting())
+    monkeypatch.setattr(LiveBroadcastService, "_instance", None)
+    svc = LiveBroadcastService()
+    svc._max_queue = 8
+    return svc
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+class TestLiveBroadcast:
+    """Test suite for LiveBroadcastService fan-out."""
+
+    async def test_slow_socket_does_not_delay_others(self, service):
+        """Broadcast latency with 1,000 spectators ignores the slowest socket."""
+        fast = [FakeSocket() for _ in range(1000)]
+        slow = FakeSocket(delay=10)
+        for i, ws in enumerate(fast):
+            await service.connect(f"fast-{i}", ws)
+        await service.connect("slow", slow)
+        await _drain()
+
+        start = time.perf_counter()
+        queued = await service.broadcast(WSLogEntry(content="hello", log_type="info"))
+        elapsed = time.perf_counter() - start
+        await _drain()
+
+        assert queued == 1001
+        assert elapsed < 1.0
+        assert all(ws.frames[-1]["content"] == "hello" for ws in fast)
+        for session_id in list(service._connections):
+            await service.disconnect(session_id)
+
+    async def test_serializes_once_per_message(self, service, monkeypatch):
+        calls = []
+        original = live_broadcast_service.serialize_message
+        monkeypatch.setattr(
+            live_broadcast_service, "serialize_message", lambda m: calls.append(m) or original(m)
+        )
+        for i in range(50):
+            service._connections[f"s{i}"] = live_broadcast_service.LiveConnection(
+                f"s{i}", FakeSocket(), 8, service.disconnect
+            )
+
+        service.publish_log("line", "info")
+
+        assert len(calls) == 1
+
+    async def test_drop_oldest_logs_and_coalesce_state(self, service):
+        slow = FakeSocket(delay=10)
+        await service.connect("slow", slow)
+        await _drain()  # writer picks the first frame and blocks on it
+
+        for n in range(20):
+            service.publish_log(f"line {n}", "info")
+        service.publish(WSPresenceUpdate(spectator_count=1))
+        service.publish(WSPresenceUpdate(spectator_count=2))
+
+        connection = service._connections["slow"]
+        queued = [json.loads(text) for _, text in connection._queue]
+        logs = [f["content"] for f in queued if f["type"] == "log_entry"]
+        presence = [f for f in queued if f["type"] == "presence_update"]
+        assert len(queued) <= 8
+        assert logs[-1] == "line 19" and "line 0" not in logs
+        assert [p["spectator_count"] for p in presence] == [2]
+        stats = service.stats()
+        assert stats["dropped"] > 0 and stats["coalesced"] >= 1
+        await service.disconnect("slow")
+
+    async def test_failed_socket_is_disconnected(self, service):
+        await service.connect("broken", BrokenSocket())
+        await _drain()
+
+        assert "broken" not in service._connections
@@ -0,0 +1,55 @@
+"""Tests for the queue-based logging pipeline."""
+
+import io
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+from src.logging_config import setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def log_stream():
+    stream = io.StringIO()
+    setup_logging(level="INFO", stream=stream)
+    yield stream
+    shutdown_logging()
+
+
+class TestLoggingPipeline:
+    """Test suite for setup_logging."""
+
+    def test_records_are_written_by_listener(self, log_stream):
+        logger = logging.getLogger("src.agent")
+
+        logger.info("card %s started", "abc")
+        logger.debug("ResultMessage received")
+        shutdown_logging()  # drena a fila
+
+        output = log_stream.getvalue()
+        assert "INFO" in output and "src.agent: card abc started" in output
+        assert "ResultMessage" not in output
+
+    def test_setup_is_idempotent(self, log_stream):
+        listener = setup_logging(level="DEBUG")
+
+        assert setup_logging() is listener
+        handlers = logging.getLogger("src").handlers
+        assert sum(isinstance(h, QueueHandler) for h in handlers) == 1
+
+    def test_agent_stream_blocks_skip_stdout(self, log_stream, capsys):
+        """Streamed text blocks stay out of stdout unless DEBUG is enabled."""
+        from src.agent import add_log
+        from src.execution import ExecutionRecord, ExecutionStatus, LogType
+
+        record = ExecutionRecord(cardId="card-12345678", status=ExecutionStatus.RUNNING, logs=[])
+        add_log(record, LogType.TEXT, "streamed token block")
+        add_log(record, LogType.ERROR, "tool failed")
+        shutdown_logging()
+
+        assert capsys.readouterr().out == ""
+        output = log_stream.getvalue()
+        assert "streamed token block" not in output
+        assert "[card-123] [ERROR] tool failed" in output
+        assert len(record.logs) == 2
@@ -0,0 +1,92 @@
+"""Tests for the startup memory warm-up and /health readiness."""
+
+import asyncio
+
+import pytest
+
+from src.services import embedding_service, qdrant_service
+from src.services.memory_warmup import MemoryWarmup
+
+
+class FakeQdrantService:
+    def __init__(self, healthy: bool):
+        self.healthy = healthy
+
+    async def health_check(self):
+        return self.healthy
+
+    async def backfill_lexical_index(self):
+        return 0
+
+
+@pytest.fixture
+def fake_memory(monkeypatch, fake_embedding_service):
+    def install(healthy: bool = True):
+        release = asyncio.Event()
+        embedder = fake_embedding_service(loaded=False, release=release)
+        monkeypatch.setattr(embedding_service, "get_embedding_service", lambda: embedder)
+        monkeypatch.setattr(qdrant_service, "get_qdrant_service", lambda: FakeQdrantService(healthy))
+        return release, embedder
+    return install
+
+
+@pytest.mark.asyncio
+class TestMemoryWarmup:
+    """Test suite for MemoryWarmup."""
+
+    async def test_ready_only_after_model_and_store(self, fake_memory):
+        """The flag flips once the model is loaded and the store answered."""
+        release, embedder = fake_memory()
+        warmup = MemoryWarmup()
+
+        warmup.start()
+        await asyncio.sleep(0.01)
+        assert not warmup.ready
+
+        release.set()
+        await warmup._task
+
+        assert warmup.ready and embedder.warm_ups == 1
+        assert warmup.to_dict()["storeReady"]
+
+    async def test_unavailable_store_does_not_block_readiness(self, fake_memory):
+        """A down vector store is reported but the instance still becomes ready."""
+        release, _ = fake_memory(healthy=False)
+        release.set()
+        warmup = MemoryWarmup()
+
+        await warmup.run()
+
+        assert warmup.ready and warmup.model_loaded
+        assert not warmup.store_ready
+        assert warmup.error == "Vector store unavailable"
+
+    async def test_health_stays_up_while_warming(self, monkeypatch):
+        """/health answers ok during the warm-up and reports it in `ready`."""
+        from src import main
+        from src.services import memory_warmup
+
+        warmup = MemoryWarmup()
+        monkeypatch.setattr(memory_warmup, "get_memory_warmup", lambda: warmup)
+
+        response = await main.health_check()
+        assert response.status == "ok" and not response.ready
+        assert not response.warmup["ready"]
+
+        warmup.ready = True
+        response = await main.health_check()
+        assert response.ready and response.status == "ok"
+
+    async def test_warmup_is_off_by_default(self, monkeypatch):
+        from src.config.qdrant import QdrantSettings
+
+        monkeypatch.delenv("QDRANT_WARMUP_ON_STARTUP", raising=False)
+
+        assert not QdrantSettings(_env_file=None).warmup_on_startup
+
+    async def test_disabled_warmup_is_ready_immediately(self):
+        warmup = MemoryWarmup(enabled=False)
+
+        warmup.start()
+
+        assert warmup.ready and warmup._task is None
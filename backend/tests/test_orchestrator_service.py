@@ -0,0 +1,300 @@
+"""Tests for OrchestratorService card execution and event-driven loop."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.orchestrator_events import OrchestratorEvent, OrchestratorEventBus
+from src.services.orchestrator_service import (
+    ActResult,
+    OrchestratorDecision,
+    OrchestratorService,
+)
+
+
+class FakeSession:
+    """Stands in for an AsyncSession; each factory call yields a new one."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+def _service(max_parallel_cards: int, stage_workers: dict | None = None) -> OrchestratorService:
+    service = OrchestratorService()
+    update = {"orchestrator_max_parallel_cards": max_parallel_cards}
+    if stage_workers:
+        update["orchestrator_stage_workers"] = stage_workers
+    service.settings = service.settings.model_copy(update=update)
+    if stage_workers:
+        service._stage_slots = {stage: asyncio.Semaphore(n) for stage, n in stage_workers.items()}
+        service._stage_busy = {stage: 0 for stage in stage_workers}
+    service.logger = AsyncMock()
+    service._get_session_factory = lambda: FakeSession
+    service._create_repos = lambda session: {"session": session}
+    service._record_card_outcome = AsyncMock()
+    return service
+
+
+def test_partial_stage_workers_override_keeps_defaults(monkeypatch):
+    """Overriding one stage's workers leaves the other stages at their defaults."""
+    from src.config.settings import Settings
+
+    monkeypatch.setenv("ORCHESTRATOR_STAGE_WORKERS", '{"implement": 4}')
+
+    workers = Settings().orchestrator_stage_workers
+
+    assert workers == {"plan": 2, "implement": 4, "test": 1, "review": 1}
+
+
+@pytest.mark.asyncio
+class TestParallelCardExecution:
+    """Test suite for the per-task card scheduler."""
+
+    async def test_cards_run_concurrently_with_own_sessions(self):
+        """Independent cards execute at the same time, each with its own session."""
+        service = _service(max_parallel_cards=3)
+        sessions = []
+        in_flight = 0
+        peak = 0
+
+        async def fake_execute(card_id, repos, **kwargs):
+            nonlocal in_flight, peak
+            sessions.append(repos["session"])
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return ActResult(success=True)
+
+        service._act_execute_card = fake_execute
+
+        result = await service._act_execute_cards_parallel(["a", "b", "c"], {}, goal_id="goal-1")
+        assert result.data["dispatched"] == ["a", "b", "c"]
+        await asyncio.gather(*service._card_tasks.values())
+
+        assert peak == 3
+        assert len({id(s) for s in sessions}) == 3
+        assert service.running_card_ids() == set()
+        assert service._record_card_outcome.await_count == 3
+
+    async def test_dispatch_respects_concurrency_limit(self):
+        """No more than orchestrator_max_parallel_cards cards run at once."""
+        service = _service(max_parallel_cards=2)
+        release = asyncio.Event()
+
+        async def fake_execute(card_id, repos, **kwargs):
+            await release.wait()
+            return ActResult(success=True)
+
+        service._act_execute_card = fake_execute
+
+        result = await service._act_execute_cards_parallel(["a", "b", "c"], {})
+        again = await service._act_execute_cards_parallel(["c"], {})
+
+        assert result.data["dispatched"] == ["a", "b"]
+        assert again.data["dispatched"] == []
+        assert service.running_card_ids() == {"a", "b"}
+
+        release.set()
+        await asyncio.gather(*service._card_tasks.values())
+
+    async def test_think_batches_ready_cards_and_skips_running(self):
+        """THINK picks every ready card that fits in the free slots."""
+        service = _service(max_parallel_cards=3)
+        service.usage_checker = SimpleNamespace(
+            check_usage=AsyncMock(return_value=SimpleNamespace(is_safe_to_execute=True))
+        )
+        goal = SimpleNamespace(id="goal-1", cards=["a", "b", "c", "d"])
+        repos = {
+            "goal_repo": SimpleNamespace(get_active_goal=AsyncMock(return_value=goal)),
+            "card_repo": None,
+        }
+        service._get_cards_status = AsyncMock(return_value=[
+            {"id": card_id, "column": "backlog", "ready_to_execute": True}
+            for card_id in goal.cards
+        ])
+        service._card_tasks["a"] = asyncio.get_running_loop().create_future()
+
+        think = await service._step_think({}, [], repos)
+
+        assert think.decision == OrchestratorDecision.EXECUTE_CARDS_PARALLEL
+        assert think.card_ids == ["b", "c"]
+        service._card_tasks.clear()
+
+
+@pytest.mark.asyncio
+class TestStagePipeline:
+    """Test suite for per-stage worker pools."""
+
+    async def test_stage_caps_serialize_a_stage_but_overlap_stages(self):
+        """Two cards cannot share a 1-worker stage, but different stages overlap."""
+        service = _service(max_parallel_cards=4, stage_workers={"plan": 1, "implement": 1, "test": 1, "review": 1})
+        service._move_card_with_broadcast = AsyncMock()
+        active = {"plan": 0, "implement": 0}
+        peak = {"plan": 0, "implement": 0}
+        overlap = False
+
+        def stage_work(stage):
+            async def work():
+                nonlocal overlap
+                active[stage] += 1
+                peak[stage] = max(peak[stage], active[stage])
+                overlap = overlap or (active["plan"] and active["implement"])
+                await asyncio.sleep(0.03)
+                active[stage] -= 1
+            return work
+
+        async def card(card_id):
+            await service._run_stage("plan", card_id, None, stage_work("plan"))
+            await service._run_stage("implement", card_id, None, stage_work("implement"))
+
+        await asyncio.gather(card("a"), card("b"), card("c"))
+
+        assert peak == {"plan": 1, "implement": 1}
+        assert overlap
+        assert service._move_card_with_broadcast.await_count == 6
+
+    async def test_think_plans_blocked_cards_ahead_with_spare_slots(self):
+        """Spare pipeline slots run PLAN for cards still waiting on dependencies."""
+        service = _service(max_parallel_cards=3)
+        service.usage_checker = SimpleNamespace(
+            check_usage=AsyncMock(return_value=SimpleNamespace(is_safe_to_execute=True))
+        )
+        goal = SimpleNamespace(id="goal-1", cards=["a", "b"])
+        repos = {
+            "goal_repo": SimpleNamespace(get_active_goal=AsyncMock(return_value=goal)),
+            "card_repo": None,
+        }
+        service._get_cards_status = AsyncMock(return_value=[
+            {"id": "a", "column": "backlog", "ready_to_execute": True, "can_plan_ahead": False},
+            {"id": "b", "column": "backlog", "ready_to_execute": False, "can_plan_ahead": True},
+        ])
+
+        think = await service._step_think({}, [], repos)
+
+        assert think.card_ids == ["a", "b"]
+        assert think.context == {"plan_only": ["b"]}
+
+    async def test_card_planned_ahead_is_not_replanned_after_restart(self, monkeypatch):
+        """A fresh service skips PLAN when the latest execution is a successful /plan."""
+        from src import agent
+        from src.models.execution import ExecutionStatus
+        from src.services import orchestrator_service
+
+        service = _service(max_parallel_cards=3)
+        service._move_card_with_broadcast = AsyncMock()
+        card = SimpleNamespace(
+            id="card-1", title="Card", description="", column_id="plan", spec_path="specs/card-1.md",
+            model_plan=None, model_implement=None, model_test=None, model_review=None,
+        )
+        card_repo = SimpleNamespace(session=None, get_by_id=AsyncMock(return_value=card))
+        last_plan = SimpleNamespace(command="/plan", status=ExecutionStatus.SUCCESS)
+        monkeypatch.setattr(
+            orchestrator_service, "ExecutionRepository",
+            lambda session: SimpleNamespace(get_active_execution=AsyncMock(return_value=last_plan)),
+        )
+        stages = {
+            name: AsyncMock(return_value=SimpleNamespace(success=True, spec_path=None))
+            for name in ("execute_plan", "execute_implement", "execute_test_implementation", "execute_review")
+        }
+        for name, mock in stages.items():
+            monkeypatch.setattr(agent, name, mock)
+
+        result = await service._act_execute_card("card-1", {"card_repo": card_repo})
+
+        assert result.success
+        stages["execute_plan"].assert_not_awaited()
+        stages["execute_implement"].assert_awaited_once()
+
+
+@pytest.mark.asyncio
+class TestEventDrivenLoop:
+    """Test suite for the event bus wake-up."""
+
+    async def test_timeout_is_only_a_fallback(self):
+        """wait() returns nothing on timeout and the published events otherwise."""
+        bus = OrchestratorEventBus(debounce_seconds=0)
+
+        assert await bus.wait(timeout=0.01) == []
+
+        bus.publish(OrchestratorEvent.GOAL_SUBMITTED, goal_id="goal-1")
+        events = await bus.wait(timeout=60)
+
+        assert [e.type for e in events] == [OrchestratorEvent.GOAL_SUBMITTED]
+        assert events[0].data == {"goal_id": "goal-1"}
+
+    async def test_burst_is_coalesced(self):
+        """Events published during the debounce window wake a single cycle."""
+        bus = OrchestratorEventBus(debounce_seconds=0.05)
+
+        async def burst():
+            bus.publish(OrchestratorEvent.CARD_COMPLETED, card_id="a")
+            await asyncio.sleep(0.01)
+            bus.publish(OrchestratorEvent.CARD_COMPLETED, card_id="b")
+
+        asyncio.get_running_loop().create_task(burst())
+        events = await bus.wait(timeout=60)
+
+        assert [e.data["card_id"] for e in events] == ["a", "b"]
+
+    async def test_card_completion_wakes_loop_immediately(self):
+        """A finished card triggers the next cycle without waiting for the timer."""
+        service = _service(max_parallel_cards=1)
+        service.event_bus = OrchestratorEventBus(debounce_seconds=0)
+        service.settings = service.settings.model_copy(
+            update={"orchestrator_loop_interval_seconds": 3600}
+        )
+        cycles = 0
+
+        async def fake_cycle():
+            nonlocal cycles
+            cycles += 1
+
+        async def fake_execute(card_id, repos, **kwargs):
+            return ActResult(success=True)
+
+        service._execute_cycle = fake_cycle
+        service._act_execute_card = fake_execute
+
+        await service.start()
+        await asyncio.sleep(0.05)
+        await service._act_execute_cards_parallel(["a"], {})
+        await asyncio.sleep(0.1)
+        await service.stop()
+
+        assert cycles == 2
+
+    async def test_usage_reset_published_while_paused(self, monkeypatch):
+        """Over the limit, a background poll publishes USAGE_RESET without a cycle."""
+        from src.services import orchestrator_events, usage_checker_service
+        from src.services.usage_checker_service import UsageCheckerService, stop_usage_reset_watch
+
+        bus = OrchestratorEventBus(debounce_seconds=0)
+        monkeypatch.setattr(orchestrator_events, "_event_bus", bus)
+        monkeypatch.setattr(usage_checker_service, "_last_safe_to_execute", None)
+        monkeypatch.setattr(
+            usage_checker_service.get_settings(), "orchestrator_usage_poll_seconds", 0.01
+        )
+        checker = UsageCheckerService()
+        results = iter([False, False, True])
+        checker._run_usage_command = AsyncMock(
+            side_effect=lambda: SimpleNamespace(is_safe_to_execute=next(results))
+        )
+
+        assert not (await checker.check_usage()).is_safe_to_execute
+        events = await bus.wait(timeout=5)
+        await stop_usage_reset_watch()
+
+        assert [e.type for e in events] == [OrchestratorEvent.USAGE_RESET]
+        assert checker._run_usage_command.await_count == 3
@@ -0,0 +1,173 @@
+"""Tests for the in-process vector store backend."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.config.qdrant import QdrantSettings
+from src.services.local_vector_store import LocalVectorStore
+from src.services.vector_store import QdrantVectorStore, VectorPoint, create_vector_store
+
+
+def _random_points(n: int, dim: int = 16, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return [
+        VectorPoint(id=f"p{i}", vector=vectors[i].tolist(), payload={"i": i, "outcome": "success" if i % 2 else "failed"})
+        for i in range(n)
+    ]
+
+
+def _brute_force(points, query, limit):
+    matrix = np.array([p.vector for p in points], dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    q = np.asarray(query, dtype=np.float32)
+    scores = matrix @ (q / np.linalg.norm(q))
+    return [points[i].id for i in np.argsort(-scores)[:limit]]
+
+
+@pytest.mark.asyncio
+class TestLocalVectorStore:
+    """Test suite for LocalVectorStore."""
+
+    async def test_query_matches_brute_force_cosine(self, tmp_path):
+        """Results are the exact cosine top-k with payloads and scores."""
+        store = LocalVectorStore(str(tmp_path), dimension=16)
+        points = _random_points(200)
+        await store.upsert(points)
+
+        results = await store.query(points[7].vector, limit=5)
+
+        assert [r.id for r in results] == _brute_force(points, points[7].vector, 5)
+        assert results[0].id == "p7"
+        assert results[0].score == pytest.approx(1.0, abs=1e-5)
+        assert results[0].payload["i"] == 7
+
+    async def test_filter_threshold_and_delete(self, tmp_path):
+        """Payload filters, score threshold and deletions are honoured."""
+        store = LocalVectorStore(str(tmp_path), dimension=16)
+        points = _random_points(50)
+        await store.upsert(points)
+
+        filtered = await store.query(points[3].vector, limit=50, payload_filter={"outcome": "success"})
+        assert filtered and all(r.payload["outcome"] == "success" for r in filtered)
+
+        strict = await store.query(points[3].vector, limit=50, score_threshold=0.99)
+        assert [r.id for r in strict] == ["p3"]
+
+        await store.delete(["p3"])
+        assert "p3" not in [r.id for r in await store.query(points[3].vector, limit=50)]
+        assert (await store.stats())["points_count"] == 49
+
+    async def test_persists_across_restart_and_grows(self, tmp_path):
+        """Points survive reopening the store, beyond the initial capacity."""
+        store = LocalVectorStore(str(tmp_path), dimension=16)
+        points = _random_points(LocalVectorStore.INITIAL_CAPACITY + 10)
+        await store.upsert(points)
+        await store.upsert([VectorPoint(id="p0", vector=points[1].vector, payload={"updated": True})])
+
+        reopened = LocalVectorStore(str(tmp_path), dimension=16)
+
+        assert (await reopened.stats())["points_count"] == len(points)
+        assert (await reopened.retrieve(["p0"]))[0].payload == {"updated": True}
+        last = points[-1]
+        assert (await reopened.query(last.vector, limit=1))[0].id == last.id
+
+    async def test_ivf_index_keeps_recall(self, tmp_path):
+        """Past the threshold the IVF index is built and still finds neighbours."""
+        store = LocalVectorStore(str(tmp_path), dimension=16, ivf_threshold=500, nprobe=8)
+        points = _random_points(2000, seed=1)
+        await store.upsert(points)
+        assert (await store.stats())["indexed"]
+
+        hits = 0
+        for point in points[:50]:
+            results = await store.query(point.vector, limit=1)
+            hits += results[0].id == point.id
+        assert hits >= 48
+
+        # Points added after the build are scanned even before a rebuild
+        extra = VectorPoint(id="new", vector=np.ones(16).tolist(), payload={})
+        await store.upsert([extra])
+        assert (await store.query(extra.vector, limit=1))[0].id == "new"
+
+
+@pytest.mark.asyncio
+class TestQuantizedStorage:
+    """Test suite for quantized codes, rescoring and truncation."""
+
+    @pytest.mark.parametrize("quantization,oversampling", [("int8", 3.0), ("binary", 10.0)])
+    async def test_rescored_results_match_float32(self, tmp_path, quantization, oversampling):
+        """Codes only choose candidates: scores are exact float32 cosines."""
+        store = LocalVectorStore(
+            str(tmp_path), dimension=64, quantization=quantization, rescore_oversampling=oversampling,
+        )
+        points = _random_points(500, dim=64, seed=2)
+        await store.upsert(points)
+
+        results = await store.query(points[11].vector, limit=3)
+
+        assert results[0].id == "p11"
+        assert results[0].score == pytest.approx(1.0, abs=1e-5)
+        stats = await store.stats()
+        assert stats["quantization"] == quantization
+        assert stats["memory_bytes"] < 500 * 64 * 4 / 3
+
+    async def test_codes_are_rebuilt_on_reopen(self, tmp_path):
+        """Quantized codes are derived from the memmap when the store loads."""
+        store = LocalVectorStore(str(tmp_path), dimension=16, quantization="int8", rescore_oversampling=1.0)
+        points = _random_points(100)
+        await store.upsert(points)
+
+        reopened = LocalVectorStore(str(tmp_path), dimension=16, quantization="int8", rescore_oversampling=1.0)
+
+        assert (await reopened.query(points[42].vector, limit=1))[0].id == "p42"
+
+    async def test_dimension_change_is_refused(self, tmp_path):
+        """A store written with another dimension is not read with the wrong row size."""
+        store = LocalVectorStore(str(tmp_path), dimension=16)
+        await store.upsert(_random_points(10))
+
+        with pytest.raises(ValueError, match="16-dimensional"):
+            LocalVectorStore(str(tmp_path), dimension=8)
+
+        (tmp_path / "store.json").unlink()
+        with pytest.raises(ValueError, match="reindex"):
+            LocalVectorStore(str(tmp_path), dimension=24)
+
+    async def test_quantization_change_reencodes_codes(self, tmp_path):
+        """Switching quantization on an existing store keeps its results."""
+        store = LocalVectorStore(str(tmp_path), dimension=16)
+        points = _random_points(100)
+        await store.upsert(points)
+
+        reopened = LocalVectorStore(str(tmp_path), dimension=16, quantization="int8", rescore_oversampling=1.0)
+
+        assert (await reopened.query(points[42].vector, limit=1))[0].id == "p42"
+        assert json.loads((tmp_path / "store.json").read_text()) == {"dimension": 16, "quantization": "int8"}
+
+    async def test_matryoshka_truncation(self, tmp_path):
+        """Longer vectors are cut to the stored dimension and renormalized."""
+        store = LocalVectorStore(str(tmp_path), dimension=8)
+        points = _random_points(20, dim=16)
+        await store.upsert(points)
+
+        result = (await store.query(points[5].vector, limit=1))[0]
+
+        assert result.id == "p5"
+        assert result.score == pytest.approx(1.0, abs=1e-5)
+
+
+class TestVectorStoreFactory:
+    """Test suite for create_vector_store."""
+
+    def test_backend_is_selected_by_settings(self, tmp_path):
+        local = create_vector_store(QdrantSettings(vector_backend="local", local_store_path=str(tmp_path)))
+        remote = create_vector_store(QdrantSettings(vector_backend="qdrant"))
+
+        assert isinstance(local, LocalVectorStore)
+        assert local.quantization == "int8"
+        assert isinstance(remote, QdrantVectorStore)
+        with pytest.raises(ValueError):
+            create_vector_store(QdrantSettings(vector_backend="faiss"))
@@ -15,11 +15,25 @@ interface DiffStatsRaw {
   total_changes: number;
   captured_at?: string;
   branch_name?: string;
-  file_diffs?: Array<{
-    path: string;
-    status: string;
-    content: string;
-  }>;
+  base_commit?: string;
+  head_commit?: string;
+  file_diffs?: FileDiffRaw[];
+}
+
+interface FileDiffRaw {
+  path: string;
+  status: string;
+  content: string;
+  truncated?: boolean;
+}
+
+function mapFileDiff(fd: FileDiffRaw): FileDiff {
+  return {
+    path: fd.path,
+    status: fd.status as FileDiff['status'],
+    content: fd.content,
+    truncated: fd.truncated,
+  };
 }
 
 interface CardResponse {
@@ -75,11 +89,9 @@ function mapDiffStats(raw: DiffStatsRaw | undefined): DiffStats | undefined {
     totalChanges: raw.total_changes,
     capturedAt: raw.captured_at,
     branchName: raw.branch_name,
-    fileDiffs: raw.file_diffs?.map(fd => ({
-      path: fd.path,
-      status: fd.status as FileDiff['status'],
-      content: fd.content,
-    })),
+    baseCommit: raw.base_commit,
+    headCommit: raw.head_commit,
+    fileDiffs: raw.file_diffs?.map(mapFileDiff),
   };
 }
 
@@ -251,6 +263,19 @@ export async function updateSpecPath(cardId: string, specPath: string): Promise<
   return mapCardResponseToCard(data.card);
 }
 
+/**
+ * Load the diff of one changed file (diff summaries come without content).
+ */
+export async function fetchFileDiff(cardId: string, path: string): Promise<FileDiff> {
+  const response = await fetch(`${API_ENDPOINTS.cards}/${cardId}/diff/file?path=${encodeURIComponent(path)}`);
+
+  if (!response.ok) {
+    throw new Error(`Failed to fetch file diff: ${response.statusText}`);
+  }
+
+  return mapFileDiff(await response.json());
+}
+
 interface LogsResponse {
   cardId: string;
   status: 'idle' | 'running' | 'success' | 'error';
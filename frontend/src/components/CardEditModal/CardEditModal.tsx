@@ -283,7 +283,7 @@ export function CardEditModal({ isOpen, onClose, card, onUpdateCard }: CardEditM
           {/* Changes Tab */}
           {activeTab === 'changes' && (
             <div className={styles.changesTab}>
-              <GitDiffViewer diffStats={card.diffStats} />
+              <GitDiffViewer cardId={card.id} diffStats={card.diffStats} />
             </div>
           )}
         </div>
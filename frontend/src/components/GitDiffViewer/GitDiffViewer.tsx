@@ -1,8 +1,10 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import type { DiffStats } from '../../types';
+import { fetchFileDiff } from '../../api/cards';
 import styles from './GitDiffViewer.module.css';
 
 interface GitDiffViewerProps {
+  cardId?: string;
   diffStats: DiffStats | null | undefined;
 }
 
@@ -77,9 +79,35 @@ function getFileDir(path: string): string {
   return parts.slice(0, -1).join('/') + '/';
 }
 
-export function GitDiffViewer({ diffStats }: GitDiffViewerProps) {
+export function GitDiffViewer({ cardId, diffStats }: GitDiffViewerProps) {
   const [expandedFiles, setExpandedFiles] = useState<Set<string>>(new Set());
   const [selectedFileIndex, setSelectedFileIndex] = useState<number | null>(null);
+  // Content of files loaded on demand (summaries come without hunks), by path
+  const [loadedContent, setLoadedContent] = useState<Record<string, string>>({});
+  const [loadingFiles, setLoadingFiles] = useState<Set<string>>(new Set());
+
+  useEffect(() => {
+    setLoadedContent({});
+  }, [cardId, diffStats?.headCommit]);
+
+  useEffect(() => {
+    if (!cardId || !diffStats?.fileDiffs) return;
+    diffStats.fileDiffs.forEach((file, index) => {
+      const path = file.path;
+      if (!expandedFiles.has(String(index)) || file.content || path in loadedContent || loadingFiles.has(path)) {
+        return;
+      }
+      setLoadingFiles(prev => new Set(prev).add(path));
+      fetchFileDiff(cardId, path)
+        .then(fileDiff => setLoadedContent(prev => ({ ...prev, [path]: fileDiff.content })))
+        .catch(() => setLoadedContent(prev => ({ ...prev, [path]: '' })))
+        .finally(() => setLoadingFiles(prev => {
+          const next = new Set(prev);
+          next.delete(path);
+          return next;
+        }));
+    });
+  }, [cardId, diffStats, expandedFiles, loadedContent, loadingFiles]);
 
   if (!diffStats) {
     return (
@@ -167,7 +195,9 @@ export function GitDiffViewer({ diffStats }: GitDiffViewerProps) {
       <div className={styles.fileList}>
         {fileDiffs.map((file, index) => {
           const isExpanded = expandedFiles.has(String(index));
-          const parsedLines = isExpanded ? parseDiffContent(file.content) : [];
+          const content = file.content || loadedContent[file.path] || '';
+          const isLoading = isExpanded && !content && loadingFiles.has(file.path);
+          const parsedLines = isExpanded ? parseDiffContent(content) : [];
 
           return (
             <div key={`${file.path}-${index}`} className={styles.fileItem}>
@@ -198,7 +228,13 @@ export function GitDiffViewer({ diffStats }: GitDiffViewerProps) {
               </button>
 
               {/* Diff Content */}
-              {isExpanded && (
+              {isLoading && (
+                <div className={styles.diffContent}>
+                  <p className={styles.emptySubtext}>Loading diff...</p>
+                </div>
+              )}
+
+              {isExpanded && !isLoading && (
                 <div className={styles.diffContent}>
                   <table className={styles.diffTable}>
                     <tbody>
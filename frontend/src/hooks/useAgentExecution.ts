@@ -1,8 +1,11 @@
 import { useState, useCallback, useRef, useEffect } from "react";
 import { Card, ExecutionStatus, ExecutionLog, CardExecutionHistory, CardExperts } from "../types";
-import { API_ENDPOINTS } from "../api/config";
+import { API_ENDPOINTS, WS_ENDPOINTS } from "../api/config";
+import type { ExecutionCompleteMessage, LogBatchMessage } from "./useExecutionWebSocket";
 
-const POLLING_INTERVAL = 1500; // Poll every 1.5 seconds
+const FALLBACK_POLLING_INTERVAL = 1500; // Only used when the WebSocket is unavailable
+const MAX_STREAM_RECONNECT_ATTEMPTS = 5;
+const STREAM_RECONNECT_BASE_DELAY = 500;
 
 interface ExecutePlanResult {
   success: boolean;
@@ -38,6 +41,30 @@ interface ExecuteImplementResult {
   error?: string;
 }
 
+interface LogCursor {
+  executionId: string;
+  lastSequence: number;
+}
+
+// Per-card log stream: WebSocket with resume, or HTTP polling as a fallback
+interface LogStream {
+  socket: WebSocket | null;
+  reconnectAttempts: number;
+  reconnectTimer?: ReturnType<typeof setTimeout>;
+  fallbackInterval?: ReturnType<typeof setInterval>;
+  closed: boolean;
+}
+
+interface FetchedExecution {
+  cardId: string;
+  status: ExecutionStatus["status"];
+  result?: string;
+  logs: ExecutionLog[];
+  startedAt?: string;
+  completedAt?: string;
+  incremental?: boolean;
+}
+
 // Callback type for execution completion
 type ExecutionCompletionCallback = (execution: ExecutionStatus) => void;
 
@@ -46,24 +73,41 @@ interface UseAgentExecutionProps {
   onExecutionComplete?: (cardId: string, status: ExecutionStatus) => void;
 }
 
+function closeLogStream(stream: LogStream) {
+  stream.closed = true;
+  if (stream.reconnectTimer) clearTimeout(stream.reconnectTimer);
+  if (stream.fallbackInterval) clearInterval(stream.fallbackInterval);
+  stream.socket?.close();
+  stream.socket = null;
+}
+
+// Incremental responses carry only new logs: append them to what is already shown
+function mergeLogs(current: ExecutionStatus | undefined, execution: { incremental?: boolean; logs?: ExecutionLog[] }): ExecutionLog[] {
+  const logs = execution.logs || [];
+  if (!execution.incremental || !current) return logs;
+  return logs.length > 0 ? [...(current.logs || []), ...logs] : current.logs || [];
+}
+
 export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, ExecutionStatus>) {
   // Support both old API (just Map) and new API (props object)
   const initialExecutions = props instanceof Map ? props : props?.initialExecutions;
   const onExecutionComplete = props instanceof Map ? undefined : props?.onExecutionComplete;
   const [executions, setExecutions] = useState<Map<string, ExecutionStatus>>(new Map());
-  const pollingIntervalsRef = useRef<Map<string, NodeJS.Timeout>>(new Map());
+  const logStreamsRef = useRef<Map<string, LogStream>>(new Map());
   // Callbacks to be called when an execution completes (for workflow recovery)
   const completionCallbacksRef = useRef<Map<string, ExecutionCompletionCallback>>(new Map());
   // Track executions that completed while waiting for callback registration
   const pendingCompletionsRef = useRef<Map<string, ExecutionStatus>>(new Map());
-  // Track if initial load is done to prevent duplicate polling
+  // Track if initial load is done to prevent duplicate streams
   const initialLoadDoneRef = useRef(false);
+  // Log cursor per card: streams resume and fetches tail after lastSequence
+  const logCursorsRef = useRef<Map<string, LogCursor>>(new Map());
 
-  // Cleanup polling intervals on unmount
+  // Close log streams on unmount
   useEffect(() => {
     return () => {
-      pollingIntervalsRef.current.forEach((interval) => clearInterval(interval));
-      pollingIntervalsRef.current.clear();
+      logStreamsRef.current.forEach(closeLogStream);
+      logStreamsRef.current.clear();
     };
   }, []);
 
@@ -75,7 +119,7 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
     }
   }, [initialExecutions]);
 
-  // Restore polling for running executions when initialExecutions becomes available
+  // Restore log streams for running executions when initialExecutions becomes available
   useEffect(() => {
     if (initialExecutions && initialExecutions.size > 0 && !initialLoadDoneRef.current) {
       initialLoadDoneRef.current = true;
@@ -85,23 +129,49 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       setTimeout(() => {
         initialExecutions.forEach((execution, cardId) => {
           if (execution.status === 'running') {
-            console.log(`[useAgentExecution] Restoring polling for card: ${cardId}`, execution);
-            startPolling(cardId);
+            console.log(`[useAgentExecution] Restoring log stream for card: ${cardId}`, execution);
+            startLogStream(cardId);
           }
         });
       }, 100);
     }
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [initialExecutions]); // startPolling is stable, we only care about initialExecutions changing
+  }, [initialExecutions]); // startLogStream is stable, we only care about initialExecutions changing
 
   // Function to fetch logs from API
+  // With a cursor, only logs after lastSequence are returned (incremental: true)
   const fetchLogs = useCallback(async (cardId: string) => {
     try {
-      const response = await fetch(`${API_ENDPOINTS.logs}/${cardId}`);
-      if (!response.ok) return null;
-      const data = await response.json();
-      if (data.success && data.execution) {
-        return data.execution;
+      let cursor = logCursorsRef.current.get(cardId);
+
+      for (let attempt = 0; attempt < 2; attempt++) {
+        const query = cursor ? `?after_sequence=${cursor.lastSequence}` : '';
+        const response = await fetch(`${API_ENDPOINTS.logs}/${cardId}${query}`);
+        if (!response.ok) return null;
+        const data = await response.json();
+        if (!data.success || !data.execution) {
+          if (!cursor) return null;
+          // The execution is no longer active: a full fetch falls back to the final in-memory state
+          logCursorsRef.current.delete(cardId);
+          cursor = undefined;
+          continue;
+        }
+
+        const execution = data.execution;
+        if (cursor && execution.executionId !== cursor.executionId) {
+          // New execution started: the cursor belongs to the previous one, refetch in full
+          logCursorsRef.current.delete(cardId);
+          cursor = undefined;
+          continue;
+        }
+
+        if (execution.executionId) {
+          logCursorsRef.current.set(cardId, {
+            executionId: execution.executionId,
+            lastSequence: execution.lastSequence ?? 0,
+          });
+        }
+        return { ...execution, incremental: !!cursor };
       }
       return null;
     } catch (error) {
@@ -129,124 +199,168 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
     }
   }, []);
 
-  // Start polling for a card
-  const startPolling = useCallback((cardId: string) => {
-    // Don't start if already polling
-    if (pollingIntervalsRef.current.has(cardId)) return;
-
-    console.log(`[useAgentExecution] Starting log polling for card: ${cardId}`);
-
-    // Immediate fetch to update UI right away (don't wait for interval)
-    const doFetch = async () => {
-      const execution = await fetchLogs(cardId);
-      if (execution) {
-        setExecutions((prev) => {
-          const next = new Map(prev);
-          const current = next.get(cardId);
-
-          // Only update if we have new logs or status changed
-          if (!current || execution.logs.length > (current.logs?.length || 0) || current.status !== execution.status) {
-            next.set(cardId, {
-              cardId: execution.cardId,
-              status: execution.status,
-              result: execution.result,
-              logs: execution.logs || [],
-              startedAt: execution.startedAt,
-              completedAt: execution.completedAt,
-            });
-          }
-
-          // Stop polling if execution completed
-          if (execution.status !== 'running') {
-            stopPolling(cardId);
-
-            // Call global onExecutionComplete callback if provided
-            const completedExecution = next.get(cardId);
-            if (onExecutionComplete && completedExecution) {
-              console.log(`[useAgentExecution] Calling global onExecutionComplete for card: ${cardId}`);
-              setTimeout(() => onExecutionComplete(cardId, completedExecution), 0);
-            }
-
-            // Call completion callback if registered
-            const callback = completionCallbacksRef.current.get(cardId);
-            if (callback && completedExecution) {
-              console.log(`[useAgentExecution] Calling completion callback for card: ${cardId}`);
-              setTimeout(() => callback(completedExecution), 0);
-              completionCallbacksRef.current.delete(cardId);
-            } else if (completedExecution) {
-              console.log(`[useAgentExecution] No callback registered for card: ${cardId}, saving as pending completion`);
-              pendingCompletionsRef.current.set(cardId, completedExecution);
-            }
-          }
+  // Apply a logs snapshot (full or incremental) and fire completion callbacks when it is final
+  const applyExecution = useCallback((cardId: string, execution: FetchedExecution) => {
+    setExecutions((prev) => {
+      const next = new Map(prev);
+      const current = next.get(cardId);
+
+      next.set(cardId, {
+        cardId: execution.cardId || cardId,
+        status: execution.status,
+        result: execution.result ?? current?.result,
+        logs: mergeLogs(current, execution),
+        startedAt: execution.startedAt ?? current?.startedAt,
+        completedAt: execution.completedAt ?? current?.completedAt,
+      });
 
-          return next;
-        });
+      // Stop streaming if execution completed
+      if (execution.status !== 'running') {
+        stopLogStream(cardId);
+
+        // Call global onExecutionComplete callback if provided
+        const completedExecution = next.get(cardId);
+        if (onExecutionComplete && completedExecution) {
+          console.log(`[useAgentExecution] Calling global onExecutionComplete for card: ${cardId}`);
+          setTimeout(() => onExecutionComplete(cardId, completedExecution), 0);
+        }
+
+        // Call completion callback if registered (for workflow recovery)
+        const callback = completionCallbacksRef.current.get(cardId);
+        if (callback && completedExecution) {
+          console.log(`[useAgentExecution] Calling completion callback for card: ${cardId}`);
+          // Use setTimeout to ensure state is updated before callback
+          setTimeout(() => callback(completedExecution), 0);
+          completionCallbacksRef.current.delete(cardId);
+        } else if (completedExecution) {
+          // Save completion for later if callback not yet registered
+          console.log(`[useAgentExecution] No callback registered for card: ${cardId}, saving as pending completion`);
+          pendingCompletionsRef.current.set(cardId, completedExecution);
+        }
       }
+
+      return next;
+    });
+  }, [onExecutionComplete]);
+
+  // Full/incremental HTTP fetch, used to resync after a sequence gap and on completion
+  const resyncLogs = useCallback(async (cardId: string) => {
+    const execution = await fetchLogs(cardId);
+    if (execution && logStreamsRef.current.has(cardId)) {
+      applyExecution(cardId, execution);
+    }
+    return execution;
+  }, [fetchLogs, applyExecution]);
+
+  // Append a pushed batch of logs, deduplicated by sequence
+  const handleLogBatch = useCallback((cardId: string, msg: LogBatchMessage) => {
+    const cursor = logCursorsRef.current.get(cardId);
+    const sameExecution = cursor?.executionId === msg.executionId;
+    const after = sameExecution ? cursor!.lastSequence : 0;
+    const logs = msg.logs.filter((log) => (log.sequence ?? 0) > after);
+    if (logs.length === 0) return;
+
+    // A frame that does not continue the cursor means we missed logs: resync over HTTP
+    if ((logs[0].sequence ?? 0) !== after + 1) {
+      if (!sameExecution) logCursorsRef.current.delete(cardId);
+      resyncLogs(cardId);
+      return;
+    }
+
+    logCursorsRef.current.set(cardId, {
+      executionId: msg.executionId,
+      lastSequence: logs[logs.length - 1].sequence ?? after,
+    });
+    applyExecution(cardId, {
+      cardId,
+      status: msg.status ?? 'running',
+      logs,
+      incremental: sameExecution,
+    });
+  }, [applyExecution, resyncLogs]);
+
+  // Fallback when the WebSocket is unavailable: cursor-based HTTP polling
+  const startFallbackPolling = useCallback((cardId: string, stream: LogStream) => {
+    if (stream.fallbackInterval) return;
+    console.log(`[useAgentExecution] WebSocket unavailable, falling back to polling for card: ${cardId}`);
+    resyncLogs(cardId);
+    stream.fallbackInterval = setInterval(() => resyncLogs(cardId), FALLBACK_POLLING_INTERVAL);
+  }, [resyncLogs]);
+
+  const connectLogStream = useCallback((cardId: string, stream: LogStream) => {
+    // Resume from the cursor: the server replays every log after it
+    const cursor = logCursorsRef.current.get(cardId);
+    const socket = new WebSocket(`${WS_ENDPOINTS.execution(cardId)}?after_sequence=${cursor?.lastSequence ?? 0}`);
+    stream.socket = socket;
+
+    socket.onopen = () => {
+      stream.reconnectAttempts = 0;
     };
 
-    // Do immediate fetch
-    doFetch();
-
-    const interval = setInterval(async () => {
-      const execution = await fetchLogs(cardId);
-      if (execution) {
-        setExecutions((prev) => {
-          const next = new Map(prev);
-          const current = next.get(cardId);
-
-          // Only update if we have new logs
-          if (!current || execution.logs.length > (current.logs?.length || 0)) {
-            next.set(cardId, {
-              cardId: execution.cardId,
-              status: execution.status,
-              result: execution.result,
-              logs: execution.logs || [],
-              startedAt: execution.startedAt,
-              completedAt: execution.completedAt,
-            });
-          }
+    socket.onmessage = (event) => {
+      let msg: LogBatchMessage | ExecutionCompleteMessage | { type: string };
+      try {
+        msg = JSON.parse(event.data);
+      } catch {
+        return;
+      }
 
-          // Stop polling if execution completed
-          if (execution.status !== 'running') {
-            stopPolling(cardId);
-
-            // Call global onExecutionComplete callback if provided
-            const completedExecution = next.get(cardId);
-            if (onExecutionComplete && completedExecution) {
-              console.log(`[useAgentExecution] Calling global onExecutionComplete for card: ${cardId}`);
-              setTimeout(() => onExecutionComplete(cardId, completedExecution), 0);
-            }
-
-            // Call completion callback if registered (for workflow recovery)
-            const callback = completionCallbacksRef.current.get(cardId);
-            if (callback && completedExecution) {
-              console.log(`[useAgentExecution] Calling completion callback for card: ${cardId}`);
-              // Use setTimeout to ensure state is updated before callback
-              setTimeout(() => callback(completedExecution), 0);
-              completionCallbacksRef.current.delete(cardId);
-            } else if (completedExecution) {
-              // Save completion for later if callback not yet registered
-              console.log(`[useAgentExecution] No callback registered for card: ${cardId}, saving as pending completion`);
-              pendingCompletionsRef.current.set(cardId, completedExecution);
-            }
+      if (msg.type === 'log_batch' || msg.type === 'log_replay') {
+        handleLogBatch(cardId, msg as LogBatchMessage);
+      } else if (msg.type === 'execution_complete') {
+        const complete = msg as ExecutionCompleteMessage;
+        // Final state (result, completedAt) comes from the logs endpoint
+        resyncLogs(cardId).then((execution) => {
+          if (!execution && logStreamsRef.current.has(cardId)) {
+            applyExecution(cardId, { cardId, status: complete.status, result: complete.error, logs: [], incremental: true });
           }
-
-          return next;
         });
       }
-    }, POLLING_INTERVAL);
-
-    pollingIntervalsRef.current.set(cardId, interval);
-  }, [fetchLogs]);
-
-  // Stop polling for a card
-  const stopPolling = useCallback((cardId: string) => {
-    const interval = pollingIntervalsRef.current.get(cardId);
-    if (interval) {
-      console.log(`[useAgentExecution] Stopping log polling for card: ${cardId}`);
-      clearInterval(interval);
-      pollingIntervalsRef.current.delete(cardId);
+    };
+
+    socket.onclose = () => {
+      if (stream.closed || stream.socket !== socket) return;
+      stream.socket = null;
+
+      if (stream.reconnectAttempts >= MAX_STREAM_RECONNECT_ATTEMPTS) {
+        startFallbackPolling(cardId, stream);
+        return;
+      }
+
+      const delay = Math.min(STREAM_RECONNECT_BASE_DELAY * 2 ** stream.reconnectAttempts, 10000);
+      stream.reconnectAttempts++;
+      stream.reconnectTimer = setTimeout(() => {
+        if (!stream.closed) connectLogStream(cardId, stream);
+      }, delay);
+    };
+  }, [handleLogBatch, resyncLogs, applyExecution, startFallbackPolling]);
+
+  // Start streaming logs for a card (pushed over the execution WebSocket)
+  const startLogStream = useCallback((cardId: string) => {
+    // Don't start if already streaming
+    if (logStreamsRef.current.has(cardId)) return;
+
+    console.log(`[useAgentExecution] Starting log stream for card: ${cardId}`);
+
+    const stream: LogStream = { socket: null, reconnectAttempts: 0, closed: false };
+    logStreamsRef.current.set(cardId, stream);
+
+    if (typeof WebSocket === 'undefined') {
+      startFallbackPolling(cardId, stream);
+      return;
+    }
+    connectLogStream(cardId, stream);
+  }, [connectLogStream, startFallbackPolling]);
+
+  // Stop streaming logs for a card
+  const stopLogStream = useCallback((cardId: string) => {
+    const stream = logStreamsRef.current.get(cardId);
+    if (stream) {
+      console.log(`[useAgentExecution] Stopping log stream for card: ${cardId}`);
+      closeLogStream(stream);
+      logStreamsRef.current.delete(cardId);
     }
+    logCursorsRef.current.delete(cardId);
   }, []);
 
   const executePlan = useCallback(async (card: Card): Promise<ExecutePlanResult> => {
@@ -272,8 +386,8 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       return next;
     });
 
-    // Start polling for real-time logs
-    startPolling(card.id);
+    // Stream real-time logs (WebSocket log_batch frames; HTTP polling only as a fallback)
+    startLogStream(card.id);
 
     try {
       const response = await fetch(API_ENDPOINTS.execution.plan, {
@@ -289,8 +403,8 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       const result = await response.json();
       const logs: ExecutionLog[] = result.logs || [];
 
-      // Stop polling and update final state
-      stopPolling(card.id);
+      // Stop the log stream and update final state
+      stopLogStream(card.id);
 
       setExecutions((prev) => {
         const next = new Map(prev);
@@ -312,7 +426,7 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
         error: result.error,
       };
     } catch (error) {
-      stopPolling(card.id);
+      stopLogStream(card.id);
       const errorMessage =
         error instanceof Error ? error.message : "Unknown error";
 
@@ -339,7 +453,7 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       console.error(`[useAgentExecution] Error:`, errorMessage);
       return { success: false, error: errorMessage };
     }
-  }, [startPolling, stopPolling]);
+  }, [startLogStream, stopLogStream]);
 
   const executeImplement = useCallback(async (card: Card): Promise<ExecuteImplementResult> => {
     if (!card.specPath) {
@@ -369,8 +483,8 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       return next;
     });
 
-    // Start polling for real-time logs
-    startPolling(card.id);
+    // Stream real-time logs (WebSocket log_batch frames; HTTP polling only as a fallback)
+    startLogStream(card.id);
 
     try {
       const response = await fetch(API_ENDPOINTS.execution.implement, {
@@ -385,8 +499,8 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       const result = await response.json();
       const logs: ExecutionLog[] = result.logs || [];
 
-      // Stop polling and update final state
-      stopPolling(card.id);
+      // Stop the log stream and update final state
+      stopLogStream(card.id);
 
       setExecutions((prev) => {
         const next = new Map(prev);
@@ -407,7 +521,7 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
         error: result.error,
       };
     } catch (error) {
-      stopPolling(card.id);
+      stopLogStream(card.id);
       const errorMessage =
         error instanceof Error ? error.message : "Unknown error";
 
@@ -434,7 +548,7 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       console.error(`[useAgentExecution] Error:`, errorMessage);
       return { success: false, error: errorMessage };
     }
-  }, [startPolling, stopPolling]);
+  }, [startLogStream, stopLogStream]);
 
   const getExecutionStatus = useCallback(
     (cardId: string): ExecutionStatus | undefined => {
@@ -470,8 +584,8 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       return next;
     });
 
-    // Start polling for real-time logs
-    startPolling(card.id);
+    // Stream real-time logs (WebSocket log_batch frames; HTTP polling only as a fallback)
+    startLogStream(card.id);
 
     try {
       const response = await fetch(API_ENDPOINTS.execution.test, {
@@ -486,8 +600,8 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       const result = await response.json();
       const logs: ExecutionLog[] = result.logs || [];
 
-      // Stop polling and update final state
-      stopPolling(card.id);
+      // Stop the log stream and update final state
+      stopLogStream(card.id);
 
       setExecutions((prev) => {
         const next = new Map(prev);
@@ -508,7 +622,7 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
         error: result.error,
       };
     } catch (error) {
-      stopPolling(card.id);
+      stopLogStream(card.id);
       const errorMessage =
         error instanceof Error ? error.message : "Unknown error";
 
@@ -535,7 +649,7 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       console.error(`[useAgentExecution] Error:`, errorMessage);
       return { success: false, error: errorMessage };
     }
-  }, [startPolling, stopPolling]);
+  }, [startLogStream, stopLogStream]);
 
   const executeReview = useCallback(async (card: Card): Promise<ExecuteImplementResult> => {
     if (!card.specPath) {
@@ -564,8 +678,8 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       return next;
     });
 
-    // Start polling for real-time logs
-    startPolling(card.id);
+    // Stream real-time logs (WebSocket log_batch frames; HTTP polling only as a fallback)
+    startLogStream(card.id);
 
     try {
       const response = await fetch(API_ENDPOINTS.execution.review, {
@@ -580,8 +694,8 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       const result = await response.json();
       const logs: ExecutionLog[] = result.logs || [];
 
-      // Stop polling and update final state
-      stopPolling(card.id);
+      // Stop the log stream and update final state
+      stopLogStream(card.id);
 
       setExecutions((prev) => {
         const next = new Map(prev);
@@ -602,7 +716,7 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
         error: result.error,
       };
     } catch (error) {
-      stopPolling(card.id);
+      stopLogStream(card.id);
       const errorMessage =
         error instanceof Error ? error.message : "Unknown error";
 
@@ -629,17 +743,17 @@ export function useAgentExecution(props?: UseAgentExecutionProps | Map<string, E
       console.error(`[useAgentExecution] Error:`, errorMessage);
       return { success: false, error: errorMessage };
     }
-  }, [startPolling, stopPolling]);
+  }, [startLogStream, stopLogStream]);
 
   const clearExecution = useCallback((cardId: string) => {
-    stopPolling(cardId);
+    stopLogStream(cardId);
     completionCallbacksRef.current.delete(cardId);
     setExecutions((prev) => {
       const next = new Map(prev);
       next.delete(cardId);
       return next;
     });
-  }, [stopPolling]);
+  }, [stopLogStream]);
 
   // Register a callback to be called when an execution completes
   // Used for workflow recovery after page refresh
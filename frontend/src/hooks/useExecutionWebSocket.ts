@@ -1,8 +1,9 @@
 import { useCallback, useMemo } from 'react';
 import { useWebSocketBase } from './useWebSocketBase';
 import { WS_ENDPOINTS } from '../api/config';
+import { ExecutionLog } from '../types';
 
-interface ExecutionCompleteMessage {
+export interface ExecutionCompleteMessage {
   type: 'execution_complete';
   cardId: string;
   status: 'success' | 'error';
@@ -21,12 +22,23 @@ interface LogMessage {
   timestamp: string;
 }
 
-type WebSocketMessage = ExecutionCompleteMessage | LogMessage;
+// Logs persistidos, agrupados em frames (~50ms) ou reenviados no resume
+export interface LogBatchMessage {
+  type: 'log_batch' | 'log_replay';
+  cardId: string;
+  executionId: string;
+  status?: 'running' | 'success' | 'error';
+  logs: ExecutionLog[];
+  lastSequence: number;
+}
+
+type WebSocketMessage = ExecutionCompleteMessage | LogMessage | LogBatchMessage;
 
 export function useExecutionWebSocket(
   cardId: string | null,
   onComplete?: (msg: ExecutionCompleteMessage) => void,
-  onLog?: (msg: LogMessage) => void
+  onLog?: (msg: LogMessage) => void,
+  onLogBatch?: (msg: LogBatchMessage) => void
 ) {
   const handleMessage = useCallback((data: unknown) => {
     const msg = data as WebSocketMessage;
@@ -35,8 +47,10 @@ export function useExecutionWebSocket(
       onComplete(msg as ExecutionCompleteMessage);
     } else if (msg.type === 'log' && onLog) {
       onLog(msg as LogMessage);
+    } else if ((msg.type === 'log_batch' || msg.type === 'log_replay') && onLogBatch) {
+      onLogBatch(msg as LogBatchMessage);
     }
-  }, [onComplete, onLog]);
+  }, [onComplete, onLog, onLogBatch]);
 
   const { isConnected, status, reconnect } = useWebSocketBase({
     url: cardId ? WS_ENDPOINTS.execution(cardId) : '',
@@ -44,6 +44,7 @@ export interface FileDiff {
   path: string;
   status: 'added' | 'modified' | 'removed';
   content: string;
+  truncated?: boolean;
 }
 
 export interface DiffStats {
@@ -55,6 +56,8 @@ export interface DiffStats {
   totalChanges: number;
   capturedAt?: string;
   branchName?: string;
+  baseCommit?: string;
+  headCommit?: string;
   fileDiffs?: FileDiff[];
 }
 
@@ -124,6 +127,7 @@ export interface ExecutionLog {
   timestamp: string;
   type: 'info' | 'tool' | 'text' | 'error' | 'result';
   content: string;
+  sequence?: number; // Ordem do log na execução (cursor de tailing)
 }
 
 export interface ExecutionStatus {